@@ -0,0 +1,77 @@
+"""
+Benchmark: completado con Tab de la shell educativa (modulos/completado.py)
+en una carpeta con muchas entradas.
+
+Mide la primera petición (el listado no está en caché y se lee en un hilo;
+la interfaz no se bloquea) y las siguientes, servidas desde la caché de
+listados, frente a filtrar cada vez la lista completa de entradas.
+
+Uso:
+    python -m benchmarks.bench_completado [--crear N]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modulos.comandos import SesionShell, COMANDOS_VALIDOS  # noqa: E402
+from modulos.completado import Completador  # noqa: E402
+from modulos.listado import CacheListados, listar_directorio  # noqa: E402
+
+
+def medir(funcion, repeticiones=200):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def completado_lineal(directorio, prefijo):
+    # Lo que haría un completado sin caché: listar y filtrar en cada Tab
+    prefijo = prefijo.lower()
+    return [e.nombre for e in listar_directorio(directorio, con_metadatos=False)
+            if e.nombre.lower().startswith(prefijo)]
+
+
+def crear_carpeta_prueba(cantidad):
+    ruta = tempfile.mkdtemp(prefix="bench_completado_")
+    for i in range(cantidad):
+        open(os.path.join(ruta, f"archivo_{i:07d}.txt"), 'w').close()
+    return ruta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--crear', type=int, default=100000, help="Archivos de la carpeta")
+    args = parser.parse_args()
+
+    ruta = crear_carpeta_prueba(args.crear)
+    try:
+        completador = Completador(SesionShell(ruta), COMANDOS_VALIDOS, CacheListados())
+        print(f"Carpeta de {args.crear} archivos\n")
+
+        inicio = time.perf_counter()
+        respuesta = completador.completar("cat a", 5)
+        primera = time.perf_counter() - inicio
+        while respuesta is None:
+            time.sleep(0.005)
+            respuesta = completador.completar("cat a", 5)
+        carga = time.perf_counter() - inicio
+        print(f"Primera petición: {primera * 1e6:.0f} µs (listado leído en segundo plano en {carga:.2f} s)\n")
+
+        print(f"{'línea':<32}{'candidatos':>11}{'caché':>12}{'lineal':>12}")
+        for linea in ("cat a", "cat archivo_00", "cat archivo_0012", "cat archivo_0012345", "cat zz"):
+            resultado = completador.completar(linea, len(linea))
+            con_cache = medir(lambda: completador.completar(linea, len(linea)))
+            lineal = medir(lambda: completado_lineal(ruta, linea.split()[-1]), repeticiones=3)
+            print(f"{linea!r:<32}{resultado.total:>11}{con_cache * 1e6:>9.0f} µs{lineal * 1e3:>9.0f} ms")
+    finally:
+        shutil.rmtree(ruta, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: búsqueda inversa en el historial de la shell (modulos/historial.py)
+con el índice de trigramas frente a recorrer el historial hacia atrás.
+
+Simula escribir una consulta letra a letra (una búsqueda por pulsación) y
+también una consulta sin resultados, el peor caso del recorrido lineal.
+
+Uso:
+    python -m benchmarks.bench_historial [--comandos N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modulos.historial import HistorialShell  # noqa: E402
+
+PALABRAS = ['ls', '-la', 'grep', 'cat', 'head', 'sort', 'wc', 'du', 'echo', 'proyecto', 'src',
+            'modulos', 'datos', 'README', 'informe', 'copia', '|', '-R', '-n', '*.txt']
+
+
+def busqueda_lineal(entradas, consulta):
+    consulta = consulta.lower()
+    for i in range(len(entradas) - 1, -1, -1):
+        comando = entradas[i]
+        if comando is not None and consulta in comando.lower():
+            return i, comando
+    return None
+
+
+def medir(funcion, repeticiones=20):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--comandos', type=int, default=100000)
+    args = parser.parse_args()
+
+    random.seed(1)
+    historial = HistorialShell(maximo=args.comandos)
+    inicio = time.perf_counter()
+    for i in range(args.comandos):
+        historial.agregar(' '.join(random.choice(PALABRAS) for _ in range(4)) + f" {i}")
+    print(f"Historial de {historial.total} comandos (indexado en {time.perf_counter() - inicio:.2f} s)\n")
+
+    objetivo = historial.entradas[len(historial.entradas) // 10]
+    consultas = [objetivo[:n] for n in range(3, len(objetivo) + 1)] + ["no-existe-en-el-historial"]
+    print(f"{'consulta':<36}{'índice':>12}{'lineal':>12}")
+    for consulta in consultas:
+        indexada = medir(lambda: historial.buscar(consulta))
+        lineal = medir(lambda: busqueda_lineal(historial.entradas, consulta))
+        print(f"{consulta!r:<36}{indexada * 1e6:>9.0f} µs{lineal * 1e6:>9.0f} µs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: búsqueda de nombres con el índice de trigramas frente al
+recorrido paralelo del árbol (modulos/busqueda.py).
+
+Mide el tiempo de construcción del índice, su tamaño en disco, la puesta al
+día sin cambios y con algunos cambios, y la latencia de varias consultas.
+
+Uso:
+    python -m benchmarks.bench_indice [directorio] [--crear N]
+
+Con --crear N se genera un árbol temporal con N archivos repartidos en
+carpetas de 100 archivos para medir sobre un tamaño conocido.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modulos.busqueda import IndiceNombres, BusquedaRecursiva  # noqa: E402
+
+PALABRAS = ["informe", "datos", "foto", "copia", "registro", "modulo", "prueba", "factura"]
+EXTENSIONES = [".txt", ".py", ".jpg", ".csv", ".log"]
+
+
+def crear_arbol_prueba(cantidad):
+    ruta = tempfile.mkdtemp(prefix="bench_indice_")
+    carpeta = ruta
+    for i in range(cantidad):
+        if i % 100 == 0:
+            carpeta = os.path.join(ruta, f"grupo_{i // 10000:03d}", f"carpeta_{i // 100:05d}")
+            os.makedirs(carpeta)
+        nombre = f"{PALABRAS[i % len(PALABRAS)]}_{i:07d}{EXTENSIONES[i % len(EXTENSIONES)]}"
+        open(os.path.join(carpeta, nombre), 'w').close()
+    return ruta
+
+
+def cronometrar(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - inicio, resultado
+
+
+def buscar_recorriendo(raiz, texto):
+    busqueda = BusquedaRecursiva(raiz, texto).iniciar()
+    busqueda.terminado.wait()
+    return busqueda.obtener_resultados()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('directorio', nargs='?', help="Árbol a indexar")
+    parser.add_argument('--crear', type=int, default=200000, help="Archivos a generar si no se indica directorio")
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    temporal = None
+    raiz = args.directorio
+    if raiz is None:
+        temporal = raiz = crear_arbol_prueba(args.crear)
+    archivo_indice = os.path.join(tempfile.gettempdir(), "bench_indice.pickle")
+
+    try:
+        indice = IndiceNombres()
+        t_construir, carpetas = cronometrar(lambda: indice.actualizar(raiz))
+        t_guardar, _ = cronometrar(lambda: indice.guardar(archivo_indice))
+        t_cargar, indice = cronometrar(lambda: IndiceNombres.cargar(archivo_indice))
+        t_sin_cambios, _ = cronometrar(lambda: indice.actualizar(raiz))
+
+        print(f"Árbol: {raiz} ({indice.total} nombres en {carpetas} carpetas)")
+        print(f"  construir índice:            {t_construir * 1000:9.1f} ms")
+        print(f"  guardar / cargar:            {t_guardar * 1000:9.1f} / {t_cargar * 1000:.1f} ms")
+        print(f"  tamaño en disco:             {os.path.getsize(archivo_indice) / 1024 / 1024:9.1f} MB")
+        print(f"  poner al día (sin cambios):  {t_sin_cambios * 1000:9.1f} ms")
+
+        if temporal:
+            # Simular cambios en unas pocas carpetas
+            for i, carpeta in enumerate(sorted(indice.directorios)[-10:]):
+                open(os.path.join(carpeta, f"nuevo_{i}.txt"), 'w').close()
+            t_cambios, releidas = cronometrar(lambda: indice.actualizar(raiz))
+            print(f"  poner al día ({releidas} carpetas):  {t_cambios * 1000:7.1f} ms")
+
+        print("  consultas (mejor de {}):".format(args.repeticiones))
+        for texto in ["factura_0001", "foto", ".csv", "zzz_no_existe", "_1"]:
+            mejor = float('inf')
+            for _ in range(args.repeticiones):
+                t, resultados = cronometrar(lambda: indice.buscar(texto))
+                mejor = min(mejor, t)
+            t_recorrido, _ = cronometrar(lambda: buscar_recorriendo(raiz, texto))
+            print(f"    {texto!r:16} {len(resultados):8} resultados  índice {mejor * 1000:8.2f} ms"
+                  f"  recorrido {t_recorrido * 1000:8.1f} ms")
+    finally:
+        if temporal:
+            shutil.rmtree(temporal, ignore_errors=True)
+        if os.path.exists(archivo_indice):
+            os.remove(archivo_indice)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: listado de directorios con os.listdir + os.path.isdir frente a
+una sola pasada de os.scandir (modulos/listado.py).
+
+Uso:
+    python -m benchmarks.bench_listado [directorio] [--crear N]
+
+Con --crear N se genera un directorio temporal con N archivos (y N/10
+carpetas) para medir sobre un tamaño conocido.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modulos.listado import listar_directorio  # noqa: E402
+
+
+def listado_original(ruta):
+    """
+    Reproduce el listado anterior del explorador: listdir + isdir por entrada.
+    """
+    items = sorted(os.listdir(ruta), key=lambda s: s.lower())
+    return [(item, os.path.isdir(os.path.join(ruta, item))) for item in items]
+
+
+def medir(funcion, ruta, repeticiones):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(ruta)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def crear_directorio_prueba(cantidad):
+    ruta = tempfile.mkdtemp(prefix="bench_listado_")
+    for i in range(cantidad):
+        with open(os.path.join(ruta, f"archivo_{i:07d}.txt"), 'w') as f:
+            f.write("x" * (i % 100))
+    for i in range(cantidad // 10):
+        os.mkdir(os.path.join(ruta, f"carpeta_{i:06d}"))
+    return ruta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('directorio', nargs='?', help="Directorio a listar")
+    parser.add_argument('--crear', type=int, default=20000, help="Archivos a generar si no se indica directorio")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    temporal = None
+    ruta = args.directorio
+    if ruta is None:
+        temporal = ruta = crear_directorio_prueba(args.crear)
+
+    try:
+        total = len(os.listdir(ruta))
+        t_original = medir(listado_original, ruta, args.repeticiones)
+        t_sin_stat = medir(lambda r: listar_directorio(r, con_metadatos=False), ruta, args.repeticiones)
+        t_scandir = medir(listar_directorio, ruta, args.repeticiones)
+
+        print(f"Directorio: {ruta} ({total} entradas)")
+        print(f"  listdir + isdir (solo tipo):          {t_original * 1000:9.1f} ms")
+        print(f"  scandir (solo tipo):                  {t_sin_stat * 1000:9.1f} ms"
+              f"  x{t_original / t_sin_stat:.1f}")
+        print(f"  scandir (tipo + tamaño + fecha):      {t_scandir * 1000:9.1f} ms"
+              f"  x{t_original / t_scandir:.1f}")
+    finally:
+        if temporal:
+            shutil.rmtree(temporal, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
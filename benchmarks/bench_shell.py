@@ -0,0 +1,99 @@
+"""
+Benchmark: latencia de las órdenes de la shell educativa ejecutadas dentro
+del proceso (modulos/comandos.py) frente a lanzarlas como subproceso.
+
+Compara, para pwd, echo y ls sobre un directorio con N archivos:
+  - la orden interna llamada directamente (coste de la propia orden),
+  - la orden interna a través de EjecucionInterna (hilo + buffer, lo que
+    hace la ventana),
+  - subprocess.run(..., shell=True), como ejecutaba la shell antes,
+  - EjecucionComando con la lista de argumentos (proceso sin /bin/sh).
+
+Uso:
+    python -m benchmarks.bench_shell [--crear N] [--repeticiones R]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modulos.comandos import SesionShell, ORDENES_INTERNAS, analizar  # noqa: E402
+from modulos.ejecucion import EjecucionComando  # noqa: E402
+
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    tiempos.sort()
+    return tiempos[len(tiempos) // 2]
+
+
+def orden_directa(sesion, linea):
+    argumentos = analizar(linea)
+    for _ in ORDENES_INTERNAS[argumentos[0]](sesion, argumentos[1:], lambda texto: None):
+        pass
+
+
+def orden_en_hilo(sesion, linea):
+    ejecucion = sesion.preparar(linea).iniciar()
+    ejecucion.terminado.wait()
+    ejecucion.obtener_salida()
+
+
+def subproceso_con_shell(sesion, linea):
+    subprocess.run(linea, shell=True, capture_output=True, cwd=sesion.directorio)
+
+
+def subproceso_sin_shell(sesion, linea):
+    ejecucion = EjecucionComando(analizar(linea), directorio=sesion.directorio).iniciar()
+    ejecucion.terminado.wait()
+    ejecucion.obtener_salida()
+
+
+def crear_directorio_prueba(cantidad):
+    ruta = tempfile.mkdtemp(prefix="bench_shell_")
+    for i in range(cantidad):
+        open(os.path.join(ruta, f"archivo_{i:07d}.txt"), 'w').close()
+    return ruta
+
+
+def formatear(segundos):
+    if segundos < 1e-3:
+        return f"{segundos * 1e6:8.1f} µs"
+    return f"{segundos * 1e3:8.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--crear', type=int, default=1000, help="Archivos del directorio para ls")
+    parser.add_argument('--repeticiones', type=int, default=50)
+    args = parser.parse_args()
+
+    ruta = crear_directorio_prueba(args.crear)
+    try:
+        sesion = SesionShell(ruta)
+        print(f"Mediana de {args.repeticiones} ejecuciones (ls sobre {args.crear} archivos)\n")
+        print(f"{'comando':<18}{'interna':>14}{'interna+hilo':>16}{'sh -c':>14}{'Popen argv':>14}")
+        for linea in ("pwd", "echo hola mundo", "ls"):
+            resultados = [
+                medir(lambda: orden_directa(sesion, linea), args.repeticiones),
+                medir(lambda: orden_en_hilo(sesion, linea), args.repeticiones),
+                medir(lambda: subproceso_con_shell(sesion, linea), args.repeticiones),
+                medir(lambda: subproceso_sin_shell(sesion, linea), args.repeticiones),
+            ]
+            print(f"{linea:<18}" + "".join(f"{formatear(t):>14}" if i != 1 else f"{formatear(t):>16}"
+                                            for i, t in enumerate(resultados)))
+    finally:
+        shutil.rmtree(ruta, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: tuberías de la shell educativa (modulos/ejecucion.py,
+modulos/comandos.py).
+
+Mide el tiempo y la memoria de Python (pico de tracemalloc) de:
+  - `ls -R` completo frente a `ls -R | head`, que debe terminar en cuanto
+    head tiene sus líneas en lugar de recorrer todo el árbol,
+  - lo mismo acumulando antes toda la salida de ls en una lista (lo que
+    haría una tubería sin streaming),
+  - `yes | head -n N | sort | wc -l`, cuya memoria no debe crecer con N
+    porque sort ordena por tramos en archivos temporales.
+
+Uso:
+    python -m benchmarks.bench_tuberias [--crear N] [--lineas N]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modulos.comandos import SesionShell, orden_ls, orden_head  # noqa: E402
+
+
+def ejecutar(sesion, linea):
+    ejecucion = sesion.preparar(linea).iniciar()
+    while not ejecucion.terminado.wait(0.01):
+        ejecucion.obtener_salida()
+    ejecucion.obtener_salida()
+
+
+def head_sin_streaming(sesion):
+    # Toda la salida de ls en memoria antes de pasarla a head
+    salida = list(orden_ls(sesion, ['-R', '.'], lambda texto: None))
+    list(orden_head(sesion, [], lambda texto: None, iter(salida)))
+
+
+def medir(funcion):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcion()
+    duracion = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracion, pico
+
+
+def crear_arbol_prueba(cantidad):
+    ruta = tempfile.mkdtemp(prefix="bench_tuberias_")
+    por_carpeta = 100
+    for i in range(cantidad):
+        carpeta = os.path.join(ruta, f"carpeta_{i // por_carpeta:05d}")
+        if i % por_carpeta == 0:
+            os.mkdir(carpeta)
+        open(os.path.join(carpeta, f"archivo_{i:07d}.txt"), 'w').close()
+    return ruta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--crear', type=int, default=50000, help="Archivos del árbol para ls -R")
+    parser.add_argument('--lineas', type=int, default=500000, help="Líneas que pasan por sort")
+    args = parser.parse_args()
+
+    ruta = crear_arbol_prueba(args.crear)
+    try:
+        sesion = SesionShell(ruta)
+        casos = [
+            ("ls -R", lambda: ejecutar(sesion, "ls -R")),
+            ("ls -R | head", lambda: ejecutar(sesion, "ls -R | head")),
+            ("ls -R (lista) + head", lambda: head_sin_streaming(sesion)),
+            (f"yes | head -n {args.lineas} | sort | wc -l",
+             lambda: ejecutar(sesion, f"yes | head -n {args.lineas} | sort | wc -l")),
+        ]
+        print(f"Árbol de {args.crear} archivos\n")
+        print(f"{'tubería':<44}{'tiempo':>12}{'pico Python':>14}")
+        for nombre, funcion in casos:
+            duracion, pico = medir(funcion)
+            print(f"{nombre:<44}{duracion * 1e3:>9.1f} ms{pico / 1024 / 1024:>11.1f} MB")
+    finally:
+        shutil.rmtree(ruta, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,7 @@ from modulos.mod_explorador import abrir_explorador
 from modulos.mod_procesos import abrir_gestion_procesos
 from modulos.mod_shell import abrir_shell
 from modulos.mod_info import abrir_info_sistema
+from modulos.mod_alertas import iniciar_alertas
 
 # =============================================================================
 # CONFIGURACIÓN DE LA VENTANA PRINCIPAL
@@ -222,6 +223,12 @@ def crear_ventana_principal(color1="#44B3EB", color2="#000000", ancho=550, alto=
     # etiquetas se queden sin imagen.
     root._imagenes = imagenes
 
+    # Arrancar el muestreo en segundo plano con el motor de alertas
+    try:
+        iniciar_alertas(root)
+    except Exception as e:
+        print(f"Error al iniciar las alertas: {e}")
+
     return root
 
 # =============================================================================
@@ -3,4 +3,4 @@
 # Puedes agregar inicializaciones de paquete aquí si es necesario en el futuro.
 __version__ = "2.0"
 __author__ = "jaider"
-__all__ = ["mod_explorador", "mod_procesos", "mod_shell", "mod_info"]
+__all__ = ["mod_explorador", "mod_procesos", "mod_shell", "mod_info", "mod_instantaneas", "mod_alertas", "mod_treemap", "mod_busqueda", "mod_duplicados", "mod_vista_previa", "mod_transferencias"]
@@ -0,0 +1,183 @@
+import json
+import os
+import queue
+from collections import namedtuple
+from datetime import datetime
+from .datos_app import obtener_directorio_datos
+
+# =============================================================================
+# MOTOR DE ALERTAS POR UMBRAL SOSTENIDO
+# =============================================================================
+# Cada regla se evalúa de forma incremental con cada lote del muestreador: en
+# lugar de volver a recorrer el buffer circular, guarda para cada clave el
+# instante en que empezó la racha actual por encima del umbral (la "ventana
+# corriente"). Evaluar una muestra es O(1) por clave presente en el lote.
+
+Alerta = namedtuple('Alerta', 'fecha regla clave valor mensaje')
+
+ARCHIVO_REGLAS = 'alertas.json'
+ARCHIVO_REGISTRO = 'alertas.log'
+
+# Reglas por defecto; se pueden sustituir con ~/.os_mini/alertas.json
+REGLAS_POR_DEFECTO = [
+    {'nombre': 'Memoria alta', 'metrica': 'memoria', 'umbral': 90, 'duracion': 30},
+    {'nombre': 'Partición llena', 'metrica': 'disco', 'umbral': 95, 'duracion': 0},
+    {'nombre': 'Proceso con mucha memoria', 'metrica': 'rss', 'umbral': 4 * 1024**3, 'duracion': 0},
+]
+
+
+class ReglaSostenida:
+    """
+    Regla que se dispara cuando una métrica supera un umbral durante un tiempo.
+
+    La regla se dispara una sola vez por racha y se rearma cuando el valor
+    vuelve a quedar por debajo del umbral (o la clave deja de aparecer).
+    """
+
+    def __init__(self, nombre, metrica, umbral, duracion=0):
+        self.nombre = nombre
+        self.metrica = metrica
+        self.umbral = umbral
+        self.duracion = duracion
+        # clave -> [inicio_racha, ya_disparada]
+        self._rachas = {}
+
+    def evaluar(self, instante, valores):
+        """
+        Evalúa un lote de muestras de la métrica de la regla.
+
+        Args:
+            instante (float): Instante del lote (time.monotonic)
+            valores (dict): Diccionario clave -> valor del lote
+
+        Returns:
+            list: Lista de tuplas (clave, valor) que disparan la regla ahora
+        """
+        disparos = []
+        rachas = self._rachas
+
+        # Claves que ya no aparecen o bajaron del umbral: se rearman
+        for clave in [c for c in rachas if valores.get(c, self.umbral) <= self.umbral]:
+            del rachas[clave]
+
+        for clave, valor in valores.items():
+            if valor <= self.umbral:
+                continue
+            racha = rachas.get(clave)
+            if racha is None:
+                racha = rachas[clave] = [instante, False]
+            if not racha[1] and instante - racha[0] >= self.duracion:
+                racha[1] = True
+                disparos.append((clave, valor))
+        return disparos
+
+    def describir(self):
+        """
+        Devuelve una descripción legible de la regla.
+
+        Returns:
+            str: Descripción de la regla
+        """
+        if self.metrica == 'rss':
+            umbral = f"{self.umbral / (1024**3):.1f} GB"
+        else:
+            umbral = f"{self.umbral}%"
+        return f"{self.nombre}: {self.metrica} > {umbral} durante {self.duracion} s"
+
+
+class MotorAlertas:
+    """
+    Agrupa las reglas, escribe el registro y encola las alertas para la interfaz.
+    """
+
+    def __init__(self, reglas, ruta_registro=None):
+        self.reglas = list(reglas)
+        self.ruta_registro = ruta_registro or os.path.join(obtener_directorio_datos(), ARCHIVO_REGISTRO)
+        self.pendientes = queue.Queue()
+        self._por_metrica = {}
+        for regla in self.reglas:
+            self._por_metrica.setdefault(regla.metrica, []).append(regla)
+
+    def umbral_minimo(self, metrica):
+        """
+        Devuelve el umbral más bajo de las reglas de una métrica.
+
+        El muestreador lo usa para enviar solo los valores que pueden disparar
+        alguna regla (por ejemplo, solo procesos con mucho RSS).
+
+        Args:
+            metrica (str): Nombre de la métrica
+
+        Returns:
+            float: El umbral más bajo, o None si no hay reglas para la métrica
+        """
+        reglas = self._por_metrica.get(metrica)
+        if not reglas:
+            return None
+        return min(regla.umbral for regla in reglas)
+
+    def procesar_lote(self, metrica, instante, valores):
+        """
+        Evalúa un lote de muestras contra las reglas de su métrica.
+
+        Pensado para suscribirse al Muestreador; se ejecuta en su hilo.
+
+        Args:
+            metrica (str): Nombre de la métrica
+            instante (float): Instante del lote
+            valores (dict): Diccionario clave -> valor
+
+        Returns:
+            None
+        """
+        for regla in self._por_metrica.get(metrica, ()):
+            for clave, valor in regla.evaluar(instante, valores):
+                self._emitir(regla, clave, valor)
+
+    def _emitir(self, regla, clave, valor):
+        if regla.metrica == 'rss':
+            detalle = f"{valor / (1024**3):.2f} GB"
+        else:
+            detalle = f"{valor:.1f}%"
+        objetivo = f" [{clave}]" if clave else ""
+        alerta = Alerta(
+            fecha=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            regla=regla.nombre,
+            clave=clave,
+            valor=valor,
+            mensaje=f"{regla.nombre}{objetivo}: {detalle}",
+        )
+
+        # Registro de solo anexado: una línea por alerta
+        try:
+            with open(self.ruta_registro, 'a', encoding='utf-8') as f:
+                f.write(f"{alerta.fecha}\t{alerta.mensaje}\n")
+        except OSError as e:
+            print(f"No se pudo escribir el registro de alertas: {e}")
+
+        self.pendientes.put(alerta)
+
+
+def cargar_reglas(ruta=None):
+    """
+    Carga las reglas desde ~/.os_mini/alertas.json o usa las de por defecto.
+
+    Args:
+        ruta (str): Archivo JSON con una lista de reglas (opcional)
+
+    Returns:
+        list: Lista de ReglaSostenida
+    """
+    ruta = ruta or os.path.join(obtener_directorio_datos(), ARCHIVO_REGLAS)
+    definiciones = REGLAS_POR_DEFECTO
+    if os.path.exists(ruta):
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                definiciones = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"No se pudieron cargar las reglas de alertas, se usan las de por defecto: {e}")
+
+    return [
+        ReglaSostenida(d['nombre'], d['metrica'], d['umbral'], d.get('duracion', 0))
+        for d in definiciones
+    ]
@@ -0,0 +1,518 @@
+import os
+import pickle
+import queue
+import threading
+from array import array
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .datos_app import obtener_directorio_datos
+
+# =============================================================================
+# BÚSQUEDA DE ARCHIVOS POR NOMBRE
+# =============================================================================
+# Dos caminos para la misma consulta (subcadena del nombre, sin distinguir
+# mayúsculas):
+#   - BusquedaRecursiva recorre el subárbol en paralelo con os.scandir y
+#     publica las coincidencias a medida que aparecen. No necesita nada
+#     preparado, pero cuesta un recorrido completo por consulta.
+#   - IndiceNombres guarda los nombres de los árboles indexados con un índice
+#     de trigramas: cada secuencia de 3 caracteres apunta a los archivos que
+#     la contienen, así que una consulta solo verifica los candidatos del
+#     trigrama menos frecuente. Se guarda en disco y se actualiza releyendo
+#     únicamente las carpetas cuyo mtime cambió.
+
+HILOS_POR_DEFECTO = 8
+
+# Resultado de una búsqueda
+Coincidencia = namedtuple('Coincidencia', 'directorio nombre es_dir')
+
+
+def trigramas(texto):
+    """
+    Devuelve los trigramas de un texto (ya en minúsculas).
+
+    Args:
+        texto (str): Texto a descomponer
+
+    Returns:
+        set: Subcadenas distintas de 3 caracteres
+    """
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def esta_dentro(ruta, raiz):
+    """
+    Indica si una ruta es `raiz` o cuelga de ella.
+
+    Args:
+        ruta (str): Ruta absoluta a comprobar
+        raiz (str): Carpeta absoluta
+
+    Returns:
+        bool: True si ruta está dentro de raiz
+    """
+    return ruta == raiz or ruta.startswith(raiz.rstrip(os.sep) + os.sep)
+
+
+# =============================================================================
+# RECORRIDO PARALELO CON RESULTADOS EN STREAMING
+# =============================================================================
+
+class BusquedaRecursiva:
+    """
+    Busca en segundo plano los nombres que contienen un texto.
+
+    Varios hilos leen carpetas con os.scandir y un hilo coordinador reparte
+    el trabajo; las coincidencias se publican en una cola por carpeta leída,
+    así que las primeras aparecen enseguida aunque el árbol sea enorme. No
+    sigue enlaces simbólicos a carpetas.
+    """
+
+    def __init__(self, raiz, texto, hilos=HILOS_POR_DEFECTO):
+        self.raiz = os.path.abspath(raiz)
+        self.texto = texto.lower()
+        self.hilos = hilos
+        self.directorios = 0
+        self.errores = 0
+        self.terminado = threading.Event()
+        self._resultados = queue.Queue()
+        self._cancelado = threading.Event()
+
+    @property
+    def cancelado(self):
+        return self._cancelado.is_set()
+
+    def iniciar(self):
+        """
+        Arranca la búsqueda en un hilo coordinador.
+
+        Returns:
+            BusquedaRecursiva: La propia búsqueda (para encadenar llamadas)
+        """
+        threading.Thread(target=self._coordinar, name="busqueda-recursiva", daemon=True).start()
+        return self
+
+    def cancelar(self):
+        """
+        Detiene la búsqueda lo antes posible.
+
+        Returns:
+            None
+        """
+        self._cancelado.set()
+
+    def obtener_resultados(self):
+        """
+        Extrae sin bloquear las coincidencias publicadas hasta ahora.
+
+        Returns:
+            list: Coincidencias encontradas desde la última llamada
+        """
+        resultados = []
+        try:
+            while True:
+                resultados.extend(self._resultados.get_nowait())
+        except queue.Empty:
+            pass
+        return resultados
+
+    def _leer(self, ruta):
+        """
+        Lee una carpeta y devuelve sus subcarpetas y coincidencias.
+
+        Returns:
+            tuple: (subcarpetas, coincidencias), o (None, None) si falla
+        """
+        if self._cancelado.is_set():
+            return (), ()
+        subdirs = []
+        coincidencias = []
+        try:
+            with os.scandir(ruta) as it:
+                for entry in it:
+                    try:
+                        es_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        es_dir = False
+                    if es_dir:
+                        subdirs.append(entry.path)
+                    if self.texto in entry.name.lower():
+                        coincidencias.append(Coincidencia(ruta, entry.name, es_dir))
+        except OSError:
+            return None, None
+        return subdirs, coincidencias
+
+    def _coordinar(self):
+        with ThreadPoolExecutor(max_workers=self.hilos) as pool:
+            pendientes = {pool.submit(self._leer, self.raiz)}
+            while pendientes and not self._cancelado.is_set():
+                hechos, pendientes = wait(pendientes, timeout=0.2, return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    subdirs, coincidencias = futuro.result()
+                    if subdirs is None:
+                        self.errores += 1
+                        continue
+                    self.directorios += 1
+                    if coincidencias:
+                        self._resultados.put(coincidencias)
+                    for subdir in subdirs:
+                        pendientes.add(pool.submit(self._leer, subdir))
+
+            for futuro in pendientes:
+                futuro.cancel()
+        self.terminado.set()
+
+
+# =============================================================================
+# ÍNDICE PERSISTENTE DE TRIGRAMAS
+# =============================================================================
+
+# Cambiar si se modifica el formato guardado: los índices antiguos se ignoran
+VERSION_INDICE = 1
+
+# Se reconstruyen las listas cuando más de la mitad de los identificadores
+# corresponden a archivos borrados (y son al menos estos)
+MIN_BORRADOS_COMPACTAR = 10000
+
+
+def _firma(info):
+    return (info.st_mtime_ns, info.st_ino, info.st_dev)
+
+
+class IndiceNombres:
+    """
+    Índice de trigramas de los nombres de archivo de uno o varios árboles.
+
+    Cada archivo indexado tiene un identificador entero; las listas de cada
+    trigrama guardan identificadores en orden creciente (array de enteros de
+    32 bits, compacto en memoria y en disco). Al releer una carpeta sus
+    archivos antiguos solo se marcan como borrados y los nuevos reciben
+    identificadores nuevos; compactar() recupera el espacio cuando los
+    borrados dominan.
+
+    Es seguro entre hilos: actualizar() puede ejecutarse en segundo plano
+    mientras la interfaz consulta con buscar().
+    """
+
+    def __init__(self):
+        self.raices = []
+        # Identificador -> nombre (None si se borró), carpeta y tipo
+        self.nombres = []
+        self.carpetas = []
+        self.es_dir = bytearray()
+        self.trigramas = {}
+        # Carpeta -> (firma, identificadores de sus entradas)
+        self.directorios = {}
+        self.borrados = 0
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        del estado['_lock']
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._lock = threading.RLock()
+
+    # -------------------------------------------------------------------------
+    # Consultas
+    # -------------------------------------------------------------------------
+
+    @property
+    def total(self):
+        """Número de nombres indexados vigentes."""
+        return len(self.nombres) - self.borrados
+
+    def cubre(self, ruta):
+        """
+        Indica si una carpeta está dentro de alguna raíz indexada.
+
+        Args:
+            ruta (str): Carpeta
+
+        Returns:
+            bool: True si el índice puede responder búsquedas en ella
+        """
+        ruta = os.path.abspath(ruta)
+        return any(esta_dentro(ruta, raiz) for raiz in self.raices)
+
+    def buscar(self, texto, dentro_de=None, limite=None):
+        """
+        Busca los nombres que contienen un texto (sin distinguir mayúsculas).
+
+        Con 3 o más caracteres solo se verifican los archivos de la lista del
+        trigrama menos frecuente; con menos se recorren todos los nombres.
+
+        Args:
+            texto (str): Subcadena a buscar
+            dentro_de (str): Si se indica, solo resultados bajo esta carpeta
+            limite (int): Número máximo de resultados (None sin límite)
+
+        Returns:
+            list: Coincidencias en orden de indexación
+        """
+        consulta = texto.lower()
+        if dentro_de is not None:
+            dentro_de = os.path.abspath(dentro_de)
+            prefijo = dentro_de.rstrip(os.sep) + os.sep
+
+        resultados = []
+        with self._lock:
+            if len(consulta) >= 3:
+                listas = [self.trigramas.get(t) for t in trigramas(consulta)]
+                if not all(listas):
+                    return resultados
+                candidatos = min(listas, key=len)
+            else:
+                candidatos = range(len(self.nombres))
+
+            nombres = self.nombres
+            carpetas = self.carpetas
+            for i in candidatos:
+                nombre = nombres[i]
+                if nombre is None or consulta not in nombre.lower():
+                    continue
+                carpeta = carpetas[i]
+                if dentro_de is not None and carpeta != dentro_de and not carpeta.startswith(prefijo):
+                    continue
+                resultados.append(Coincidencia(carpeta, nombre, bool(self.es_dir[i])))
+                if limite is not None and len(resultados) >= limite:
+                    break
+        return resultados
+
+    # -------------------------------------------------------------------------
+    # Actualización
+    # -------------------------------------------------------------------------
+
+    def _agregar(self, carpeta, nombre, es_dir):
+        identificador = len(self.nombres)
+        self.nombres.append(nombre)
+        self.carpetas.append(carpeta)
+        self.es_dir.append(1 if es_dir else 0)
+        for trigrama in trigramas(nombre.lower()):
+            lista = self.trigramas.get(trigrama)
+            if lista is None:
+                lista = self.trigramas[trigrama] = array('I')
+            lista.append(identificador)
+        return identificador
+
+    def _quitar_directorio(self, carpeta):
+        anterior = self.directorios.pop(carpeta, None)
+        if anterior is None:
+            return
+        for identificador in anterior[1]:
+            if self.nombres[identificador] is not None:
+                self.nombres[identificador] = None
+                self.borrados += 1
+
+    def _reemplazar_directorio(self, carpeta, firma, entradas):
+        self._quitar_directorio(carpeta)
+        ids = array('I', (self._agregar(carpeta, nombre, es_dir) for nombre, es_dir in entradas))
+        self.directorios[carpeta] = (firma, ids)
+
+    def _subcarpetas(self, carpeta):
+        """Subcarpetas registradas de una carpeta ya indexada."""
+        _, ids = self.directorios[carpeta]
+        return [os.path.join(carpeta, self.nombres[i]) for i in ids
+                if self.es_dir[i] and self.nombres[i] is not None]
+
+    def _leer(self, carpeta, firma_guardada, dev_raiz):
+        """
+        Lee una carpeta si su firma cambió (se ejecuta en los hilos).
+
+        Returns:
+            tuple: (carpeta, firma, entradas o None si no cambió),
+                   (carpeta, None, None) si no se pudo leer o es de otro
+                   dispositivo, o (carpeta, None, []) si ya no existe
+        """
+        try:
+            info = os.stat(carpeta, follow_symlinks=False)
+            if info.st_dev != dev_raiz:
+                return carpeta, None, None
+            firma = _firma(info)
+            if firma == firma_guardada:
+                return carpeta, firma, None
+            entradas = []
+            with os.scandir(carpeta) as it:
+                for entry in it:
+                    try:
+                        es_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        es_dir = False
+                    entradas.append((entry.name, es_dir))
+            return carpeta, firma, entradas
+        except (FileNotFoundError, NotADirectoryError):
+            return carpeta, None, []
+        except OSError:
+            return carpeta, None, None
+
+    def actualizar(self, raiz, hilos=HILOS_POR_DEFECTO, cancelado=None):
+        """
+        Indexa un árbol o lo pone al día releyendo solo lo que cambió.
+
+        Crear, borrar o renombrar una entrada cambia el mtime de su carpeta,
+        así que en un árbol sin cambios el coste es un stat por carpeta. No
+        cruza a otros sistemas de archivos.
+
+        Args:
+            raiz (str): Carpeta a indexar (se añade a las raíces)
+            hilos (int): Hilos de lectura
+            cancelado (threading.Event): Si se activa, se deja a medias
+                                         (lo ya leído queda indexado)
+
+        Returns:
+            int: Número de carpetas releídas
+        """
+        raiz = os.path.abspath(raiz)
+        dev_raiz = os.stat(raiz).st_dev
+        with self._lock:
+            if not self.cubre(raiz):
+                # Una raíz nueva puede englobar a otras ya indexadas
+                self.raices = [r for r in self.raices if not esta_dentro(r, raiz)] + [raiz]
+
+        releidas = 0
+        visitadas = set()
+        # Carpetas que no se pudieron leer: su subárbol indexado se conserva
+        conservadas = []
+        with ThreadPoolExecutor(max_workers=hilos) as pool:
+            def enviar(carpeta):
+                guardada = self.directorios.get(carpeta)
+                return pool.submit(self._leer, carpeta, guardada[0] if guardada else None, dev_raiz)
+
+            pendientes = {enviar(raiz)}
+            while pendientes:
+                if cancelado is not None and cancelado.is_set():
+                    for futuro in pendientes:
+                        futuro.cancel()
+                    return releidas
+                hechos, pendientes = wait(pendientes, timeout=0.2, return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    carpeta, firma, entradas = futuro.result()
+                    if firma is None:
+                        if entradas is None:
+                            # Ilegible u otro dispositivo: se conserva lo que hubiera
+                            visitadas.add(carpeta)
+                            conservadas.append(carpeta)
+                        continue
+                    visitadas.add(carpeta)
+                    with self._lock:
+                        if entradas is not None:
+                            self._reemplazar_directorio(carpeta, firma, entradas)
+                            releidas += 1
+                        subcarpetas = self._subcarpetas(carpeta)
+                    for subcarpeta in subcarpetas:
+                        pendientes.add(enviar(subcarpeta))
+
+        # Carpetas indexadas que ya no existen bajo esta raíz
+        with self._lock:
+            for carpeta in [c for c in self.directorios if esta_dentro(c, raiz) and c not in visitadas]:
+                if not any(esta_dentro(carpeta, c) for c in conservadas):
+                    self._quitar_directorio(carpeta)
+            if self.borrados >= MIN_BORRADOS_COMPACTAR and self.borrados * 2 > len(self.nombres):
+                self.compactar()
+        return releidas
+
+    def compactar(self):
+        """
+        Renumera los nombres vigentes y reconstruye las listas de trigramas.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            directorios = self.directorios
+            nombres = self.nombres
+            es_dir = self.es_dir
+            self.nombres = []
+            self.carpetas = []
+            self.es_dir = bytearray()
+            self.trigramas = {}
+            self.directorios = {}
+            self.borrados = 0
+            for carpeta, (firma, ids) in directorios.items():
+                entradas = [(nombres[i], es_dir[i]) for i in ids if nombres[i] is not None]
+                self._reemplazar_directorio(carpeta, firma, entradas)
+
+    # -------------------------------------------------------------------------
+    # Persistencia
+    # -------------------------------------------------------------------------
+
+    def guardar(self, ruta):
+        """
+        Guarda el índice en disco de forma atómica.
+
+        Args:
+            ruta (str): Archivo de destino
+
+        Returns:
+            None
+        """
+        temporal = ruta + '.tmp'
+        with self._lock:
+            with open(temporal, 'wb') as f:
+                pickle.dump((VERSION_INDICE, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar(cls, ruta):
+        """
+        Carga un índice guardado.
+
+        Args:
+            ruta (str): Archivo del índice
+
+        Returns:
+            IndiceNombres: El índice guardado, o uno vacío si no existe,
+                           está dañado o es de otra versión
+        """
+        try:
+            with open(ruta, 'rb') as f:
+                version, indice = pickle.load(f)
+            if version == VERSION_INDICE and isinstance(indice, cls):
+                return indice
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError, AttributeError):
+            pass
+        return cls()
+
+
+# Instancia compartida por todas las ventanas (se carga al primer uso)
+_indice_nombres = None
+_lock_indice = threading.Lock()
+
+
+def ruta_indice():
+    """
+    Devuelve la ruta del índice de nombres persistente.
+
+    Returns:
+        str: ~/.os_mini/indice/nombres.pickle
+    """
+    return os.path.join(obtener_directorio_datos('indice'), 'nombres.pickle')
+
+
+def indice_nombres_cargado():
+    """
+    Devuelve el índice de nombres compartido solo si ya está en memoria.
+
+    Cargarlo de disco puede tardar (varios MB en árboles grandes), así que
+    la interfaz usa esta función y deja la carga a un hilo.
+
+    Returns:
+        IndiceNombres: La instancia compartida, o None si aún no se cargó
+    """
+    return _indice_nombres
+
+
+def obtener_indice_nombres():
+    """
+    Devuelve el índice de nombres compartido, cargándolo de disco si hace falta.
+
+    Returns:
+        IndiceNombres: La instancia compartida
+    """
+    global _indice_nombres
+    with _lock_indice:
+        if _indice_nombres is None:
+            _indice_nombres = IndiceNombres.cargar(ruta_indice())
+        return _indice_nombres
@@ -0,0 +1,801 @@
+import heapq
+import os
+import re
+import shlex
+import stat
+import tempfile
+import time
+from functools import partial
+from itertools import islice
+from .listado import listar_directorio, formatear_fecha, formatear_tamano
+from .ejecucion import (EjecucionComando, EjecucionInterna, EjecucionTuberia, ErrorComando, ERROR,
+                        MAX_LONGITUD_LINEA, CODIGO_NO_ENCONTRADO)
+from .trabajos import GestorTrabajos
+from .recursos import RegistroTiempos, LimitesRecursos
+from .busqueda import esta_dentro
+
+# =============================================================================
+# ÓRDENES INTERNAS Y SESIÓN DE LA SHELL EDUCATIVA
+# =============================================================================
+# ls, dir, pwd, echo y cd se implementan en Python y se ejecutan dentro del
+# propio proceso: no hay fork, ni exec, ni /bin/sh interpretando la línea.
+# Una orden interna cuesta microsegundos en lugar de los milisegundos de
+# crear un proceso, y cd funciona de verdad porque cambia el directorio de
+# la sesión (no el de un subproceso que muere al terminar).
+#
+# Cada orden es una función (sesion, argumentos, error) que devuelve un
+# iterable de líneas; las largas (ls -R) son generadores, así que la salida
+# empieza a mostrarse enseguida y cancelar solo tiene que dejar de iterar.
+#
+# Los programas externos que se permitan (COMANDOS_EXTERNOS) se ejecutan
+# como procesos, con su lista de argumentos y sin shell de por medio.
+#
+# cat y los filtros solo leen archivos dentro de la carpeta en la que
+# empezó la sesión (`sesion.raiz`), aunque cd se haya movido fuera de ella.
+#
+# Una línea terminada en '&' se lanza como trabajo en segundo plano
+# (modulos/trabajos.py); jobs, fg, wait y kill %n los controlan.
+#
+# Las órdenes se pueden encadenar con '|'. grep, head, wc y sort son
+# filtros internos: generadores que leen su entrada línea a línea, de modo
+# que `ls -R / | head` termina en cuanto head tiene sus diez líneas.
+#
+# `time linea` ejecuta la línea (también una tubería) y al terminar informa
+# de su tiempo real, CPU, memoria y E/S; `times` muestra los comandos más
+# lentos de la sesión (modulos/recursos.py). Los programas externos se
+# lanzan con los límites de la sesión (CPU, memoria, archivos abiertos,
+# tamaño de archivo y salida), que `ulimit` consulta y cambia.
+
+# Programas externos permitidos. Solo dos, para poder ver los límites de
+# la sesión en acción (solo se aplican a procesos): `yes` no termina nunca
+# y choca con el límite de CPU o de salida, y `sleep` casi no gasta CPU,
+# así que sirve para comparar tiempo real y CPU con `time` y para probar
+# los trabajos en segundo plano (`sleep 5 &`)
+COMANDOS_EXTERNOS = ['sleep', 'yes']
+
+# Órdenes que no tienen sentido en segundo plano ni dentro de una tubería
+SOLO_PRIMER_PLANO = {'cd', 'fg', 'wait', 'ulimit'}
+
+# Órdenes internas que leen la salida de la etapa anterior de una tubería
+ORDENES_FILTRO = {'cat', 'grep', 'head', 'wc', 'sort'}
+
+# sort ordena en memoria tramos de como mucho estos bytes; si la entrada es
+# mayor, los guarda ordenados en archivos temporales y los mezcla al final
+MAX_BYTES_ORDENACION = 8 * 1024 * 1024
+
+# Cada cuánto comprueban fg y wait si el trabajo terminó (y si se canceló la espera)
+INTERVALO_ESPERA_TRABAJO = 0.05
+
+
+class SesionShell:
+    """
+    Estado de una sesión de la shell: el directorio de trabajo, los
+    trabajos en segundo plano, el registro de tiempos de los comandos y los
+    límites de recursos que se les aplican.
+
+    Cada ventana de la shell tiene su propia sesión; el directorio de
+    trabajo del proceso (os.getcwd) no se toca. `raiz` es el directorio
+    inicial: las órdenes que leen archivos no salen de él.
+    """
+
+    def __init__(self, directorio=None):
+        self.directorio = os.path.abspath(directorio or os.getcwd())
+        self.raiz = os.path.realpath(self.directorio)
+        self.anterior = None
+        self.trabajos = GestorTrabajos()
+        self.tiempos = RegistroTiempos()
+        self.limites = LimitesRecursos()
+
+    def resolver(self, ruta):
+        """
+        Convierte una ruta relativa al directorio de la sesión en absoluta.
+
+        Args:
+            ruta (str): Ruta escrita por el usuario (admite ~)
+
+        Returns:
+            str: Ruta absoluta normalizada
+        """
+        return os.path.normpath(os.path.join(self.directorio, os.path.expanduser(ruta)))
+
+    def permite_leer(self, ruta):
+        """
+        Indica si una ruta queda dentro de la carpeta raíz de la sesión.
+
+        Se comprueba la ruta real, así que un enlace simbólico que apunte
+        fuera tampoco se admite.
+
+        Args:
+            ruta (str): Ruta absoluta (de resolver())
+
+        Returns:
+            bool: True si se puede leer desde la shell
+        """
+        return esta_dentro(os.path.realpath(ruta), self.raiz)
+
+    def preparar(self, linea):
+        """
+        Valida una línea de comando y crea su ejecución (sin iniciarla).
+
+        Con `time` delante, la ejecución escribe al terminar el informe de
+        su consumo. Todas quedan anotadas en `self.tiempos` al terminar.
+
+        Args:
+            linea (str): Línea escrita por el usuario
+
+        Returns:
+            Ejecucion: EjecucionInterna o EjecucionComando lista para iniciar()
+
+        Raises:
+            ErrorComando: Si la línea está mal formada o el comando no está
+                          permitido
+        """
+        linea, medir = separar_time(linea)
+        ejecucion = self._preparar_linea(linea)
+        ejecucion.mostrar_consumo = medir
+        ejecucion.limites = self.limites.copia()
+        ejecucion.al_terminar.append(lambda terminada: self.tiempos.registrar(linea, terminada.consumo))
+        return ejecucion
+
+    def _preparar_linea(self, linea):
+        segmentos = separar_tuberia(linea)
+        if len(segmentos) > 1:
+            return EjecucionTuberia([self._preparar_etapa(segmento) for segmento in segmentos],
+                                    directorio=self.directorio)
+        argumentos = analizar(linea)
+        if not argumentos:
+            raise ErrorComando("Línea vacía")
+        nombre = validar_comando(argumentos[0])
+        if nombre in ORDENES_INTERNAS:
+            return EjecucionInterna(partial(ORDENES_INTERNAS[nombre], self, argumentos[1:]))
+        return EjecucionComando([nombre] + argumentos[1:], directorio=self.directorio)
+
+    def _preparar_etapa(self, segmento):
+        """
+        Valida una etapa de una tubería.
+
+        Returns:
+            callable o list: Orden interna (error, entrada) -> líneas, o la
+                             lista de argumentos de un programa externo
+        """
+        argumentos = analizar(segmento)
+        if not argumentos:
+            raise ErrorComando("Error de sintaxis cerca de '|'", 2)
+        if argumentos[0].lower() == 'time':
+            raise ErrorComando("time: solo se puede usar al principio de la línea", 2)
+        nombre = validar_comando(argumentos[0])
+        if nombre in SOLO_PRIMER_PLANO:
+            raise ErrorComando(f"{argumentos[0]}: no se puede usar en una tubería")
+        if nombre not in ORDENES_INTERNAS:
+            return [nombre] + argumentos[1:]
+        orden = partial(ORDENES_INTERNAS[nombre], self, argumentos[1:])
+        if nombre in ORDENES_FILTRO:
+            return lambda error, entrada: orden(error, entrada)
+        # Las demás órdenes internas no leen su entrada
+        return lambda error, entrada: orden(error)
+
+    def lanzar_en_segundo_plano(self, linea):
+        """
+        Valida una línea y la encola como trabajo en segundo plano.
+
+        Args:
+            linea (str): Línea sin el '&' final
+
+        Returns:
+            TrabajoShell: El trabajo creado
+
+        Raises:
+            ErrorComando: Si la línea no es válida, la orden no admite
+                          segundo plano o hay demasiados trabajos
+        """
+        argumentos = analizar(separar_time(linea)[0])
+        if argumentos and argumentos[0].lower() in SOLO_PRIMER_PLANO:
+            raise ErrorComando(f"{argumentos[0]}: no se puede ejecutar en segundo plano")
+        return self.trabajos.agregar(linea, self.preparar(linea))
+
+
+def validar_comando(nombre):
+    """
+    Comprueba que un comando esté permitido.
+
+    Args:
+        nombre (str): Primer argumento de la orden
+
+    Returns:
+        str: Nombre normalizado (en minúsculas)
+
+    Raises:
+        ErrorComando: Si el comando no está permitido
+    """
+    nombre = nombre.lower()
+    if nombre not in ORDENES_INTERNAS and nombre not in COMANDOS_EXTERNOS:
+        raise ErrorComando(
+            f"Comando '{nombre}' no permitido en esta shell educativa.\n"
+            f"Comandos disponibles: {', '.join(COMANDOS_VALIDOS)}",
+            CODIGO_NO_ENCONTRADO
+        )
+    return nombre
+
+
+def separar_tuberia(linea):
+    """
+    Divide una línea en las etapas de una tubería por los '|' sin comillas.
+
+    Args:
+        linea (str): Línea escrita por el usuario
+
+    Returns:
+        list: Texto de cada etapa (una sola si no hay tubería)
+    """
+    segmentos, actual = [], []
+    comilla = None
+    escapado = False
+    for caracter in linea:
+        if escapado:
+            escapado = False
+        elif caracter == '\\' and comilla != "'":
+            escapado = True
+        elif comilla:
+            if caracter == comilla:
+                comilla = None
+        elif caracter in ('"', "'"):
+            comilla = caracter
+        elif caracter == '|':
+            segmentos.append(''.join(actual))
+            actual = []
+            continue
+        actual.append(caracter)
+    segmentos.append(''.join(actual))
+    return segmentos
+
+
+def analizar(linea):
+    """
+    Separa una línea en argumentos respetando comillas (sin expandir nada).
+
+    Args:
+        linea (str): Línea escrita por el usuario
+
+    Returns:
+        list: Argumentos
+
+    Raises:
+        ErrorComando: Si hay comillas sin cerrar
+    """
+    try:
+        return shlex.split(linea, posix=True)
+    except ValueError as e:
+        raise ErrorComando(f"Error de sintaxis: {e}", 2)
+
+
+def separar_segundo_plano(linea):
+    """
+    Detecta el '&' final que manda una línea a segundo plano.
+
+    Args:
+        linea (str): Línea escrita por el usuario
+
+    Returns:
+        tuple: (línea sin el '&', True si iba en segundo plano)
+    """
+    linea = linea.strip()
+    if linea.endswith('&') and not linea.endswith(('&&', '\\&')):
+        return linea[:-1].rstrip(), True
+    return linea, False
+
+
+def separar_time(linea):
+    """
+    Detecta el `time` que pide medir el consumo de una línea.
+
+    Args:
+        linea (str): Línea escrita por el usuario
+
+    Returns:
+        tuple: (línea sin `time`, True si había que medirla)
+
+    Raises:
+        ErrorComando: Si `time` no va seguido de un comando
+    """
+    palabras = linea.strip().split(None, 1)
+    if not palabras or palabras[0].lower() != 'time':
+        return linea, False
+    if len(palabras) == 1:
+        raise ErrorComando("time: uso: time comando [| comando...]", 2)
+    return palabras[1], True
+
+
+def separar_opciones(argumentos, validas, orden):
+    """
+    Separa las opciones de una letra (-la, -R...) del resto de argumentos.
+
+    Args:
+        argumentos (list): Argumentos de la orden
+        validas (str): Letras de opción admitidas
+        orden (str): Nombre de la orden (para los mensajes de error)
+
+    Returns:
+        tuple: (conjunto de letras, lista de argumentos restantes)
+
+    Raises:
+        ErrorComando: Si aparece una opción no admitida
+    """
+    opciones, resto = set(), []
+    solo_argumentos = False
+    for argumento in argumentos:
+        if solo_argumentos or not argumento.startswith('-') or argumento == '-':
+            resto.append(argumento)
+        elif argumento == '--':
+            solo_argumentos = True
+        else:
+            for letra in argumento[1:]:
+                if letra not in validas:
+                    raise ErrorComando(f"{orden}: opción no válida -- '{letra}'", 2)
+                opciones.add(letra)
+    return opciones, resto
+
+
+# =============================================================================
+# ÓRDENES INTERNAS
+# =============================================================================
+
+def formatear_largo(ruta, nombre):
+    """
+    Línea de `ls -l` para una entrada: permisos, enlaces, tamaño, fecha y nombre.
+
+    Raises:
+        OSError: Si la entrada ya no existe
+    """
+    info = os.lstat(ruta)
+    return (f"{stat.filemode(info.st_mode)} {info.st_nlink:>3} {info.st_size:>12} "
+            f"{formatear_fecha(info.st_mtime)} {nombre}\n")
+
+
+def orden_ls(sesion, argumentos, error):
+    """
+    ls [-a] [-l] [-R] [rutas...]: lista archivos y carpetas.
+
+    -a incluye los ocultos, -l muestra permisos, tamaño y fecha y -R entra
+    en las subcarpetas (sin seguir enlaces simbólicos).
+    """
+    opciones, rutas = separar_opciones(argumentos, 'alR', 'ls')
+    todos, largo, recursivo = 'a' in opciones, 'l' in opciones, 'R' in opciones
+    rutas = rutas or ['.']
+
+    carpetas = []
+    for ruta in rutas:
+        absoluta = sesion.resolver(ruta)
+        try:
+            if os.path.isdir(absoluta):
+                carpetas.append((ruta, absoluta))
+            elif largo:
+                yield formatear_largo(absoluta, ruta)
+            else:
+                os.lstat(absoluta)
+                yield f"{ruta}\n"
+        except OSError as e:
+            error(f"ls: no se puede acceder a '{ruta}': {e.strerror}\n")
+
+    con_titulo = len(rutas) > 1 or recursivo
+    # Recorrido en profundidad en el mismo orden que ls -R
+    pila = list(reversed(carpetas))
+    while pila:
+        mostrada, absoluta = pila.pop()
+        try:
+            entradas = listar_directorio(absoluta, con_metadatos=False)
+        except OSError as e:
+            error(f"ls: no se puede abrir el directorio '{mostrada}': {e.strerror}\n")
+            continue
+        if con_titulo:
+            yield f"{mostrada}:\n"
+        subcarpetas = []
+        for entrada in entradas:
+            if not todos and entrada.nombre.startswith('.'):
+                continue
+            ruta = os.path.join(absoluta, entrada.nombre)
+            if largo:
+                try:
+                    yield formatear_largo(ruta, entrada.nombre)
+                except OSError:
+                    continue
+            else:
+                yield f"{entrada.nombre}\n"
+            if recursivo and entrada.es_dir and not os.path.islink(ruta):
+                subcarpetas.append((os.path.join(mostrada, entrada.nombre), ruta))
+        if con_titulo:
+            yield "\n"
+        pila.extend(reversed(subcarpetas))
+
+
+def orden_pwd(sesion, argumentos, error):
+    """pwd: muestra el directorio de trabajo de la sesión."""
+    return [sesion.directorio + "\n"]
+
+
+def orden_echo(sesion, argumentos, error):
+    """echo [-n] [texto...]: imprime los argumentos separados por espacios."""
+    if argumentos[:1] == ['-n']:
+        return [' '.join(argumentos[1:])]
+    return [' '.join(argumentos) + "\n"]
+
+
+def orden_cd(sesion, argumentos, error):
+    """
+    cd [carpeta | -]: cambia el directorio de trabajo de la sesión.
+
+    Sin argumentos va a la carpeta personal; con '-' vuelve a la anterior.
+    """
+    if len(argumentos) > 1:
+        raise ErrorComando("cd: demasiados argumentos")
+    destino = argumentos[0] if argumentos else '~'
+    salida = []
+    if destino == '-':
+        if sesion.anterior is None:
+            raise ErrorComando("cd: no hay directorio anterior")
+        destino = sesion.anterior
+        salida.append(destino + "\n")
+    ruta = sesion.resolver(destino)
+    if not os.path.isdir(ruta):
+        raise ErrorComando(f"cd: {destino}: No existe el directorio")
+    if not os.access(ruta, os.X_OK):
+        raise ErrorComando(f"cd: {destino}: Permiso denegado")
+    sesion.anterior, sesion.directorio = sesion.directorio, ruta
+    return salida
+
+
+# =============================================================================
+# FILTROS (cat, grep, head, wc, sort)
+# =============================================================================
+# Leen los archivos indicados o, si no hay ninguno, la entrada que les pasa
+# la etapa anterior de la tubería (vacía si la orden va sola). Los archivos
+# tienen que estar dentro de la carpeta raíz de la sesión.
+
+def fuentes_entrada(sesion, archivos, entrada, orden, error):
+    """
+    Recorre las fuentes de un filtro: los archivos o la entrada de la tubería.
+
+    Yields:
+        tuple: (nombre del archivo o None, iterable de líneas)
+    """
+    if not archivos:
+        yield None, entrada
+        return
+    for archivo in archivos:
+        ruta = sesion.resolver(archivo)
+        if not sesion.permite_leer(ruta):
+            error(f"{orden}: {archivo}: fuera de la carpeta de la sesión\n")
+            continue
+        try:
+            f = open(ruta, encoding='utf-8', errors='replace', newline='')
+        except OSError as e:
+            error(f"{orden}: {archivo}: {e.strerror}\n")
+            continue
+        with f:
+            # readline con límite: un archivo sin saltos de línea no se carga entero
+            yield archivo, iter(partial(f.readline, MAX_LONGITUD_LINEA), '')
+
+
+def con_salto(linea):
+    return linea if linea.endswith('\n') else linea + '\n'
+
+
+def orden_cat(sesion, argumentos, error, entrada=()):
+    """
+    cat [-n] [archivos...]: muestra el contenido de los archivos (o la entrada).
+
+    -n numera las líneas.
+    """
+    opciones, archivos = separar_opciones(argumentos, 'n', 'cat')
+    numero = 0
+    for _, lineas in fuentes_entrada(sesion, archivos, entrada, 'cat', error):
+        if 'n' not in opciones:
+            yield from lineas
+            continue
+        for linea in lineas:
+            numero += 1
+            yield f"{numero:>6}\t{linea}"
+
+
+def orden_grep(sesion, argumentos, error, entrada=()):
+    """
+    grep [-i] [-v] [-n] [-c] patrón [archivos...]: muestra las líneas que
+    contienen el patrón (expresión regular de Python).
+
+    -i ignora mayúsculas, -v invierte la búsqueda, -n numera las líneas y
+    -c solo cuenta. Termina con código 1 si no hay ninguna coincidencia.
+    """
+    opciones, resto = separar_opciones(argumentos, 'ivnc', 'grep')
+    if not resto:
+        raise ErrorComando("grep: uso: grep [-i] [-v] [-n] [-c] patrón [archivos...]", 2)
+    try:
+        patron = re.compile(resto[0], re.IGNORECASE if 'i' in opciones else 0)
+    except re.error as e:
+        raise ErrorComando(f"grep: expresión no válida: {e}", 2)
+    archivos = resto[1:]
+    invertir, numerar, contar = 'v' in opciones, 'n' in opciones, 'c' in opciones
+    buscar = patron.search
+    coincidencias = 0
+    for nombre, lineas in fuentes_entrada(sesion, archivos, entrada, 'grep', error):
+        prefijo = f"{nombre}:" if len(archivos) > 1 else ""
+        cuenta = 0
+        for numero, linea in enumerate(lineas, 1):
+            if (buscar(linea) is None) == invertir:
+                cuenta += 1
+                if not contar:
+                    yield f"{prefijo}{numero}:{con_salto(linea)}" if numerar else prefijo + con_salto(linea)
+        if contar:
+            yield f"{prefijo}{cuenta}\n"
+        coincidencias += cuenta
+    return 0 if coincidencias else 1
+
+
+def orden_head(sesion, argumentos, error, entrada=()):
+    """
+    head [-n N | -N] [archivos...]: muestra las primeras líneas (10 por defecto).
+
+    En una tubería deja de leer en cuanto tiene las líneas pedidas.
+    """
+    cantidad, archivos = 10, []
+    pendientes = iter(argumentos)
+    for argumento in pendientes:
+        valor = None
+        if argumento == '-n':
+            valor = next(pendientes, None)
+            if valor is None:
+                raise ErrorComando("head: la opción -n requiere un argumento", 2)
+        elif argumento.startswith('-n'):
+            valor = argumento[2:]
+        elif argumento.startswith('-') and argumento[1:].isdigit():
+            valor = argumento[1:]
+        elif argumento.startswith('-') and argumento != '-':
+            raise ErrorComando(f"head: opción no válida -- '{argumento[1:]}'", 2)
+        else:
+            archivos.append(argumento)
+            continue
+        if not valor.isdigit():
+            raise ErrorComando(f"head: número de líneas no válido: '{valor}'", 2)
+        cantidad = int(valor)
+
+    for indice, (nombre, lineas) in enumerate(fuentes_entrada(sesion, archivos, entrada, 'head', error)):
+        if len(archivos) > 1:
+            yield f"\n==> {nombre} <==\n" if indice else f"==> {nombre} <==\n"
+        yield from islice(lineas, cantidad)
+
+
+def orden_wc(sesion, argumentos, error, entrada=()):
+    """
+    wc [-l] [-w] [-c] [archivos...]: cuenta líneas, palabras y bytes.
+    """
+    opciones, archivos = separar_opciones(argumentos, 'lwc', 'wc')
+    opciones = opciones or {'l', 'w', 'c'}
+    totales = [0, 0, 0]
+
+    def formatear(cuentas, nombre):
+        columnas = [f"{n:>7}" for n, letra in zip(cuentas, 'lwc') if letra in opciones]
+        return ' '.join(columnas) + (f" {nombre}" if nombre else "") + "\n"
+
+    for nombre, lineas in fuentes_entrada(sesion, archivos, entrada, 'wc', error):
+        cuentas = [0, 0, 0]
+        for linea in lineas:
+            cuentas[0] += linea.endswith('\n')
+            cuentas[1] += len(linea.split())
+            cuentas[2] += len(linea.encode('utf-8', 'replace'))
+        totales = [t + c for t, c in zip(totales, cuentas)]
+        yield formatear(cuentas, nombre)
+    if len(archivos) > 1:
+        yield formatear(totales, "total")
+
+
+def clave_numerica(linea):
+    """Clave de sort -n: el número al principio de la línea (0 si no hay)."""
+    coincidencia = re.match(r'\s*(-?\d+(?:\.\d*)?)', linea)
+    return (float(coincidencia.group(1)) if coincidencia else 0.0, linea)
+
+
+def orden_sort(sesion, argumentos, error, entrada=()):
+    """
+    sort [-r] [-n] [-u] [archivos...]: ordena líneas.
+
+    -r invierte el orden, -n ordena por el número inicial y -u quita las
+    repetidas. Las entradas grandes se ordenan por tramos en archivos
+    temporales que luego se mezclan, así que la memoria no depende del
+    tamaño de la entrada.
+    """
+    opciones, archivos = separar_opciones(argumentos, 'rnu', 'sort')
+    clave = clave_numerica if 'n' in opciones else None
+    reverso = 'r' in opciones
+
+    tramo, tamano, temporales = [], 0, []
+    try:
+        for _, lineas in fuentes_entrada(sesion, archivos, entrada, 'sort', error):
+            for linea in lineas:
+                tramo.append(con_salto(linea))
+                # Se cuenta también el coste de cada objeto str
+                tamano += len(linea) + 50
+                if tamano >= MAX_BYTES_ORDENACION:
+                    tramo.sort(key=clave, reverse=reverso)
+                    temporal = tempfile.TemporaryFile('w+', encoding='utf-8', errors='replace', newline='')
+                    temporales.append(temporal)
+                    temporal.writelines(tramo)
+                    temporal.seek(0)
+                    tramo, tamano = [], 0
+        tramo.sort(key=clave, reverse=reverso)
+        ordenadas = heapq.merge(tramo, *temporales, key=clave, reverse=reverso) if temporales else tramo
+        anterior = None
+        for linea in ordenadas:
+            if 'u' in opciones:
+                actual = clave(linea)[0] if clave else linea
+                if actual == anterior:
+                    continue
+                anterior = actual
+            yield linea
+    finally:
+        for temporal in temporales:
+            temporal.close()
+
+
+# =============================================================================
+# CONTROL DE TRABAJOS
+# =============================================================================
+
+def describir_trabajo(trabajo):
+    """Línea de `jobs` y de los avisos de fin: [n] estado  comando."""
+    return f"[{trabajo.numero}] {trabajo.texto_estado():<16} {trabajo.comando}\n"
+
+
+def orden_jobs(sesion, argumentos, error):
+    """jobs: lista los trabajos en segundo plano de la sesión."""
+    if argumentos:
+        return [describir_trabajo(sesion.trabajos.obtener(referencia, 'jobs')) for referencia in argumentos]
+    return [describir_trabajo(trabajo) for trabajo in sesion.trabajos.trabajos]
+
+
+def orden_fg(sesion, argumentos, error):
+    """
+    fg [%n]: trae un trabajo a primer plano.
+
+    Muestra la salida que el trabajo haya guardado y la que siga
+    produciendo hasta que termine, y devuelve su código de salida. Cancelar
+    fg (Ctrl-C) interrumpe el trabajo, como en bash.
+    """
+    if len(argumentos) > 1:
+        raise ErrorComando("fg: demasiados argumentos")
+    trabajo = sesion.trabajos.obtener(argumentos[0] if argumentos else None)
+    trabajo.en_primer_plano = True
+    yield trabajo.comando + "\n"
+    try:
+        while True:
+            terminado = trabajo.terminado.is_set()
+            trozos, omitidos = trabajo.ejecucion.obtener_salida()
+            if omitidos:
+                error(f"[... {formatear_tamano(omitidos)} de salida omitidos ...]\n")
+            for flujo, texto in trozos:
+                if flujo == ERROR:
+                    error(texto)
+                else:
+                    yield texto
+            if terminado:
+                break
+            # Una línea vacía deja que la ejecución compruebe si se canceló
+            yield ''
+            time.sleep(INTERVALO_ESPERA_TRABAJO)
+    finally:
+        if not trabajo.terminado.is_set():
+            trabajo.cancelar()
+    if trabajo.ejecucion.error is not None:
+        raise ErrorComando(f"fg: {trabajo.ejecucion.error}")
+    sesion.trabajos.quitar(trabajo)
+    return trabajo.codigo
+
+
+def orden_wait(sesion, argumentos, error):
+    """wait [%n...]: espera a que terminen los trabajos (todos si no se indican)."""
+    if argumentos:
+        trabajos = [sesion.trabajos.obtener(referencia, 'wait') for referencia in argumentos]
+    else:
+        trabajos = list(sesion.trabajos.trabajos)
+    for trabajo in trabajos:
+        while not trabajo.terminado.wait(INTERVALO_ESPERA_TRABAJO):
+            yield ''
+    return trabajos[-1].codigo if trabajos else 0
+
+
+def orden_kill(sesion, argumentos, error):
+    """kill %n...: interrumpe trabajos en segundo plano."""
+    if not argumentos:
+        raise ErrorComando("kill: uso: kill %n...", 2)
+    for referencia in argumentos:
+        if not referencia.startswith('%'):
+            error(f"kill: {referencia}: solo se admiten trabajos de esta shell (%n)\n")
+            continue
+        try:
+            trabajo = sesion.trabajos.obtener(referencia, 'kill')
+        except ErrorComando as e:
+            error(f"{e}\n")
+            continue
+        trabajo.cancelar()
+    return []
+
+
+# =============================================================================
+# TIEMPOS Y LÍMITES DE LA SESIÓN
+# =============================================================================
+
+def orden_times(sesion, argumentos, error):
+    """times: totales de la sesión y los comandos más lentos (tiempo real, CPU y memoria)."""
+    if argumentos:
+        raise ErrorComando("times: no admite argumentos", 2)
+    return sesion.tiempos.tabla()
+
+
+def orden_ulimit(sesion, argumentos, error):
+    """
+    ulimit [-a] [-t|-v|-n|-f|-o [valor|unlimited]]...: consulta o cambia
+    los límites de los comandos siguientes de la sesión.
+
+    -t segundos de CPU, -v memoria virtual en KB, -n archivos abiertos, -f
+    tamaño de archivo en KB y -o salida del comando en KB (esta no existe
+    en bash). Sin opciones muestra todos. Los límites se pueden bajar, pero
+    no subir por encima del valor con el que empezó la sesión.
+    """
+    limites = sesion.limites
+    campos = {opcion: (atributo, unidad) for atributo, opcion, _, unidad in limites.CAMPOS}
+    if not argumentos or argumentos == ['-a']:
+        return limites.describir()
+    lineas = []
+    pendientes = list(argumentos)
+    while pendientes:
+        argumento = pendientes.pop(0)
+        opcion = argumento[1:] if argumento.startswith('-') else None
+        if argumento == '-a':
+            lineas.extend(limites.describir())
+            continue
+        if opcion not in campos:
+            raise ErrorComando(f"ulimit: {argumento}: opción no válida", 2)
+        atributo, unidad = campos[opcion]
+        if not pendientes or pendientes[0].startswith('-'):
+            valor = getattr(limites, atributo)
+            lineas.append("ilimitado\n" if valor is None else f"{valor // unidad if unidad else valor}\n")
+            continue
+        texto = pendientes.pop(0)
+        if texto.lower() in ('unlimited', 'ilimitado'):
+            valor = None
+        else:
+            try:
+                valor = int(texto)
+            except ValueError:
+                raise ErrorComando(f"ulimit: {texto}: número no válido", 2)
+            if valor <= 0:
+                raise ErrorComando(f"ulimit: {texto}: el límite debe ser mayor que 0", 2)
+            valor = valor * unidad if unidad else valor
+        maximo = limites.maximo(atributo)
+        if maximo is not None and (valor is None or valor > maximo):
+            raise ErrorComando(f"ulimit: -{opcion}: no se puede subir el límite por encima de "
+                               f"{maximo // unidad if unidad else maximo}")
+        setattr(limites, atributo, valor)
+    return lineas
+
+
+# Órdenes que se ejecutan dentro del proceso (dir es el nombre de Windows de ls)
+ORDENES_INTERNAS = {
+    'ls': orden_ls,
+    'dir': orden_ls,
+    'pwd': orden_pwd,
+    'echo': orden_echo,
+    'cd': orden_cd,
+    'jobs': orden_jobs,
+    'fg': orden_fg,
+    'wait': orden_wait,
+    'kill': orden_kill,
+    'times': orden_times,
+    'ulimit': orden_ulimit,
+    'cat': orden_cat,
+    'grep': orden_grep,
+    'head': orden_head,
+    'wc': orden_wc,
+    'sort': orden_sort,
+}
+
+# Todo lo que acepta la shell (time lo atiende la sesión al preparar la
+# línea y clear, la propia ventana)
+COMANDOS_VALIDOS = list(ORDENES_INTERNAS) + ['time', 'clear'] + COMANDOS_EXTERNOS
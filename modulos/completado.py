@@ -0,0 +1,220 @@
+import os
+import re
+import threading
+from collections import namedtuple
+from .listado import listar_directorio, firma_directorio, buscar_posicion, obtener_cache_listados
+
+# =============================================================================
+# COMPLETADO CON TAB EN LA SHELL EDUCATIVA
+# =============================================================================
+# La primera palabra de cada etapa (al principio de la línea o tras un '|')
+# se completa con los comandos permitidos; las demás, con rutas relativas al
+# directorio de la sesión.
+#
+# Las rutas salen de la caché de listados compartida con el explorador
+# (modulos/listado.py): un único stat del directorio comprueba que el
+# listado guardado sigue vigente y, como las entradas están ordenadas por
+# nombre en minúsculas, los candidatos de un prefijo son un tramo contiguo
+# que se localiza con dos búsquedas binarias. El prefijo común de todo el
+# tramo es el de su primera y su última entrada, así que completar en una
+# carpeta de 100000 entradas no recorre la lista.
+#
+# Si el listado no está en caché o caducó, se lee en un hilo y la interfaz
+# vuelve a preguntar hasta que esté listo; leer una carpeta enorme nunca
+# bloquea la ventana.
+
+# Candidatos que se devuelven como mucho para mostrarlos
+MAX_CANDIDATOS = 100
+
+# Mayor que cualquier carácter: `prefijo + FIN_PREFIJO` acota el tramo
+FIN_PREFIJO = '\U0010ffff'
+
+# Caracteres que se escapan con '\' al insertar un nombre en la línea
+ESPECIALES = re.compile(r'''([\s'"\\|&])''')
+
+# Resultado de un completado: la línea y el cursor nuevos, los candidatos
+# (como mucho MAX_CANDIDATOS) y cuántos había en total
+Completado = namedtuple('Completado', 'linea cursor candidatos total')
+
+
+def palabra_actual(linea, cursor):
+    """
+    Localiza la palabra que termina en el cursor.
+
+    Respeta comillas y barras invertidas como separar_tuberia().
+
+    Args:
+        linea (str): Texto de la entrada
+        cursor (int): Posición del cursor
+
+    Returns:
+        tuple: (posición donde empieza la palabra, palabra sin comillas ni
+                escapes, True si es el nombre del comando de su etapa)
+    """
+    inicio = 0
+    palabra = []
+    es_comando = True
+    comilla = None
+    escapado = False
+    for posicion, caracter in enumerate(linea[:cursor]):
+        if escapado:
+            escapado = False
+            palabra.append(caracter)
+        elif caracter == '\\' and comilla != "'":
+            escapado = True
+        elif comilla:
+            if caracter == comilla:
+                comilla = None
+            else:
+                palabra.append(caracter)
+        elif caracter in ('"', "'"):
+            comilla = caracter
+        elif caracter.isspace() or caracter == '|':
+            if palabra or caracter == '|':
+                # Tras `time` sigue esperándose el nombre de un comando
+                es_comando = caracter == '|' or (es_comando and ''.join(palabra).lower() == 'time')
+            inicio = posicion + 1
+            palabra = []
+        else:
+            palabra.append(caracter)
+    return inicio, ''.join(palabra), es_comando
+
+
+def escapar(texto):
+    """Escapa con '\\' los espacios, comillas y caracteres especiales."""
+    return ESPECIALES.sub(r'\\\1', texto)
+
+
+def prefijo_comun(a, b):
+    """Longitud del prefijo común de dos textos."""
+    return len(os.path.commonprefix([a, b]))
+
+
+class Completador:
+    """
+    Calcula completados para la línea de una sesión de la shell.
+
+    completar() responde al momento con lo que haya en la caché; si falta
+    el listado de una carpeta, lanza su lectura en un hilo y devuelve None
+    para que la interfaz vuelva a llamar más tarde.
+    """
+
+    def __init__(self, sesion, comandos, cache=None):
+        self.sesion = sesion
+        self.comandos = sorted(comandos)
+        self.cache = cache or obtener_cache_listados()
+        self._cargando = set()
+        # Directorio -> firma con la que no se pudo leer
+        self._ilegibles = {}
+        # Último listado leído, por si era demasiado grande para la caché
+        self._ultimo = None
+        self._lock = threading.Lock()
+
+    def completar(self, linea, cursor):
+        """
+        Completa la palabra que termina en el cursor.
+
+        Args:
+            linea (str): Texto de la entrada
+            cursor (int): Posición del cursor
+
+        Returns:
+            Completado: Resultado (con la línea sin cambios si no hay nada
+                        que añadir), o None si se está leyendo la carpeta
+        """
+        inicio, palabra, es_comando = palabra_actual(linea, cursor)
+        if es_comando and os.sep not in palabra and '/' not in palabra:
+            return self._completar_comando(linea, cursor, inicio, palabra)
+        return self._completar_ruta(linea, cursor, inicio, palabra)
+
+    def _resultado(self, linea, cursor, inicio, texto, candidatos, total, sufijo=''):
+        insertado = escapar(texto) + sufijo
+        nueva = linea[:inicio] + insertado + linea[cursor:]
+        return Completado(nueva, inicio + len(insertado), candidatos, total)
+
+    def _completar_comando(self, linea, cursor, inicio, palabra):
+        candidatos = [c for c in self.comandos if c.startswith(palabra.lower())]
+        if not candidatos:
+            return Completado(linea, cursor, [], 0)
+        if len(candidatos) == 1:
+            return self._resultado(linea, cursor, inicio, candidatos[0], candidatos, 1, sufijo=' ')
+        comun = candidatos[0][:prefijo_comun(candidatos[0], candidatos[-1])]
+        return self._resultado(linea, cursor, inicio, max(comun, palabra, key=len), candidatos, len(candidatos))
+
+    def _completar_ruta(self, linea, cursor, inicio, palabra):
+        carpeta, prefijo = os.path.split(palabra)
+        directorio = self.sesion.resolver(carpeta or '.')
+        entradas = self._listado(directorio)
+        if entradas is None:
+            return None
+
+        clave = prefijo.lower()
+        desde = buscar_posicion(entradas, clave)
+        hasta = buscar_posicion(entradas, clave + FIN_PREFIJO)
+        tramos = [(desde, hasta)]
+        if not prefijo.startswith('.'):
+            # Los ocultos solo se ofrecen si el prefijo empieza por '.'; todos
+            # empiezan igual, así que forman un tramo contiguo que se salta
+            ocultos = buscar_posicion(entradas, '.'), buscar_posicion(entradas, '.' + FIN_PREFIJO)
+            inicio_ocultos, fin_ocultos = max(desde, ocultos[0]), min(hasta, ocultos[1])
+            if inicio_ocultos < fin_ocultos:
+                tramos = [(desde, inicio_ocultos), (fin_ocultos, hasta)]
+        tramos = [(a, b) for a, b in tramos if a < b]
+        total = sum(b - a for a, b in tramos)
+        if not total:
+            return Completado(linea, cursor, [], 0)
+
+        primera = entradas[tramos[0][0]]
+        ultima = entradas[tramos[-1][1] - 1]
+        candidatos = []
+        for a, b in tramos:
+            for entrada in entradas[a:min(b, a + MAX_CANDIDATOS - len(candidatos))]:
+                candidatos.append(entrada.nombre + (os.sep if entrada.es_dir else ''))
+
+        sufijo = ''
+        if total == 1:
+            final = primera.nombre
+            sufijo = os.sep if primera.es_dir else ' '
+        else:
+            # El prefijo común (sin distinguir mayúsculas) del tramo ordenado
+            # es el de sus extremos; se escribe como en la primera entrada
+            comun = prefijo_comun(primera.nombre.lower(), ultima.nombre.lower())
+            final = primera.nombre[:comun] if comun > len(prefijo) else prefijo
+        return self._resultado(linea, cursor, inicio, os.path.join(carpeta, final) if carpeta else final,
+                               candidatos, total, sufijo)
+
+    def _listado(self, directorio):
+        """
+        Entradas vigentes de un directorio, o None si se están leyendo.
+        """
+        try:
+            firma = firma_directorio(directorio)
+        except OSError:
+            return []
+        listado = self.cache.obtener(directorio)
+        if listado is not None and listado.firma == firma:
+            return listado.entradas
+        ultimo = self._ultimo
+        if ultimo is not None and ultimo[:2] == (directorio, firma):
+            return ultimo[2]
+        with self._lock:
+            if self._ilegibles.get(directorio) == firma:
+                return []
+            if directorio in self._cargando:
+                return None
+            self._cargando.add(directorio)
+        threading.Thread(target=self._cargar, args=(directorio, firma), name="completado", daemon=True).start()
+        return None
+
+    def _cargar(self, directorio, firma):
+        try:
+            entradas = listar_directorio(directorio)
+        except OSError:
+            with self._lock:
+                self._ilegibles[directorio] = firma
+        else:
+            self.cache.guardar(directorio, firma, entradas)
+            self._ultimo = (directorio, firma, entradas)
+        finally:
+            with self._lock:
+                self._cargando.discard(directorio)
@@ -0,0 +1,466 @@
+import tkinter as tk
+from tkinter import ttk, font as tkfont
+import os
+from collections import OrderedDict
+from .miniaturas import LADO_MINIATURA, ServicioMiniaturas, ruta_en_cache, es_imagen
+
+# =============================================================================
+# CUADRÍCULA DE MINIATURAS VIRTUALIZADA SOBRE UN CANVAS
+# =============================================================================
+# Igual que TablaVirtual, la cuadrícula solo tiene elementos de Tk para las
+# celdas que caben en pantalla y los reutiliza al desplazarse. Ofrece la
+# misma interfaz (registros, seleccionado, canvas, establecer_registros,
+# seleccionar...), así que el explorador puede cambiar de vista sin que el
+# resto de su código note la diferencia. El desplazamiento se mide en filas
+# de celdas.
+
+# Número máximo de miniaturas decodificadas (tk.PhotoImage) en memoria.
+# A 128x128 son unos 64 KB cada una: unos 20 MB como mucho.
+MAX_MINIATURAS_EN_MEMORIA = 300
+
+# Intervalo de recogida de las miniaturas generadas por el pool
+INTERVALO_MINIATURAS_MS = 50
+
+
+class CuadriculaMiniaturas(ttk.Frame):
+    """
+    Cuadrícula de solo lectura que dibuja únicamente las celdas visibles.
+
+    Cada celda muestra la imagen que devuelva `imagen(registro)` o, si
+    devuelve None, el icono de `icono(registro)`, y debajo `texto(registro)`.
+    """
+
+    def __init__(self, padre, texto, icono, imagen=None, lado=LADO_MINIATURA, fuente=('Arial', 9), **kwargs):
+        super().__init__(padre, **kwargs)
+        self.texto = texto
+        self.icono = icono
+        self.imagen = imagen or (lambda registro: None)
+        self.registros = []
+        self.seleccionado = None
+        self.mensaje = None
+        self.primera = 0
+        self._al_activar = None
+        self._al_seleccionar = None
+        self._al_dibujar = None
+
+        self.fuente = tkfont.Font(font=fuente)
+        self.lado = lado
+        self.ancho_celda = lado + 24
+        self.alto_celda = lado + self.fuente.metrics('linespace') + 14
+        self.columnas = 1
+        self._max_caracteres = max(4, self.ancho_celda // max(1, self.fuente.measure('n')))
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._desplazar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.canvas = tk.Canvas(self, bg='white', highlightthickness=1, takefocus=1)
+        self.canvas.pack(expand=True, fill=tk.BOTH, side=tk.LEFT)
+
+        # Elementos reutilizados por celda visible: (fondo, imagen, icono, texto)
+        self._celdas = []
+        self._mensaje_item = self.canvas.create_text(8, 8, anchor='nw', font=self.fuente, fill='#555555')
+
+        self.canvas.bind('<Configure>', lambda e: self._recalcular())
+        self.canvas.bind('<Button-1>', self._clic)
+        self.canvas.bind('<Double-1>', self._doble_clic)
+        self.canvas.bind('<MouseWheel>', self._rueda)
+        self.canvas.bind('<Button-4>', lambda e: self.desplazar_filas(-1))
+        self.canvas.bind('<Button-5>', lambda e: self.desplazar_filas(1))
+        self.canvas.bind('<Left>', lambda e: self._mover(-1))
+        self.canvas.bind('<Right>', lambda e: self._mover(1))
+        self.canvas.bind('<Up>', lambda e: self._mover(-self.columnas))
+        self.canvas.bind('<Down>', lambda e: self._mover(self.columnas))
+        self.canvas.bind('<Prior>', lambda e: self._mover(-self.columnas * max(1, self._filas_visibles() - 1)))
+        self.canvas.bind('<Next>', lambda e: self._mover(self.columnas * max(1, self._filas_visibles() - 1)))
+        self.canvas.bind('<Home>', lambda e: self.seleccionar(0))
+        self.canvas.bind('<End>', lambda e: self.seleccionar(len(self.registros) - 1))
+        self.canvas.bind('<Return>', lambda e: self._activar())
+
+    # -------------------------------------------------------------------------
+    # API pública (la misma que TablaVirtual)
+    # -------------------------------------------------------------------------
+
+    def establecer_registros(self, registros, conservar_posicion=False):
+        """
+        Asigna la lista de registros a mostrar (se guarda por referencia).
+
+        Args:
+            registros (list): Lista de registros; la cuadrícula la lee, no la copia
+            conservar_posicion (bool): Si es True mantiene el desplazamiento
+                                       y la selección actuales
+
+        Returns:
+            None
+        """
+        self.registros = registros
+        if not conservar_posicion:
+            self.seleccionado = None
+            self.primera = 0
+        self.mensaje = None
+        self.actualizar()
+
+    def actualizar(self):
+        """
+        Vuelve a dibujar las celdas visibles tras cambiar la lista de registros.
+
+        Returns:
+            None
+        """
+        self.primera = min(self.primera, self._primera_maxima())
+        if self.seleccionado is not None and self.seleccionado >= len(self.registros):
+            self.seleccionado = None
+        self._dibujar()
+
+    def mostrar_mensaje(self, texto):
+        """
+        Vacía la cuadrícula y muestra un mensaje (p. ej. carpeta vacía o error).
+
+        Args:
+            texto (str): Mensaje a mostrar
+
+        Returns:
+            None
+        """
+        self.registros = []
+        self.seleccionado = None
+        self.primera = 0
+        self.mensaje = texto
+        self._dibujar()
+
+    def seleccion(self):
+        """
+        Devuelve el índice del registro seleccionado.
+
+        Returns:
+            int: Índice en la lista de registros, o None si no hay selección
+        """
+        return self.seleccionado
+
+    def seleccionar(self, indice):
+        """
+        Selecciona un registro y desplaza la vista para que sea visible.
+
+        Args:
+            indice (int): Índice del registro
+
+        Returns:
+            None
+        """
+        if not self.registros:
+            return
+        self.seleccionado = max(0, min(indice, len(self.registros) - 1))
+        self.ver(self.seleccionado)
+        if self._al_seleccionar:
+            self._al_seleccionar(self.seleccionado)
+
+    def ver(self, indice):
+        """
+        Desplaza la vista lo mínimo necesario para mostrar un registro.
+
+        Args:
+            indice (int): Índice del registro
+
+        Returns:
+            None
+        """
+        fila = indice // self.columnas
+        completas = max(1, self.canvas.winfo_height() // self.alto_celda)
+        if fila < self.primera:
+            self.primera = fila
+        elif fila >= self.primera + completas:
+            self.primera = fila - completas + 1
+        self._dibujar()
+
+    def desplazar_filas(self, filas):
+        """
+        Desplaza la vista un número de filas de celdas.
+
+        Args:
+            filas (int): Filas a desplazar (negativo hacia arriba)
+
+        Returns:
+            None
+        """
+        self.primera = max(0, min(self.primera + filas, self._primera_maxima()))
+        self._dibujar()
+
+    def al_activar(self, callback):
+        """
+        Registra la función llamada con el índice al hacer doble clic o Enter.
+
+        Args:
+            callback (callable): Función (indice)
+
+        Returns:
+            None
+        """
+        self._al_activar = callback
+
+    def al_seleccionar(self, callback):
+        """
+        Registra la función llamada con el índice al cambiar la selección.
+
+        Args:
+            callback (callable): Función (indice)
+
+        Returns:
+            None
+        """
+        self._al_seleccionar = callback
+
+    def al_dibujar(self, callback):
+        """
+        Registra la función llamada tras cada redibujado (p. ej. para pedir
+        las miniaturas que faltan en las celdas visibles).
+
+        Args:
+            callback (callable): Función sin argumentos
+
+        Returns:
+            None
+        """
+        self._al_dibujar = callback
+
+    # -------------------------------------------------------------------------
+    # Dibujo
+    # -------------------------------------------------------------------------
+
+    def _filas_totales(self):
+        return (len(self.registros) + self.columnas - 1) // self.columnas
+
+    def _filas_visibles(self):
+        return max(1, self.canvas.winfo_height() // self.alto_celda + 1)
+
+    def _primera_maxima(self):
+        completas = max(1, self.canvas.winfo_height() // self.alto_celda)
+        return max(0, self._filas_totales() - completas)
+
+    def _recalcular(self):
+        """
+        Recalcula el número de columnas y de celdas reutilizables.
+        """
+        # Mantener a la vista el mismo primer registro al cambiar de ancho
+        primer_registro = self.primera * self.columnas
+        self.columnas = max(1, self.canvas.winfo_width() // self.ancho_celda)
+        self.primera = primer_registro // self.columnas
+
+        necesarias = self.columnas * self._filas_visibles()
+        while len(self._celdas) < necesarias:
+            self._celdas.append((
+                self.canvas.create_rectangle(0, 0, 0, 0, fill='#cce4f7', width=0, state='hidden'),
+                self.canvas.create_image(0, 0, anchor='center'),
+                self.canvas.create_text(0, 0, anchor='center', font=('Arial', 36)),
+                self.canvas.create_text(0, 0, anchor='n', font=self.fuente),
+            ))
+        while len(self._celdas) > necesarias:
+            for item in self._celdas.pop():
+                self.canvas.delete(item)
+
+        for posicion, (fondo, imagen, icono, texto) in enumerate(self._celdas):
+            fila, columna = divmod(posicion, self.columnas)
+            x = columna * self.ancho_celda
+            y = fila * self.alto_celda
+            centro_x = x + self.ancho_celda // 2
+            centro_y = y + 6 + self.lado // 2
+            self.canvas.coords(fondo, x + 2, y + 2, x + self.ancho_celda - 2, y + self.alto_celda - 2)
+            self.canvas.coords(imagen, centro_x, centro_y)
+            self.canvas.coords(icono, centro_x, centro_y)
+            self.canvas.coords(texto, centro_x, y + self.lado + 10)
+        self.actualizar()
+
+    def _recortar(self, texto):
+        if len(texto) <= self._max_caracteres:
+            return texto
+        return texto[:self._max_caracteres - 1] + '…'
+
+    def _dibujar(self):
+        total = len(self.registros)
+        registros = self.registros
+        inicio = self.primera * self.columnas
+        for posicion, (fondo, imagen, icono, texto) in enumerate(self._celdas):
+            indice = inicio + posicion
+            if indice >= total:
+                self.canvas.itemconfigure(fondo, state='hidden')
+                self.canvas.itemconfigure(imagen, image='', state='hidden')
+                self.canvas.itemconfigure(icono, text='')
+                self.canvas.itemconfigure(texto, text='')
+                continue
+            registro = registros[indice]
+            foto = self.imagen(registro)
+            if foto is not None:
+                self.canvas.itemconfigure(imagen, image=foto, state='normal')
+                self.canvas.itemconfigure(icono, text='')
+            else:
+                self.canvas.itemconfigure(imagen, image='', state='hidden')
+                self.canvas.itemconfigure(icono, text=self.icono(registro))
+            self.canvas.itemconfigure(texto, text=self._recortar(self.texto(registro)))
+            self.canvas.itemconfigure(fondo, state='normal' if indice == self.seleccionado else 'hidden')
+
+        self.canvas.itemconfigure(self._mensaje_item, text=self.mensaje or '')
+
+        filas = self._filas_totales()
+        if filas:
+            completas = max(1, self.canvas.winfo_height() // self.alto_celda)
+            self.scrollbar.set(self.primera / filas, min(1.0, (self.primera + completas) / filas))
+        else:
+            self.scrollbar.set(0, 1)
+
+        if self._al_dibujar:
+            self._al_dibujar()
+
+    # -------------------------------------------------------------------------
+    # Eventos
+    # -------------------------------------------------------------------------
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        if accion == 'moveto':
+            self.primera = int(float(cantidad) * self._filas_totales())
+            self.desplazar_filas(0)
+        elif accion == 'scroll':
+            pasos = int(cantidad)
+            if unidad == 'pages':
+                pasos *= max(1, self._filas_visibles() - 2)
+            self.desplazar_filas(pasos)
+
+    def _rueda(self, event):
+        self.desplazar_filas(-1 if event.delta > 0 else 1)
+
+    def _indice_en(self, x, y):
+        columna = int(self.canvas.canvasx(x)) // self.ancho_celda
+        if columna >= self.columnas:
+            return None
+        fila = self.primera + int(self.canvas.canvasy(y)) // self.alto_celda
+        indice = fila * self.columnas + columna
+        return indice if indice < len(self.registros) else None
+
+    def _clic(self, event):
+        self.canvas.focus_set()
+        indice = self._indice_en(event.x, event.y)
+        if indice is not None:
+            self.seleccionar(indice)
+
+    def _doble_clic(self, event):
+        indice = self._indice_en(event.x, event.y)
+        if indice is not None:
+            self.seleccionado = indice
+            self._activar()
+
+    def _mover(self, delta):
+        actual = self.seleccionado if self.seleccionado is not None else self.primera * self.columnas - 1
+        self.seleccionar(actual + delta)
+
+    def _activar(self):
+        if self._al_activar and self.seleccionado is not None:
+            self._al_activar(self.seleccionado)
+
+
+class MiniaturasVisibles:
+    """
+    Proporciona a la cuadrícula las miniaturas de las imágenes visibles.
+
+    Busca primero en la LRU de imágenes ya decodificadas, después en la
+    caché en disco y, si no están, las anota para pedirlas al pool de
+    procesos al terminar el redibujado. Cuando llegan, vuelve a dibujar
+    la cuadrícula.
+    """
+
+    def __init__(self, cuadricula, maximo=MAX_MINIATURAS_EN_MEMORIA):
+        self.cuadricula = cuadricula
+        self.maximo = maximo
+        self.servicio = ServicioMiniaturas(lado=cuadricula.lado)
+        self._fotos = OrderedDict()
+        self._fallidas = set()
+        self._pedidos = []
+        self._esperando = False
+
+    def obtener(self, ruta, mtime, tamano):
+        """
+        Devuelve la miniatura de una imagen si ya está disponible.
+
+        Args:
+            ruta (str): Imagen original
+            mtime (float): Fecha de modificación
+            tamano (int): Tamaño en bytes
+
+        Returns:
+            tk.PhotoImage: Miniatura, o None si aún no existe o no se pudo generar
+        """
+        destino = ruta_en_cache(ruta, mtime, tamano, self.cuadricula.lado)
+        foto = self._fotos.get(destino)
+        if foto is not None:
+            self._fotos.move_to_end(destino)
+            return foto
+        if destino in self._fallidas:
+            return None
+        if os.path.exists(destino):
+            try:
+                foto = tk.PhotoImage(file=destino, master=self.cuadricula)
+            except tk.TclError:
+                self._fallidas.add(destino)
+                return None
+            self._fotos[destino] = foto
+            while len(self._fotos) > self.maximo:
+                self._fotos.popitem(last=False)
+            return foto
+        self._pedidos.append((ruta, destino))
+        return None
+
+    def imagen_de(self, carpeta, entrada):
+        """
+        Miniatura de una entrada del listado (None si no es una imagen).
+
+        Args:
+            carpeta (str): Carpeta que contiene la entrada
+            entrada (Entrada): Registro del listado
+
+        Returns:
+            tk.PhotoImage: Miniatura o None
+        """
+        if entrada.es_dir or not es_imagen(entrada.nombre):
+            return None
+        return self.obtener(os.path.join(carpeta, entrada.nombre), entrada.mtime, entrada.tamano)
+
+    def solicitar_pendientes(self):
+        """
+        Pide al pool las miniaturas que faltaban en el último redibujado.
+
+        Las que se pidieron antes y ya no son visibles se cancelan.
+
+        Returns:
+            None
+        """
+        pedidos, self._pedidos = self._pedidos, []
+        self.servicio.solicitar(pedidos)
+        if pedidos and not self._esperando:
+            self._esperando = True
+            self.cuadricula.after(INTERVALO_MINIATURAS_MS, self._recoger)
+
+    def _recoger(self):
+        """
+        Recoge las miniaturas generadas y redibuja si llegó alguna.
+
+        Se vuelve a programar con after() mientras queden pedidos en curso.
+        """
+        if not self.cuadricula.winfo_exists():
+            return
+        listas = self.servicio.obtener_listas()
+        for ruta, destino, exito in listas:
+            if not exito:
+                self._fallidas.add(destino)
+        self._esperando = False
+        if listas:
+            # Redibujar vuelve a pedir (y a programar la recogida) lo que falte
+            self.cuadricula.actualizar()
+        if self.servicio.hay_pendientes() and not self._esperando:
+            self._esperando = True
+            self.cuadricula.after(INTERVALO_MINIATURAS_MS, self._recoger)
+
+    def cerrar(self):
+        """
+        Detiene el pool de procesos y libera las imágenes.
+
+        Returns:
+            None
+        """
+        self.servicio.cerrar()
+        self._fotos.clear()
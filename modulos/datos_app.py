@@ -0,0 +1,24 @@
+import os
+
+# =============================================================================
+# DIRECTORIO DE DATOS DE LA APLICACIÓN
+# =============================================================================
+# Todos los archivos persistentes de la aplicación (instantáneas, registros,
+# índices, cachés...) se guardan bajo ~/.os_mini para no ensuciar el proyecto.
+
+DIRECTORIO_BASE = os.path.join(os.path.expanduser('~'), '.os_mini')
+
+
+def obtener_directorio_datos(*partes):
+    """
+    Devuelve (y crea si no existe) un subdirectorio de datos de la aplicación.
+
+    Args:
+        *partes (str): Componentes de la ruta relativa a ~/.os_mini
+
+    Returns:
+        str: Ruta absoluta del directorio
+    """
+    ruta = os.path.join(DIRECTORIO_BASE, *partes)
+    os.makedirs(ruta, exist_ok=True)
+    return ruta
@@ -0,0 +1,362 @@
+import hashlib
+import multiprocessing
+import os
+import queue
+import stat
+import threading
+from collections import namedtuple, defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# =============================================================================
+# BÚSQUEDA DE ARCHIVOS DUPLICADOS POR ETAPAS
+# =============================================================================
+# Leer todos los archivos para compararlos es caro, así que cada etapa
+# descarta candidatos con la información más barata disponible:
+#   1. Tamaño: sale del propio recorrido (scandir + stat); dos archivos de
+#      tamaño distinto no pueden ser iguales.
+#   2. Huella parcial: hash del primer y del último bloque de los archivos
+#      con el mismo tamaño. Descarta casi todos los falsos candidatos
+#      (cabeceras o colas distintas) leyendo unos pocos KB por archivo.
+#   3. Huella completa: solo los que siguen empatados se leen enteros, en un
+#      pool de procesos y con lecturas secuenciales grandes.
+# Los archivos con el mismo (dispositivo, inodo) son enlaces duros al mismo
+# contenido: se cuentan una sola vez porque borrar uno no libera espacio.
+
+HILOS_POR_DEFECTO = 8
+
+# Bytes leídos del principio y del final en la huella parcial
+BLOQUE_PARCIAL = 64 * 1024
+
+# Tamaño de cada lectura al calcular la huella completa
+BLOQUE_COMPLETO = 1024 * 1024
+
+# Aviso de cancelación compartido con los procesos del pool (lo fija
+# _iniciar_proceso en cada uno de ellos)
+_cancelado_proceso = None
+
+# Grupo de archivos con el mismo contenido
+GrupoDuplicados = namedtuple('GrupoDuplicados', 'tamano huella rutas')
+
+# Etapas (para mostrar el progreso)
+ETAPA_RECORRIDO = "Recorriendo"
+ETAPA_PARCIAL = "Huella parcial"
+ETAPA_COMPLETA = "Huella completa"
+ETAPA_TERMINADA = "Terminado"
+
+
+def huella_parcial(ruta, tamano, bloque=BLOQUE_PARCIAL):
+    """
+    Calcula el hash del primer y del último bloque de un archivo.
+
+    Si el archivo cabe en dos bloques se lee entero y la huella es completa.
+
+    Args:
+        ruta (str): Archivo
+        tamano (int): Tamaño del archivo
+        bloque (int): Bytes a leer de cada extremo
+
+    Returns:
+        tuple: (huella en hexadecimal, bytes leídos)
+
+    Raises:
+        OSError: Si el archivo no se puede leer
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(ruta, 'rb') as f:
+        if tamano <= 2 * bloque:
+            datos = f.read()
+            h.update(datos)
+            return h.hexdigest(), len(datos)
+        inicio = f.read(bloque)
+        f.seek(-bloque, os.SEEK_END)
+        fin = f.read(bloque)
+    h.update(inicio)
+    h.update(fin)
+    return h.hexdigest(), len(inicio) + len(fin)
+
+
+def _iniciar_proceso(cancelado):
+    """Inicializador de los procesos del pool: guarda el aviso de cancelación."""
+    global _cancelado_proceso
+    _cancelado_proceso = cancelado
+
+
+def huella_completa(ruta, bloque=BLOQUE_COMPLETO):
+    """
+    Calcula el hash de todo el contenido de un archivo.
+
+    Se ejecuta en los procesos del pool, por eso es una función de módulo y
+    devuelve el error en lugar de lanzarlo. Entre bloque y bloque comprueba
+    si la búsqueda se canceló, para no seguir leyendo archivos enormes.
+
+    Args:
+        ruta (str): Archivo
+        bloque (int): Tamaño de cada lectura
+
+    Returns:
+        tuple: (ruta, huella o None si falla o se cancela, bytes leídos)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    leidos = 0
+    try:
+        with open(ruta, 'rb', buffering=0) as f:
+            buffer = bytearray(bloque)
+            vista = memoryview(buffer)
+            while True:
+                if _cancelado_proceso is not None and _cancelado_proceso.is_set():
+                    return ruta, None, leidos
+                n = f.readinto(buffer)
+                if not n:
+                    break
+                h.update(vista[:n])
+                leidos += n
+    except OSError:
+        return ruta, None, leidos
+    return ruta, h.hexdigest(), leidos
+
+
+class BuscadorDuplicados:
+    """
+    Busca en segundo plano archivos duplicados bajo una carpeta.
+
+    Los grupos confirmados se publican en una cola en cuanto todas sus
+    copias tienen huella completa, así que los primeros aparecen antes de
+    que termine la búsqueda.
+
+    Atributos de progreso:
+        etapa (str): Etapa actual
+        archivos (int): Archivos regulares encontrados
+        candidatos (int): Archivos que comparten tamaño con otro
+        bytes_candidatos (int): Lo que habría que leer hasheando todo
+        bytes_leidos (int): Bytes distintos leídos de los archivos (lo que
+                            la huella parcial ya leyó no se cuenta otra
+                            vez en la completa)
+        grupos (int): Grupos de duplicados encontrados
+        bytes_recuperables (int): Espacio que liberaría dejar una copia
+        errores (int): Carpetas o archivos que no se pudieron leer
+    """
+
+    def __init__(self, raiz, hilos=HILOS_POR_DEFECTO, procesos=None, tamano_minimo=1):
+        self.raiz = os.path.abspath(raiz)
+        self.hilos = hilos
+        self.procesos = procesos or os.cpu_count() or 2
+        self.tamano_minimo = tamano_minimo
+        self.etapa = ETAPA_RECORRIDO
+        self.archivos = 0
+        self.candidatos = 0
+        self.bytes_candidatos = 0
+        self.bytes_leidos = 0
+        self.grupos = 0
+        self.bytes_recuperables = 0
+        self.errores = 0
+        self.terminado = threading.Event()
+        self._grupos = queue.Queue()
+        self._cancelado = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelado(self):
+        return self._cancelado.is_set()
+
+    def iniciar(self):
+        """
+        Arranca la búsqueda en un hilo coordinador.
+
+        Returns:
+            BuscadorDuplicados: El propio buscador (para encadenar llamadas)
+        """
+        threading.Thread(target=self._coordinar, name="buscador-duplicados", daemon=True).start()
+        return self
+
+    def cancelar(self):
+        """
+        Detiene la búsqueda lo antes posible.
+
+        Returns:
+            None
+        """
+        self._cancelado.set()
+
+    def obtener_grupos(self):
+        """
+        Extrae sin bloquear los grupos confirmados hasta ahora.
+
+        Returns:
+            list: GrupoDuplicados publicados desde la última llamada
+        """
+        grupos = []
+        try:
+            while True:
+                grupos.append(self._grupos.get_nowait())
+        except queue.Empty:
+            pass
+        return grupos
+
+    def _publicar(self, tamano, huella, rutas):
+        rutas = sorted(rutas)
+        self.grupos += 1
+        self.bytes_recuperables += tamano * (len(rutas) - 1)
+        self._grupos.put(GrupoDuplicados(tamano, huella, rutas))
+
+    # -------------------------------------------------------------------------
+    # Etapa 1: recorrido y agrupación por tamaño
+    # -------------------------------------------------------------------------
+
+    def _leer_carpeta(self, ruta):
+        """
+        Lee una carpeta (en los hilos).
+
+        Returns:
+            tuple: (subcarpetas, [(tamano, (dev, inodo), ruta)]) o (None, None)
+        """
+        if self._cancelado.is_set():
+            return (), ()
+        subdirs = []
+        archivos = []
+        try:
+            with os.scandir(ruta) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                            continue
+                        info = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if stat.S_ISREG(info.st_mode) and info.st_size >= self.tamano_minimo:
+                        archivos.append((info.st_size, (info.st_dev, info.st_ino), entry.path))
+        except OSError:
+            return None, None
+        return subdirs, archivos
+
+    def _agrupar_por_tamano(self):
+        por_tamano = defaultdict(dict)
+        with ThreadPoolExecutor(max_workers=self.hilos) as pool:
+            pendientes = {pool.submit(self._leer_carpeta, self.raiz)}
+            while pendientes and not self._cancelado.is_set():
+                hechos, pendientes = wait(pendientes, timeout=0.2, return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    subdirs, archivos = futuro.result()
+                    if subdirs is None:
+                        self.errores += 1
+                        continue
+                    for tamano, inodo, ruta in archivos:
+                        # Los enlaces duros al mismo inodo cuentan una vez
+                        if inodo not in por_tamano[tamano]:
+                            por_tamano[tamano][inodo] = ruta
+                            self.archivos += 1
+                    for subdir in subdirs:
+                        pendientes.add(pool.submit(self._leer_carpeta, subdir))
+            for futuro in pendientes:
+                futuro.cancel()
+        return {tamano: list(rutas.values()) for tamano, rutas in por_tamano.items() if len(rutas) > 1}
+
+    # -------------------------------------------------------------------------
+    # Etapa 2: huella parcial
+    # -------------------------------------------------------------------------
+
+    def _parcial(self, tamano, ruta):
+        if self._cancelado.is_set():
+            return tamano, ruta, None
+        try:
+            huella, leidos = huella_parcial(ruta, tamano)
+        except OSError:
+            return tamano, ruta, None
+        with self._lock:
+            self.bytes_leidos += leidos
+        return tamano, ruta, huella
+
+    def _agrupar_por_huella_parcial(self, por_tamano):
+        """
+        Agrupa por huella parcial y publica los grupos que ya son completos.
+
+        Returns:
+            list: Grupos (tamano, rutas) que necesitan huella completa
+        """
+        por_parcial = defaultdict(list)
+        with ThreadPoolExecutor(max_workers=self.hilos) as pool:
+            tareas = [pool.submit(self._parcial, tamano, ruta)
+                      for tamano, rutas in por_tamano.items() for ruta in rutas]
+            for futuro in tareas:
+                tamano, ruta, huella = futuro.result()
+                if huella is None:
+                    if not self._cancelado.is_set():
+                        self.errores += 1
+                    continue
+                por_parcial[(tamano, huella)].append(ruta)
+
+        pendientes = []
+        for (tamano, huella), rutas in por_parcial.items():
+            if len(rutas) < 2:
+                continue
+            if tamano <= 2 * BLOQUE_PARCIAL:
+                # La huella parcial cubrió el archivo entero
+                self._publicar(tamano, huella, rutas)
+            else:
+                pendientes.append((tamano, rutas))
+        return pendientes
+
+    # -------------------------------------------------------------------------
+    # Etapa 3: huella completa en un pool de procesos
+    # -------------------------------------------------------------------------
+
+    def _agrupar_por_huella_completa(self, grupos):
+        # Primero los más grandes: son los que más espacio pueden liberar
+        grupos.sort(key=lambda g: g[0], reverse=True)
+        # 'spawn' evita heredar por fork el estado de Tk y de los hilos
+        contexto = multiprocessing.get_context('spawn')
+        cancelado = contexto.Event()
+        pool = ProcessPoolExecutor(max_workers=self.procesos, mp_context=contexto,
+                                   initializer=_iniciar_proceso, initargs=(cancelado,))
+        try:
+            # futuro -> índice del grupo; por grupo, huellas y copias pendientes
+            pendientes = {}
+            resultados = [defaultdict(list) for _ in grupos]
+            faltan = [len(rutas) for _, rutas in grupos]
+            for indice, (_, rutas) in enumerate(grupos):
+                for ruta in rutas:
+                    pendientes[pool.submit(huella_completa, ruta)] = indice
+
+            while pendientes and not self._cancelado.is_set():
+                hechos, _ = wait(pendientes, timeout=0.2, return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    indice = pendientes.pop(futuro)
+                    ruta, huella, leidos = futuro.result()
+                    # El primer y el último bloque ya se contaron en la huella
+                    # parcial: solo suma lo que queda entre ellos
+                    tamano = grupos[indice][0]
+                    self.bytes_leidos += max(0, min(leidos, tamano - BLOQUE_PARCIAL) - BLOQUE_PARCIAL)
+                    if huella is None:
+                        self.errores += 1
+                    else:
+                        resultados[indice][huella].append(ruta)
+                    faltan[indice] -= 1
+                    if faltan[indice] == 0:
+                        for huella_grupo, rutas in resultados[indice].items():
+                            if len(rutas) > 1:
+                                self._publicar(tamano, huella_grupo, rutas)
+                        resultados[indice] = None
+        finally:
+            # Al cancelar, cerrar el pool no debe esperar a todos los archivos
+            # enviados: se descartan los que no empezaron y los que están en
+            # curso dejan de leer en el siguiente bloque
+            cancelado.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _coordinar(self):
+        try:
+            por_tamano = self._agrupar_por_tamano()
+            self.candidatos = sum(len(rutas) for rutas in por_tamano.values())
+            self.bytes_candidatos = sum(tamano * len(rutas) for tamano, rutas in por_tamano.items())
+
+            pendientes = []
+            if not self._cancelado.is_set():
+                self.etapa = ETAPA_PARCIAL
+                pendientes = self._agrupar_por_huella_parcial(por_tamano)
+
+            if not self._cancelado.is_set() and pendientes:
+                self.etapa = ETAPA_COMPLETA
+                self._agrupar_por_huella_completa(pendientes)
+        finally:
+            self.etapa = ETAPA_TERMINADA
+            self.terminado.set()
@@ -0,0 +1,772 @@
+import codecs
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+from .recursos import ConsumoRecursos, uso_hilo
+
+# =============================================================================
+# EJECUCIÓN DE COMANDOS EN SEGUNDO PLANO CON SALIDA EN STREAMING
+# =============================================================================
+# Hay dos tipos de ejecución con la misma interfaz (iniciar, cancelar,
+# terminado, codigo, obtener_salida):
+#
+# - EjecucionComando lanza un programa externo con Popen (lista de
+#   argumentos, sin pasar por /bin/sh) y dos hilos lectores vacían stdout y
+#   stderr a medida que el proceso escribe.
+# - EjecucionInterna ejecuta en un hilo una orden implementada en Python
+#   (ls, cd, echo...), sin fork ni exec: la orden es un generador de líneas.
+#
+# En ambos casos los trozos de salida se publican en un buffer que la
+# interfaz consume con after(). Así la ventana nunca espera al comando y la
+# salida aparece mientras se produce, no al final.
+#
+# El proceso arranca en su propio grupo (sesión nueva en POSIX, grupo de
+# procesos nuevo en Windows) para poder interrumpirlo junto con sus hijos:
+# primero SIGINT, como Ctrl-C en una terminal, y si no ha terminado tras
+# ESPERA_CANCELACION segundos, SIGTERM.
+#
+# Los trozos se guardan en un BufferSalida acotado: si el proceso escribe
+# más deprisa de lo que la interfaz puede mostrar, se descartan los trozos
+# más antiguos (y se cuentan), de modo que la memoria no crece con el
+# volumen de salida.
+#
+# EjecucionTuberia conecta varias etapas (a | b | c) sin acumular salidas
+# intermedias: dos programas externos seguidos se unen con una tubería del
+# sistema, y las órdenes internas son generadores encadenados que consumen
+# la entrada línea a línea. Cuando la última etapa termina (head ya tiene
+# sus líneas) se cierran las anteriores: los generadores dejan de iterar y
+# los procesos reciben SIGPIPE al escribir en una tubería sin lector.
+#
+# Toda ejecución mide lo que consume (modulos/recursos.py): los procesos se
+# recogen con os.wait4() para obtener su rusage y las órdenes internas
+# miden su hilo. `time comando` añade el informe al final de la salida.
+#
+# Con `limites` (LimitesRecursos) los procesos nacen con setrlimit y nice
+# bajos, la salida total se cuenta al leerla y, si supera el límite, la
+# ejecución se detiene como al cancelarla. Los límites alcanzados se
+# explican al final de la salida.
+
+# Flujos de salida
+SALIDA = 'salida'
+ERROR = 'error'
+
+# Bytes por lectura de las tuberías
+BLOQUE_LECTURA = 64 * 1024
+
+# Segundos entre SIGINT y SIGTERM al cancelar
+ESPERA_CANCELACION = 2.0
+
+# Las órdenes internas publican su salida cada BLOQUE_LECTURA caracteres o
+# cada INTERVALO_PUBLICACION segundos, lo que ocurra antes
+INTERVALO_PUBLICACION = 0.05
+
+# Código de salida de un comando cancelado (como tras Ctrl-C en bash)
+CODIGO_CANCELADO = 130
+
+# Código de salida de un comando que no existe o no está permitido (como sh)
+CODIGO_NO_ENCONTRADO = 127
+
+# Código de salida de un comando detenido por el límite de salida: el de un
+# proceso que muere por SIGXFSZ, la señal del límite de tamaño de archivo
+CODIGO_LIMITE_SALIDA = 128 + getattr(signal, 'SIGXFSZ', 25)
+
+# Bytes de salida pendientes de mostrar que se guardan como mucho
+MAX_BYTES_BUFFER = 1024 * 1024
+
+# Una línea más larga que esto se entrega partida a la etapa siguiente
+MAX_LONGITUD_LINEA = 1024 * 1024
+
+
+class BufferSalida:
+    """
+    Cola de trozos de salida acotada en bytes y segura entre hilos.
+
+    Al superar `max_bytes` se descartan los trozos más antiguos: lo que se
+    pierde es lo que de todos modos habría salido ya de la pantalla. Con
+    `esperar` (modo por lotes, donde no se debe perder nada) agregar()
+    espera a que se extraiga lo pendiente, y el comando, a su vez, a que
+    se lea su tubería.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES_BUFFER, esperar=False):
+        self.max_bytes = max_bytes
+        self.esperar = esperar
+        self.bytes = 0
+        self.descartados = 0
+        self._trozos = deque()
+        self._descartados_pendientes = 0
+        self._lock = threading.Lock()
+        self._hay_sitio = threading.Condition(self._lock)
+
+    def agregar(self, flujo, texto, tamano=None):
+        """
+        Añade un trozo al final y descarta los más antiguos si no cabe.
+
+        Args:
+            flujo (str): SALIDA o ERROR
+            texto (str): Texto del trozo
+            tamano (int): Bytes que ocupaba el trozo (por defecto len(texto))
+
+        Returns:
+            None
+        """
+        tamano = len(texto) if tamano is None else tamano
+        with self._lock:
+            while self.esperar and self._trozos and self.bytes + tamano > self.max_bytes:
+                self._hay_sitio.wait()
+            self._trozos.append((flujo, texto, tamano))
+            self.bytes += tamano
+            while self.bytes > self.max_bytes and len(self._trozos) > 1:
+                self._descartar(self._trozos.popleft()[2])
+            if self.bytes > self.max_bytes:
+                # Un único trozo mayor que el buffer: se conserva su final
+                flujo, texto, tamano = self._trozos.pop()
+                sobrante = len(texto) - self.max_bytes
+                self._trozos.append((flujo, texto[sobrante:], self.max_bytes))
+                self.bytes = self.max_bytes
+                self._descartar(tamano - self.max_bytes)
+
+    def _descartar(self, tamano):
+        self.bytes -= tamano
+        self.descartados += tamano
+        self._descartados_pendientes += tamano
+
+    def extraer(self):
+        """
+        Vacía el buffer.
+
+        Returns:
+            tuple: (lista de tuplas (flujo, texto), bytes descartados desde
+                    la última extracción)
+        """
+        with self._lock:
+            trozos = [(flujo, texto) for flujo, texto, _ in self._trozos]
+            descartados = self._descartados_pendientes
+            self._trozos.clear()
+            self.bytes = 0
+            self._descartados_pendientes = 0
+            self._hay_sitio.notify_all()
+        return trozos, descartados
+
+    def dejar_de_esperar(self):
+        """
+        Vuelve a descartar en lugar de esperar (nadie va a extraer más).
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.esperar = False
+            self._hay_sitio.notify_all()
+
+
+def leer_trozos(tuberia):
+    """
+    Lee una tubería por bloques y devuelve el texto decodificado.
+
+    La tubería se cierra al terminar o al abandonar el generador, de modo
+    que el proceso que escribe en ella recibe SIGPIPE.
+
+    Args:
+        tuberia: Archivo binario (stdout o stderr de un proceso)
+
+    Yields:
+        tuple: (texto, bytes leídos)
+    """
+    # Decodificador incremental: un carácter UTF-8 puede quedar partido
+    # entre dos lecturas
+    decodificador = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    descriptor = tuberia.fileno()
+    try:
+        while True:
+            try:
+                datos = os.read(descriptor, BLOQUE_LECTURA)
+            except OSError:
+                break
+            if not datos:
+                break
+            texto = decodificador.decode(datos)
+            if texto:
+                yield texto, len(datos)
+        resto = decodificador.decode(b'', final=True)
+        if resto:
+            yield resto, len(resto)
+    finally:
+        tuberia.close()
+
+
+def leer_lineas(tuberia):
+    """
+    Lee una tubería línea a línea (cada línea con su '\\n').
+
+    Args:
+        tuberia: Archivo binario (stdout de un proceso)
+
+    Yields:
+        str: Líneas; las de más de MAX_LONGITUD_LINEA salen partidas
+    """
+    resto = ''
+    trozos = leer_trozos(tuberia)
+    try:
+        for texto, _ in trozos:
+            partes = (resto + texto).split('\n')
+            resto = partes.pop()
+            for parte in partes:
+                yield parte + '\n'
+            if len(resto) >= MAX_LONGITUD_LINEA:
+                yield resto
+                resto = ''
+        if resto:
+            yield resto
+    finally:
+        trozos.close()
+
+
+def opciones_grupo_nuevo():
+    """
+    Opciones de Popen para lanzar un proceso en su propio grupo.
+
+    Returns:
+        dict: Sesión nueva en POSIX, grupo de procesos nuevo en Windows
+    """
+    if os.name == 'nt':
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+def enviar_senal(proceso, senal):
+    """
+    Envía una señal al grupo de un proceso lanzado con opciones_grupo_nuevo().
+
+    Args:
+        proceso (subprocess.Popen): Proceso
+        senal (int): Señal (en Windows, CTRL_BREAK_EVENT)
+
+    Returns:
+        None
+    """
+    try:
+        if os.name == 'nt':
+            proceso.send_signal(senal)
+        else:
+            os.killpg(proceso.pid, senal)
+    except (OSError, ValueError):
+        # El proceso ya terminó
+        pass
+
+
+def esperar_proceso(proceso):
+    """
+    Espera a que termine un proceso y obtiene los recursos que consumió.
+
+    Usa os.wait4() donde existe; Popen.wait() no devuelve el rusage.
+
+    Args:
+        proceso (subprocess.Popen): Proceso hijo
+
+    Returns:
+        tuple: (código de salida como Popen.returncode, rusage del proceso
+                o None si ya se había recogido o el sistema no lo da)
+    """
+    if proceso.returncode is not None or not hasattr(os, 'wait4'):
+        return proceso.wait(), None
+    try:
+        _, estado, uso = os.wait4(proceso.pid, 0)
+    except ChildProcessError:
+        # Otro hilo lo recogió antes (Popen.poll al cancelar)
+        return proceso.wait(), None
+    proceso.returncode = os.waitstatus_to_exitcode(estado)
+    return proceso.returncode, uso
+
+
+def interrumpir_procesos(procesos, terminados):
+    """
+    SIGINT a los procesos y, si pasado ESPERA_CANCELACION no han terminado, SIGTERM.
+
+    Args:
+        procesos (list): Procesos a interrumpir
+        terminados (callable): Devuelve True si ya no hace falta forzar
+
+    Returns:
+        None
+    """
+    for proceso in procesos:
+        enviar_senal(proceso, signal.CTRL_BREAK_EVENT if os.name == 'nt' else signal.SIGINT)
+
+    def forzar():
+        if terminados():
+            return
+        for proceso in procesos:
+            if proceso.poll() is None:
+                if os.name == 'nt':
+                    proceso.terminate()
+                else:
+                    enviar_senal(proceso, signal.SIGTERM)
+
+    temporizador = threading.Timer(ESPERA_CANCELACION, forzar)
+    temporizador.daemon = True
+    temporizador.start()
+
+
+class ErrorComando(Exception):
+    """
+    Error de una orden interna que la termina con un mensaje y un código.
+    """
+
+    def __init__(self, mensaje, codigo=1):
+        super().__init__(mensaje)
+        self.codigo = codigo
+
+
+class Ejecucion:
+    """
+    Parte común de las ejecuciones: salida, fin, código, cancelación y
+    consumo de recursos.
+
+    Si `mostrar_consumo` es True (`time comando`) el informe de consumo se
+    escribe en la salida de error al terminar. Las funciones de
+    `al_terminar` reciben la ejecución cuando acaba, antes de que se marque
+    como terminada. `limites_superados` guarda los avisos de los límites
+    alcanzados; un comando detenido por el límite de salida termina con
+    CODIGO_LIMITE_SALIDA, no con el de cancelado.
+    """
+
+    def __init__(self):
+        self.codigo = None
+        self.error = None
+        self.terminado = threading.Event()
+        self.salida = BufferSalida()
+        self.consumo = ConsumoRecursos()
+        self.mostrar_consumo = False
+        self.al_terminar = []
+        self.limites = None
+        self.limites_superados = []
+        self._bytes_salida = 0
+        self._salida_superada = False
+        self._lock_limites = threading.Lock()
+        self._cancelado = threading.Event()
+
+    @property
+    def cancelado(self):
+        return self._cancelado.is_set()
+
+    def _opciones_proceso(self):
+        # Opciones de Popen: grupo propio y, con límites, los del hijo
+        opciones = opciones_grupo_nuevo()
+        if self.limites is not None and os.name != 'nt':
+            funcion = self.limites.funcion_hijo()
+            if funcion is not None:
+                opciones['preexec_fn'] = funcion
+        return opciones
+
+    def _proceso_lanzado(self, proceso):
+        if self.limites is not None:
+            self.limites.bajar_prioridad_disco(proceso.pid)
+
+    def _esperar_proceso(self, proceso):
+        codigo, uso = esperar_proceso(proceso)
+        self.consumo.sumar_proceso(uso)
+        if self.limites is not None:
+            mensaje = self.limites.motivo_fin(codigo, uso)
+            if mensaje is not None:
+                self._anotar_limite(mensaje)
+        return codigo
+
+    def _anotar_limite(self, mensaje):
+        with self._lock_limites:
+            if mensaje not in self.limites_superados:
+                self.limites_superados.append(mensaje)
+
+    def _contar_salida(self, tamano):
+        """
+        Suma bytes a la salida del comando y lo detiene si pasan del límite.
+
+        Returns:
+            bool: False si se superó el límite (hay que dejar de leer)
+        """
+        if self.limites is None or self.limites.salida is None:
+            return True
+        with self._lock_limites:
+            self._bytes_salida += tamano
+            if self._bytes_salida <= self.limites.salida:
+                return True
+            self._salida_superada = True
+        self._anotar_limite(self.limites.mensaje_salida())
+        self.cancelar()
+        return False
+
+    def _finalizar(self):
+        if self._salida_superada:
+            # Se detuvo con cancelar(): sin esto el código sería el de Ctrl-C
+            self.codigo = CODIGO_LIMITE_SALIDA
+        self.consumo.terminar()
+        for mensaje in self.limites_superados:
+            self.salida.agregar(ERROR, f"\n {mensaje}\n")
+        if self.mostrar_consumo:
+            self.salida.agregar(ERROR, self.consumo.informe())
+        for funcion in self.al_terminar:
+            funcion(self)
+        self.terminado.set()
+
+    def obtener_salida(self):
+        """
+        Extrae sin bloquear los trozos de salida publicados.
+
+        Returns:
+            tuple: (lista de tuplas (flujo, texto) con flujo SALIDA o ERROR,
+                    en orden; bytes descartados por falta de espacio)
+        """
+        return self.salida.extraer()
+
+
+class EjecucionComando(Ejecucion):
+    """
+    Ejecuta un programa externo en un proceso hijo y recoge su salida por trozos.
+    """
+
+    def __init__(self, argumentos, directorio=None):
+        super().__init__()
+        self.argumentos = argumentos
+        self.directorio = directorio
+        self.proceso = None
+
+    def iniciar(self):
+        """
+        Lanza el proceso y los hilos lectores.
+
+        Si el proceso no se puede crear, el error queda en `self.error` y la
+        ejecución se marca como terminada.
+
+        Returns:
+            EjecucionComando: La propia ejecución (para encadenar llamadas)
+        """
+        self.consumo.iniciar()
+        try:
+            self.proceso = subprocess.Popen(
+                self.argumentos,
+                cwd=self.directorio,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                **self._opciones_proceso()
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            # SubprocessError: falló la preparación del hijo (preexec_fn)
+            self.error = e
+            self._finalizar()
+            return self
+        self._proceso_lanzado(self.proceso)
+
+        lectores = [
+            threading.Thread(target=self._leer, args=(self.proceso.stdout, SALIDA), name="lector-stdout", daemon=True),
+            threading.Thread(target=self._leer, args=(self.proceso.stderr, ERROR), name="lector-stderr", daemon=True),
+        ]
+        for lector in lectores:
+            lector.start()
+        threading.Thread(target=self._esperar, args=(lectores,), name="espera-comando", daemon=True).start()
+        return self
+
+    def cancelar(self):
+        """
+        Interrumpe el proceso: SIGINT y, si sigue vivo, SIGTERM más tarde.
+
+        Returns:
+            None
+        """
+        if self.proceso is None or self.terminado.is_set() or self._cancelado.is_set():
+            return
+        self._cancelado.set()
+        interrumpir_procesos([self.proceso], self.terminado.is_set)
+
+    def _leer(self, tuberia, flujo):
+        trozos = leer_trozos(tuberia)
+        try:
+            for texto, tamano in trozos:
+                self.salida.agregar(flujo, texto, tamano)
+                if not self._contar_salida(tamano):
+                    break
+        finally:
+            # Al dejar de leer se cierra la tubería: el proceso recibe SIGPIPE
+            trozos.close()
+
+    def _esperar(self, lectores):
+        for lector in lectores:
+            lector.join()
+        self.codigo = self._esperar_proceso(self.proceso)
+        self._finalizar()
+
+
+class EjecucionInterna(Ejecucion):
+    """
+    Ejecuta una orden interna en un hilo, sin crear procesos.
+
+    `generar(error)` devuelve un iterable de líneas de salida; `error(texto)`
+    escribe en la salida de error sin detener la orden (la ejecución
+    terminará con código 1). Para un error fatal la orden lanza
+    ErrorComando. Un generador puede fijar el código de salida con
+    `return codigo`.
+    """
+
+    def __init__(self, generar):
+        super().__init__()
+        self.generar = generar
+        self._hubo_errores = False
+        self._pendientes = []
+        self._hilo = None
+
+    def iniciar(self):
+        """
+        Arranca el hilo que ejecuta la orden.
+
+        Returns:
+            EjecucionInterna: La propia ejecución (para encadenar llamadas)
+        """
+        self.consumo.iniciar()
+        threading.Thread(target=self._ejecutar, name="orden-interna", daemon=True).start()
+        return self
+
+    def cancelar(self):
+        """
+        Pide a la orden que se detenga antes de producir la línea siguiente.
+
+        Returns:
+            None
+        """
+        self._cancelado.set()
+
+    def _escribir_error(self, texto):
+        self._hubo_errores = True
+        # La salida normal acumulada va antes, para conservar el orden (las
+        # etapas de una tubería que corren en otro hilo escriben sin más)
+        if threading.get_ident() == self._hilo:
+            self._publicar()
+        self.salida.agregar(ERROR, texto)
+
+    def _publicar(self):
+        if self._pendientes:
+            self.salida.agregar(SALIDA, ''.join(self._pendientes))
+            self._pendientes = []
+
+    def _ejecutar(self):
+        self._hilo = threading.get_ident()
+        uso = uso_hilo()
+        lineas = None
+        codigo = None
+        tamano = 0
+        ultima = time.monotonic()
+        try:
+            lineas = iter(self.generar(self._escribir_error))
+            while not self._cancelado.is_set():
+                try:
+                    linea = next(lineas)
+                except StopIteration as fin:
+                    codigo = fin.value
+                    break
+                self._pendientes.append(linea)
+                tamano += len(linea)
+                self._contar_salida(len(linea))
+                if tamano >= BLOQUE_LECTURA or time.monotonic() - ultima >= INTERVALO_PUBLICACION:
+                    self._publicar()
+                    tamano = 0
+                    ultima = time.monotonic()
+            self._publicar()
+            if self._cancelado.is_set():
+                self.codigo = CODIGO_CANCELADO
+            elif codigo is not None:
+                self.codigo = codigo
+            else:
+                self.codigo = 1 if self._hubo_errores else 0
+        except ErrorComando as e:
+            self._publicar()
+            self.salida.agregar(ERROR, f"{e}\n")
+            self.codigo = e.codigo
+        except (OSError, subprocess.SubprocessError) as e:
+            # SubprocessError: falló la preparación del hijo (preexec_fn)
+            self.error = e
+            self.codigo = 1
+        finally:
+            # Cerrar el generador libera lo que tuviera abierto (p. ej. scandir)
+            if lineas is not None and hasattr(lineas, 'close'):
+                lineas.close()
+            self.consumo.sumar_hilo(uso)
+            self._finalizar()
+
+
+class EjecucionTuberia(EjecucionInterna):
+    """
+    Ejecuta una tubería (a | b | c) pasando la salida de cada etapa a la
+    siguiente a medida que se produce.
+
+    Cada etapa es una orden interna, un callable (error, entrada) que
+    devuelve un iterable de líneas y lee las suyas del iterable `entrada`, o
+    un programa externo, dado por su lista de argumentos. El código de salida
+    es el de la última etapa, como en bash.
+    """
+
+    def __init__(self, etapas, directorio=None):
+        super().__init__(self._generar)
+        self.etapas = etapas
+        self.directorio = directorio
+        self.procesos = []
+        self._lock_procesos = threading.Lock()
+
+    def cancelar(self):
+        """
+        Detiene las órdenes internas e interrumpe los procesos de la tubería.
+
+        Returns:
+            None
+        """
+        with self._lock_procesos:
+            if self._cancelado.is_set():
+                return
+            self._cancelado.set()
+            procesos = list(self.procesos)
+        interrumpir_procesos(procesos, self.terminado.is_set)
+
+    def _lanzar(self, argumentos, entrada):
+        proceso = subprocess.Popen(
+            argumentos,
+            cwd=self.directorio,
+            stdin=entrada,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            **self._opciones_proceso()
+        )
+        self._proceso_lanzado(proceso)
+        with self._lock_procesos:
+            self.procesos.append(proceso)
+            cancelado = self._cancelado.is_set()
+        if cancelado:
+            interrumpir_procesos([proceso], self.terminado.is_set)
+        lector = threading.Thread(target=self._leer_errores, args=(proceso.stderr,), name="lector-stderr", daemon=True)
+        lector.start()
+        return proceso, lector
+
+    def _leer_errores(self, tuberia):
+        trozos = leer_trozos(tuberia)
+        try:
+            for texto, tamano in trozos:
+                self.salida.agregar(ERROR, texto, tamano)
+                if not self._contar_salida(tamano):
+                    break
+        finally:
+            trozos.close()
+
+    def _vigilar(self, lineas):
+        # Al cancelar, la entrada de una orden interna se acaba: así también
+        # termina una etapa que consume toda su entrada antes de escribir (sort)
+        for linea in lineas:
+            if self._cancelado.is_set():
+                return
+            yield linea
+
+    def _alimentar(self, lineas, tuberia, iteradores):
+        """
+        Escribe en la entrada de un proceso la salida de las órdenes internas
+        anteriores (en un hilo propio, para no bloquear la tubería).
+        """
+        pendientes, tamano = [], 0
+        try:
+            for linea in lineas:
+                pendientes.append(linea)
+                tamano += len(linea)
+                if tamano >= BLOQUE_LECTURA:
+                    tuberia.write(''.join(pendientes).encode('utf-8', 'replace'))
+                    pendientes, tamano = [], 0
+            if pendientes:
+                tuberia.write(''.join(pendientes).encode('utf-8', 'replace'))
+        except OSError:
+            # El proceso dejó de leer (SIGPIPE en bash): se abandona la etapa
+            pass
+        except ErrorComando as e:
+            self._escribir_error(f"{e}\n")
+        finally:
+            cerrar_iteradores(iteradores)
+            try:
+                tuberia.close()
+            except OSError:
+                pass
+
+    def _generar(self, error):
+        entrada = iter(())
+        anterior = None
+        iteradores = []
+        lectores = []
+        errores_ultima = []
+        # Proceso final ya esperado para obtener el código (no se espera dos
+        # veces: su consumo se sumaría de nuevo)
+        esperado = None
+        try:
+            for numero, etapa in enumerate(self.etapas):
+                if callable(etapa):
+                    if anterior is not None:
+                        entrada = leer_lineas(anterior.stdout)
+                        iteradores.append(entrada)
+                        anterior = None
+                    errores_ultima = []
+
+                    def error_etapa(texto, errores=errores_ultima):
+                        errores.append(True)
+                        error(texto)
+
+                    entrada = iter(etapa(error_etapa, self._vigilar(entrada)))
+                    iteradores.append(entrada)
+                else:
+                    if anterior is not None:
+                        proceso, lector = self._lanzar(etapa, anterior.stdout)
+                        # Solo el proceso siguiente debe tener abierta la tubería
+                        anterior.stdout.close()
+                    elif numero == 0:
+                        proceso, lector = self._lanzar(etapa, subprocess.DEVNULL)
+                    else:
+                        proceso, lector = self._lanzar(etapa, subprocess.PIPE)
+                        threading.Thread(target=self._alimentar, args=(entrada, proceso.stdin, iteradores),
+                                         name="alimentar-tuberia", daemon=True).start()
+                        iteradores = []
+                    lectores.append(lector)
+                    anterior = proceso
+
+            if anterior is not None:
+                trozos = leer_trozos(anterior.stdout)
+                iteradores.append(trozos)
+                for texto, _ in trozos:
+                    yield texto
+                codigo = self._esperar_proceso(anterior)
+                esperado = anterior
+                return codigo
+            codigo = yield from entrada
+            if codigo is None:
+                codigo = 1 if errores_ultima else 0
+            return codigo
+        finally:
+            # La última etapa terminó (o se canceló): se cierran las
+            # anteriores y se espera a los procesos, que al escribir en una
+            # tubería cerrada reciben SIGPIPE
+            cerrar_iteradores(iteradores)
+            for proceso in self.procesos:
+                if proceso is esperado:
+                    continue
+                if proceso.stdout is not None:
+                    proceso.stdout.close()
+                self._esperar_proceso(proceso)
+            for lector in lectores:
+                lector.join()
+
+
+def cerrar_iteradores(iteradores):
+    """
+    Cierra los generadores de una cadena de etapas, del último al primero.
+
+    Args:
+        iteradores (list): Iteradores (los que no son generadores se ignoran)
+
+    Returns:
+        None
+    """
+    for iterador in reversed(iteradores):
+        if hasattr(iterador, 'close'):
+            iterador.close()
@@ -0,0 +1,319 @@
+import os
+import threading
+from array import array
+from bisect import bisect_left
+from .busqueda import trigramas
+from .datos_app import obtener_directorio_datos
+
+# =============================================================================
+# HISTORIAL PERSISTENTE DE LA SHELL
+# =============================================================================
+# Cada comando ejecutado se añade como una línea al final de
+# ~/.os_mini/shell/historial.txt: escribir nunca reescribe el archivo, así
+# que cerrar la ventana (o que se cierre la aplicación) no pierde nada.
+#
+# En memoria cada comando aparece una sola vez, en la posición de su último
+# uso: repetir un comando marca como borrada su entrada anterior. Para la
+# búsqueda inversa (Ctrl-R) hay un índice de trigramas como el de
+# modulos/busqueda.py: cada trigrama apunta a las entradas que lo contienen
+# en orden creciente, y la búsqueda recorre hacia atrás solo la lista del
+# trigrama menos frecuente de la consulta, sin volver a mirar todo el
+# historial en cada pulsación.
+#
+# El archivo se lee en un hilo al abrir la primera shell; cuando acumula
+# demasiadas líneas repetidas o supera el límite se reescribe de una vez
+# con las entradas vigentes.
+
+# Comandos distintos que se conservan (se olvidan los más antiguos)
+MAX_HISTORIAL = 100000
+
+# El archivo se compacta cuando tiene estas líneas de más sobre las vigentes
+MARGEN_COMPACTAR_ARCHIVO = 20000
+
+# Se reconstruye el índice cuando más de la mitad de las entradas están
+# borradas (y son al menos estas)
+MIN_BORRADOS_COMPACTAR = 10000
+
+
+def ruta_historial():
+    """
+    Devuelve la ruta del archivo de historial.
+
+    Returns:
+        str: ~/.os_mini/shell/historial.txt
+    """
+    return os.path.join(obtener_directorio_datos('shell'), 'historial.txt')
+
+
+class HistorialShell:
+    """
+    Historial de comandos sin repetidos, con búsqueda indexada.
+
+    Las entradas tienen un identificador creciente (su posición); las
+    borradas quedan como None hasta la siguiente compactación. Es seguro
+    entre hilos: la carga se hace en segundo plano mientras la interfaz
+    agrega y consulta.
+    """
+
+    def __init__(self, ruta=None, maximo=MAX_HISTORIAL):
+        self.ruta = ruta
+        self.maximo = maximo
+        self.entradas = []
+        self.cargado = threading.Event()
+        self._posiciones = {}
+        self._trigramas = {}
+        self._vigentes = 0
+        self._borrados = 0
+        self._primero = 0
+        self._lineas_archivo = 0
+        self._lock = threading.RLock()
+
+    @property
+    def total(self):
+        """Número de comandos distintos en el historial."""
+        return self._vigentes
+
+    # -------------------------------------------------------------------------
+    # Carga y persistencia
+    # -------------------------------------------------------------------------
+
+    def cargar_en_segundo_plano(self):
+        """
+        Lee el archivo en un hilo; hasta que termine solo se ven los
+        comandos agregados en esta sesión.
+
+        Returns:
+            HistorialShell: El propio historial (para encadenar llamadas)
+        """
+        threading.Thread(target=self.cargar, name="carga-historial", daemon=True).start()
+        return self
+
+    def cargar(self):
+        """
+        Lee el archivo de historial y construye el índice.
+
+        Los comandos agregados antes de terminar la carga se conservan como
+        los más recientes.
+
+        Returns:
+            None
+        """
+        comandos = []
+        if self.ruta is not None:
+            try:
+                with open(self.ruta, encoding='utf-8', errors='replace') as f:
+                    comandos = f.read().splitlines()
+            except OSError:
+                pass
+
+        # Se quitan los repetidos (queda el último uso) antes de indexar
+        unicos = list(dict.fromkeys(comando for comando in reversed(comandos) if comando))[:self.maximo]
+        unicos.reverse()
+        nuevo = HistorialShell(self.ruta, self.maximo)
+        for comando in unicos:
+            nuevo._agregar(comando)
+
+        with self._lock:
+            # Lo agregado durante la carga va detrás de lo leído
+            for comando in self.entradas:
+                if comando is not None:
+                    nuevo._agregar(comando)
+            nuevo._recortar()
+            self.entradas = nuevo.entradas
+            self._posiciones = nuevo._posiciones
+            self._trigramas = nuevo._trigramas
+            self._vigentes = nuevo._vigentes
+            self._borrados = nuevo._borrados
+            self._primero = nuevo._primero
+            self._lineas_archivo += len(comandos)
+            if self._borrados >= MIN_BORRADOS_COMPACTAR and self._borrados * 2 > len(self.entradas):
+                self._compactar()
+            if self._lineas_archivo > self._vigentes + MARGEN_COMPACTAR_ARCHIVO:
+                self._reescribir_archivo()
+        self.cargado.set()
+
+    def _reescribir_archivo(self):
+        # Con el lock tomado: el archivo pasa a tener solo las entradas vigentes
+        if self.ruta is None:
+            return
+        vigentes = [comando for comando in self.entradas if comando is not None]
+        temporal = self.ruta + '.tmp'
+        try:
+            with open(temporal, 'w', encoding='utf-8') as f:
+                f.writelines(comando + '\n' for comando in vigentes)
+            os.replace(temporal, self.ruta)
+            self._lineas_archivo = len(vigentes)
+        except OSError:
+            pass
+
+    # -------------------------------------------------------------------------
+    # Modificación
+    # -------------------------------------------------------------------------
+
+    def agregar(self, comando):
+        """
+        Añade un comando al final del historial y del archivo.
+
+        Args:
+            comando (str): Línea ejecutada
+
+        Returns:
+            None
+        """
+        comando = ' '.join(comando.splitlines()).strip()
+        if not comando:
+            return
+        with self._lock:
+            ultimo = self._posiciones.get(comando)
+            if ultimo is not None and ultimo == len(self.entradas) - 1:
+                # Igual que el anterior: ni se duplica ni se escribe
+                return
+            self._agregar(comando)
+            self._recortar()
+            if self.ruta is not None:
+                try:
+                    with open(self.ruta, 'a', encoding='utf-8') as f:
+                        f.write(comando + '\n')
+                    self._lineas_archivo += 1
+                except OSError:
+                    pass
+            if not self.cargado.is_set():
+                return
+            if self._borrados >= MIN_BORRADOS_COMPACTAR and self._borrados * 2 > len(self.entradas):
+                self._compactar()
+            if self._lineas_archivo > self._vigentes + MARGEN_COMPACTAR_ARCHIVO:
+                self._reescribir_archivo()
+
+    def _agregar(self, comando):
+        anterior = self._posiciones.get(comando)
+        if anterior is not None:
+            self.entradas[anterior] = None
+            self._borrados += 1
+            self._vigentes -= 1
+        identificador = len(self.entradas)
+        self.entradas.append(comando)
+        self._posiciones[comando] = identificador
+        self._vigentes += 1
+        for trigrama in trigramas(comando.lower()):
+            lista = self._trigramas.get(trigrama)
+            if lista is None:
+                lista = self._trigramas[trigrama] = array('I')
+            lista.append(identificador)
+
+    def _recortar(self):
+        # Se olvidan los comandos más antiguos por encima del máximo
+        while self._vigentes > self.maximo:
+            comando = self.entradas[self._primero]
+            if comando is not None:
+                self.entradas[self._primero] = None
+                del self._posiciones[comando]
+                self._vigentes -= 1
+                self._borrados += 1
+            self._primero += 1
+
+    def _compactar(self):
+        # Renumera las entradas vigentes y reconstruye el índice
+        entradas = self.entradas
+        self.entradas = []
+        self._posiciones = {}
+        self._trigramas = {}
+        self._vigentes = 0
+        self._borrados = 0
+        self._primero = 0
+        for comando in entradas:
+            if comando is not None:
+                self._agregar(comando)
+
+    # -------------------------------------------------------------------------
+    # Consultas
+    # -------------------------------------------------------------------------
+
+    def anterior(self, antes_de=None):
+        """
+        Devuelve el comando vigente anterior a una posición (flecha arriba).
+
+        Args:
+            antes_de (int): Identificador de referencia (None: desde el final)
+
+        Returns:
+            tuple: (identificador, comando), o None si no hay más
+        """
+        with self._lock:
+            i = len(self.entradas) if antes_de is None else min(antes_de, len(self.entradas))
+            while i > 0:
+                i -= 1
+                if self.entradas[i] is not None:
+                    return i, self.entradas[i]
+        return None
+
+    def siguiente(self, despues_de):
+        """
+        Devuelve el comando vigente posterior a una posición (flecha abajo).
+
+        Args:
+            despues_de (int): Identificador de referencia
+
+        Returns:
+            tuple: (identificador, comando), o None si ya era el último
+        """
+        with self._lock:
+            for i in range(despues_de + 1, len(self.entradas)):
+                if self.entradas[i] is not None:
+                    return i, self.entradas[i]
+        return None
+
+    def buscar(self, texto, antes_de=None):
+        """
+        Busca el comando más reciente que contiene un texto (sin distinguir
+        mayúsculas), como la búsqueda inversa de bash.
+
+        Con 3 o más caracteres solo se recorre, de atrás hacia delante, la
+        lista del trigrama menos frecuente de la consulta.
+
+        Args:
+            texto (str): Texto a buscar
+            antes_de (int): Solo entradas anteriores a este identificador
+                            (para pasar a la coincidencia siguiente)
+
+        Returns:
+            tuple: (identificador, comando), o None si no hay coincidencia
+        """
+        consulta = texto.lower()
+        with self._lock:
+            limite = len(self.entradas) if antes_de is None else antes_de
+            if len(consulta) >= 3:
+                listas = [self._trigramas.get(t) for t in trigramas(consulta)]
+                if not all(listas):
+                    return None
+                candidatos = min(listas, key=len)
+                posiciones = range(bisect_left(candidatos, limite) - 1, -1, -1)
+                for posicion in posiciones:
+                    i = candidatos[posicion]
+                    comando = self.entradas[i]
+                    if comando is not None and consulta in comando.lower():
+                        return i, comando
+                return None
+            for i in range(min(limite, len(self.entradas)) - 1, -1, -1):
+                comando = self.entradas[i]
+                if comando is not None and consulta in comando.lower():
+                    return i, comando
+        return None
+
+
+# Instancia compartida por todas las ventanas de la shell
+_historial = None
+_lock_historial = threading.Lock()
+
+
+def obtener_historial():
+    """
+    Devuelve el historial compartido; la primera vez empieza a cargarlo.
+
+    Returns:
+        HistorialShell: La instancia compartida
+    """
+    global _historial
+    with _lock_historial:
+        if _historial is None:
+            _historial = HistorialShell(ruta_historial()).cargar_en_segundo_plano()
+        return _historial
@@ -0,0 +1,328 @@
+import json
+import os
+import platform
+import heapq
+from datetime import datetime
+import psutil # pyright: ignore[reportMissingModuleSource]
+from .datos_app import obtener_directorio_datos
+
+# =============================================================================
+# CAPTURA Y COMPARACIÓN DE INSTANTÁNEAS DEL SISTEMA
+# =============================================================================
+# Una instantánea es un diccionario JSON con secciones indexadas por clave
+# (procesos por pid+inicio, particiones por punto de montaje, interfaces por
+# nombre). Comparar dos instantáneas es una mezcla por clave: cada sección se
+# recorre una sola vez y se consulta en un diccionario, así que el coste es
+# O(n) en el tamaño de las instantáneas.
+
+VERSION_FORMATO = 1
+
+# Cambios de memoria por proceso menores que esto se consideran ruido
+UMBRAL_CAMBIO_RSS = 1024 * 1024
+
+
+def _clave_proceso(pid, inicio):
+    """
+    Construye la clave estable de un proceso.
+
+    El PID solo no basta porque el sistema lo reutiliza; combinado con el
+    instante de creación identifica un proceso de forma única.
+
+    Args:
+        pid (int): Identificador del proceso
+        inicio (float): Marca de tiempo de creación del proceso
+
+    Returns:
+        str: Clave del proceso
+    """
+    return f"{pid}@{inicio or 0:.2f}"
+
+
+def capturar_instantanea():
+    """
+    Captura el estado actual de procesos, memoria, particiones y red.
+
+    Returns:
+        dict: Instantánea serializable a JSON
+    """
+    procesos = {}
+    for proc in psutil.process_iter(['pid', 'name', 'username', 'memory_info', 'create_time']):
+        try:
+            info = proc.info
+            memoria = info.get('memory_info')
+            procesos[_clave_proceso(info['pid'], info.get('create_time'))] = {
+                'pid': info['pid'],
+                'nombre': info.get('name') or '',
+                'usuario': info.get('username') or 'N/A',
+                'rss': memoria.rss if memoria else 0,
+            }
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            pass
+
+    particiones = {}
+    for particion in psutil.disk_partitions():
+        try:
+            uso = psutil.disk_usage(particion.mountpoint)
+        except Exception:
+            continue
+        particiones[particion.mountpoint] = {
+            'dispositivo': particion.device,
+            'fstype': particion.fstype,
+            'total': uso.total,
+            'usado': uso.used,
+            'porcentaje': uso.percent,
+        }
+
+    interfaces = {}
+    try:
+        for interfaz, direcciones in psutil.net_if_addrs().items():
+            interfaces[interfaz] = sorted(d.address for d in direcciones if d.address)
+    except Exception:
+        pass
+
+    memoria = psutil.virtual_memory()
+
+    return {
+        'version': VERSION_FORMATO,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'host': platform.node(),
+        'memoria': {
+            'total': memoria.total,
+            'usado': memoria.used,
+            'porcentaje': memoria.percent,
+        },
+        'procesos': procesos,
+        'particiones': particiones,
+        'interfaces': interfaces,
+    }
+
+
+def guardar_instantanea(instantanea, ruta=None):
+    """
+    Guarda una instantánea en disco como JSON.
+
+    Args:
+        instantanea (dict): Instantánea obtenida con capturar_instantanea()
+        ruta (str): Archivo destino. Si es None se genera uno con la fecha
+                    dentro de ~/.os_mini/instantaneas
+
+    Returns:
+        str: Ruta del archivo escrito
+    """
+    if ruta is None:
+        nombre = datetime.now().strftime('instantanea_%Y%m%d_%H%M%S.json')
+        ruta = os.path.join(obtener_directorio_datos('instantaneas'), nombre)
+
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(instantanea, f, ensure_ascii=False)
+    return ruta
+
+
+def cargar_instantanea(ruta):
+    """
+    Carga una instantánea desde disco.
+
+    Args:
+        ruta (str): Archivo JSON de la instantánea
+
+    Returns:
+        dict: La instantánea
+
+    Raises:
+        ValueError: Si el archivo no tiene el formato esperado
+    """
+    with open(ruta, 'r', encoding='utf-8') as f:
+        instantanea = json.load(f)
+    if not isinstance(instantanea, dict) or 'version' not in instantanea:
+        raise ValueError(f"El archivo no es una instantánea válida: {ruta}")
+    return instantanea
+
+
+def _mezclar_por_clave(antes, despues, comparar):
+    """
+    Recorre dos secciones indexadas por clave en una sola pasada.
+
+    Args:
+        antes (dict): Sección de la instantánea antigua
+        despues (dict): Sección de la instantánea nueva
+        comparar (callable): Función (clave, valor_antes, valor_despues) que
+                             devuelve un dict con el cambio o None si no hay
+
+    Returns:
+        tuple: (nuevos, eliminados, cambios); nuevos y eliminados son
+               diccionarios clave -> valor y cambios es una lista
+    """
+    nuevos, cambios = {}, []
+    for clave, valor in despues.items():
+        anterior = antes.get(clave)
+        if anterior is None:
+            nuevos[clave] = valor
+        else:
+            cambio = comparar(clave, anterior, valor)
+            if cambio is not None:
+                cambios.append(cambio)
+    eliminados = {clave: valor for clave, valor in antes.items() if clave not in despues}
+    return nuevos, eliminados, cambios
+
+
+def _cambio_proceso(clave, antes, despues):
+    delta = despues['rss'] - antes['rss']
+    if abs(delta) < UMBRAL_CAMBIO_RSS:
+        return None
+    return {
+        'pid': despues['pid'],
+        'nombre': despues['nombre'],
+        'rss_antes': antes['rss'],
+        'rss_despues': despues['rss'],
+        'delta': delta,
+    }
+
+
+def _cambio_particion(clave, antes, despues):
+    delta = despues['usado'] - antes['usado']
+    if delta == 0 and despues['total'] == antes['total']:
+        return None
+    return {
+        'punto_montaje': clave,
+        'usado_antes': antes['usado'],
+        'usado_despues': despues['usado'],
+        'porcentaje_antes': antes['porcentaje'],
+        'porcentaje_despues': despues['porcentaje'],
+        'delta': delta,
+    }
+
+
+def _cambio_interfaz(clave, antes, despues):
+    agregadas = sorted(set(despues) - set(antes))
+    eliminadas = sorted(set(antes) - set(despues))
+    if not agregadas and not eliminadas:
+        return None
+    return {
+        'nombre': clave,
+        'direcciones_agregadas': agregadas,
+        'direcciones_eliminadas': eliminadas,
+    }
+
+
+def comparar_instantaneas(antes, despues):
+    """
+    Calcula las diferencias entre dos instantáneas.
+
+    Args:
+        antes (dict): Instantánea antigua
+        despues (dict): Instantánea nueva
+
+    Returns:
+        dict: Diferencia serializable a JSON con una entrada por sección
+    """
+    procs_nuevos, procs_terminados, procs_cambios = _mezclar_por_clave(
+        antes.get('procesos', {}), despues.get('procesos', {}), _cambio_proceso)
+    parts_nuevas, parts_eliminadas, parts_cambios = _mezclar_por_clave(
+        antes.get('particiones', {}), despues.get('particiones', {}), _cambio_particion)
+    ifs_nuevas, ifs_eliminadas, ifs_cambios = _mezclar_por_clave(
+        antes.get('interfaces', {}), despues.get('interfaces', {}), _cambio_interfaz)
+
+    mem_antes = antes.get('memoria', {})
+    mem_despues = despues.get('memoria', {})
+
+    return {
+        'antes': {'fecha': antes.get('fecha'), 'host': antes.get('host')},
+        'despues': {'fecha': despues.get('fecha'), 'host': despues.get('host')},
+        'memoria': {
+            'usado_antes': mem_antes.get('usado', 0),
+            'usado_despues': mem_despues.get('usado', 0),
+            'delta': mem_despues.get('usado', 0) - mem_antes.get('usado', 0),
+        },
+        'procesos': {
+            'nuevos': list(procs_nuevos.values()),
+            'terminados': list(procs_terminados.values()),
+            'cambios_memoria': procs_cambios,
+        },
+        'particiones': {
+            'nuevas': [dict(p, punto_montaje=k) for k, p in parts_nuevas.items()],
+            'eliminadas': [dict(p, punto_montaje=k) for k, p in parts_eliminadas.items()],
+            'cambios': parts_cambios,
+        },
+        'interfaces': {
+            'nuevas': list(ifs_nuevas),
+            'eliminadas': list(ifs_eliminadas),
+            'cambios': ifs_cambios,
+        },
+    }
+
+
+def formatear_diferencia(diferencia, limite=25):
+    """
+    Convierte una diferencia en texto legible para mostrar en la interfaz.
+
+    Los cambios de memoria se ordenan con heapq.nlargest para mostrar solo
+    los `limite` más grandes sin ordenar la lista completa.
+
+    Args:
+        diferencia (dict): Resultado de comparar_instantaneas()
+        limite (int): Número máximo de elementos mostrados por lista
+
+    Returns:
+        str: Texto formateado
+    """
+    def mb(valor):
+        return f"{valor / (1024**2):+.1f} MB"
+
+    def encabezado(titulo):
+        return "╔" + "═" * 60 + "╗\n" + "║" + titulo.center(60) + "║\n" + "╚" + "═" * 60 + "╝\n\n"
+
+    texto = ""
+    texto += f" Antes:   {diferencia['antes']['fecha']} ({diferencia['antes']['host']})\n"
+    texto += f" Después: {diferencia['despues']['fecha']} ({diferencia['despues']['host']})\n\n"
+
+    texto += encabezado("MEMORIA")
+    texto += f" Memoria usada: {mb(diferencia['memoria']['delta'])}\n\n"
+
+    procesos = diferencia['procesos']
+    texto += encabezado("PROCESOS")
+    texto += f" Nuevos: {len(procesos['nuevos'])} | Terminados: {len(procesos['terminados'])}"
+    texto += f" | Con cambios de memoria: {len(procesos['cambios_memoria'])}\n\n"
+
+    crecimientos = heapq.nlargest(limite, (c for c in procesos['cambios_memoria'] if c['delta'] > 0),
+                                  key=lambda c: c['delta'])
+    if crecimientos:
+        texto += " Mayores crecimientos de memoria (RSS):\n"
+        for c in crecimientos:
+            texto += f"   PID {c['pid']:6d} {c['nombre'][:30]:30s} {mb(c['delta'])}\n"
+        texto += "\n"
+    if procesos['nuevos']:
+        texto += " Procesos nuevos:\n"
+        for p in heapq.nlargest(limite, procesos['nuevos'], key=lambda p: p['rss']):
+            texto += f"   PID {p['pid']:6d} {p['nombre'][:30]:30s} {p['rss'] / (1024**2):.1f} MB\n"
+        texto += "\n"
+    if procesos['terminados']:
+        texto += " Procesos terminados:\n"
+        for p in procesos['terminados'][:limite]:
+            texto += f"   PID {p['pid']:6d} {p['nombre'][:30]}\n"
+        texto += "\n"
+
+    particiones = diferencia['particiones']
+    texto += encabezado("PARTICIONES")
+    for p in particiones['nuevas']:
+        texto += f" + {p['punto_montaje']} ({p['dispositivo']}, {p['fstype']})\n"
+    for p in particiones['eliminadas']:
+        texto += f" - {p['punto_montaje']} ({p['dispositivo']}, {p['fstype']})\n"
+    for c in particiones['cambios']:
+        texto += (f"   {c['punto_montaje']}: {mb(c['delta'])} "
+                  f"({c['porcentaje_antes']}% → {c['porcentaje_despues']}%)\n")
+    if not any(particiones.values()):
+        texto += " Sin cambios\n"
+    texto += "\n"
+
+    interfaces = diferencia['interfaces']
+    texto += encabezado("RED")
+    for nombre in interfaces['nuevas']:
+        texto += f" + {nombre}\n"
+    for nombre in interfaces['eliminadas']:
+        texto += f" - {nombre}\n"
+    for c in interfaces['cambios']:
+        texto += f"   {c['nombre']}: +{c['direcciones_agregadas']} -{c['direcciones_eliminadas']}\n"
+    if not any(interfaces.values()):
+        texto += " Sin cambios\n"
+
+    return texto
@@ -0,0 +1,402 @@
+import os
+import queue
+import stat
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime
+
+# =============================================================================
+# LISTADO DE DIRECTORIOS CON METADATOS EN CACHÉ
+# =============================================================================
+# os.scandir() devuelve el tipo de cada entrada junto con su nombre (d_type en
+# Linux, datos de FindFirstFile en Windows), así que saber si una entrada es
+# carpeta no requiere un stat adicional como os.path.isdir(). El tamaño y la
+# fecha se leen una única vez con DirEntry.stat() (gratis en Windows, un lstat
+# en POSIX) y quedan guardados en el registro Entrada para que la vista no
+# vuelva a tocar el disco al dibujar.
+
+Entrada = namedtuple('Entrada', 'nombre es_dir tamano mtime')
+
+
+def crear_entrada(entry, con_metadatos=True):
+    """
+    Convierte un os.DirEntry en un registro Entrada.
+
+    Args:
+        entry (os.DirEntry): Entrada devuelta por os.scandir()
+        con_metadatos (bool): Si es False no se consulta tamaño ni fecha
+
+    Returns:
+        Entrada: Registro con nombre, tipo, tamaño y fecha de modificación
+    """
+    try:
+        es_dir = entry.is_dir()
+    except OSError:
+        es_dir = False
+
+    tamano = mtime = None
+    if con_metadatos:
+        try:
+            info = entry.stat(follow_symlinks=False)
+            tamano = None if es_dir else info.st_size
+            mtime = info.st_mtime
+        except OSError:
+            pass
+
+    return Entrada(entry.name, es_dir, tamano, mtime)
+
+
+def crear_entrada_desde_ruta(directorio, nombre):
+    """
+    Construye un registro Entrada consultando el disco (un lstat).
+
+    Se usa cuando no hay un os.DirEntry a mano, p. ej. al aplicar un evento
+    de creación recibido por el vigilante de cambios.
+
+    Args:
+        directorio (str): Directorio que contiene la entrada
+        nombre (str): Nombre de la entrada
+
+    Returns:
+        Entrada: Registro con nombre, tipo, tamaño y fecha de modificación
+
+    Raises:
+        OSError: Si la entrada ya no existe
+    """
+    ruta = os.path.join(directorio, nombre)
+    info = os.lstat(ruta)
+    es_dir = stat.S_ISDIR(info.st_mode) or (stat.S_ISLNK(info.st_mode) and os.path.isdir(ruta))
+    return Entrada(nombre, es_dir, None if es_dir else info.st_size, info.st_mtime)
+
+
+def clave_orden(entrada):
+    """
+    Clave de ordenación alfabética sin distinguir mayúsculas.
+
+    Args:
+        entrada (Entrada): Registro a ordenar
+
+    Returns:
+        str: Nombre en minúsculas
+    """
+    return entrada.nombre.lower()
+
+
+def buscar_posicion(entradas, clave):
+    """
+    Búsqueda binaria de la posición de una clave en una lista ordenada.
+
+    Equivale a bisect.bisect_left sobre clave_orden(entrada), que en
+    Python 3.8 no admite el parámetro key.
+
+    Args:
+        entradas (list): Entradas ordenadas con clave_orden
+        clave (str): Clave buscada (nombre en minúsculas)
+
+    Returns:
+        int: Primera posición cuya clave no es menor que `clave`
+    """
+    inicio, fin = 0, len(entradas)
+    while inicio < fin:
+        medio = (inicio + fin) // 2
+        if entradas[medio].nombre.lower() < clave:
+            inicio = medio + 1
+        else:
+            fin = medio
+    return inicio
+
+
+def listar_directorio(ruta, con_metadatos=True):
+    """
+    Lee un directorio en una sola pasada de os.scandir().
+
+    Args:
+        ruta (str): Directorio a listar
+        con_metadatos (bool): Si es True incluye tamaño y fecha de modificación
+
+    Returns:
+        list: Lista de Entrada ordenada alfabéticamente
+
+    Raises:
+        OSError: Si el directorio no se puede leer (p. ej. PermissionError)
+    """
+    with os.scandir(ruta) as it:
+        entradas = [crear_entrada(entry, con_metadatos) for entry in it]
+    entradas.sort(key=clave_orden)
+    return entradas
+
+
+def formatear_tamano(tamano):
+    """
+    Convierte un tamaño en bytes a texto legible.
+
+    Args:
+        tamano (int): Tamaño en bytes (o None si no se conoce)
+
+    Returns:
+        str: Tamaño formateado, p. ej. "1.5 MB"
+    """
+    if tamano is None:
+        return ""
+    valor = float(tamano)
+    for unidad in ("B", "KB", "MB", "GB", "TB"):
+        if valor < 1024 or unidad == "TB":
+            return f"{valor:.0f} {unidad}" if unidad == "B" else f"{valor:.1f} {unidad}"
+        valor /= 1024
+
+
+def formatear_fecha(mtime):
+    """
+    Convierte una marca de tiempo en texto legible.
+
+    Args:
+        mtime (float): Marca de tiempo (o None si no se conoce)
+
+    Returns:
+        str: Fecha en formato AAAA-MM-DD HH:MM
+    """
+    if mtime is None:
+        return ""
+    return datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M')
+
+
+def nombre_visible(entrada):
+    """
+    Devuelve el nombre con el que se muestra una entrada en la lista.
+
+    Args:
+        entrada (Entrada): Registro a mostrar
+
+    Returns:
+        str: Nombre con el prefijo [CARPETA] si es un directorio
+    """
+    if entrada.es_dir:
+        return f"[CARPETA] {entrada.nombre}"
+    return entrada.nombre
+
+
+# =============================================================================
+# CARGA EN SEGUNDO PLANO, POR LOTES Y CANCELABLE
+# =============================================================================
+
+class CargadorDirectorio:
+    """
+    Lee un directorio en un hilo y entrega las entradas por lotes.
+
+    El hilo publica lotes en una cola en cuanto acumula `tam_lote` entradas o
+    pasa `intervalo_lote` segundos, así las primeras filas están disponibles
+    enseguida aunque el directorio tenga cientos de miles de entradas. La
+    interfaz consume la cola con after() y puede cancelar la carga en
+    cualquier momento; el hilo lo comprueba entrada a entrada.
+    """
+
+    def __init__(self, ruta, con_metadatos=True, tam_lote=1000, intervalo_lote=0.03):
+        self.ruta = ruta
+        self.con_metadatos = con_metadatos
+        self.tam_lote = tam_lote
+        self.intervalo_lote = intervalo_lote
+        self.error = None
+        self.terminado = threading.Event()
+        self._lotes = queue.Queue()
+        self._cancelado = threading.Event()
+
+    @property
+    def cancelado(self):
+        return self._cancelado.is_set()
+
+    def iniciar(self):
+        """
+        Arranca el hilo de lectura.
+
+        Returns:
+            CargadorDirectorio: El propio cargador (para encadenar llamadas)
+        """
+        threading.Thread(target=self._leer, name="cargador-directorio", daemon=True).start()
+        return self
+
+    def cancelar(self):
+        """
+        Pide al hilo que deje de leer lo antes posible.
+
+        Returns:
+            None
+        """
+        self._cancelado.set()
+
+    def obtener_lotes(self):
+        """
+        Extrae sin bloquear todas las entradas disponibles en la cola.
+
+        Returns:
+            list: Entradas leídas desde la última llamada (sin ordenar)
+        """
+        entradas = []
+        try:
+            while True:
+                entradas.extend(self._lotes.get_nowait())
+        except queue.Empty:
+            pass
+        return entradas
+
+    def _leer(self):
+        try:
+            with os.scandir(self.ruta) as it:
+                lote = []
+                limite = time.monotonic() + self.intervalo_lote
+                for entry in it:
+                    if self._cancelado.is_set():
+                        return
+                    lote.append(crear_entrada(entry, self.con_metadatos))
+                    if len(lote) >= self.tam_lote or (len(lote) % 64 == 0 and time.monotonic() >= limite):
+                        self._lotes.put(lote)
+                        lote = []
+                        limite = time.monotonic() + self.intervalo_lote
+                if lote:
+                    self._lotes.put(lote)
+        except OSError as e:
+            self.error = e
+        finally:
+            self.terminado.set()
+
+
+# =============================================================================
+# CACHÉ LRU DE LISTADOS VALIDADA POR MTIME/INODO
+# =============================================================================
+# Crear, borrar o renombrar una entrada cambia el mtime del directorio, así
+# que (mtime, inodo, dispositivo) sirve como firma barata: un solo stat del
+# directorio dice si un listado guardado sigue siendo válido.
+
+MAX_ENTRADAS_CACHE = 500000
+
+ListadoEnCache = namedtuple('ListadoEnCache', 'firma entradas')
+
+
+def firma_directorio(ruta):
+    """
+    Calcula la firma de un directorio con un único stat.
+
+    Args:
+        ruta (str): Directorio
+
+    Returns:
+        tuple: (st_mtime_ns, st_ino, st_dev)
+
+    Raises:
+        OSError: Si el directorio no existe o no es accesible
+    """
+    info = os.stat(ruta)
+    return (info.st_mtime_ns, info.st_ino, info.st_dev)
+
+
+class CacheListados:
+    """
+    Caché LRU de listados de directorio acotada por número total de entradas.
+
+    Es segura entre hilos para que las cargas en segundo plano puedan
+    guardar listados mientras la interfaz los consulta.
+    """
+
+    def __init__(self, max_entradas=MAX_ENTRADAS_CACHE):
+        self.max_entradas = max_entradas
+        self.total_entradas = 0
+        self._listados = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _clave(ruta):
+        return os.path.normcase(os.path.abspath(ruta))
+
+    def obtener(self, ruta):
+        """
+        Devuelve el listado guardado de un directorio y lo marca como reciente.
+
+        Args:
+            ruta (str): Directorio
+
+        Returns:
+            ListadoEnCache: Firma y entradas guardadas, o None si no está
+        """
+        clave = self._clave(ruta)
+        with self._lock:
+            listado = self._listados.get(clave)
+            if listado is not None:
+                self._listados.move_to_end(clave)
+            return listado
+
+    def obtener_valido(self, ruta):
+        """
+        Devuelve las entradas guardadas solo si la firma actual coincide.
+
+        Args:
+            ruta (str): Directorio
+
+        Returns:
+            list: Entradas guardadas, o None si no están o han caducado
+        """
+        listado = self.obtener(ruta)
+        if listado is None:
+            return None
+        try:
+            if firma_directorio(ruta) != listado.firma:
+                return None
+        except OSError:
+            return None
+        return listado.entradas
+
+    def guardar(self, ruta, firma, entradas):
+        """
+        Guarda el listado de un directorio y expulsa los menos recientes.
+
+        Args:
+            ruta (str): Directorio
+            firma (tuple): Firma tomada ANTES de leer el directorio
+            entradas (list): Entradas del directorio
+
+        Returns:
+            None
+        """
+        clave = self._clave(ruta)
+        with self._lock:
+            anterior = self._listados.pop(clave, None)
+            if anterior is not None:
+                self.total_entradas -= len(anterior.entradas)
+            if len(entradas) > self.max_entradas:
+                return
+            self._listados[clave] = ListadoEnCache(firma, entradas)
+            self.total_entradas += len(entradas)
+            while self.total_entradas > self.max_entradas:
+                _, expulsado = self._listados.popitem(last=False)
+                self.total_entradas -= len(expulsado.entradas)
+
+    def invalidar(self, ruta):
+        """
+        Elimina el listado guardado de un directorio.
+
+        Args:
+            ruta (str): Directorio
+
+        Returns:
+            None
+        """
+        with self._lock:
+            anterior = self._listados.pop(self._clave(ruta), None)
+            if anterior is not None:
+                self.total_entradas -= len(anterior.entradas)
+
+
+# Instancia compartida por todas las ventanas
+_cache_listados = None
+
+
+def obtener_cache_listados():
+    """
+    Devuelve la caché de listados compartida de la aplicación.
+
+    Returns:
+        CacheListados: La instancia compartida
+    """
+    global _cache_listados
+    if _cache_listados is None:
+        _cache_listados = CacheListados()
+    return _cache_listados
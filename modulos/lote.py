@@ -0,0 +1,231 @@
+import argparse
+import os
+import sys
+from .comandos import SesionShell, separar_segundo_plano
+from .ejecucion import ErrorComando, ERROR, CODIGO_NO_ENCONTRADO
+from .listado import formatear_tamano
+
+# =============================================================================
+# MODO POR LOTES DE LA SHELL EDUCATIVA (SIN VENTANA)
+# =============================================================================
+# Ejecuta un archivo de comandos, uno por línea, con una SesionShell como la
+# de la ventana: la misma validación, las mismas órdenes internas, trabajos
+# y límites. La salida de cada comando se escribe en stdout y stderr a
+# medida que se produce y el proceso termina con el código del último
+# comando, como un script de sh. No crea ninguna ventana, así que funciona
+# en máquinas sin pantalla, y cada script es un proceso independiente que
+# se puede lanzar en paralelo con otros.
+#
+#   python -m modulos.mod_shell --script comandos.txt
+#   python -m modulos.lote --script comandos.txt
+#
+# A diferencia de la ventana, no se descarta salida: si stdout va más
+# despacio que el comando, el comando espera (BufferSalida con `esperar`).
+#
+# Las líneas vacías y las que empiezan por '#' se ignoran; `clear` no hace
+# nada. Los trabajos en segundo plano que sigan en marcha al terminar el
+# script se interrumpen (para esperarlos, `wait`).
+
+# Segundos entre recogidas de la salida del comando en ejecución
+INTERVALO_SALIDA = 0.02
+
+# Códigos de salida como los de sh (CODIGO_NO_ENCONTRADO, 127, viene de
+# ejecucion.py: también lo usan los comandos no permitidos)
+CODIGO_NO_EJECUTABLE = 126
+CODIGO_INTERRUMPIDO = 130
+CODIGO_TUBERIA_CERRADA = 141    # 128 + SIGPIPE
+
+
+def codigo_estado(ejecucion):
+    """
+    Convierte el resultado de una ejecución en un código de salida (0-255).
+
+    Args:
+        ejecucion (Ejecucion): Ejecución terminada
+
+    Returns:
+        int: Código como el de sh (128 + señal si un proceso murió por una)
+    """
+    if ejecucion.error is not None:
+        return CODIGO_NO_ENCONTRADO if isinstance(ejecucion.error, FileNotFoundError) else CODIGO_NO_EJECUTABLE
+    codigo = ejecucion.codigo
+    if codigo is None:
+        return 1
+    if codigo < 0:
+        return 128 - codigo
+    return min(codigo, 255)
+
+
+def seguir_ejecucion(ejecucion, salida, errores):
+    """
+    Escribe la salida de una ejecución iniciada hasta que termina.
+
+    Mientras haya salida pendiente se recoge sin esperar, para que el
+    comando no tenga que detenerse a esperar al buffer.
+
+    Args:
+        ejecucion (Ejecucion): Ejecución en marcha
+        salida: Archivo de texto para la salida normal
+        errores: Archivo de texto para la salida de error
+
+    Returns:
+        None
+    """
+    hubo_salida = False
+    while True:
+        # Comprobar el fin ANTES de vaciar el buffer: así no se pierde el último trozo
+        terminado = ejecucion.terminado.is_set() if hubo_salida else ejecucion.terminado.wait(INTERVALO_SALIDA)
+        trozos, omitidos = ejecucion.obtener_salida()
+        if omitidos:
+            errores.write(f"[... {formatear_tamano(omitidos)} de salida omitidos ...]\n")
+        for flujo, texto in trozos:
+            (errores if flujo == ERROR else salida).write(texto)
+        hubo_salida = bool(trozos)
+        if hubo_salida:
+            salida.flush()
+            errores.flush()
+        if terminado:
+            return
+
+
+def ejecutar_linea(sesion, linea, salida, errores, mostrar_tiempos=False, origen=None):
+    """
+    Ejecuta una línea de comandos en la sesión y espera a que termine.
+
+    Args:
+        sesion (SesionShell): Sesión del script
+        linea (str): Línea del script
+        salida: Archivo de texto para la salida normal
+        errores: Archivo de texto para la salida de error
+        mostrar_tiempos (bool): Escribir en stderr el resumen de recursos
+        origen (str): Prefijo de los errores de validación (archivo:línea)
+
+    Returns:
+        int: Código de salida del comando
+    """
+    linea, segundo_plano = separar_segundo_plano(linea)
+    palabras = linea.split()
+    if palabras and palabras[0].lower() == 'clear':
+        return 0
+    try:
+        if segundo_plano:
+            trabajo = sesion.lanzar_en_segundo_plano(linea)
+            errores.write(f"[{trabajo.numero}] {trabajo.comando}\n")
+            return 0
+        ejecucion = sesion.preparar(linea)
+    except ErrorComando as e:
+        errores.write(f"{origen}: {e}\n" if origen else f"{e}\n")
+        return e.codigo
+    ejecucion.salida.esperar = True
+    ejecucion.iniciar()
+    try:
+        seguir_ejecucion(ejecucion, salida, errores)
+    except BaseException:
+        # Ctrl-C o stdout cerrado: el comando no debe seguir sin nadie que lo lea
+        ejecucion.salida.dejar_de_esperar()
+        ejecucion.cancelar()
+        ejecucion.terminado.wait()
+        raise
+    if ejecucion.error is not None:
+        errores.write(f"{palabras[0]}: {ejecucion.error}\n")
+    if mostrar_tiempos and not ejecucion.mostrar_consumo:
+        errores.write(f"[tiempo] {ejecucion.consumo.resumen()}\n")
+    return codigo_estado(ejecucion)
+
+
+def ejecutar_script(lineas, nombre='script', sesion=None, salida=None, errores=None,
+                    detener_en_error=False, eco=False, mostrar_tiempos=False):
+    """
+    Ejecuta una secuencia de líneas de comandos en una sesión.
+
+    Args:
+        lineas (iterable): Líneas del script (se leen a medida que se ejecutan)
+        nombre (str): Nombre del script para los mensajes de error
+        sesion (SesionShell): Sesión (por defecto una nueva en el directorio actual)
+        salida: Archivo de texto para la salida normal (sys.stdout)
+        errores: Archivo de texto para la salida de error (sys.stderr)
+        detener_en_error (bool): Parar en el primer comando que falle (set -e)
+        eco (bool): Escribir cada línea en stderr antes de ejecutarla (set -x)
+        mostrar_tiempos (bool): Resumen de recursos tras cada comando
+
+    Returns:
+        int: Código del último comando ejecutado (0 si no había ninguno)
+    """
+    sesion = sesion or SesionShell()
+    salida = salida or sys.stdout
+    errores = errores or sys.stderr
+    codigo = 0
+    try:
+        for numero, linea in enumerate(lineas, 1):
+            linea = linea.strip()
+            if not linea or linea.startswith('#'):
+                continue
+            if eco:
+                errores.write(f"+ {linea}\n")
+                errores.flush()
+            codigo = ejecutar_linea(sesion, linea, salida, errores, mostrar_tiempos, f"{nombre}:{numero}")
+            if codigo != 0 and detener_en_error:
+                errores.write(f"{nombre}:{numero}: el comando terminó con código {codigo}; se detiene el script\n")
+                break
+    finally:
+        pendientes = [t for t in sesion.trabajos.trabajos if not t.terminado.is_set()]
+        if pendientes:
+            errores.write(f"{nombre}: se interrumpen {len(pendientes)} trabajos en segundo plano sin terminar\n")
+        sesion.trabajos.cancelar_todos()
+        salida.flush()
+        errores.flush()
+    return codigo
+
+
+def main(argv=None):
+    """
+    Punto de entrada de `python -m modulos.mod_shell --script archivo`.
+
+    Args:
+        argv (list): Argumentos (por defecto los de la línea de órdenes)
+
+    Returns:
+        int: Código de salida del proceso
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m modulos.mod_shell",
+        description="Ejecuta un archivo de comandos de la shell educativa sin abrir ninguna ventana."
+    )
+    parser.add_argument('--script', required=True, metavar='ARCHIVO',
+                        help="archivo con un comando por línea ('-': entrada estándar)")
+    parser.add_argument('-C', '--directorio', metavar='CARPETA', help="directorio de trabajo inicial")
+    parser.add_argument('-e', '--detener', action='store_true',
+                        help="parar en el primer comando que falle (como set -e)")
+    parser.add_argument('-x', '--eco', action='store_true',
+                        help="escribir cada comando en stderr antes de ejecutarlo (como set -x)")
+    parser.add_argument('--tiempos', action='store_true',
+                        help="escribir en stderr el tiempo y los recursos de cada comando")
+    args = parser.parse_args(argv)
+
+    if args.directorio is not None and not os.path.isdir(args.directorio):
+        parser.error(f"no existe el directorio '{args.directorio}'")
+    # Una salida que no admite algún carácter no debe interrumpir el script
+    for flujo in (sys.stdout, sys.stderr):
+        if hasattr(flujo, 'reconfigure'):
+            flujo.reconfigure(errors='replace')
+
+    try:
+        archivo = sys.stdin if args.script == '-' else open(args.script, encoding='utf-8', errors='replace')
+    except OSError as e:
+        parser.error(f"no se puede leer '{args.script}': {e.strerror}")
+
+    try:
+        with archivo:
+            return ejecutar_script(archivo, args.script, SesionShell(args.directorio),
+                                   detener_en_error=args.detener, eco=args.eco, mostrar_tiempos=args.tiempos)
+    except BrokenPipeError:
+        # Quien leía la salida (p. ej. `| head`) ya terminó: se descarta el
+        # resto para que el cierre del intérprete no vuelva a fallar
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return CODIGO_TUBERIA_CERRADA
+    except KeyboardInterrupt:
+        return CODIGO_INTERRUMPIDO
+
+
+if __name__ == "__main__":
+    sys.exit(main())
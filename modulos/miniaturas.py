@@ -0,0 +1,217 @@
+import hashlib
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from .datos_app import obtener_directorio_datos
+
+# =============================================================================
+# GENERACIÓN DE MINIATURAS EN UN POOL DE PROCESOS CON CACHÉ EN DISCO
+# =============================================================================
+# Decodificar imágenes es trabajo de CPU que retiene el GIL, así que se hace
+# en procesos aparte y la interfaz solo carga el PNG pequeño resultante. Cada
+# miniatura se guarda en ~/.os_mini/miniaturas con un nombre derivado de
+# (ruta, mtime, tamaño): si el archivo no cambió, la siguiente visita la lee
+# directamente del disco; si cambió, la clave es otra y se regenera.
+#
+# Para abaratar la decodificación, Image.draft() pide al decodificador JPEG
+# que reduzca la imagen en la propia transformada DCT (1/2, 1/4 o 1/8) y
+# Image.reduce() divide por un factor entero antes del redimensionado final.
+
+LADO_MINIATURA = 128
+
+EXTENSIONES_IMAGEN = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tif', '.tiff', '.ico', '.ppm'}
+
+# Procesos del pool de generación
+PROCESOS_MINIATURAS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+def es_imagen(nombre):
+    """
+    Indica por la extensión si un archivo es una imagen con miniatura.
+
+    Args:
+        nombre (str): Nombre del archivo
+
+    Returns:
+        bool: True si la extensión es de imagen
+    """
+    return os.path.splitext(nombre)[1].lower() in EXTENSIONES_IMAGEN
+
+
+def ruta_en_cache(ruta, mtime, tamano, lado=LADO_MINIATURA, directorio=None):
+    """
+    Devuelve dónde se guarda (o guardaría) la miniatura de un archivo.
+
+    Args:
+        ruta (str): Archivo de imagen
+        mtime (float): Fecha de modificación del archivo
+        tamano (int): Tamaño del archivo en bytes
+        lado (int): Lado máximo de la miniatura
+        directorio (str): Carpeta de la caché (por defecto ~/.os_mini/miniaturas)
+
+    Returns:
+        str: Ruta del PNG de la miniatura
+    """
+    clave = hashlib.sha1(f"{os.path.abspath(ruta)}\0{mtime!r}\0{tamano}\0{lado}".encode('utf-8', 'surrogateescape'))
+    nombre = clave.hexdigest()
+    directorio = directorio or obtener_directorio_datos('miniaturas')
+    return os.path.join(directorio, nombre[:2], nombre + '.png')
+
+
+def generar_miniatura(ruta, destino, lado=LADO_MINIATURA):
+    """
+    Genera la miniatura de una imagen y la guarda como PNG.
+
+    Se ejecuta en los procesos del pool, por eso importa Pillow dentro y
+    devuelve el error en lugar de lanzarlo.
+
+    Args:
+        ruta (str): Imagen original
+        destino (str): PNG a crear
+        lado (int): Lado máximo de la miniatura
+
+    Returns:
+        bool: True si la miniatura quedó guardada en `destino`
+    """
+    if os.path.exists(destino):
+        return True
+    try:
+        from PIL import Image
+
+        with Image.open(ruta) as imagen:
+            # JPEG: decodificar ya reducido (no hace nada en otros formatos)
+            imagen.draft('RGB', (lado, lado))
+            factor = min(imagen.width // lado, imagen.height // lado)
+            if factor >= 2:
+                imagen = imagen.reduce(factor)
+            imagen.thumbnail((lado, lado))
+            if imagen.mode not in ('RGB', 'RGBA'):
+                imagen = imagen.convert('RGBA' if 'A' in imagen.getbands() or 'transparency' in imagen.info
+                                        else 'RGB')
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            temporal = f"{destino}.{os.getpid()}.tmp"
+            imagen.save(temporal, 'PNG', compress_level=1)
+        os.replace(temporal, destino)
+        return True
+    except Exception:
+        return False
+
+
+class ServicioMiniaturas:
+    """
+    Reparte la generación de miniaturas entre procesos.
+
+    La interfaz pide en cada redibujado las miniaturas de las celdas
+    visibles; las peticiones que aún no empezaron y ya no son visibles se
+    cancelan, así que desplazarse rápido por una carpeta enorme no deja
+    miles de imágenes en cola.
+    """
+
+    def __init__(self, lado=LADO_MINIATURA, procesos=PROCESOS_MINIATURAS):
+        self.lado = lado
+        self.procesos = procesos
+        self._pool = None
+        self._pendientes = {}
+        self._listas = queue.Queue()
+        self._lock = threading.Lock()
+
+    def _obtener_pool(self):
+        if self._pool is None:
+            # 'spawn' evita heredar por fork el estado de Tk y de los hilos
+            self._pool = ProcessPoolExecutor(max_workers=self.procesos,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+
+    def _enviar(self, ruta, destino):
+        # Llamar con el lock tomado
+        try:
+            return self._obtener_pool().submit(generar_miniatura, ruta, destino, self.lado)
+        except BrokenProcessPool:
+            # Un proceso murió (p. ej. una imagen que agota la memoria) y el
+            # pool ya no admite trabajo: se descarta y se crea otro
+            self._pool.shutdown(wait=False)
+            self._pool = None
+            return self._obtener_pool().submit(generar_miniatura, ruta, destino, self.lado)
+
+    def solicitar(self, pedidos):
+        """
+        Pide las miniaturas de las celdas visibles.
+
+        Args:
+            pedidos (list): Tuplas (ruta, destino) con el PNG a generar
+
+        Returns:
+            None
+        """
+        visibles = {ruta for ruta, _ in pedidos}
+        nuevos = []
+        with self._lock:
+            for ruta, futuro in list(self._pendientes.items()):
+                if ruta not in visibles and futuro.cancel():
+                    del self._pendientes[ruta]
+            for ruta, destino in pedidos:
+                if ruta in self._pendientes:
+                    continue
+                futuro = self._enviar(ruta, destino)
+                self._pendientes[ruta] = futuro
+                nuevos.append((futuro, ruta, destino))
+        # Fuera del lock: si el futuro ya terminó, add_done_callback llama a
+        # _terminar en este mismo hilo y _terminar necesita tomar el lock
+        for futuro, ruta, destino in nuevos:
+            futuro.add_done_callback(lambda f, r=ruta, d=destino: self._terminar(f, r, d))
+
+    def _terminar(self, futuro, ruta, destino):
+        if futuro.cancelled():
+            return
+        try:
+            exito = futuro.result()
+        except Exception:
+            # El proceso murió (p. ej. por una imagen que agota la memoria)
+            exito = False
+        with self._lock:
+            if self._pendientes.get(ruta) is futuro:
+                del self._pendientes[ruta]
+        self._listas.put((ruta, destino, exito))
+
+    def hay_pendientes(self):
+        """
+        Indica si queda alguna miniatura pedida sin terminar.
+
+        Returns:
+            bool: True si hay peticiones en curso o en cola
+        """
+        with self._lock:
+            return bool(self._pendientes)
+
+    def obtener_listas(self):
+        """
+        Extrae sin bloquear las miniaturas generadas desde la última llamada.
+
+        Returns:
+            list: Tuplas (ruta, destino, exito)
+        """
+        listas = []
+        try:
+            while True:
+                listas.append(self._listas.get_nowait())
+        except queue.Empty:
+            pass
+        return listas
+
+    def cerrar(self):
+        """
+        Cancela lo pendiente y detiene los procesos.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            for futuro in self._pendientes.values():
+                futuro.cancel()
+            self._pendientes.clear()
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
@@ -0,0 +1,170 @@
+import tkinter as tk
+from tkinter import ttk, scrolledtext
+import queue
+from .estilo import aplicar_gradiente_y_contenido
+from .alertas import MotorAlertas, cargar_reglas
+from .muestreo import obtener_muestreador
+
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+INTERVALO_REVISION_MS = 500     # cada cuánto se revisan las alertas pendientes
+DURACION_NOTIFICACION_MS = 6000 # tiempo que permanece visible una notificación
+
+# =============================================================================
+# NOTIFICACIONES NO MODALES
+# =============================================================================
+
+def mostrar_notificacion(root, mensaje):
+    """
+    Muestra una notificación pequeña en la esquina inferior derecha.
+
+    La notificación no toma el foco ni bloquea otras ventanas y se cierra
+    sola pasados unos segundos (o al hacer clic sobre ella).
+
+    Args:
+        root (tk.Tk): Ventana principal de la aplicación
+        mensaje (str): Texto de la alerta
+
+    Returns:
+        None
+    """
+    activas = root.__dict__.setdefault('_notificaciones', [])
+
+    aviso = tk.Toplevel(root)
+    aviso.overrideredirect(True)
+    aviso.attributes('-topmost', True)
+    aviso.configure(bg='#c0392b')
+
+    etiqueta = tk.Label(
+        aviso,
+        text=f" {mensaje} ",
+        font=('Arial', 9, 'bold'),
+        bg='#c0392b',
+        fg='white',
+        padx=10,
+        pady=8
+    )
+    etiqueta.pack()
+
+    # Apilar las notificaciones visibles una encima de otra
+    aviso.update_idletasks()
+    ancho = aviso.winfo_reqwidth()
+    alto = aviso.winfo_reqheight()
+    x = root.winfo_screenwidth() - ancho - 20
+    y = root.winfo_screenheight() - (alto + 10) * (len(activas) + 1) - 40
+    aviso.geometry(f"+{x}+{y}")
+
+    def cerrar(event=None):
+        if aviso in activas:
+            activas.remove(aviso)
+        aviso.destroy()
+
+    activas.append(aviso)
+    etiqueta.bind('<Button-1>', cerrar)
+    aviso.after(DURACION_NOTIFICACION_MS, cerrar)
+
+
+def iniciar_alertas(root):
+    """
+    Arranca el muestreador compartido con el motor de alertas suscrito.
+
+    Las reglas se evalúan en el hilo del muestreador; aquí solo se revisa
+    periódicamente la cola de alertas pendientes para notificarlas en Tk.
+
+    Args:
+        root (tk.Tk): Ventana principal de la aplicación
+
+    Returns:
+        MotorAlertas: El motor creado (también queda en root._motor_alertas)
+    """
+    motor = getattr(root, '_motor_alertas', None)
+    if motor is not None:
+        return motor
+
+    motor = MotorAlertas(cargar_reglas())
+    muestreador = obtener_muestreador()
+    muestreador.umbral_rss = motor.umbral_minimo('rss')
+    muestreador.suscribir(motor.procesar_lote)
+    muestreador.iniciar()
+    root._motor_alertas = motor
+
+    def revisar_pendientes():
+        try:
+            while True:
+                mostrar_notificacion(root, motor.pendientes.get_nowait().mensaje)
+        except queue.Empty:
+            pass
+        root.after(INTERVALO_REVISION_MS, revisar_pendientes)
+
+    revisar_pendientes()
+    return motor
+
+# =============================================================================
+# VENTANA DEL REGISTRO DE ALERTAS
+# =============================================================================
+
+def abrir_registro_alertas(ventana_padre, motor):
+    """
+    Crea y muestra una ventana con las reglas activas y el registro de alertas.
+
+    Args:
+        ventana_padre (tk.Toplevel): Ventana desde la que se abre
+        motor (MotorAlertas): Motor cuyas reglas y registro se muestran
+
+    Returns:
+        None
+    """
+    alertas_win = tk.Toplevel(ventana_padre)
+    alertas_win.title("Alertas del Sistema")
+    alertas_win.geometry("600x450")
+    alertas_win.resizable(True, True)
+
+    canvas_fondo, frame_grad, mid_color = aplicar_gradiente_y_contenido(alertas_win, "#44B3EB", "#000000")
+
+    frame = tk.Frame(frame_grad, bg=mid_color)
+    frame.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
+
+    reglas_frame = ttk.LabelFrame(frame, text="Reglas activas", padding="10")
+    reglas_frame.pack(fill=tk.X, pady=(0, 10))
+    for regla in motor.reglas:
+        ttk.Label(reglas_frame, text=f"• {regla.describir()}", font=('Arial', 9)).pack(anchor='w')
+
+    txt_registro = scrolledtext.ScrolledText(
+        frame,
+        wrap=tk.NONE,
+        state=tk.DISABLED,
+        font=('Courier', 9),
+        bg='#f8f9fa',
+        fg='#212529'
+    )
+    txt_registro.pack(expand=True, fill=tk.BOTH, pady=5)
+
+    def cargar_registro():
+        """
+        Muestra las últimas líneas del registro de alertas.
+
+        Returns:
+            None
+        """
+        try:
+            with open(motor.ruta_registro, 'r', encoding='utf-8') as f:
+                lineas = f.readlines()[-500:]
+            contenido = "".join(lineas) or " No se han registrado alertas.\n"
+        except FileNotFoundError:
+            contenido = " No se han registrado alertas.\n"
+
+        txt_registro.config(state=tk.NORMAL)
+        txt_registro.delete(1.0, tk.END)
+        txt_registro.insert(tk.END, contenido)
+        txt_registro.config(state=tk.DISABLED)
+        txt_registro.see(tk.END)
+
+    botones_frame = ttk.Frame(frame)
+    botones_frame.pack(fill=tk.X, pady=5)
+
+    ttk.Button(botones_frame, text=" Refrescar", command=cargar_registro).pack(side=tk.LEFT, padx=5)
+    ttk.Button(botones_frame, text=" Retroceder", command=alertas_win.destroy).pack(side=tk.RIGHT, padx=5)
+
+    cargar_registro()
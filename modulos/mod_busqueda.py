@@ -0,0 +1,331 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+import os
+import threading
+from .estilo import aplicar_gradiente_y_contenido
+from .tabla_virtual import TablaVirtual
+from .busqueda import BusquedaRecursiva, indice_nombres_cargado, obtener_indice_nombres, ruta_indice
+
+# =============================================================================
+# FUNCIÓN PRINCIPAL DEL MÓDULO
+# =============================================================================
+
+# Intervalo de recogida de resultados mientras se recorre el árbol
+INTERVALO_RESULTADOS_MS = 50
+
+# Resultados máximos pedidos al índice en una consulta
+LIMITE_RESULTADOS_INDICE = 100000
+
+
+def abrir_busqueda(ventana_padre, raiz, texto="", al_elegir=None):
+    """
+    Crea y muestra la ventana de búsqueda de archivos por nombre.
+
+    Si la carpeta está dentro de un árbol indexado, la consulta se responde
+    al instante con el índice de trigramas (que se pone al día en segundo
+    plano); si no, se recorre el subárbol en paralelo y los resultados
+    aparecen a medida que se encuentran.
+
+    Args:
+        ventana_padre (tk.Tk o tk.Toplevel): Ventana desde la que se abre
+        raiz (str): Carpeta donde buscar
+        texto (str): Texto inicial de la búsqueda
+        al_elegir (callable): Función (directorio, nombre) llamada al hacer
+                              doble clic en un resultado
+
+    Returns:
+        None
+    """
+
+    # =============================================================================
+    # CONFIGURACIÓN DE LA VENTANA
+    # =============================================================================
+
+    busqueda_win = tk.Toplevel(ventana_padre)
+    busqueda_win.title("Buscar Archivos")
+    busqueda_win.geometry("750x500")
+    busqueda_win.resizable(True, True)
+
+    canvas_fondo, frame_grad, mid_color = aplicar_gradiente_y_contenido(busqueda_win, "#44B3EB", "#000000")
+
+    frame = tk.Frame(frame_grad, bg=mid_color)
+    frame.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
+
+    raiz = os.path.abspath(raiz)
+    texto_var = tk.StringVar(value=texto)
+    usar_indice_var = tk.BooleanVar(value=True)
+
+    # =============================================================================
+    # SECCIÓN: CONSULTA
+    # =============================================================================
+
+    consulta_frame = ttk.Frame(frame)
+    consulta_frame.pack(fill=tk.X, pady=(0, 5))
+
+    ttk.Label(consulta_frame, text=f"En: {raiz}", font=('Courier', 9)).pack(fill=tk.X)
+
+    entrada_texto = ttk.Entry(consulta_frame, textvariable=texto_var, font=('Courier', 10))
+    entrada_texto.pack(side=tk.LEFT, expand=True, fill=tk.X, pady=5)
+
+    # =============================================================================
+    # SECCIÓN: RESULTADOS
+    # =============================================================================
+
+    # Coincidencias mostradas (la tabla lee esta lista por referencia)
+    resultados = []
+
+    def carpeta_visible(coincidencia):
+        relativa = os.path.relpath(coincidencia.directorio, raiz)
+        return "" if relativa == os.curdir else relativa
+
+    tabla = TablaVirtual(
+        frame,
+        columnas=[
+            {'titulo': "Nombre", 'ancho': 260,
+             'valor': lambda c: f"[CARPETA] {c.nombre}" if c.es_dir else c.nombre},
+            {'titulo': "Carpeta", 'ancho': None, 'valor': carpeta_visible},
+        ],
+        fuente=('Courier', 10)
+    )
+    tabla.pack(expand=True, fill=tk.BOTH, pady=5)
+
+    # =============================================================================
+    # FUNCIONES INTERNAS DEL MÓDULO
+    # =============================================================================
+
+    # Recorrido en curso, actualización del índice en curso y carga del
+    # índice de disco (en un hilo, para no congelar la ventana)
+    busqueda_actual = None
+    indexando = None
+    cargando_indice = None
+
+    def buscar(actualizar_indice=True):
+        """
+        Lanza la búsqueda del texto escrito.
+
+        Args:
+            actualizar_indice (bool): Si es False no se pone al día el índice
+                                      tras responder con él
+
+        Returns:
+            None
+        """
+        nonlocal busqueda_actual, resultados
+
+        if busqueda_actual is not None:
+            busqueda_actual.cancelar()
+            busqueda_actual = None
+
+        consulta = texto_var.get().strip()
+        if not consulta:
+            tabla.mostrar_mensaje("Escribe parte del nombre a buscar")
+            return
+
+        indice = indice_nombres_cargado() if usar_indice_var.get() else None
+        if usar_indice_var.get() and indice is None:
+            esperar_indice(actualizar_indice)
+            return
+        if indice is not None and indice.cubre(raiz):
+            resultados = indice.buscar(consulta, dentro_de=raiz, limite=LIMITE_RESULTADOS_INDICE)
+            mostrar_resultados()
+            lbl_estado.config(text=f"{len(resultados)} resultados (índice de {indice.total} nombres)")
+            # Poner el índice al día y repetir la consulta si algo cambió
+            if actualizar_indice:
+                indexar(raiz, repetir=True)
+            return
+
+        resultados = []
+        tabla.establecer_registros(resultados)
+        busqueda = busqueda_actual = BusquedaRecursiva(raiz, consulta).iniciar()
+        busqueda_win.after(1, lambda: recoger_resultados(busqueda))
+
+    def esperar_indice(actualizar_indice):
+        """
+        Carga el índice de disco en un hilo y repite la búsqueda al terminar.
+
+        Args:
+            actualizar_indice (bool): Se pasa a buscar() al repetirla
+
+        Returns:
+            None
+        """
+        nonlocal cargando_indice
+
+        tabla.mostrar_mensaje("Cargando el índice de nombres...")
+        if cargando_indice is not None:
+            # Ya se está cargando: la búsqueda se repetirá con el texto actual
+            return
+        cargando_indice = threading.Thread(target=obtener_indice_nombres, name="carga-indice", daemon=True)
+        cargando_indice.start()
+
+        def comprobar():
+            nonlocal cargando_indice
+            if not busqueda_win.winfo_exists():
+                return
+            if cargando_indice.is_alive():
+                busqueda_win.after(INTERVALO_RESULTADOS_MS, comprobar)
+                return
+            cargando_indice = None
+            buscar(actualizar_indice)
+
+        busqueda_win.after(INTERVALO_RESULTADOS_MS, comprobar)
+
+    def mostrar_resultados():
+        if resultados:
+            tabla.establecer_registros(resultados)
+        else:
+            tabla.mostrar_mensaje("[Sin resultados]")
+
+    def recoger_resultados(busqueda):
+        """
+        Añade a la tabla las coincidencias que ha publicado el recorrido.
+
+        Se vuelve a programar con after() hasta que el recorrido termina.
+
+        Args:
+            busqueda (BusquedaRecursiva): Recorrido en curso
+
+        Returns:
+            None
+        """
+        nonlocal busqueda_actual
+
+        if busqueda is not busqueda_actual or not busqueda_win.winfo_exists():
+            busqueda.cancelar()
+            return
+
+        terminado = busqueda.terminado.is_set()
+        nuevas = busqueda.obtener_resultados()
+        if nuevas:
+            resultados.extend(nuevas)
+            tabla.actualizar()
+
+        if not terminado:
+            lbl_estado.config(text=f"Buscando... {len(resultados)} resultados en {busqueda.directorios} carpetas")
+            busqueda_win.after(INTERVALO_RESULTADOS_MS, lambda: recoger_resultados(busqueda))
+            return
+
+        busqueda_actual = None
+        mostrar_resultados()
+        texto_estado = f"{len(resultados)} resultados en {busqueda.directorios} carpetas"
+        if busqueda.errores:
+            texto_estado += f", {busqueda.errores} sin acceso"
+        lbl_estado.config(text=texto_estado)
+
+    def indexar(carpeta, repetir=False):
+        """
+        Indexa (o pone al día) una carpeta en segundo plano y guarda el índice.
+
+        Args:
+            carpeta (str): Raíz a indexar
+            repetir (bool): Si es True, al terminar repite la búsqueda
+                            cuando se releyó alguna carpeta
+
+        Returns:
+            None
+        """
+        nonlocal indexando
+
+        if indexando is not None:
+            return
+        cancelado = indexando = threading.Event()
+        estado = {}
+
+        def trabajar():
+            try:
+                indice = obtener_indice_nombres()
+                estado['releidas'] = indice.actualizar(carpeta, cancelado=cancelado)
+                if not cancelado.is_set():
+                    indice.guardar(ruta_indice())
+            except Exception as e:
+                estado['error'] = e
+            finally:
+                estado['fin'] = True
+
+        def esperar():
+            nonlocal indexando
+            if not busqueda_win.winfo_exists():
+                return
+            if 'fin' not in estado:
+                busqueda_win.after(200, esperar)
+                return
+            indexando = None
+            btn_indexar.state(['!disabled'])
+            if 'error' in estado:
+                messagebox.showerror("Error", f"No se pudo indexar:\n{estado['error']}", parent=busqueda_win)
+                return
+            if repetir:
+                if estado['releidas']:
+                    buscar(actualizar_indice=False)
+            else:
+                lbl_estado.config(text=f"Índice actualizado: {obtener_indice_nombres().total} nombres")
+
+        btn_indexar.state(['disabled'])
+        if not repetir:
+            lbl_estado.config(text="Indexando...")
+        threading.Thread(target=trabajar, name="indexador-nombres", daemon=True).start()
+        esperar()
+
+    def elegir(indice):
+        """
+        Abre en el explorador la carpeta del resultado activado.
+
+        Args:
+            indice (int): Índice del resultado
+
+        Returns:
+            None
+        """
+        if al_elegir is not None and indice < len(resultados):
+            coincidencia = resultados[indice]
+            al_elegir(coincidencia.directorio, coincidencia.nombre)
+
+    def cerrar_ventana():
+        """
+        Cierra la ventana cancelando el recorrido y la indexación en curso.
+
+        Returns:
+            None
+        """
+        if busqueda_actual is not None:
+            busqueda_actual.cancelar()
+        if indexando is not None:
+            indexando.set()
+        busqueda_win.destroy()
+
+    # =============================================================================
+    # CONFIGURACIÓN DE EVENTOS
+    # =============================================================================
+
+    tabla.al_activar(elegir)
+    entrada_texto.bind('<Return>', lambda e: buscar())
+    busqueda_win.protocol("WM_DELETE_WINDOW", cerrar_ventana)
+
+    # =============================================================================
+    # SECCIÓN: BOTONES Y ESTADO
+    # =============================================================================
+
+    btn_buscar = ttk.Button(consulta_frame, text=" Buscar", command=buscar)
+    btn_buscar.pack(side=tk.LEFT, padx=5)
+
+    chk_indice = ttk.Checkbutton(consulta_frame, text="Usar índice", variable=usar_indice_var)
+    chk_indice.pack(side=tk.LEFT, padx=5)
+
+    botones_frame = ttk.Frame(frame)
+    botones_frame.pack(fill=tk.X, pady=5)
+
+    btn_indexar = ttk.Button(botones_frame, text=" Indexar esta carpeta", command=lambda: indexar(raiz))
+    btn_indexar.pack(side=tk.LEFT, padx=5)
+
+    lbl_estado = ttk.Label(botones_frame, text="", font=('Arial', 9))
+    lbl_estado.pack(side=tk.LEFT, padx=10)
+
+    btn_retroceder = ttk.Button(botones_frame, text="⬅ Retroceder", command=cerrar_ventana)
+    btn_retroceder.pack(side=tk.RIGHT, padx=5)
+
+    # =============================================================================
+    # INICIALIZACIÓN
+    # =============================================================================
+
+    entrada_texto.focus_set()
+    buscar()
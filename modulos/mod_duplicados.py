@@ -0,0 +1,206 @@
+import tkinter as tk
+from tkinter import ttk
+import os
+from .estilo import aplicar_gradiente_y_contenido
+from .listado import formatear_tamano
+from .duplicados import BuscadorDuplicados
+
+# =============================================================================
+# FUNCIÓN PRINCIPAL DEL MÓDULO
+# =============================================================================
+
+# Intervalo de recogida de grupos y de refresco del progreso
+INTERVALO_DUPLICADOS_MS = 300
+
+
+def abrir_duplicados(ventana_padre, raiz, al_elegir=None):
+    """
+    Crea y muestra la ventana de búsqueda de archivos duplicados.
+
+    Los grupos aparecen a medida que se confirman, cada uno con sus copias
+    como filas hijas. La barra de estado indica cuántos bytes se han leído
+    frente a los que habría que leer hasheando todos los candidatos.
+
+    Args:
+        ventana_padre (tk.Tk o tk.Toplevel): Ventana desde la que se abre
+        raiz (str): Carpeta a analizar
+        al_elegir (callable): Función (directorio, nombre) llamada al hacer
+                              doble clic en una copia
+
+    Returns:
+        None
+    """
+
+    # =============================================================================
+    # CONFIGURACIÓN DE LA VENTANA
+    # =============================================================================
+
+    duplicados_win = tk.Toplevel(ventana_padre)
+    duplicados_win.title("Archivos Duplicados")
+    duplicados_win.geometry("800x550")
+    duplicados_win.resizable(True, True)
+
+    canvas_fondo, frame_grad, mid_color = aplicar_gradiente_y_contenido(duplicados_win, "#44B3EB", "#000000")
+
+    frame = tk.Frame(frame_grad, bg=mid_color)
+    frame.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
+
+    raiz = os.path.abspath(raiz)
+    ttk.Label(frame, text=f"En: {raiz}", font=('Courier', 9), relief="sunken", padding=5).pack(fill=tk.X)
+
+    # =============================================================================
+    # SECCIÓN: GRUPOS DE DUPLICADOS
+    # =============================================================================
+
+    arbol_frame = ttk.Frame(frame)
+    arbol_frame.pack(expand=True, fill=tk.BOTH, pady=5)
+
+    arbol = ttk.Treeview(arbol_frame, columns=('tamano',), selectmode='browse')
+    arbol.heading('#0', text="Grupo / Copia")
+    arbol.heading('tamano', text="Tamaño")
+    arbol.column('tamano', width=110, anchor='e', stretch=False)
+
+    scrollbar = ttk.Scrollbar(arbol_frame, orient=tk.VERTICAL, command=arbol.yview)
+    arbol.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    arbol.pack(expand=True, fill=tk.BOTH, side=tk.LEFT)
+
+    # =============================================================================
+    # FUNCIONES INTERNAS DEL MÓDULO
+    # =============================================================================
+
+    # Búsqueda en curso
+    buscador_actual = None
+
+    # Fila hija -> ruta completa de la copia
+    rutas_por_fila = {}
+
+    def buscar():
+        """
+        Lanza (o relanza) la búsqueda de duplicados.
+
+        Returns:
+            None
+        """
+        nonlocal buscador_actual
+
+        if buscador_actual is not None:
+            buscador_actual.cancelar()
+        arbol.delete(*arbol.get_children())
+        rutas_por_fila.clear()
+
+        buscador = buscador_actual = BuscadorDuplicados(raiz).iniciar()
+        seguir_busqueda(buscador)
+
+    def agregar_grupo(grupo):
+        """
+        Inserta un grupo y sus copias en el árbol.
+
+        Args:
+            grupo (GrupoDuplicados): Grupo confirmado
+
+        Returns:
+            None
+        """
+        desperdicio = grupo.tamano * (len(grupo.rutas) - 1)
+        fila = arbol.insert(
+            '', tk.END,
+            text=f"{len(grupo.rutas)} copias · recuperable {formatear_tamano(desperdicio)}",
+            values=(formatear_tamano(grupo.tamano),),
+            open=True
+        )
+        for ruta in grupo.rutas:
+            hija = arbol.insert(fila, tk.END, text=os.path.relpath(ruta, raiz), values=("",))
+            rutas_por_fila[hija] = ruta
+
+    def seguir_busqueda(buscador):
+        """
+        Añade los grupos confirmados y muestra el progreso.
+
+        Se vuelve a programar con after() hasta que la búsqueda termina.
+
+        Args:
+            buscador (BuscadorDuplicados): Búsqueda en curso
+
+        Returns:
+            None
+        """
+        nonlocal buscador_actual
+
+        if buscador is not buscador_actual or not duplicados_win.winfo_exists():
+            buscador.cancelar()
+            return
+
+        terminado = buscador.terminado.is_set()
+        for grupo in buscador.obtener_grupos():
+            agregar_grupo(grupo)
+
+        leidos = buscador.bytes_leidos
+        candidatos = buscador.bytes_candidatos
+        texto = (f"{buscador.etapa}: {buscador.archivos} archivos, {buscador.candidatos} con tamaño repetido | "
+                 f"{buscador.grupos} grupos, {formatear_tamano(buscador.bytes_recuperables)} recuperables | "
+                 f"leídos {formatear_tamano(leidos)}")
+        if candidatos:
+            texto += f" de {formatear_tamano(candidatos)} ({100 - leidos * 100 / candidatos:.0f}% evitado)"
+        if buscador.errores:
+            texto += f" | {buscador.errores} sin acceso"
+        lbl_estado.config(text=texto)
+
+        if not terminado:
+            duplicados_win.after(INTERVALO_DUPLICADOS_MS, lambda: seguir_busqueda(buscador))
+            return
+        buscador_actual = None
+        if not buscador.grupos:
+            arbol.insert('', tk.END, text="[No se encontraron duplicados]", values=("",))
+
+    def elegir(event):
+        """
+        Abre en el explorador la carpeta de la copia seleccionada.
+
+        Returns:
+            None
+        """
+        ruta = rutas_por_fila.get(arbol.focus())
+        if ruta is not None and al_elegir is not None:
+            al_elegir(os.path.dirname(ruta), os.path.basename(ruta))
+
+    def cerrar_ventana():
+        """
+        Cierra la ventana cancelando la búsqueda en curso.
+
+        Returns:
+            None
+        """
+        if buscador_actual is not None:
+            buscador_actual.cancelar()
+        duplicados_win.destroy()
+
+    # =============================================================================
+    # CONFIGURACIÓN DE EVENTOS
+    # =============================================================================
+
+    arbol.bind('<Double-1>', elegir)
+    arbol.bind('<Return>', elegir)
+    duplicados_win.protocol("WM_DELETE_WINDOW", cerrar_ventana)
+
+    # =============================================================================
+    # SECCIÓN: BOTONES Y ESTADO
+    # =============================================================================
+
+    lbl_estado = ttk.Label(frame, text="", font=('Arial', 9), wraplength=760)
+    lbl_estado.pack(fill=tk.X, pady=(5, 0))
+
+    botones_frame = ttk.Frame(frame)
+    botones_frame.pack(fill=tk.X, pady=5)
+
+    btn_buscar = ttk.Button(botones_frame, text=" Volver a buscar", command=buscar)
+    btn_buscar.pack(side=tk.LEFT, padx=5)
+
+    btn_retroceder = ttk.Button(botones_frame, text="⬅ Retroceder", command=cerrar_ventana)
+    btn_retroceder.pack(side=tk.RIGHT, padx=5)
+
+    # =============================================================================
+    # INICIALIZACIÓN
+    # =============================================================================
+
+    buscar()
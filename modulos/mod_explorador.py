@@ -2,6 +2,28 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import os
 from .estilo import aplicar_gradiente_y_contenido
+from .listado import (
+    CargadorDirectorio,
+    clave_orden,
+    firma_directorio,
+    buscar_posicion,
+    obtener_cache_listados,
+    nombre_visible,
+    formatear_tamano,
+    formatear_fecha,
+)
+from .tabla_virtual import TablaVirtual
+from .cuadricula import CuadriculaMiniaturas, MiniaturasVisibles
+from .miniaturas import es_imagen
+from .vigilancia import crear_vigilante, aplicar_cambios
+from .precarga import PrecargadorListados
+from .tamanos import CalculadorTamano, obtener_cache_tamanos
+from .mod_treemap import abrir_treemap
+from .mod_busqueda import abrir_busqueda
+from .mod_duplicados import abrir_duplicados
+from .mod_vista_previa import abrir_vista_previa
+from .mod_transferencias import abrir_panel_transferencias
+from .transferencias import obtener_cola_transferencias, COPIAR, MOVER
 
 # =============================================================================
 # FUNCIÓN PRINCIPAL DEL MÓDULO
@@ -27,7 +49,7 @@ def abrir_explorador(ventana_padre):
     
     explorador_win = tk.Toplevel(ventana_padre)
     explorador_win.title("Explorador de Archivos")
-    explorador_win.geometry("600x500")
+    explorador_win.geometry("950x500")
     explorador_win.resizable(True, True)
     
     # Aplicar fondo gradiente (azul a negro)
@@ -52,7 +74,15 @@ def abrir_explorador(ventana_padre):
         padding=5,
         font=('Courier', 9)
     )
-    lbl_ruta.pack(fill=tk.X, pady=(0, 10))
+    lbl_ruta.pack(fill=tk.X, pady=(0, 5))
+    
+    # Cuadro de búsqueda por nombre en la carpeta actual y sus subcarpetas
+    busqueda_frame = ttk.Frame(frame)
+    busqueda_frame.pack(fill=tk.X, pady=(0, 5))
+    
+    texto_busqueda_var = tk.StringVar()
+    entrada_busqueda = ttk.Entry(busqueda_frame, textvariable=texto_busqueda_var, font=('Courier', 9))
+    entrada_busqueda.pack(side=tk.LEFT, expand=True, fill=tk.X)
     
     # =============================================================================
     # SECCIÓN: BOTONES DE CONTROL
@@ -66,49 +96,249 @@ def abrir_explorador(ventana_padre):
     # SECCIÓN: LISTA DE ARCHIVOS Y CARPETAS
     # =============================================================================
     
-    # Frame para la lista con scrollbar
-    lista_frame = ttk.Frame(frame)
-    lista_frame.pack(expand=True, fill=tk.BOTH, pady=5)
-    
-    # Listbox para mostrar archivos y carpetas
-    listbox = tk.Listbox(
-        lista_frame,
-        height=15,
-        font=('Courier', 10),
-        selectmode=tk.SINGLE
+    # Tabla virtualizada: solo dibuja las filas visibles, así que la memoria
+    # de Tk no crece con el número de entradas de la carpeta
+    tabla = TablaVirtual(
+        frame,
+        columnas=[
+            {'titulo': "Nombre", 'ancho': None, 'valor': nombre_visible},
+            {'titulo': "Tamaño", 'ancho': 110, 'ancla': 'e', 'valor': lambda e: tamano_visible(e)},
+            {'titulo': "Modificado", 'ancho': 150, 'valor': lambda e: formatear_fecha(e.mtime)},
+        ],
+        fuente=('Courier', 10)
     )
+    tabla.pack(expand=True, fill=tk.BOTH, pady=5)
     
-    # Scrollbar vertical para la lista
-    scrollbar = ttk.Scrollbar(
-        lista_frame,
-        orient=tk.VERTICAL,
-        command=listbox.yview
+    # Vista alternativa en cuadrícula con miniaturas de las imágenes. Solo
+    # se genera la miniatura de las celdas visibles y `tabla` apunta siempre
+    # a la vista activa, así que el resto del código no distingue entre ambas
+    lista = tabla
+    cuadricula = CuadriculaMiniaturas(
+        frame,
+        texto=lambda e: e.nombre,
+        icono=lambda e: "📁" if e.es_dir else ("🖼" if es_imagen(e.nombre) else "📄"),
+        imagen=lambda e: miniaturas.imagen_de(ruta_actual_var.get(), e)
     )
-    listbox.configure(yscrollcommand=scrollbar.set)
-    
-    # Empaquetar la lista y el scrollbar
-    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-    listbox.pack(expand=True, fill=tk.BOTH, side=tk.LEFT)
+    miniaturas = MiniaturasVisibles(cuadricula)
+    cuadricula.al_dibujar(miniaturas.solicitar_pendientes)
     
     # =============================================================================
     # FUNCIONES INTERNAS DEL MÓDULO
     # =============================================================================
     
+    # Registros de las entradas de la carpeta. La tabla los lee por
+    # referencia y la selección se traduce a un registro por índice.
+    entradas_actuales = []
+    
+    # Carga en curso (se cancela al navegar a otra carpeta)
+    cargador_actual = None
+    
+    # Vigilante de cambios de la carpeta mostrada (inotify o sondeo)
+    vigilante_actual = None
+    
+    # Listados recientes compartidos por todas las ventanas del explorador
+    cache_listados = obtener_cache_listados()
+    
+    # Precarga en segundo plano de los listados de las subcarpetas visibles
+    # (se desactiva sola en montajes remotos o lentos)
+    precargador = PrecargadorListados(cache_listados)
+    
+    # Historial de navegación (rutas visitadas antes y después de la actual)
+    historial_atras = []
+    historial_adelante = []
+    
+    # Cálculo recursivo de tamaño en curso y totales parciales por carpeta
+    # (ruta -> bytes) mientras se calcula; los totales completos quedan en
+    # la caché de tamaños compartida
+    calculo_actual = None
+    tamanos_parciales = {}
+    cache_tamanos = obtener_cache_tamanos()
+    
+    # Archivo o carpeta marcado con Copiar/Cortar: (COPIAR o MOVER, ruta)
+    portapapeles = None
+    
+    # Nombre a seleccionar cuando termine de cargarse la carpeta (al abrir
+    # un resultado de búsqueda)
+    nombre_pendiente = None
+    
+    # Intervalo entre lotes mientras se lee una carpeta
+    INTERVALO_LOTES_MS = 20
+    
+    # Intervalo de refresco de los totales parciales del cálculo de tamaño
+    INTERVALO_TAMANOS_MS = 200
+    
+    # Los cambios detectados por el vigilante se aplican como mucho cada
+    # INTERVALO_CAMBIOS_MS y en bloques de MAX_CAMBIOS_POR_BLOQUE, de modo
+    # que una ráfaga enorme se reparte en varias actualizaciones acotadas
+    INTERVALO_CAMBIOS_MS = 300
+    MAX_CAMBIOS_POR_BLOQUE = 5000
+    
+    def tamano_visible(entrada):
+        """
+        Texto de la columna Tamaño para una entrada.
+        
+        Las carpetas muestran su tamaño recursivo si se ha calculado (con
+        "…" mientras el cálculo sigue en curso); los archivos, su tamaño.
+        
+        Args:
+            entrada (Entrada): Registro a mostrar
+        
+        Returns:
+            str: Tamaño formateado
+        """
+        if not entrada.es_dir:
+            return formatear_tamano(entrada.tamano)
+        ruta = os.path.join(ruta_actual_var.get(), entrada.nombre)
+        parcial = tamanos_parciales.get(ruta)
+        if parcial is not None:
+            return f"… {formatear_tamano(parcial)}"
+        total = cache_tamanos.total(ruta)
+        return formatear_tamano(total) if total is not None else ""
+    
+    def calcular_tamano():
+        """
+        Calcula el tamaño recursivo de la carpeta seleccionada.
+        
+        Si no hay una carpeta seleccionada, calcula el de la carpeta actual
+        y, de paso, el de cada una de sus subcarpetas. Los totales parciales
+        aparecen en la columna Tamaño a medida que avanza el cálculo.
+        
+        Returns:
+            None
+        """
+        nonlocal calculo_actual
+        
+        if calculo_actual is not None:
+            calculo_actual.cancelar()
+        
+        indice = tabla.seleccion()
+        if indice is not None and entradas_actuales[indice].es_dir:
+            raiz = os.path.join(ruta_actual_var.get(), entradas_actuales[indice].nombre)
+        else:
+            raiz = ruta_actual_var.get()
+        
+        calculo = calculo_actual = CalculadorTamano(raiz).iniciar()
+        seguir_calculo(calculo)
+    
+    def seguir_calculo(calculo):
+        """
+        Vuelca el progreso del cálculo de tamaño en la tabla.
+        
+        Se vuelve a programar con after() hasta que el cálculo termina.
+        
+        Args:
+            calculo (CalculadorTamano): Cálculo en curso
+        
+        Returns:
+            None
+        """
+        nonlocal calculo_actual
+        
+        if calculo is not calculo_actual or not explorador_win.winfo_exists():
+            return
+        
+        terminado = calculo.terminado.is_set()
+        total, totales_hijos, directorios = calculo.progreso()
+        
+        tamanos_parciales.clear()
+        if not terminado:
+            tamanos_parciales[calculo.raiz] = total
+            for nombre, parcial in totales_hijos.items():
+                tamanos_parciales[os.path.join(calculo.raiz, nombre)] = parcial
+        tabla.actualizar()
+        
+        if not terminado:
+            lbl_tamano.config(text=f"Calculando... {formatear_tamano(total)} en {directorios} carpetas")
+            explorador_win.after(INTERVALO_TAMANOS_MS, lambda: seguir_calculo(calculo))
+            return
+        
+        calculo_actual = None
+        texto = (f"{os.path.basename(calculo.raiz) or calculo.raiz}: {formatear_tamano(total)} "
+                 f"({directorios} carpetas, {calculo.reutilizados} sin cambios)")
+        if calculo.errores:
+            texto += f", {calculo.errores} sin acceso"
+        lbl_tamano.config(text=texto)
+    
+    def mostrar_entradas(entradas, conservar_posicion=False):
+        """
+        Muestra una lista de entradas en la tabla (o el aviso de carpeta vacía).
+        
+        Args:
+            entradas (list): Entradas ya ordenadas
+            conservar_posicion (bool): Si es True mantiene el desplazamiento
+        
+        Returns:
+            None
+        """
+        nonlocal entradas_actuales, nombre_pendiente
+        entradas_actuales = entradas
+        if entradas:
+            tabla.establecer_registros(entradas, conservar_posicion)
+        else:
+            tabla.mostrar_mensaje("[Carpeta vacía]")
+        
+        if nombre_pendiente is not None:
+            posicion = buscar_posicion(entradas, nombre_pendiente.lower())
+            if posicion < len(entradas) and entradas[posicion].nombre == nombre_pendiente:
+                tabla.seleccionar(posicion)
+            nombre_pendiente = None
+    
+    def precargar_subcarpetas(entradas):
+        """
+        Programa la precarga de las primeras subcarpetas de la carpeta actual.
+        
+        Args:
+            entradas (list): Entradas ya ordenadas de la carpeta actual
+        
+        Returns:
+            None
+        """
+        precargador.programar(ruta_actual_var.get(), (e.nombre for e in entradas if e.es_dir))
+    
+    def precargar_seleccionada(indice):
+        """
+        Adelanta la precarga de la carpeta seleccionada (la más probable de
+        abrirse a continuación).
+        
+        Args:
+            indice (int): Índice seleccionado en entradas_actuales
+        
+        Returns:
+            None
+        """
+        if indice < len(entradas_actuales) and entradas_actuales[indice].es_dir:
+            precargador.programar(ruta_actual_var.get(), [entradas_actuales[indice].nombre], prioritario=True)
+    
     def actualizar_lista():
         """
-        Actualiza el contenido del listbox con los archivos y carpetas
+        Actualiza el contenido de la tabla con los archivos y carpetas
         del directorio actual.
         
         Esta función:
-        1. Limpia la lista actual
-        2. Lee el contenido del directorio
-        3. Ordena los elementos alfabéticamente
-        4. Distingue entre carpetas (con prefijo [CARPETA]) y archivos
-        5. Maneja errores de permisos y otros problemas
+        1. Cancela la carga anterior si aún estaba en curso
+        2. Si la carpeta está en caché y su firma (mtime/inodo) no cambió,
+           muestra el listado guardado sin leer el disco
+        3. Si está en caché pero cambió, muestra el listado guardado y lo
+           revalida leyendo el directorio en segundo plano
+        4. Si no está en caché, lee el directorio en un hilo y va mostrando
+           las entradas por lotes con after()
+        5. Al terminar, ordena alfabéticamente, guarda en caché y maneja errores
         
         Returns:
             None
         """
+        nonlocal cargador_actual, entradas_actuales, vigilante_actual
+        
+        # Cancelar la carga anterior (si la hay) inmediatamente; la precarga
+        # pendiente tampoco debe competir con la carga visible
+        precargador.cancelar()
+        if cargador_actual is not None:
+            cargador_actual.cancelar()
+            cargador_actual = None
+        if vigilante_actual is not None:
+            vigilante_actual.detener()
+            vigilante_actual = None
+        
         try:
             # Obtener la ruta actual
             ruta = ruta_actual_var.get()
@@ -116,49 +346,234 @@ def abrir_explorador(ventana_padre):
             # Cambiar al directorio (asegura que estamos en la ruta correcta)
             os.chdir(ruta)
             
-            # Limpiar el listbox
-            listbox.delete(0, tk.END)
-            
-            # Obtener la lista de elementos en el directorio
-            items = os.listdir(ruta)
-            
-            # Si el directorio está vacío, mostrar mensaje
-            if not items:
-                listbox.insert(tk.END, "[Carpeta vacía]")
-                return
-            
-            # Ordenar elementos alfabéticamente (sin distinguir mayúsculas)
-            items_ordenados = sorted(items, key=lambda s: s.lower())
-            
-            # Insertar elementos en el listbox
-            for item in items_ordenados:
-                ruta_completa = os.path.join(ruta, item)
-                
-                # Distinguir entre carpetas y archivos
-                if os.path.isdir(ruta_completa):
-                    listbox.insert(tk.END, f" [CARPETA] {item}")
-                else:
-                    listbox.insert(tk.END, f" {item}")
-                    
+            # Firma tomada antes de leer: si el directorio cambia durante la
+            # lectura, la próxima visita lo detectará
+            firma = firma_directorio(ruta)
         except PermissionError:
-            # Error de permisos denegados
-            listbox.delete(0, tk.END)
-            listbox.insert(tk.END, "❌ [Error: Permiso denegado]")
-            messagebox.showwarning(
-                "Permiso Denegado",
-                "No tienes permisos para acceder a este directorio.",
-                parent=explorador_win
-            )
-            
+            mostrar_error_permisos()
+            return
         except Exception as e:
-            # Otros errores
-            messagebox.showerror(
-                "Error",
-                f"No se pudo leer el directorio:\n{e}",
-                parent=explorador_win
-            )
-            # Intentar volver al directorio anterior
-            subir_nivel()
+            mostrar_error_lectura(e)
+            return
+        
+        # Vigilar la carpeta desde ya: los cambios ocurridos durante la carga
+        # quedan pendientes y se aplican cuando termina
+        try:
+            vigilante_actual = crear_vigilante(ruta)
+        except OSError:
+            vigilante_actual = None
+        
+        en_cache = cache_listados.obtener(ruta)
+        if en_cache is not None:
+            mostrar_entradas(en_cache.entradas)
+            if en_cache.firma == firma:
+                lbl_cargadas.config(text=f"{len(en_cache.entradas)} entradas")
+                precargar_subcarpetas(en_cache.entradas)
+                return
+            # Listado caducado: se sigue mostrando mientras se revalida
+            destino = []
+            lbl_cargadas.config(text="Revalidando...")
+        else:
+            # Sin caché: las filas se muestran a medida que se leen
+            destino = entradas_actuales = []
+            tabla.establecer_registros(destino)
+            lbl_cargadas.config(text="Cargando...")
+        
+        # Leer el directorio en segundo plano y consumir los lotes
+        cargador = cargador_actual = CargadorDirectorio(ruta).iniciar()
+        explorador_win.after(1, lambda: consumir_lotes(cargador, firma, destino))
+    
+    def consumir_lotes(cargador, firma, destino):
+        """
+        Recoge las entradas que el hilo de lectura ha publicado.
+        
+        Si `destino` es la lista que se está mostrando, las filas aparecen
+        a medida que llegan; si no (revalidación de un listado en caché), la
+        lista nueva sustituye a la mostrada solo al terminar. Se vuelve a
+        programar con after() hasta que la carga termina o se cancela.
+        
+        Args:
+            cargador (CargadorDirectorio): Carga a consumir
+            firma (tuple): Firma del directorio tomada antes de leerlo
+            destino (list): Lista donde acumular las entradas
+        
+        Returns:
+            None
+        """
+        nonlocal cargador_actual
+        
+        # Si se navegó a otra carpeta, esta carga ya no interesa
+        if cargador is not cargador_actual or cargador.cancelado:
+            return
+        if not explorador_win.winfo_exists():
+            cargador.cancelar()
+            return
+        
+        # Comprobar el fin ANTES de vaciar la cola: así no se pierde el último lote
+        fin_lectura = cargador.terminado.is_set()
+        nuevas = cargador.obtener_lotes()
+        visible = destino is entradas_actuales
+        
+        if fin_lectura:
+            cargador_actual = None
+        
+        if fin_lectura and cargador.error is not None:
+            cache_listados.invalidar(cargador.ruta)
+            if isinstance(cargador.error, PermissionError):
+                mostrar_error_permisos()
+            else:
+                mostrar_error_lectura(cargador.error)
+            return
+        
+        if nuevas:
+            destino.extend(nuevas)
+            if visible:
+                tabla.actualizar()
+        
+        if not fin_lectura:
+            if visible:
+                lbl_cargadas.config(text=f"{len(destino)} entradas cargadas")
+            else:
+                lbl_cargadas.config(text=f"Revalidando... {len(destino)} entradas")
+            explorador_win.after(INTERVALO_LOTES_MS, lambda: consumir_lotes(cargador, firma, destino))
+            return
+        
+        # Carga completa: ordenar, guardar en caché y mostrar
+        destino.sort(key=clave_orden)
+        cache_listados.guardar(cargador.ruta, firma, destino)
+        mostrar_entradas(destino, conservar_posicion=True)
+        lbl_cargadas.config(text=f"{len(destino)} entradas")
+        precargar_subcarpetas(destino)
+    
+    def revisar_cambios():
+        """
+        Aplica a la tabla los cambios detectados por el vigilante.
+        
+        Se ejecuta periódicamente con after(). Las altas, bajas y
+        renombrados se aplican como actualizaciones incrementales de filas;
+        si el vigilante perdió eventos, se relee la carpeta entera.
+        
+        Returns:
+            None
+        """
+        if not explorador_win.winfo_exists():
+            return
+        explorador_win.after(INTERVALO_CAMBIOS_MS, revisar_cambios)
+        
+        # No tocar la lista mientras se está cargando: los cambios esperan
+        vigilante = vigilante_actual
+        if vigilante is None or cargador_actual is not None or not vigilante.hay_cambios():
+            return
+        
+        if vigilante.desbordado:
+            cache_listados.invalidar(vigilante.ruta)
+            actualizar_lista()
+            return
+        
+        # Recordar la selección por nombre: los índices cambian al insertar
+        indice = tabla.seleccion()
+        seleccionada = entradas_actuales[indice].nombre if indice is not None else None
+        
+        # Sobre una copia: la lista mostrada suele ser la misma que guarda la
+        # caché de listados, que no debe cambiar sin actualizar su recuento
+        # (y cuya firma ya no correspondería al contenido)
+        entradas = list(entradas_actuales)
+        aplicar_cambios(entradas, vigilante.ruta, vigilante.obtener_cambios(MAX_CAMBIOS_POR_BLOQUE))
+        mostrar_entradas(entradas, conservar_posicion=True)
+        lbl_cargadas.config(text=f"{len(entradas_actuales)} entradas")
+        
+        if seleccionada is not None:
+            posicion = buscar_posicion(entradas_actuales, seleccionada.lower())
+            if posicion < len(entradas_actuales) and entradas_actuales[posicion].nombre == seleccionada:
+                tabla.seleccionado = posicion
+                tabla.actualizar()
+    
+    def ir_a(nueva_ruta, registrar=True):
+        """
+        Navega a una carpeta, registrándola en el historial.
+        
+        Args:
+            nueva_ruta (str): Carpeta de destino
+            registrar (bool): Si es False no modifica el historial
+                              (lo usan Atrás y Adelante)
+        
+        Returns:
+            None
+        """
+        ruta_anterior = ruta_actual_var.get()
+        if registrar and os.path.normpath(nueva_ruta) != os.path.normpath(ruta_anterior):
+            historial_atras.append(ruta_anterior)
+            historial_adelante.clear()
+        ruta_actual_var.set(nueva_ruta)
+        actualizar_estado_historial()
+        actualizar_lista()
+    
+    def ir_atras():
+        """
+        Vuelve a la carpeta anterior del historial.
+        
+        Returns:
+            None
+        """
+        if historial_atras:
+            historial_adelante.append(ruta_actual_var.get())
+            ir_a(historial_atras.pop(), registrar=False)
+    
+    def ir_adelante():
+        """
+        Avanza a la carpeta siguiente del historial.
+        
+        Returns:
+            None
+        """
+        if historial_adelante:
+            historial_atras.append(ruta_actual_var.get())
+            ir_a(historial_adelante.pop(), registrar=False)
+    
+    def actualizar_estado_historial():
+        """
+        Habilita o deshabilita los botones Atrás/Adelante según el historial.
+        
+        Returns:
+            None
+        """
+        btn_atras.state(['!disabled'] if historial_atras else ['disabled'])
+        btn_adelante.state(['!disabled'] if historial_adelante else ['disabled'])
+    
+    def mostrar_error_permisos():
+        """
+        Muestra el aviso de permisos denegados en la tabla y en un diálogo.
+        
+        Returns:
+            None
+        """
+        nonlocal entradas_actuales
+        entradas_actuales = []
+        tabla.mostrar_mensaje("❌ [Error: Permiso denegado]")
+        lbl_cargadas.config(text="")
+        messagebox.showwarning(
+            "Permiso Denegado",
+            "No tienes permisos para acceder a este directorio.",
+            parent=explorador_win
+        )
+    
+    def mostrar_error_lectura(error):
+        """
+        Muestra un error de lectura y vuelve al directorio padre.
+        
+        Args:
+            error (Exception): Error producido al leer el directorio
+        
+        Returns:
+            None
+        """
+        messagebox.showerror(
+            "Error",
+            f"No se pudo leer el directorio:\n{error}",
+            parent=explorador_win
+        )
+        # Intentar volver al directorio anterior
+        subir_nivel()
     
     def subir_nivel():
         """
@@ -174,58 +589,35 @@ def abrir_explorador(ventana_padre):
         ruta_actual = ruta_actual_var.get()
         nueva_ruta = os.path.abspath(os.path.join(ruta_actual, '..'))
         
-        # Actualizar la variable de ruta
-        ruta_actual_var.set(nueva_ruta)
-        
-        # Actualizar la lista
-        actualizar_lista()
+        # Navegar (actualiza la variable de ruta, el historial y la lista)
+        ir_a(nueva_ruta)
     
-    def navegar(event):
+    def navegar(indice):
         """
-        Maneja el evento de doble clic en un elemento de la lista.
+        Maneja el doble clic (o Enter) sobre una fila de la tabla.
         
-        Si el elemento es una carpeta, navega hacia ella.
-        Si es un archivo, no hace nada (se podría extender para abrirlo).
+        Si el registro es una carpeta, navega hacia ella.
+        Si es un archivo, abre su vista previa.
         
         Args:
-            event: Evento de Tkinter (doble clic)
+            indice (int): Índice del registro activado en entradas_actuales
         
         Returns:
             None
         """
         try:
-            # Obtener el elemento seleccionado
-            seleccion = listbox.get(listbox.curselection())
-            
-            # Ignorar si es el mensaje de carpeta vacía o error
-            if seleccion.startswith("[Carpeta vacía]") or seleccion.startswith("❌"):
-                return
+            entrada = entradas_actuales[indice]
             
-            # Limpiar el prefijo de carpeta si existe
-            if "[CARPETA]" in seleccion:
-                # Remover el emoji y el prefijo [CARPETA]
-                seleccion = seleccion.split("[CARPETA]")[1].strip()
-            elif seleccion.startswith("📁"):
-                seleccion = seleccion[2:].strip()
-            elif seleccion.startswith("📄"):
-                # Es un archivo, no hacer nada
-                messagebox.showinfo(
-                    "Archivo",
-                    "Has seleccionado un archivo. En esta versión solo se puede navegar por carpetas.",
-                    parent=explorador_win
-                )
+            if not entrada.es_dir:
+                # Es un archivo: abrir la vista previa
+                abrir_vista_previa(explorador_win, os.path.join(ruta_actual_var.get(), entrada.nombre))
                 return
             
-            # Construir la nueva ruta
-            nueva_ruta = os.path.join(ruta_actual_var.get(), seleccion)
+            # Construir la nueva ruta y navegar
+            ir_a(os.path.join(ruta_actual_var.get(), entrada.nombre))
             
-            # Verificar si es un directorio
-            if os.path.isdir(nueva_ruta):
-                ruta_actual_var.set(nueva_ruta)
-                actualizar_lista()
-                
-        except tk.TclError:
-            # No hay selección
+        except IndexError:
+            # La lista cambió entre el clic y la activación
             pass
             
         except Exception as e:
@@ -235,29 +627,199 @@ def abrir_explorador(ventana_padre):
                 parent=explorador_win
             )
     
+    def buscar_archivos():
+        """
+        Abre la búsqueda por nombre en la carpeta actual.
+        
+        Returns:
+            None
+        """
+        abrir_busqueda(explorador_win, ruta_actual_var.get(), texto_busqueda_var.get().strip(),
+                       al_elegir=mostrar_resultado)
+    
+    def mostrar_resultado(directorio, nombre):
+        """
+        Navega a la carpeta de un resultado de búsqueda y lo selecciona.
+        
+        Args:
+            directorio (str): Carpeta que contiene el resultado
+            nombre (str): Nombre del resultado
+        
+        Returns:
+            None
+        """
+        nonlocal nombre_pendiente
+        nombre_pendiente = nombre
+        ir_a(directorio)
+        explorador_win.lift()
+    
+    def marcar(tipo):
+        """
+        Marca la entrada seleccionada para copiarla o moverla con Pegar.
+        
+        Args:
+            tipo (str): COPIAR o MOVER
+        
+        Returns:
+            None
+        """
+        nonlocal portapapeles
+        indice = tabla.seleccion()
+        if indice is None:
+            messagebox.showwarning(
+                "Sin Selección",
+                "Selecciona primero un archivo o carpeta.",
+                parent=explorador_win
+            )
+            return
+        ruta = os.path.join(ruta_actual_var.get(), entradas_actuales[indice].nombre)
+        portapapeles = (tipo, ruta)
+        accion = "copiar" if tipo == COPIAR else "mover"
+        lbl_cargadas.config(text=f"Listo para {accion}: {entradas_actuales[indice].nombre}")
+    
+    def pegar():
+        """
+        Encola la copia o el movimiento marcado hacia la carpeta actual.
+        
+        La transferencia se hace en segundo plano: se puede seguir navegando
+        y el progreso se ve en el panel de transferencias.
+        
+        Returns:
+            None
+        """
+        nonlocal portapapeles
+        if portapapeles is None:
+            return
+        tipo, origen = portapapeles
+        try:
+            obtener_cola_transferencias().agregar(tipo, origen, ruta_actual_var.get())
+        except OSError as e:
+            messagebox.showerror(
+                "Error",
+                f"No se puede {'copiar' if tipo == COPIAR else 'mover'}:\n{e}",
+                parent=explorador_win
+            )
+            return
+        # Un movimiento solo se puede pegar una vez
+        if tipo == MOVER:
+            portapapeles = None
+        abrir_panel_transferencias(explorador_win)
+    
+    def cambiar_vista():
+        """
+        Alterna entre la lista y la cuadrícula de miniaturas.
+        
+        La vista nueva recibe los mismos registros, el mensaje y la
+        selección de la anterior.
+        
+        Returns:
+            None
+        """
+        nonlocal tabla
+        anterior = tabla
+        tabla = cuadricula if anterior is lista else lista
+        anterior.pack_forget()
+        tabla.pack(expand=True, fill=tk.BOTH, pady=5, after=btn_frame)
+        btn_vista.config(text=" Lista" if tabla is cuadricula else " Miniaturas")
+        
+        if anterior.mensaje:
+            tabla.mostrar_mensaje(anterior.mensaje)
+        else:
+            tabla.establecer_registros(anterior.registros)
+            if anterior.seleccionado is not None:
+                tabla.seleccionar(anterior.seleccionado)
+        tabla.canvas.focus_set()
+    
     def cerrar_ventana():
         """
         Cierra la ventana del explorador de archivos.
         
         Esta función se ejecuta cuando el usuario hace clic en el botón
-        de retroceso.
+        de retroceso. También cancela la carga y la vigilancia en curso.
         
         Returns:
             None
         """
+        if cargador_actual is not None:
+            cargador_actual.cancelar()
+        if vigilante_actual is not None:
+            vigilante_actual.detener()
+        if calculo_actual is not None:
+            calculo_actual.cancelar()
+        miniaturas.cerrar()
+        precargador.detener()
         explorador_win.destroy()
     
     # =============================================================================
     # CONFIGURACIÓN DE EVENTOS
     # =============================================================================
     
-    # Vincular doble clic a la función de navegación
-    listbox.bind("<Double-1>", navegar)
+    # Vincular doble clic / Enter a la función de navegación (en ambas vistas)
+    for vista in (lista, cuadricula):
+        vista.al_activar(navegar)
+        vista.al_seleccionar(precargar_seleccionada)
+        
+        # Atajos de portapapeles sobre la vista
+        vista.canvas.bind("<Control-c>", lambda e: marcar(COPIAR))
+        vista.canvas.bind("<Control-x>", lambda e: marcar(MOVER))
+        vista.canvas.bind("<Control-v>", lambda e: pegar())
+    
+    # Cerrar con la X de la ventana también cancela la carga en curso
+    explorador_win.protocol("WM_DELETE_WINDOW", cerrar_ventana)
+    
+    # Enter en el cuadro de búsqueda lanza la búsqueda
+    entrada_busqueda.bind("<Return>", lambda e: buscar_archivos())
+    
+    # Atajos de historial: Alt+Izquierda / Alt+Derecha
+    explorador_win.bind("<Alt-Left>", lambda e: ir_atras())
+    explorador_win.bind("<Alt-Right>", lambda e: ir_adelante())
     
     # =============================================================================
     # CREACIÓN DE BOTONES DE CONTROL
     # =============================================================================
     
+    # Botón: Buscar (junto al cuadro de búsqueda)
+    btn_buscar = ttk.Button(
+        busqueda_frame,
+        text=" Buscar",
+        command=buscar_archivos
+    )
+    btn_buscar.pack(side=tk.LEFT, padx=5)
+    
+    # Botones: Copiar / Cortar / Pegar y panel de transferencias
+    btn_copiar = ttk.Button(busqueda_frame, text=" Copiar", command=lambda: marcar(COPIAR))
+    btn_copiar.pack(side=tk.LEFT, padx=(15, 2))
+    
+    btn_cortar = ttk.Button(busqueda_frame, text=" Cortar", command=lambda: marcar(MOVER))
+    btn_cortar.pack(side=tk.LEFT, padx=2)
+    
+    btn_pegar = ttk.Button(busqueda_frame, text=" Pegar", command=pegar)
+    btn_pegar.pack(side=tk.LEFT, padx=2)
+    
+    btn_transferencias = ttk.Button(
+        busqueda_frame,
+        text=" Transferencias",
+        command=lambda: abrir_panel_transferencias(explorador_win)
+    )
+    btn_transferencias.pack(side=tk.LEFT, padx=(2, 5))
+    
+    # Botones: Atrás / Adelante en el historial de navegación
+    btn_atras = ttk.Button(
+        btn_frame,
+        text="◀",
+        width=3,
+        command=ir_atras
+    )
+    btn_atras.pack(side=tk.LEFT, padx=(5, 0))
+    
+    btn_adelante = ttk.Button(
+        btn_frame,
+        text="▶",
+        width=3,
+        command=ir_adelante
+    )
+    btn_adelante.pack(side=tk.LEFT, padx=(0, 5))
+    
     # Botón: Refrescar
     btn_refrescar = ttk.Button(
         btn_frame,
@@ -274,6 +836,42 @@ def abrir_explorador(ventana_padre):
     )
     btn_subir.pack(side=tk.LEFT, padx=5)
     
+    # Botón: Calcular Tamaño (de la carpeta seleccionada o de la actual)
+    btn_tamano = ttk.Button(
+        btn_frame,
+        text=" Calcular Tamaño",
+        command=calcular_tamano
+    )
+    btn_tamano.pack(side=tk.LEFT, padx=5)
+    
+    # Botón: Mapa de Uso (treemap de la carpeta actual)
+    btn_mapa = ttk.Button(
+        btn_frame,
+        text=" Mapa de Uso",
+        command=lambda: abrir_treemap(explorador_win, ruta_actual_var.get())
+    )
+    btn_mapa.pack(side=tk.LEFT, padx=5)
+    
+    # Botón: Duplicados (archivos repetidos bajo la carpeta actual)
+    btn_duplicados = ttk.Button(
+        btn_frame,
+        text=" Duplicados",
+        command=lambda: abrir_duplicados(explorador_win, ruta_actual_var.get(), al_elegir=mostrar_resultado)
+    )
+    btn_duplicados.pack(side=tk.LEFT, padx=5)
+    
+    # Botón: alternar entre lista y cuadrícula de miniaturas
+    btn_vista = ttk.Button(
+        btn_frame,
+        text=" Miniaturas",
+        command=cambiar_vista
+    )
+    btn_vista.pack(side=tk.LEFT, padx=5)
+    
+    # Contador de entradas cargadas (se actualiza mientras se lee la carpeta)
+    lbl_cargadas = ttk.Label(btn_frame, text="", font=('Arial', 9))
+    lbl_cargadas.pack(side=tk.LEFT, padx=10)
+    
     # Botón: Retroceder (NUEVO)
     btn_retroceder = ttk.Button(
         btn_frame,
@@ -287,12 +885,20 @@ def abrir_explorador(ventana_padre):
     # =============================================================================
     
     # Cargar la lista inicial de archivos
+    actualizar_estado_historial()
     actualizar_lista()
     
+    # Revisar periódicamente los cambios de la carpeta mostrada
+    revisar_cambios()
+    
+    # Resultado del último cálculo de tamaño
+    lbl_tamano = ttk.Label(frame, text="", font=('Arial', 9))
+    lbl_tamano.pack(fill=tk.X)
+    
     # Información de ayuda en la barra de estado
     barra_estado = ttk.Label(
         frame,
-        text=" Doble clic en una carpeta para navegar | Usa 'Subir Nivel' para retroceder",
+        text=" Doble clic en una carpeta para navegar o en un archivo para previsualizarlo | Usa 'Subir Nivel' para retroceder",
         relief=tk.SUNKEN,
         padding=5,
         font=('Arial', 8)
@@ -6,6 +6,8 @@ import psutil # pyright: ignore[reportMissingModuleSource]
 import os
 from datetime import datetime
 from .estilo import aplicar_gradiente_y_contenido
+from .mod_instantaneas import guardar_instantanea_actual, abrir_comparador_instantaneas
+from .mod_alertas import iniciar_alertas, abrir_registro_alertas
 
 # =============================================================================
 # FUNCIÓN PRINCIPAL DEL MÓDULO
@@ -339,6 +341,30 @@ def abrir_info_sistema(ventana_padre):
     )
     btn_actualizar.pack(side=tk.LEFT, padx=5)
     
+    # Botón: Guardar Instantánea
+    btn_instantanea = ttk.Button(
+        botones_frame,
+        text=" Guardar Instantánea",
+        command=lambda: guardar_instantanea_actual(info_win)
+    )
+    btn_instantanea.pack(side=tk.LEFT, padx=5)
+    
+    # Botón: Comparar Instantáneas
+    btn_comparar = ttk.Button(
+        botones_frame,
+        text=" Comparar",
+        command=lambda: abrir_comparador_instantaneas(info_win)
+    )
+    btn_comparar.pack(side=tk.LEFT, padx=5)
+    
+    # Botón: Alertas (reglas activas y registro)
+    btn_alertas = ttk.Button(
+        botones_frame,
+        text=" Alertas",
+        command=lambda: abrir_registro_alertas(info_win, iniciar_alertas(ventana_padre))
+    )
+    btn_alertas.pack(side=tk.LEFT, padx=5)
+    
     # Botón: Retroceder (NUEVO)
     btn_retroceder = ttk.Button(
         botones_frame,
@@ -0,0 +1,222 @@
+import tkinter as tk
+from tkinter import ttk, scrolledtext, messagebox, filedialog
+import json
+import threading
+from .estilo import aplicar_gradiente_y_contenido
+from .datos_app import obtener_directorio_datos
+from .instantaneas import (
+    capturar_instantanea,
+    guardar_instantanea,
+    cargar_instantanea,
+    comparar_instantaneas,
+    formatear_diferencia,
+)
+
+# Intervalo de comprobación de la captura en segundo plano
+INTERVALO_CAPTURA_MS = 100
+
+# =============================================================================
+# FUNCIONES COMPARTIDAS POR LOS MÓDULOS DE INFO Y PROCESOS
+# =============================================================================
+
+def guardar_instantanea_actual(ventana):
+    """
+    Captura una instantánea del sistema y la guarda en ~/.os_mini/instantaneas.
+
+    Recorrer todos los procesos lleva su tiempo, así que la captura se hace
+    en un hilo y el resultado se muestra al terminar, sin congelar la ventana.
+
+    Args:
+        ventana (tk.Toplevel): Ventana sobre la que se muestran los mensajes
+
+    Returns:
+        None
+    """
+    estado = {}
+
+    def trabajar():
+        try:
+            estado['ruta'] = guardar_instantanea(capturar_instantanea())
+        except Exception as e:
+            estado['error'] = e
+
+    def esperar():
+        if not ventana.winfo_exists():
+            return
+        if hilo.is_alive():
+            ventana.after(INTERVALO_CAPTURA_MS, esperar)
+            return
+        if 'error' in estado:
+            messagebox.showerror(
+                "Error",
+                f"No se pudo guardar la instantánea:\n{estado['error']}",
+                parent=ventana
+            )
+            return
+        messagebox.showinfo(
+            "Instantánea Guardada",
+            f"Instantánea guardada en:\n{estado['ruta']}",
+            parent=ventana
+        )
+
+    hilo = threading.Thread(target=trabajar, name="captura-instantanea", daemon=True)
+    hilo.start()
+    ventana.after(INTERVALO_CAPTURA_MS, esperar)
+
+# =============================================================================
+# FUNCIÓN PRINCIPAL DEL MÓDULO
+# =============================================================================
+
+def abrir_comparador_instantaneas(ventana_padre):
+    """
+    Crea y muestra la ventana para comparar dos instantáneas del sistema.
+
+    Args:
+        ventana_padre (tk.Tk o tk.Toplevel): Ventana desde la que se abre
+
+    Returns:
+        None
+    """
+
+    # =============================================================================
+    # CONFIGURACIÓN DE LA VENTANA
+    # =============================================================================
+
+    comparador_win = tk.Toplevel(ventana_padre)
+    comparador_win.title("Comparar Instantáneas")
+    comparador_win.geometry("700x600")
+    comparador_win.resizable(True, True)
+
+    canvas_fondo, frame_grad, mid_color = aplicar_gradiente_y_contenido(comparador_win, "#44B3EB", "#000000")
+
+    frame = tk.Frame(frame_grad, bg=mid_color)
+    frame.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
+
+    # =============================================================================
+    # SECCIÓN: SELECCIÓN DE ARCHIVOS
+    # =============================================================================
+
+    ruta_antes_var = tk.StringVar()
+    ruta_despues_var = tk.StringVar()
+
+    # Última diferencia calculada (para exportarla como JSON)
+    diferencia_actual = {}
+
+    seleccion_frame = ttk.LabelFrame(frame, text="Instantáneas a comparar", padding="10")
+    seleccion_frame.pack(fill=tk.X, pady=(0, 10))
+
+    def elegir_archivo(variable):
+        """
+        Abre un diálogo para elegir una instantánea y guarda su ruta.
+
+        Args:
+            variable (tk.StringVar): Variable donde guardar la ruta elegida
+
+        Returns:
+            None
+        """
+        ruta = filedialog.askopenfilename(
+            parent=comparador_win,
+            initialdir=obtener_directorio_datos('instantaneas'),
+            filetypes=[("Instantáneas JSON", "*.json"), ("Todos", "*.*")]
+        )
+        if ruta:
+            variable.set(ruta)
+
+    for fila, (texto, variable) in enumerate([("Antes:", ruta_antes_var), ("Después:", ruta_despues_var)]):
+        ttk.Label(seleccion_frame, text=texto, width=9).grid(row=fila, column=0, sticky='w')
+        ttk.Entry(seleccion_frame, textvariable=variable, font=('Courier', 9)).grid(
+            row=fila, column=1, sticky='ew', padx=5, pady=2)
+        ttk.Button(seleccion_frame, text="Elegir...",
+                   command=lambda v=variable: elegir_archivo(v)).grid(row=fila, column=2)
+    seleccion_frame.columnconfigure(1, weight=1)
+
+    # =============================================================================
+    # SECCIÓN: RESULTADO
+    # =============================================================================
+
+    txt_resultado = scrolledtext.ScrolledText(
+        frame,
+        wrap=tk.NONE,
+        state=tk.DISABLED,
+        font=('Courier', 9),
+        bg='#f8f9fa',
+        fg='#212529'
+    )
+    txt_resultado.pack(expand=True, fill=tk.BOTH, pady=10)
+
+    # =============================================================================
+    # FUNCIONES INTERNAS DEL MÓDULO
+    # =============================================================================
+
+    def comparar():
+        """
+        Carga las dos instantáneas elegidas y muestra sus diferencias.
+
+        Returns:
+            None
+        """
+        try:
+            antes = cargar_instantanea(ruta_antes_var.get())
+            despues = cargar_instantanea(ruta_despues_var.get())
+        except Exception as e:
+            messagebox.showerror(
+                "Error",
+                f"No se pudieron cargar las instantáneas:\n{e}",
+                parent=comparador_win
+            )
+            return
+
+        diferencia_actual.clear()
+        diferencia_actual.update(comparar_instantaneas(antes, despues))
+
+        txt_resultado.config(state=tk.NORMAL)
+        txt_resultado.delete(1.0, tk.END)
+        txt_resultado.insert(tk.END, formatear_diferencia(diferencia_actual))
+        txt_resultado.config(state=tk.DISABLED)
+
+    def exportar_json():
+        """
+        Guarda la última diferencia calculada en un archivo JSON.
+
+        Returns:
+            None
+        """
+        if not diferencia_actual:
+            messagebox.showwarning(
+                "Sin Datos",
+                "Primero compara dos instantáneas.",
+                parent=comparador_win
+            )
+            return
+
+        ruta = filedialog.asksaveasfilename(
+            parent=comparador_win,
+            defaultextension=".json",
+            initialdir=obtener_directorio_datos('instantaneas'),
+            initialfile="diferencia.json",
+            filetypes=[("JSON", "*.json")]
+        )
+        if not ruta:
+            return
+        try:
+            with open(ruta, 'w', encoding='utf-8') as f:
+                json.dump(diferencia_actual, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            messagebox.showerror("Error", f"No se pudo exportar:\n{e}", parent=comparador_win)
+
+    # =============================================================================
+    # SECCIÓN: BOTONES DE CONTROL
+    # =============================================================================
+
+    botones_frame = ttk.Frame(frame)
+    botones_frame.pack(fill=tk.X, pady=5)
+
+    btn_comparar = ttk.Button(botones_frame, text=" Comparar", command=comparar)
+    btn_comparar.pack(side=tk.LEFT, padx=5)
+
+    btn_exportar = ttk.Button(botones_frame, text=" Exportar JSON", command=exportar_json)
+    btn_exportar.pack(side=tk.LEFT, padx=5)
+
+    btn_retroceder = ttk.Button(botones_frame, text=" Retroceder", command=comparador_win.destroy)
+    btn_retroceder.pack(side=tk.RIGHT, padx=5)
@@ -3,6 +3,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import psutil  # pyright: ignore[reportMissingModuleSource] # Biblioteca específica para gestión de procesos
 from .estilo import aplicar_gradiente_y_contenido
+from .mod_instantaneas import guardar_instantanea_actual, abrir_comparador_instantaneas
 
 # =============================================================================
 # FUNCIÓN PRINCIPAL DEL MÓDULO
@@ -342,6 +343,22 @@ def abrir_gestion_procesos(ventana_padre):
     )
     lbl_contador.pack(side=tk.LEFT, padx=20)
     
+    # Botón: Guardar Instantánea
+    btn_instantanea = ttk.Button(
+        botones_frame,
+        text=" Instantánea",
+        command=lambda: guardar_instantanea_actual(procesos_win)
+    )
+    btn_instantanea.pack(side=tk.LEFT, padx=5)
+    
+    # Botón: Comparar Instantáneas
+    btn_comparar = ttk.Button(
+        botones_frame,
+        text=" Comparar",
+        command=lambda: abrir_comparador_instantaneas(procesos_win)
+    )
+    btn_comparar.pack(side=tk.LEFT, padx=5)
+    
     # Botón: Retroceder (NUEVO)
     btn_retroceder = ttk.Button(
         botones_frame,
@@ -1,15 +1,77 @@
 # modulos/mod_shell.py
+import sys
+
+if __name__ == "__main__":
+    # python -m modulos.mod_shell --script comandos.txt ejecuta el archivo
+    # sin abrir ninguna ventana (modulos/lote.py). Se despacha antes de
+    # importar Tk para que funcione también donde Tk no está instalado
+    from .lote import main as main_lote
+    sys.exit(main_lote())
+
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
-import subprocess
 import os
 from .estilo import aplicar_gradiente_y_contenido
+from .listado import formatear_tamano
+from .tabla_virtual import TablaVirtual
+from .mod_transferencias import formatear_duracion
+from .ejecucion import BufferSalida, ErrorComando, ERROR
+from .comandos import SesionShell, COMANDOS_VALIDOS, separar_segundo_plano, describir_trabajo
+from .trabajos import EJECUTANDO
+from .historial import obtener_historial
+from .completado import Completador
+
+# Líneas que conserva el área de salida; al superarlas en más de
+# MARGEN_LINEAS_SALIDA se recortan de golpe las más antiguas
+LIMITE_LINEAS_SALIDA = 5000
+MARGEN_LINEAS_SALIDA = 500
+
+# Caracteres que conserva el área de salida (con su margen de recorte) y
+# longitud máxima de una línea: la salida sin saltos de línea (binarios,
+# minificados) se parte para que ni la memoria ni el ajuste de línea del
+# widget crezcan sin límite
+LIMITE_CARACTERES_SALIDA = 1000000
+MARGEN_CARACTERES_SALIDA = 100000
+MAX_COLUMNAS_SALIDA = 1000
+
+# Texto pendiente de mostrar como mucho (lo que exceda se descarta)
+MAX_BYTES_POR_VOLCADO = 256 * 1024
+
+# Intervalo de volcado del texto pendiente (un fotograma a ~60 Hz)
+INTERVALO_VOLCADO_MS = 16
+
+# Intervalo de refresco del panel de trabajos en segundo plano
+INTERVALO_TRABAJOS_MS = 500
+
+def partir_lineas_largas(texto, columna, maximo=MAX_COLUMNAS_SALIDA):
+    """
+    Inserta saltos de línea en las líneas de más de `maximo` caracteres.
+
+    Args:
+        texto (str): Texto a mostrar
+        columna (int): Caracteres que ya tiene la última línea mostrada
+        maximo (int): Longitud máxima de una línea
+
+    Returns:
+        tuple: (texto partido, caracteres de su última línea)
+    """
+    lineas = texto.split('\n')
+    for i, linea in enumerate(lineas):
+        inicio = columna if i == 0 else 0
+        if inicio + len(linea) > maximo:
+            primero = max(0, maximo - inicio)
+            trozos = [linea[:primero]] + [linea[j:j + maximo] for j in range(primero, len(linea), maximo)]
+            lineas[i] = '\n'.join(trozos)
+    ultima = lineas[-1].rsplit('\n', 1)
+    columna = (columna if len(lineas) == 1 and len(ultima) == 1 else 0) + len(ultima[-1])
+    return '\n'.join(lineas), columna
+
 
 # =============================================================================
 # FUNCIÓN PRINCIPAL DEL MÓDULO
 # =============================================================================
 
-def abrir_shell(ventana_padre):
+def abrir_shell(ventana_padre, limite_lineas=LIMITE_LINEAS_SALIDA):
     """
     Crea y muestra la ventana de la shell educativa.
     
@@ -18,6 +80,7 @@ def abrir_shell(ventana_padre):
     
     Args:
         ventana_padre (tk.Tk): La ventana principal de la aplicación
+        limite_lineas (int): Líneas de historial que conserva el área de salida
     
     Returns:
         None
@@ -29,7 +92,7 @@ def abrir_shell(ventana_padre):
     
     shell_win = tk.Toplevel(ventana_padre)
     shell_win.title("Shell Educativa")
-    shell_win.geometry("700x550")
+    shell_win.geometry("950x550")
     shell_win.resizable(True, True)
     
     # Aplicar fondo gradiente (azul a negro)
@@ -69,9 +132,13 @@ def abrir_shell(ventana_padre):
     lbl_output = ttk.Label(frame, text="Salida de Comandos:", font=('Arial', 10, 'bold'))
     lbl_output.pack(anchor='w', pady=(5, 2))
     
+    # Salida a la izquierda y panel de trabajos a la derecha
+    centro_frame = ttk.Frame(frame)
+    centro_frame.pack(expand=True, fill=tk.BOTH)
+    
     # ScrolledText para mostrar la salida de los comandos
     txt_output = scrolledtext.ScrolledText(
-        frame,
+        centro_frame,
         wrap=tk.WORD,
         height=15,
         state=tk.DISABLED,
@@ -80,7 +147,39 @@ def abrir_shell(ventana_padre):
         fg='#00ff00',  # Texto verde estilo terminal
         insertbackground='white'
     )
-    txt_output.pack(expand=True, fill=tk.BOTH, pady=5)
+    txt_output.pack(expand=True, fill=tk.BOTH, side=tk.LEFT, pady=5)
+    
+    # =============================================================================
+    # SECCIÓN: PANEL DE TRABAJOS EN SEGUNDO PLANO
+    # =============================================================================
+    
+    trabajos_frame = ttk.LabelFrame(centro_frame, text="Trabajos (comando &)", padding="5")
+    trabajos_frame.pack(fill=tk.Y, side=tk.RIGHT, padx=(10, 0), pady=5)
+    
+    tabla_trabajos = TablaVirtual(
+        trabajos_frame,
+        columnas=[
+            {'titulo': "%", 'ancho': 30, 'ancla': 'e', 'valor': lambda t: str(t.numero)},
+            {'titulo': "Comando", 'ancho': None, 'valor': lambda t: t.comando},
+            {'titulo': "Estado", 'ancho': 85, 'valor': lambda t: t.texto_estado()},
+            {'titulo': "Tiempo", 'ancho': 50, 'ancla': 'e', 'valor': lambda t: formatear_duracion(t.duracion())},
+        ],
+        fuente=('Courier', 9)
+    )
+    tabla_trabajos.canvas.config(width=280, height=150)
+    tabla_trabajos.pack(expand=True, fill=tk.BOTH)
+    
+    botones_trabajos = ttk.Frame(trabajos_frame)
+    botones_trabajos.pack(fill=tk.X, pady=(5, 0))
+    
+    btn_fg = ttk.Button(botones_trabajos, text=" Traer (fg)", command=lambda: traer_trabajo())
+    btn_fg.pack(side=tk.LEFT)
+    
+    btn_matar = ttk.Button(botones_trabajos, text=" Matar", command=lambda: matar_trabajo())
+    btn_matar.pack(side=tk.LEFT, padx=5)
+    
+    lbl_trabajos = ttk.Label(botones_trabajos, text="", font=('Arial', 9))
+    lbl_trabajos.pack(side=tk.RIGHT)
     
     # =============================================================================
     # SECCIÓN: ENTRADA DE COMANDOS
@@ -115,6 +214,15 @@ def abrir_shell(ventana_padre):
     )
     btn_ejecutar.pack(side=tk.RIGHT, padx=5)
     
+    # Botón para interrumpir el comando en ejecución (SIGINT y luego SIGTERM)
+    btn_cancelar = ttk.Button(
+        entrada_interna,
+        text=" Cancelar",
+        command=lambda: cancelar_comando()
+    )
+    btn_cancelar.pack(side=tk.RIGHT, padx=5)
+    btn_cancelar.state(['disabled'])
+    
     # =============================================================================
     # SECCIÓN: INFORMACIÓN DE COMANDOS PERMITIDOS
     # =============================================================================
@@ -124,7 +232,7 @@ def abrir_shell(ventana_padre):
     
     info_comandos = ttk.Label(
         info_frame,
-        text=" Comandos permitidos: ls, dir, pwd, echo",
+        text=f" Comandos permitidos: {', '.join(COMANDOS_VALIDOS)}",
         font=('Arial', 9),
         foreground='blue',
         background='#e7f3ff',
@@ -137,12 +245,44 @@ def abrir_shell(ventana_padre):
     # VARIABLES GLOBALES DEL MÓDULO
     # =============================================================================
     
-    # Historial de comandos
-    historial_comandos = []
-    indice_historial = -1
+    # Historial de comandos persistente, compartido por todas las shells (se
+    # carga en segundo plano). posicion_historial es la entrada que muestra
+    # la línea al navegar con las flechas (None: línea nueva)
+    historial = obtener_historial()
+    posicion_historial = None
+    
+    # Búsqueda inversa en el historial (Ctrl-R)
+    busqueda_activa = False
+    consulta_busqueda = ""
+    coincidencia_busqueda = None
+    texto_antes_busqueda = ""
+    
+    # Sesión de la shell: directorio de trabajo propio de esta ventana
+    sesion = SesionShell()
+    
+    # Completado con Tab de comandos y rutas (listados en caché)
+    completador = Completador(sesion, COMANDOS_VALIDOS)
+    
+    # Comando en ejecución (solo uno a la vez)
+    ejecucion_actual = None
+    
+    # Pie con el tiempo y los recursos consumidos tras cada comando
+    mostrar_tiempos = tk.BooleanVar(master=shell_win, value=False)
+    
+    # Intervalo de recogida de la salida del comando en ejecución
+    INTERVALO_SALIDA_MS = 30
+    
+    # Color de la salida de error y de los avisos de texto omitido
+    COLOR_ERROR = '#ff6b6b'
+    COLOR_AVISO = '#ffd166'
     
-    # Lista de comandos permitidos
-    COMANDOS_VALIDOS = ['ls', 'dir', 'pwd', 'echo', 'cd', 'clear']
+    # Texto escrito pero aún no mostrado, por color. Se vuelca en el widget
+    # como mucho una vez por fotograma
+    salida_pendiente = BufferSalida(MAX_BYTES_POR_VOLCADO)
+    volcado_programado = False
+    
+    # Caracteres de la última línea del área de salida (para partir las largas)
+    columna_salida = 0
     
     # =============================================================================
     # FUNCIONES INTERNAS DEL MÓDULO
@@ -159,8 +299,67 @@ def abrir_shell(ventana_padre):
         Returns:
             None
         """
+        nonlocal volcado_programado
+        
+        # Solo se acumula: el widget se actualiza en volcar_salida()
+        salida_pendiente.agregar(color, texto)
+        if not volcado_programado:
+            volcado_programado = True
+            shell_win.after(INTERVALO_VOLCADO_MS, volcar_salida)
+    
+    def aviso_omitidos(cantidad):
+        """
+        Texto del aviso de salida descartada por llegar demasiado deprisa.
+        
+        Args:
+            cantidad (int): Bytes descartados
+        
+        Returns:
+            str: Aviso a mostrar en el área de salida
+        """
+        return f"\n[... {formatear_tamano(cantidad)} de salida omitidos ...]\n"
+    
+    def volcar_salida():
+        """
+        Muestra de una vez todo el texto pendiente y recorta el historial.
+        
+        Los trozos seguidos del mismo color se insertan juntos, las líneas
+        muy largas se parten y lo que excede los límites de líneas o de
+        caracteres se borra en bloque, así que el widget no crece sin límite
+        aunque un comando escriba millones de líneas o ninguna.
+        
+        Returns:
+            None
+        """
+        nonlocal volcado_programado, columna_salida
+        volcado_programado = False
+        if not shell_win.winfo_exists():
+            return
+        
+        trozos, omitidos = salida_pendiente.extraer()
+        if omitidos:
+            trozos.insert(0, (COLOR_AVISO, aviso_omitidos(omitidos)))
+        if not trozos:
+            return
+        
         txt_output.config(state=tk.NORMAL)
-        txt_output.insert(tk.END, texto)
+        color_actual, partes = trozos[0][0], []
+        for color, texto in trozos + [(None, '')]:
+            if color != color_actual:
+                txt_output.tag_configure(color_actual, foreground=color_actual)
+                txt_output.insert(tk.END, ''.join(partes), (color_actual,))
+                color_actual, partes = color, []
+            texto, columna_salida = partir_lineas_largas(texto, columna_salida)
+            partes.append(texto)
+        
+        lineas = int(txt_output.index('end-1c').split('.')[0])
+        if lineas > limite_lineas + MARGEN_LINEAS_SALIDA:
+            txt_output.delete('1.0', f'{lineas - limite_lineas + 1}.0')
+        # count() devuelve una tupla (o None si no hay nada que contar)
+        caracteres = (txt_output.count('1.0', 'end-1c', 'chars') or (0,))[0]
+        if caracteres > LIMITE_CARACTERES_SALIDA + MARGEN_CARACTERES_SALIDA:
+            # Líneas enteras: ninguna pasa de MAX_COLUMNAS_SALIDA caracteres
+            txt_output.delete('1.0', f'1.0 + {caracteres - LIMITE_CARACTERES_SALIDA} chars lineend + 1 chars')
         txt_output.config(state=tk.DISABLED)
         txt_output.see(tk.END)  # Hacer scroll hasta el final
     
@@ -171,36 +370,69 @@ def abrir_shell(ventana_padre):
         Returns:
             None
         """
+        nonlocal columna_salida
+        salida_pendiente.extraer()
+        columna_salida = 0
         txt_output.config(state=tk.NORMAL)
         txt_output.delete(1.0, tk.END)
         txt_output.config(state=tk.DISABLED)
     
-    def ejecutar_comando():
+    def ejecutar_comando(comando_str=None):
         """
         Ejecuta el comando ingresado por el usuario.
         
         Esta función:
         1. Obtiene el comando del campo de entrada
         2. Valida que el comando esté en la lista de permitidos
-        3. Ejecuta el comando usando subprocess
-        4. Muestra la salida en el área de texto
+        3. Lanza el comando sin bloquear la ventana (las órdenes internas en
+           un hilo, los programas externos en un proceso hijo); si termina
+           en '&' lo deja como trabajo en segundo plano
+        4. Programa la recogida de la salida a medida que se produce
         5. Maneja errores y comandos no permitidos
         
+        Args:
+            comando_str (str): Comando a ejecutar (por defecto, el de la entrada)
+        
         Returns:
             None
         """
-        nonlocal indice_historial
+        nonlocal posicion_historial, ejecucion_actual
+        
+        if busqueda_activa:
+            terminar_busqueda(aceptar=True)
         
         # Obtener el comando ingresado
-        comando_str = entry_cmd.get().strip()
+        if comando_str is None:
+            comando_str = entry_cmd.get().strip()
         
         # Validar que no esté vacío
         if not comando_str:
             return
         
+        # Los trabajos en segundo plano se aceptan aunque haya otro comando en marcha
+        linea, segundo_plano = separar_segundo_plano(comando_str)
+        if segundo_plano:
+            historial.agregar(comando_str)
+            posicion_historial = None
+            entry_cmd.delete(0, tk.END)
+            escribir_salida(f"\n$ {comando_str}\n")
+            try:
+                trabajo = sesion.lanzar_en_segundo_plano(linea)
+            except ErrorComando as e:
+                escribir_salida(f" ERROR: {e}\n\n", COLOR_ERROR)
+                return
+            escribir_salida(f"[{trabajo.numero}] {trabajo.comando}\n")
+            refrescar_trabajos(reprogramar=False)
+            return
+        
+        # Solo un comando a la vez: el anterior debe terminar o cancelarse
+        if ejecucion_actual is not None:
+            escribir_salida(" Hay un comando en ejecución. Espera a que termine o pulsa Cancelar.\n", COLOR_ERROR)
+            return
+        
         # Agregar al historial
-        historial_comandos.append(comando_str)
-        indice_historial = len(historial_comandos)
+        historial.agregar(comando_str)
+        posicion_historial = None
         
         # Extraer el comando base (primera palabra)
         comando_base = comando_str.split()[0].lower()
@@ -212,13 +444,12 @@ def abrir_shell(ventana_padre):
             escribir_salida("Pantalla limpiada.\n\n")
             return
         
-        # Validar contra la lista de comandos permitidos
-        if comando_base not in COMANDOS_VALIDOS:
+        # Validar contra la lista de comandos permitidos y preparar la ejecución
+        try:
+            ejecucion = sesion.preparar(comando_str)
+        except ErrorComando as e:
             escribir_salida(f"\n$ {comando_str}\n")
-            escribir_salida(
-                f" ERROR: Comando '{comando_base}' no permitido en esta shell educativa.\n"
-                f" Comandos disponibles: {', '.join(COMANDOS_VALIDOS)}\n\n"
-            )
+            escribir_salida(f" ERROR: {e}\n\n", COLOR_ERROR)
             entry_cmd.delete(0, tk.END)
             return
         
@@ -226,47 +457,158 @@ def abrir_shell(ventana_padre):
         escribir_salida(f"\n$ {comando_str}\n")
         escribir_salida("-" * 60 + "\n")
         
-        try:
-            # Ejecutar el comando
-            # Nota: Usamos shell=True para comandos como 'dir' y 'echo' en Windows
-            resultado = subprocess.run(
-                comando_str,
-                capture_output=True,
-                text=True,
-                shell=True,
-                encoding='utf-8',
-                errors='ignore',
-                timeout=10  # Timeout de 10 segundos
-            )
-            
-            # Obtener la salida estándar y de error
-            salida = resultado.stdout
-            error = resultado.stderr
-            
-            # Mostrar la salida
-            if salida:
-                escribir_salida(salida)
-            
-            # Mostrar errores si existen
-            if error:
-                escribir_salida(f"\n ADVERTENCIA/ERROR:\n{error}\n")
-            
-            # Si no hay salida ni error
-            if not salida and not error:
-                escribir_salida(" Comando ejecutado correctamente (sin salida).\n")
-            
-            escribir_salida("-" * 60 + "\n")
-            
-        except subprocess.TimeoutExpired:
-            escribir_salida(" ERROR: El comando excedió el tiempo límite de ejecución.\n")
-            escribir_salida("-" * 60 + "\n")
-            
-        except Exception as e:
-            escribir_salida(f" ERROR al ejecutar el comando:\n{e}\n")
-            escribir_salida("-" * 60 + "\n")
+        # Ejecutar el comando en segundo plano
+        ejecucion_actual = ejecucion.iniciar()
+        btn_cancelar.state(['!disabled'])
         
         # Limpiar el campo de entrada
         entry_cmd.delete(0, tk.END)
+        
+        seguir_ejecucion(ejecucion, hubo_salida=False)
+    
+    def seguir_ejecucion(ejecucion, hubo_salida):
+        """
+        Vuelca en el área de salida lo que el comando ha escrito.
+        
+        Se vuelve a programar con after() hasta que el comando termina.
+        
+        Args:
+            ejecucion (EjecucionComando): Comando en ejecución
+            hubo_salida (bool): Si el comando ya escribió algo
+        
+        Returns:
+            None
+        """
+        nonlocal ejecucion_actual
+        
+        if not shell_win.winfo_exists():
+            ejecucion.cancelar()
+            return
+        
+        # Comprobar el fin ANTES de vaciar la cola: así no se pierde el último trozo
+        terminado = ejecucion.terminado.is_set()
+        trozos, omitidos = ejecucion.obtener_salida()
+        if omitidos:
+            escribir_salida(aviso_omitidos(omitidos), COLOR_AVISO)
+        for flujo, texto in trozos:
+            escribir_salida(texto, COLOR_ERROR if flujo == ERROR else '#00ff00')
+            hubo_salida = True
+        
+        if not terminado:
+            shell_win.after(INTERVALO_SALIDA_MS, lambda: seguir_ejecucion(ejecucion, hubo_salida))
+            return
+        
+        ejecucion_actual = None
+        btn_cancelar.state(['disabled'])
+        actualizar_prompt()
+        
+        if ejecucion.error is not None:
+            escribir_salida(f" ERROR al ejecutar el comando:\n{ejecucion.error}\n", COLOR_ERROR)
+        elif ejecucion.limites_superados:
+            # El aviso del límite ya está en la salida
+            pass
+        elif ejecucion.cancelado:
+            escribir_salida("\n Comando cancelado.\n", COLOR_ERROR)
+        elif ejecucion.codigo != 0:
+            escribir_salida(f"\n El comando terminó con código {ejecucion.codigo}.\n", COLOR_ERROR)
+        elif not hubo_salida:
+            escribir_salida(" Comando ejecutado correctamente (sin salida).\n")
+        # Con `time` el informe ya forma parte de la salida
+        if mostrar_tiempos.get() and not ejecucion.mostrar_consumo:
+            escribir_salida(f" Tiempo: {ejecucion.consumo.resumen()}\n", COLOR_AVISO)
+        escribir_salida("-" * 60 + "\n")
+    
+    def refrescar_trabajos(reprogramar=True):
+        """
+        Actualiza el panel de trabajos y avisa de los que han terminado.
+        
+        Se vuelve a programar con after() mientras la ventana esté abierta.
+        La tabla solo dibuja las filas visibles, así que el coste no depende
+        del número de trabajos.
+        
+        Args:
+            reprogramar (bool): Si es False solo refresca una vez
+        
+        Returns:
+            None
+        """
+        if not shell_win.winfo_exists():
+            return
+        gestor = sesion.trabajos
+        if tabla_trabajos.registros is not gestor.trabajos:
+            tabla_trabajos.establecer_registros(gestor.trabajos, conservar_posicion=True)
+        else:
+            tabla_trabajos.actualizar()
+        for trabajo in gestor.obtener_terminados():
+            color = '#00ff00' if trabajo.codigo == 0 else COLOR_ERROR
+            escribir_salida(describir_trabajo(trabajo), color)
+        en_marcha = sum(1 for t in gestor.trabajos if t.estado == EJECUTANDO)
+        lbl_trabajos.config(text=f"{en_marcha} en marcha")
+        if reprogramar:
+            shell_win.after(INTERVALO_TRABAJOS_MS, refrescar_trabajos)
+    
+    def trabajo_seleccionado():
+        """
+        Devuelve el trabajo seleccionado en el panel (o None).
+        """
+        indice = tabla_trabajos.seleccion()
+        if indice is not None and indice < len(tabla_trabajos.registros):
+            return tabla_trabajos.registros[indice]
+        return None
+    
+    def traer_trabajo():
+        """
+        Trae a primer plano el trabajo seleccionado (como escribir fg %n).
+        
+        Returns:
+            None
+        """
+        trabajo = trabajo_seleccionado()
+        if trabajo is not None:
+            ejecutar_comando(f"fg %{trabajo.numero}")
+    
+    def matar_trabajo():
+        """
+        Interrumpe el trabajo seleccionado (como escribir kill %n).
+        
+        Returns:
+            None
+        """
+        trabajo = trabajo_seleccionado()
+        if trabajo is not None:
+            trabajo.cancelar()
+    
+    def actualizar_prompt():
+        """
+        Muestra en el prompt la carpeta de trabajo de la sesión (cambia con cd).
+        
+        Returns:
+            None
+        """
+        lbl_prompt.config(text=f"{os.path.basename(sesion.directorio) or sesion.directorio} $")
+    
+    def cancelar_comando():
+        """
+        Interrumpe el comando en ejecución.
+        
+        Returns:
+            None
+        """
+        if ejecucion_actual is not None:
+            ejecucion_actual.cancelar()
+    
+    def interrumpir(event):
+        """
+        Ctrl-C en la entrada: abandona la búsqueda en el historial o cancela
+        el comando si hay uno en ejecución; si no, deja que la entrada copie
+        el texto seleccionado.
+        """
+        if busqueda_activa:
+            terminar_busqueda(aceptar=False)
+            return 'break'
+        if ejecucion_actual is not None:
+            cancelar_comando()
+            return 'break'
     
     def navegar_historial(event):
         """
@@ -278,38 +620,183 @@ def abrir_shell(ventana_padre):
         Returns:
             None
         """
-        nonlocal indice_historial
+        nonlocal posicion_historial
         
-        if not historial_comandos:
-            return
+        if busqueda_activa:
+            terminar_busqueda(aceptar=True)
         
         # Flecha arriba: comando anterior
         if event.keysym == 'Up':
-            if indice_historial > 0:
-                indice_historial -= 1
+            encontrado = historial.anterior(posicion_historial)
+            if encontrado is not None:
+                posicion_historial, comando = encontrado
                 entry_cmd.delete(0, tk.END)
-                entry_cmd.insert(0, historial_comandos[indice_historial])
+                entry_cmd.insert(0, comando)
         
         # Flecha abajo: comando siguiente
-        elif event.keysym == 'Down':
-            if indice_historial < len(historial_comandos) - 1:
-                indice_historial += 1
-                entry_cmd.delete(0, tk.END)
-                entry_cmd.insert(0, historial_comandos[indice_historial])
+        elif event.keysym == 'Down' and posicion_historial is not None:
+            encontrado = historial.siguiente(posicion_historial)
+            entry_cmd.delete(0, tk.END)
+            if encontrado is not None:
+                posicion_historial, comando = encontrado
+                entry_cmd.insert(0, comando)
             else:
-                indice_historial = len(historial_comandos)
-                entry_cmd.delete(0, tk.END)
+                posicion_historial = None
+    
+    def iniciar_busqueda(event=None):
+        """
+        Ctrl-R: empieza la búsqueda inversa en el historial o, si ya está
+        activa, pasa a la coincidencia anterior.
+        
+        Returns:
+            str: 'break' para que la entrada no procese la tecla
+        """
+        nonlocal busqueda_activa, consulta_busqueda, coincidencia_busqueda, texto_antes_busqueda
+        if busqueda_activa:
+            if coincidencia_busqueda is not None:
+                buscar_en_historial(antes_de=coincidencia_busqueda)
+            return 'break'
+        busqueda_activa = True
+        consulta_busqueda = ""
+        coincidencia_busqueda = None
+        texto_antes_busqueda = entry_cmd.get()
+        mostrar_busqueda(encontrado=True)
+        return 'break'
+    
+    def buscar_en_historial(antes_de=None):
+        """
+        Busca la consulta en el historial y muestra la coincidencia en la entrada.
+        
+        Si no hay coincidencia se conserva la anterior, como en bash.
+        
+        Args:
+            antes_de (int): Solo entradas anteriores a esta posición
+        
+        Returns:
+            None
+        """
+        nonlocal coincidencia_busqueda
+        if not consulta_busqueda:
+            mostrar_busqueda(encontrado=True)
+            return
+        encontrado = historial.buscar(consulta_busqueda, antes_de)
+        if encontrado is not None:
+            coincidencia_busqueda, comando = encontrado
+            entry_cmd.delete(0, tk.END)
+            entry_cmd.insert(0, comando)
+            posicion = comando.lower().find(consulta_busqueda.lower())
+            entry_cmd.icursor(posicion)
+        mostrar_busqueda(encontrado=encontrado is not None)
+    
+    def mostrar_busqueda(encontrado):
+        """
+        Muestra la consulta de la búsqueda inversa en el lugar del prompt.
+        """
+        estado = "buscar" if encontrado else "buscar: sin resultados"
+        lbl_prompt.config(text=f"({estado}) `{consulta_busqueda}':")
+    
+    def tecla_en_busqueda(event):
+        """
+        Mientras la búsqueda está activa, las teclas escriben en la consulta.
+        
+        Retroceso la acorta y Escape la abandona; cualquier otra tecla de
+        edición (flechas, Inicio, Tab...) acepta la coincidencia y actúa
+        sobre ella.
+        
+        Args:
+            event: Evento de teclado
+        
+        Returns:
+            str: 'break' si la tecla era para la consulta
+        """
+        nonlocal consulta_busqueda
+        if not busqueda_activa:
+            return None
+        if event.keysym in ('Shift_L', 'Shift_R', 'Control_L', 'Control_R', 'Alt_L', 'Alt_R', 'Caps_Lock'):
+            return 'break'
+        if event.keysym == 'Escape' or (event.keysym == 'g' and event.state & 0x4):
+            # Escape o Ctrl-G: se recupera lo que había escrito
+            terminar_busqueda(aceptar=False)
+            return 'break'
+        if event.keysym == 'BackSpace':
+            consulta_busqueda = consulta_busqueda[:-1]
+            buscar_en_historial()
+            return 'break'
+        if event.char and event.char.isprintable() and not event.state & 0x4:
+            consulta_busqueda += event.char
+            # La coincidencia actual sirve si sigue conteniendo la consulta
+            buscar_en_historial(antes_de=None if coincidencia_busqueda is None else coincidencia_busqueda + 1)
+            return 'break'
+        terminar_busqueda(aceptar=True)
+        return None
+    
+    def terminar_busqueda(aceptar):
+        """
+        Sale de la búsqueda inversa.
+        
+        Args:
+            aceptar (bool): Si es True la coincidencia queda en la entrada y
+                            las flechas siguen desde ella; si no, se
+                            recupera el texto anterior a Ctrl-R
+        
+        Returns:
+            None
+        """
+        nonlocal busqueda_activa, posicion_historial
+        busqueda_activa = False
+        if not aceptar:
+            entry_cmd.delete(0, tk.END)
+            entry_cmd.insert(0, texto_antes_busqueda)
+        elif coincidencia_busqueda is not None:
+            posicion_historial = coincidencia_busqueda
+        actualizar_prompt()
+    
+    def completar_linea(event=None):
+        """
+        Tab: completa el comando o la ruta que termina en el cursor.
+        
+        Si la carpeta aún no está en caché se lee en segundo plano y se
+        vuelve a intentar mientras la línea no cambie. Cuando no se puede
+        completar más y hay varios candidatos, se listan en la salida.
+        
+        Returns:
+            str: 'break' para que Tab no cambie el foco
+        """
+        if busqueda_activa:
+            terminar_busqueda(aceptar=True)
+        linea = entry_cmd.get()
+        cursor = entry_cmd.index(tk.INSERT)
+        resultado = completador.completar(linea, cursor)
+        if resultado is None:
+            def reintentar():
+                if entry_cmd.winfo_exists() and entry_cmd.get() == linea and entry_cmd.index(tk.INSERT) == cursor:
+                    completar_linea()
+            shell_win.after(INTERVALO_VOLCADO_MS, reintentar)
+            return 'break'
+        if resultado.linea != linea:
+            entry_cmd.delete(0, tk.END)
+            entry_cmd.insert(0, resultado.linea)
+            entry_cmd.icursor(resultado.cursor)
+        elif resultado.total > 1:
+            texto = "  ".join(resultado.candidatos)
+            if resultado.total > len(resultado.candidatos):
+                texto += f"  ... y {resultado.total - len(resultado.candidatos)} más"
+            escribir_salida(texto + "\n", COLOR_AVISO)
+        return 'break'
     
     def cerrar_ventana():
         """
         Cierra la ventana de la shell educativa.
         
         Esta función se ejecuta cuando el usuario hace clic en el botón
-        de retroceso.
+        de retroceso. También interrumpe el comando en ejecución y los
+        trabajos en segundo plano.
         
         Returns:
             None
         """
+        cancelar_comando()
+        sesion.trabajos.cancelar_todos()
         shell_win.destroy()
     
     # =============================================================================
@@ -323,6 +810,23 @@ def abrir_shell(ventana_padre):
     entry_cmd.bind("<Up>", navegar_historial)
     entry_cmd.bind("<Down>", navegar_historial)
     
+    # Ctrl-R busca hacia atrás en el historial; mientras tanto las teclas
+    # escriben en la consulta
+    entry_cmd.bind("<Control-r>", iniciar_busqueda)
+    entry_cmd.bind("<KeyPress>", tecla_en_busqueda)
+    
+    # Tab completa comandos y rutas
+    entry_cmd.bind("<Tab>", completar_linea)
+    
+    # Ctrl-C interrumpe el comando en ejecución
+    entry_cmd.bind("<Control-c>", interrumpir)
+    
+    # Doble clic o Enter en un trabajo lo trae a primer plano
+    tabla_trabajos.al_activar(lambda indice: traer_trabajo())
+    
+    # Cerrar con la X de la ventana también interrumpe el comando
+    shell_win.protocol("WM_DELETE_WINDOW", cerrar_ventana)
+    
     # =============================================================================
     # SECCIÓN: BOTONES DE CONTROL
     # =============================================================================
@@ -343,18 +847,52 @@ def abrir_shell(ventana_padre):
         ayuda_texto = """
 COMANDOS DISPONIBLES EN LA SHELL EDUCATIVA:
 
-• ls / dir: Lista los archivos y carpetas del directorio actual
+• ls / dir [-a] [-l] [-R] [rutas]: Lista archivos y carpetas
+  (-a ocultos, -l detalles, -R subcarpetas)
 • pwd: Muestra la ruta del directorio actual
 • echo [texto]: Imprime el texto especificado
+• cd [carpeta | -]: Cambia el directorio actual de la shell
+• cat [-n] [archivos]: Muestra el contenido de archivos
+• grep [-i] [-v] [-n] [-c] patrón: Filtra líneas
+• head [-n N]: Primeras líneas  • wc [-l] [-w] [-c]: Cuenta
+• sort [-r] [-n] [-u]: Ordena líneas
+• a | b: Pasa la salida de a como entrada de b
+• comando &: Ejecuta el comando en segundo plano
+• jobs: Lista los trabajos en segundo plano
+• fg [%n]: Muestra la salida de un trabajo y espera a que termine
+• wait [%n]: Espera a que terminen los trabajos
+• kill %n: Interrumpe un trabajo
+• time comando: Ejecuta el comando (o la tubería) y muestra su tiempo
+  real, CPU de usuario y sistema, memoria máxima y E/S
+• times: Comandos más lentos de la sesión y totales
+• ulimit [-t|-v|-n|-f|-o [valor]]: Límites de CPU (s), memoria (KB),
+  archivos abiertos, tamaño de archivo (KB) y salida (KB) de los
+  comandos siguientes (se pueden bajar, no subir)
+• sleep segundos, yes [texto]: programas externos, para probar
+  los límites, time y los trabajos en segundo plano
 • clear: Limpia la pantalla de la terminal
 
 ATAJOS DE TECLADO:
 • Enter: Ejecutar comando
 • Flecha Arriba/Abajo: Navegar por el historial de comandos
+• Tab: Completar el comando o la ruta (si hay varias opciones, se
+  listan en la salida)
+• Ctrl-R: Buscar hacia atrás en el historial (otra vez Ctrl-R: la
+  coincidencia anterior; Escape: salir sin cambiar la línea)
+• Ctrl-C o Cancelar: Interrumpir el comando en ejecución
 
 NOTAS:
 - Esta es una shell educativa con comandos limitados por seguridad
-- Los comandos se ejecutan en el contexto del sistema operativo actual
+- ls, dir, pwd, echo, cd, cat, los filtros y las órdenes de trabajos se
+  ejecutan dentro de la aplicación, sin crear procesos; el resto se lanza
+  sin pasar por una shell del sistema
+- cat y los filtros solo leen archivos de la carpeta en la que se abrió
+  la shell (y sus subcarpetas)
+- Se ejecutan a la vez como mucho 4 trabajos en segundo plano; los demás
+  esperan en cola. Cada uno guarda los últimos 256 KB de su salida
+- Los programas externos se ejecutan con prioridad baja y con límites
+  (por defecto 60 s de CPU, 2 GB de memoria virtual, 256 archivos, 256 MB
+  por archivo y 64 MB de salida); al alcanzar uno se avisa en la salida
         """
         messagebox.showinfo("Ayuda - Shell Educativa", ayuda_texto, parent=shell_win)
     
@@ -365,6 +903,14 @@ NOTAS:
     )
     btn_ayuda.pack(side=tk.LEFT, padx=5)
     
+    # Casilla: pie de tiempos tras cada comando
+    chk_tiempos = ttk.Checkbutton(
+        botones_frame,
+        text="Mostrar tiempos",
+        variable=mostrar_tiempos
+    )
+    chk_tiempos.pack(side=tk.LEFT, padx=5)
+    
     # Botón: Retroceder (NUEVO)
     btn_retroceder = ttk.Button(
         botones_frame,
@@ -384,7 +930,7 @@ NOTAS:
 ╚════════════════════════════════════════════════════════════╝
 
 Sistema Operativo: {os.name}
-Directorio Actual: {os.getcwd()}
+Directorio Actual: {sesion.directorio}
 
 Escribe 'clear' para limpiar la pantalla o presiona el botón de Ayuda
 para ver los comandos disponibles.
@@ -392,5 +938,12 @@ para ver los comandos disponibles.
 """
     escribir_salida(mensaje_bienvenida)
     
+    # Mostrar la carpeta de trabajo en el prompt
+    actualizar_prompt()
+    
+    # Empezar a refrescar el panel de trabajos
+    refrescar_trabajos()
+    
     # Enfocar el campo de entrada
     entry_cmd.focus()
+
@@ -0,0 +1,163 @@
+import tkinter as tk
+from tkinter import ttk
+from .estilo import aplicar_gradiente_y_contenido
+from .listado import formatear_tamano
+from .tabla_virtual import TablaVirtual
+from .transferencias import obtener_cola_transferencias, EN_CURSO, FALLIDO
+
+# =============================================================================
+# PANEL DE TRANSFERENCIAS
+# =============================================================================
+
+# Intervalo de refresco del progreso
+INTERVALO_TRANSFERENCIAS_MS = 500
+
+# Panel abierto (solo hay uno para toda la aplicación)
+_panel_abierto = None
+
+
+def formatear_duracion(segundos):
+    """
+    Convierte segundos en texto corto (p. ej. "1:05:30" o "4:12").
+
+    Args:
+        segundos (float): Duración (o None si no se conoce)
+
+    Returns:
+        str: Duración formateada
+    """
+    if segundos is None:
+        return ""
+    segundos = int(segundos)
+    horas, resto = divmod(segundos, 3600)
+    minutos, segundos = divmod(resto, 60)
+    return f"{horas}:{minutos:02d}:{segundos:02d}" if horas else f"{minutos}:{segundos:02d}"
+
+
+def texto_progreso(trabajo):
+    if not trabajo.bytes_totales:
+        return trabajo.estado if trabajo.estado != EN_CURSO else "…"
+    porcentaje = trabajo.bytes_copiados * 100 // trabajo.bytes_totales
+    return f"{porcentaje:3d}% de {formatear_tamano(trabajo.bytes_totales)}"
+
+
+def texto_estado(trabajo):
+    if trabajo.estado == FALLIDO and trabajo.error is not None:
+        return f"Error: {trabajo.error.strerror or trabajo.error}"
+    if trabajo.metodo and trabajo.estado == EN_CURSO:
+        return f"{trabajo.estado} ({trabajo.metodo})"
+    return trabajo.estado
+
+
+def abrir_panel_transferencias(ventana_padre):
+    """
+    Muestra el panel con las copias y movimientos en curso.
+
+    Si el panel ya está abierto solo se trae al frente.
+
+    Args:
+        ventana_padre (tk.Tk o tk.Toplevel): Ventana desde la que se abre
+
+    Returns:
+        None
+    """
+    global _panel_abierto
+    if _panel_abierto is not None and _panel_abierto.winfo_exists():
+        _panel_abierto.deiconify()
+        _panel_abierto.lift()
+        return
+
+    cola = obtener_cola_transferencias()
+
+    # =============================================================================
+    # CONFIGURACIÓN DE LA VENTANA
+    # =============================================================================
+
+    panel_win = _panel_abierto = tk.Toplevel(ventana_padre)
+    panel_win.title("Transferencias")
+    panel_win.geometry("850x300")
+    panel_win.resizable(True, True)
+
+    canvas_fondo, frame_grad, mid_color = aplicar_gradiente_y_contenido(panel_win, "#44B3EB", "#000000")
+
+    frame = tk.Frame(frame_grad, bg=mid_color)
+    frame.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
+
+    tabla = TablaVirtual(
+        frame,
+        columnas=[
+            {'titulo': "Tipo", 'ancho': 60, 'valor': lambda t: t.tipo},
+            {'titulo': "Origen → Destino", 'ancho': None, 'valor': lambda t: f"{t.origen} → {t.destino or t.carpeta_destino}"},
+            {'titulo': "Progreso", 'ancho': 140, 'ancla': 'e', 'valor': texto_progreso},
+            {'titulo': "Velocidad", 'ancho': 100, 'ancla': 'e',
+             'valor': lambda t: f"{formatear_tamano(t.velocidad())}/s" if t.inicio else ""},
+            {'titulo': "Restante", 'ancho': 70, 'ancla': 'e', 'valor': lambda t: formatear_duracion(t.eta())},
+            {'titulo': "Estado", 'ancho': 170, 'valor': texto_estado},
+        ],
+        fuente=('Courier', 9)
+    )
+    tabla.pack(expand=True, fill=tk.BOTH, pady=5)
+
+    # =============================================================================
+    # FUNCIONES INTERNAS DEL MÓDULO
+    # =============================================================================
+
+    def refrescar():
+        """
+        Vuelve a dibujar el progreso de los trabajos.
+
+        Se vuelve a programar con after() mientras el panel esté abierto.
+
+        Returns:
+            None
+        """
+        if not panel_win.winfo_exists():
+            return
+        if tabla.registros is not cola.trabajos:
+            tabla.establecer_registros(cola.trabajos, conservar_posicion=True)
+        else:
+            tabla.actualizar()
+        en_curso = sum(1 for t in cola.trabajos if t.estado == EN_CURSO)
+        lbl_estado.config(text=f"{en_curso} en curso, {len(cola.trabajos)} en total")
+        panel_win.after(INTERVALO_TRANSFERENCIAS_MS, refrescar)
+
+    def cancelar_seleccionado():
+        """
+        Cancela el trabajo seleccionado.
+
+        Returns:
+            None
+        """
+        indice = tabla.seleccion()
+        if indice is not None and indice < len(tabla.registros):
+            tabla.registros[indice].cancelar()
+
+    def limpiar():
+        cola.limpiar_terminados()
+        tabla.establecer_registros(cola.trabajos)
+
+    # =============================================================================
+    # SECCIÓN: BOTONES
+    # =============================================================================
+
+    botones_frame = ttk.Frame(frame)
+    botones_frame.pack(fill=tk.X, pady=5)
+
+    btn_cancelar = ttk.Button(botones_frame, text=" Cancelar", command=cancelar_seleccionado)
+    btn_cancelar.pack(side=tk.LEFT, padx=5)
+
+    btn_limpiar = ttk.Button(botones_frame, text=" Quitar terminados", command=limpiar)
+    btn_limpiar.pack(side=tk.LEFT, padx=5)
+
+    lbl_estado = ttk.Label(botones_frame, text="", font=('Arial', 9))
+    lbl_estado.pack(side=tk.LEFT, padx=10)
+
+    # El panel se puede cerrar sin afectar a las transferencias en curso
+    btn_cerrar = ttk.Button(botones_frame, text="⬅ Cerrar", command=panel_win.destroy)
+    btn_cerrar.pack(side=tk.RIGHT, padx=5)
+
+    # =============================================================================
+    # INICIALIZACIÓN
+    # =============================================================================
+
+    refrescar()
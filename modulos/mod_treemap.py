@@ -0,0 +1,337 @@
+import tkinter as tk
+from tkinter import ttk
+import os
+import zlib
+from .estilo import aplicar_gradiente_y_contenido
+from .listado import formatear_tamano
+from .tamanos import CalculadorTamano
+from .treemap import ARCHIVOS, calcular_disposicion, extraer_subarbol
+
+# =============================================================================
+# MAPA DE USO DEL DISCO (TREEMAP)
+# =============================================================================
+
+# Niveles de subcarpetas que se calculan con detalle bajo la carpeta mostrada
+PROFUNDIDAD_MAPA = 3
+
+# Intervalo de redibujado mientras el cálculo avanza
+INTERVALO_MAPA_MS = 300
+
+# Colores por carpeta de primer nivel; los niveles inferiores se aclaran
+PALETA = ['#4e79a7', '#f28e2b', '#e15759', '#76b7b2', '#59a14f',
+          '#edc948', '#b07aa1', '#ff9da7', '#9c755f', '#bab0ac']
+COLOR_ARCHIVOS = '#d9d9d9'
+
+
+def aclarar(color, factor):
+    """
+    Mezcla un color con blanco.
+
+    Args:
+        color (str): Color en formato #rrggbb
+        factor (float): 0 deja el color igual, 1 lo vuelve blanco
+
+    Returns:
+        str: Color resultante en formato #rrggbb
+    """
+    componentes = [int(color[i:i + 2], 16) for i in (1, 3, 5)]
+    return '#' + ''.join(f"{int(c + (255 - c) * factor):02x}" for c in componentes)
+
+
+# =============================================================================
+# FUNCIÓN PRINCIPAL DEL MÓDULO
+# =============================================================================
+
+def abrir_treemap(ventana_padre, raiz):
+    """
+    Crea y muestra el mapa de uso del disco de una carpeta.
+
+    Cada carpeta es un rectángulo de área proporcional a lo que ocupa, con
+    sus subcarpetas dentro. El mapa se dibuja con los totales parciales del
+    cálculo y se va refinando a medida que llegan más tamaños. Un clic en
+    una carpeta la abre en el mapa reutilizando lo ya calculado.
+
+    Args:
+        ventana_padre (tk.Tk o tk.Toplevel): Ventana desde la que se abre
+        raiz (str): Carpeta a mostrar
+
+    Returns:
+        None
+    """
+
+    # =============================================================================
+    # CONFIGURACIÓN DE LA VENTANA
+    # =============================================================================
+
+    mapa_win = tk.Toplevel(ventana_padre)
+    mapa_win.title("Mapa de Uso del Disco")
+    mapa_win.geometry("800x600")
+    mapa_win.resizable(True, True)
+
+    canvas_fondo, frame_grad, mid_color = aplicar_gradiente_y_contenido(mapa_win, "#44B3EB", "#000000")
+
+    frame = tk.Frame(frame_grad, bg=mid_color)
+    frame.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
+
+    ruta_var = tk.StringVar(value=os.path.abspath(raiz))
+    ttk.Entry(frame, textvariable=ruta_var, state='readonly', font=('Courier', 9)).pack(fill=tk.X, pady=(0, 5))
+
+    lienzo = tk.Canvas(frame, bg='white', highlightthickness=0)
+    lienzo.pack(expand=True, fill=tk.BOTH)
+
+    # =============================================================================
+    # ESTADO DEL MAPA
+    # =============================================================================
+
+    # Cálculo en curso para la carpeta mostrada
+    calculo_actual = None
+
+    # Datos con los que se dibuja mientras el cálculo no los supera: lo que
+    # ya se sabía de la carpeta (de una vista anterior) y lo calculado ahora
+    datos_previos = ({}, {})
+    datos_actuales = ({}, {})
+
+    # Datos completos de cada carpeta visitada en esta ventana, para volver
+    # a ellas (con Subir) sin esperar a que se recalculen
+    datos_por_ruta = {}
+
+    # Nodos dibujados en el último redibujado (para localizar clics)
+    nodos_dibujados = []
+
+    # Elementos del canvas reutilizados entre redibujados: en lugar de borrar
+    # y crear rectángulos se cambian sus coordenadas y se ocultan los que
+    # sobran, así el coste depende de los rectángulos visibles
+    rectangulos = []
+    textos = []
+
+    def mezclar(previos, actuales):
+        """
+        Combina dos diccionarios de tamaños quedándose con el mayor.
+
+        Los totales parciales del cálculo en curso solo crecen, así que
+        mientras no alcanzan a los ya conocidos se muestran estos.
+        """
+        if not previos:
+            return actuales
+        mezcla = dict(previos)
+        for clave, tamano in actuales.items():
+            if tamano > mezcla.get(clave, 0):
+                mezcla[clave] = tamano
+        return mezcla
+
+    def color_nodo(nodo):
+        if nodo.clave[-1] == ARCHIVOS:
+            return COLOR_ARCHIVOS
+        # crc32 y no hash(): el hash de las cadenas cambia en cada ejecución
+        base = PALETA[zlib.crc32(nodo.clave[0].encode('utf-8', 'surrogateescape')) % len(PALETA)]
+        return aclarar(base, min(0.7, 0.25 * (nodo.nivel - 1)))
+
+    def etiqueta_nodo(nodo):
+        nombre = "(archivos)" if nodo.clave[-1] == ARCHIVOS else nodo.clave[-1]
+        return f"{nombre} {formatear_tamano(nodo.tamano)}"
+
+    def redibujar():
+        """
+        Recalcula la disposición y mueve los elementos del canvas a su sitio.
+
+        Returns:
+            None
+        """
+        nonlocal nodos_dibujados
+
+        totales = mezclar(datos_previos[0], datos_actuales[0])
+        propios = mezclar(datos_previos[1], datos_actuales[1])
+        ancho = lienzo.winfo_width()
+        alto = lienzo.winfo_height()
+        nodos_dibujados = calcular_disposicion(totales, propios, (), 0, 0, ancho, alto)
+
+        # Los elementos se apilan en el orden en que se crean (rectángulo y
+        # texto de cada índice seguidos) y la disposición va por niveles, de
+        # padres a hijos: cada texto queda sobre su rectángulo y ambos sobre
+        # los del nivel padre sin tener que reordenarlos en cada redibujado
+        while len(rectangulos) < len(nodos_dibujados):
+            rectangulos.append(lienzo.create_rectangle(0, 0, 0, 0, outline='#333333'))
+            textos.append(lienzo.create_text(0, 0, anchor='nw', font=('Arial', 8)))
+
+        for i, nodo in enumerate(nodos_dibujados):
+            lienzo.coords(rectangulos[i], nodo.x, nodo.y, nodo.x + nodo.ancho, nodo.y + nodo.alto)
+            lienzo.itemconfigure(rectangulos[i], fill=color_nodo(nodo), state='normal')
+            texto = etiqueta_nodo(nodo)
+            # Solo se rotula si el nombre cabe (aprox. 6 px por carácter)
+            visible = nodo.alto >= 14 and nodo.ancho >= len(texto) * 6 + 4
+            lienzo.coords(textos[i], nodo.x + 3, nodo.y + 1)
+            lienzo.itemconfigure(textos[i], text=texto if visible else '', state='normal')
+
+        for i in range(len(nodos_dibujados), len(rectangulos)):
+            lienzo.itemconfigure(rectangulos[i], state='hidden')
+            lienzo.itemconfigure(textos[i], state='hidden')
+
+    def seguir_calculo(calculo):
+        """
+        Redibuja periódicamente con el progreso del cálculo.
+
+        Args:
+            calculo (CalculadorTamano): Cálculo en curso
+
+        Returns:
+            None
+        """
+        nonlocal calculo_actual, datos_previos, datos_actuales
+
+        if calculo is not calculo_actual or not mapa_win.winfo_exists():
+            return
+
+        terminado = calculo.terminado.is_set()
+        datos_actuales = calculo.detalle()
+        if terminado and not calculo.cancelado:
+            # El cálculo completo sustituye a lo anterior: las carpetas que
+            # han encogido o desaparecido no deben conservar su tamaño viejo
+            datos_previos = ({}, {})
+        redibujar()
+
+        if not terminado:
+            lbl_estado.config(text=f"Calculando... {formatear_tamano(calculo.total)} "
+                                   f"en {calculo.directorios} carpetas")
+            mapa_win.after(INTERVALO_MAPA_MS, lambda: seguir_calculo(calculo))
+            return
+
+        calculo_actual = None
+        if not calculo.cancelado:
+            datos_por_ruta[calculo.raiz] = datos_actuales
+        lbl_estado.config(text=f"{formatear_tamano(calculo.total)} en {calculo.directorios} carpetas "
+                               f"({calculo.reutilizados} sin cambios)")
+
+    def mostrar_ruta(ruta, previos=None):
+        """
+        Muestra una carpeta en el mapa y lanza su cálculo.
+
+        Args:
+            ruta (str): Carpeta a mostrar
+            previos (tuple): (totales, propios) ya conocidos de la carpeta
+
+        Returns:
+            None
+        """
+        nonlocal calculo_actual, datos_previos, datos_actuales
+
+        if calculo_actual is not None:
+            calculo_actual.cancelar()
+
+        ruta_var.set(ruta)
+        datos_previos = datos_por_ruta.get(ruta) or previos or ({}, {})
+        datos_actuales = ({}, {})
+        redibujar()
+
+        # El cálculo se repite aunque haya datos: con la caché de tamaños
+        # las carpetas sin cambios se resuelven con un stat
+        calculo = calculo_actual = CalculadorTamano(ruta, profundidad=PROFUNDIDAD_MAPA).iniciar()
+        seguir_calculo(calculo)
+
+    def nodo_en(x, y):
+        """
+        Devuelve el nodo más profundo que contiene un punto.
+
+        Args:
+            x, y (int): Coordenadas en el canvas
+
+        Returns:
+            Nodo: Nodo encontrado, o None
+        """
+        encontrado = None
+        for nodo in nodos_dibujados:
+            if nodo.x <= x < nodo.x + nodo.ancho and nodo.y <= y < nodo.y + nodo.alto:
+                if encontrado is None or nodo.nivel > encontrado.nivel:
+                    encontrado = nodo
+        return encontrado
+
+    def abrir_nodo(event):
+        """
+        Abre en el mapa la carpeta pulsada (o su padre si son sus archivos).
+
+        Returns:
+            None
+        """
+        nodo = nodo_en(event.x, event.y)
+        if nodo is None:
+            return
+        clave = nodo.clave[:-1] if nodo.clave[-1] == ARCHIVOS else nodo.clave
+        if not clave:
+            return
+
+        totales = mezclar(datos_previos[0], datos_actuales[0])
+        propios = mezclar(datos_previos[1], datos_actuales[1])
+        mostrar_ruta(os.path.join(ruta_var.get(), *clave), extraer_subarbol(totales, propios, clave))
+
+    def subir():
+        """
+        Muestra en el mapa la carpeta padre de la actual.
+
+        Returns:
+            None
+        """
+        actual = ruta_var.get()
+        padre = os.path.dirname(actual)
+        if padre and padre != actual:
+            mostrar_ruta(padre)
+
+    def describir_nodo(event):
+        """
+        Muestra en la barra de estado la ruta y el tamaño bajo el ratón.
+
+        Returns:
+            None
+        """
+        nodo = nodo_en(event.x, event.y)
+        if nodo is None:
+            lbl_detalle.config(text="")
+            return
+        nombres = [n for n in nodo.clave if n != ARCHIVOS]
+        ruta = os.path.join(ruta_var.get(), *nombres)
+        if nodo.clave[-1] == ARCHIVOS:
+            ruta = os.path.join(ruta, "(archivos sueltos)")
+        lbl_detalle.config(text=f"{ruta}  {formatear_tamano(nodo.tamano)}")
+
+    def cerrar_ventana():
+        """
+        Cierra el mapa y cancela el cálculo en curso.
+
+        Returns:
+            None
+        """
+        if calculo_actual is not None:
+            calculo_actual.cancelar()
+        mapa_win.destroy()
+
+    # =============================================================================
+    # CONFIGURACIÓN DE EVENTOS
+    # =============================================================================
+
+    lienzo.bind('<Button-1>', abrir_nodo)
+    lienzo.bind('<Motion>', describir_nodo)
+    lienzo.bind('<Configure>', lambda e: redibujar())
+    mapa_win.protocol("WM_DELETE_WINDOW", cerrar_ventana)
+
+    # =============================================================================
+    # SECCIÓN: BOTONES Y ESTADO
+    # =============================================================================
+
+    lbl_detalle = ttk.Label(frame, text="", font=('Courier', 9))
+    lbl_detalle.pack(fill=tk.X, pady=(5, 0))
+
+    botones_frame = ttk.Frame(frame)
+    botones_frame.pack(fill=tk.X, pady=5)
+
+    btn_subir = ttk.Button(botones_frame, text="⬆ Subir", command=subir)
+    btn_subir.pack(side=tk.LEFT, padx=5)
+
+    lbl_estado = ttk.Label(botones_frame, text="", font=('Arial', 9))
+    lbl_estado.pack(side=tk.LEFT, padx=10)
+
+    btn_retroceder = ttk.Button(botones_frame, text="⬅ Retroceder", command=cerrar_ventana)
+    btn_retroceder.pack(side=tk.RIGHT, padx=5)
+
+    # =============================================================================
+    # INICIALIZACIÓN
+    # =============================================================================
+
+    mostrar_ruta(ruta_var.get())
@@ -0,0 +1,354 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, font as tkfont
+import os
+from .estilo import aplicar_gradiente_y_contenido
+from .listado import formatear_tamano
+from .vista_previa import (
+    ArchivoMapeado,
+    IndiceLineas,
+    inicio_linea_siguiente,
+    inicio_linea_anterior,
+    leer_lineas,
+    formatear_hex,
+)
+
+# =============================================================================
+# FUNCIÓN PRINCIPAL DEL MÓDULO
+# =============================================================================
+
+# Bytes por fila en la vista hexadecimal
+BYTES_POR_FILA = 16
+
+# Intervalo de comprobación de crecimiento en modo "seguir" y de refresco
+# del progreso del índice
+INTERVALO_SEGUIR_MS = 500
+
+
+def abrir_vista_previa(ventana_padre, ruta):
+    """
+    Crea y muestra la vista previa de un archivo (texto o hexadecimal).
+
+    Solo se leen los bytes de las filas visibles, así que el archivo puede
+    ser mucho mayor que la memoria. Con "Seguir" la vista se queda al final
+    y muestra lo que se va añadiendo, como `tail -f`.
+
+    Args:
+        ventana_padre (tk.Tk o tk.Toplevel): Ventana desde la que se abre
+        ruta (str): Archivo a mostrar
+
+    Returns:
+        None
+    """
+    try:
+        archivo = ArchivoMapeado(ruta)
+    except (OSError, ValueError) as e:
+        messagebox.showerror("Error", f"No se pudo abrir el archivo:\n{e}", parent=ventana_padre)
+        return
+
+    indice = IndiceLineas(archivo)
+    indice.extender()
+
+    # =============================================================================
+    # CONFIGURACIÓN DE LA VENTANA
+    # =============================================================================
+
+    vista_win = tk.Toplevel(ventana_padre)
+    vista_win.title(f"Vista Previa - {os.path.basename(ruta)}")
+    vista_win.geometry("800x550")
+    vista_win.resizable(True, True)
+
+    canvas_fondo, frame_grad, mid_color = aplicar_gradiente_y_contenido(vista_win, "#44B3EB", "#000000")
+
+    frame = tk.Frame(frame_grad, bg=mid_color)
+    frame.pack(expand=True, fill=tk.BOTH, padx=10, pady=10)
+
+    ttk.Label(frame, text=ruta, font=('Courier', 9), relief="sunken", padding=5).pack(fill=tk.X)
+
+    # =============================================================================
+    # SECCIÓN: CONTROLES
+    # =============================================================================
+
+    controles_frame = ttk.Frame(frame)
+    controles_frame.pack(fill=tk.X, pady=5)
+
+    modo_var = tk.StringVar(value='texto')
+    seguir_var = tk.BooleanVar(value=False)
+    linea_var = tk.StringVar()
+
+    # =============================================================================
+    # SECCIÓN: CONTENIDO
+    # =============================================================================
+
+    contenido_frame = ttk.Frame(frame)
+    contenido_frame.pack(expand=True, fill=tk.BOTH)
+
+    fuente = tkfont.Font(family='Courier', size=10)
+    scrollbar = ttk.Scrollbar(contenido_frame, orient=tk.VERTICAL)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    txt_contenido = tk.Text(
+        contenido_frame,
+        wrap=tk.NONE,
+        font=fuente,
+        bg='#f8f9fa',
+        fg='#212529',
+        state=tk.DISABLED,
+        takefocus=1
+    )
+    txt_contenido.pack(expand=True, fill=tk.BOTH, side=tk.LEFT)
+
+    lbl_estado = ttk.Label(frame, text="", font=('Arial', 9))
+    lbl_estado.pack(fill=tk.X, pady=(5, 0))
+
+    # =============================================================================
+    # FUNCIONES INTERNAS DEL MÓDULO
+    # =============================================================================
+
+    # Desplazamiento en bytes de la primera fila visible
+    posicion = 0
+
+    def filas_visibles():
+        return max(1, txt_contenido.winfo_height() // fuente.metrics('linespace'))
+
+    def es_hex():
+        return modo_var.get() == 'hex'
+
+    def dibujar():
+        """
+        Lee y muestra únicamente las filas que caben en la ventana.
+
+        Returns:
+            None
+        """
+        filas = filas_visibles()
+        if es_hex():
+            datos = archivo.leer(posicion, filas * BYTES_POR_FILA)
+            lineas = formatear_hex(datos, posicion, BYTES_POR_FILA)
+            fin = posicion + len(datos)
+        else:
+            lineas, fin = leer_lineas(archivo, posicion, filas)
+
+        txt_contenido.config(state=tk.NORMAL)
+        txt_contenido.delete(1.0, tk.END)
+        txt_contenido.insert(tk.END, '\n'.join(lineas))
+        txt_contenido.config(state=tk.DISABLED)
+
+        if archivo.tamano:
+            scrollbar.set(posicion / archivo.tamano, fin / archivo.tamano)
+        else:
+            scrollbar.set(0, 1)
+        actualizar_estado()
+
+    def actualizar_estado():
+        texto = f"{formatear_tamano(archivo.tamano)}"
+        linea = indice.linea_de(posicion)
+        if linea is not None:
+            texto += f" | línea {linea + 1}"
+        if indice.completo:
+            texto += f" de {indice.total_lineas()}"
+        elif archivo.tamano:
+            texto += f" | indexando líneas... {indice.procesado * 100 // archivo.tamano}%"
+        if seguir_var.get():
+            texto += " | siguiendo"
+        lbl_estado.config(text=texto)
+
+    def alinear(nueva):
+        """Ajusta un desplazamiento al inicio de una fila del modo actual."""
+        nueva = max(0, min(nueva, archivo.tamano))
+        if es_hex():
+            return nueva - nueva % BYTES_POR_FILA
+        if nueva >= archivo.tamano:
+            return inicio_linea_anterior(archivo, archivo.tamano)
+        # Inicio de la línea que contiene `nueva` (el '\n' previo más cercano)
+        return inicio_linea_anterior(archivo, nueva + 1)
+
+    def desplazar_filas(filas):
+        """
+        Desplaza la vista un número de filas.
+
+        Args:
+            filas (int): Filas a desplazar (negativo hacia arriba)
+
+        Returns:
+            None
+        """
+        nonlocal posicion
+        if es_hex():
+            posicion = alinear(posicion + filas * BYTES_POR_FILA)
+        else:
+            for _ in range(abs(filas)):
+                if filas > 0:
+                    siguiente = inicio_linea_siguiente(archivo, posicion)
+                    if siguiente >= archivo.tamano:
+                        break
+                    posicion = siguiente
+                else:
+                    if posicion == 0:
+                        break
+                    posicion = inicio_linea_anterior(archivo, posicion)
+        dibujar()
+
+    def ir_inicio():
+        nonlocal posicion
+        seguir_var.set(False)
+        posicion = 0
+        dibujar()
+
+    def ir_final():
+        """
+        Muestra las últimas filas del archivo.
+
+        Returns:
+            None
+        """
+        nonlocal posicion
+        filas = filas_visibles()
+        if es_hex():
+            ultima = max(0, archivo.tamano - 1)
+            posicion = max(0, ultima - ultima % BYTES_POR_FILA - (filas - 1) * BYTES_POR_FILA)
+        else:
+            posicion = archivo.tamano
+            for _ in range(filas):
+                if posicion == 0:
+                    break
+                posicion = inicio_linea_anterior(archivo, posicion)
+        dibujar()
+
+    def ir_a_linea():
+        """
+        Salta a la línea escrita (si el índice ya llegó hasta ella).
+
+        Returns:
+            None
+        """
+        nonlocal posicion
+        try:
+            linea = int(linea_var.get()) - 1
+        except ValueError:
+            return
+        destino = indice.desplazamiento_de(max(0, linea))
+        if destino is None:
+            messagebox.showinfo(
+                "Línea no disponible",
+                "El índice de líneas todavía no ha llegado hasta esa línea.",
+                parent=vista_win
+            )
+            return
+        seguir_var.set(False)
+        modo_var.set('texto')
+        posicion = destino
+        dibujar()
+
+    def scroll(accion, cantidad, unidad=None):
+        """
+        Atiende la barra de desplazamiento (proporcional al tamaño en bytes).
+        """
+        nonlocal posicion
+        if accion == 'moveto':
+            posicion = alinear(int(float(cantidad) * archivo.tamano))
+            dibujar()
+        elif accion == 'scroll':
+            pasos = int(cantidad)
+            if unidad == 'pages':
+                pasos *= max(1, filas_visibles() - 1)
+            desplazar_filas(pasos)
+
+    def cambiar_modo():
+        nonlocal posicion
+        posicion = alinear(posicion)
+        dibujar()
+
+    def seguir():
+        """
+        Comprueba si el archivo creció y, en modo "seguir", muestra el final.
+
+        Solo se indexan los bytes añadidos; si el archivo se truncó (p. ej.
+        rotación de logs) el índice se rehace desde el principio.
+
+        Returns:
+            None
+        """
+        nonlocal posicion
+        if not vista_win.winfo_exists():
+            return
+        vista_win.after(INTERVALO_SEGUIR_MS, seguir)
+
+        if seguir_var.get():
+            try:
+                diferencia = archivo.remapear()
+            except (OSError, ValueError):
+                diferencia = 0
+            if diferencia < 0:
+                posicion = 0
+                indice.reiniciar()
+            elif diferencia > 0:
+                indice.extender()
+            if diferencia:
+                ir_final()
+                return
+        if not indice.completo or seguir_var.get():
+            actualizar_estado()
+
+    def activar_seguir():
+        if seguir_var.get():
+            ir_final()
+
+    def cerrar_ventana():
+        """
+        Cierra la vista previa liberando la proyección del archivo.
+
+        Returns:
+            None
+        """
+        indice.detener()
+        vista_win.destroy()
+        archivo.cerrar()
+
+    # =============================================================================
+    # CONFIGURACIÓN DE EVENTOS
+    # =============================================================================
+
+    scrollbar.config(command=scroll)
+    txt_contenido.bind('<Configure>', lambda e: dibujar())
+    txt_contenido.bind('<MouseWheel>', lambda e: desplazar_filas(-3 if e.delta > 0 else 3) or 'break')
+    txt_contenido.bind('<Button-4>', lambda e: desplazar_filas(-3) or 'break')
+    txt_contenido.bind('<Button-5>', lambda e: desplazar_filas(3) or 'break')
+    txt_contenido.bind('<Up>', lambda e: desplazar_filas(-1) or 'break')
+    txt_contenido.bind('<Down>', lambda e: desplazar_filas(1) or 'break')
+    txt_contenido.bind('<Prior>', lambda e: desplazar_filas(-(filas_visibles() - 1)) or 'break')
+    txt_contenido.bind('<Next>', lambda e: desplazar_filas(filas_visibles() - 1) or 'break')
+    txt_contenido.bind('<Control-Home>', lambda e: ir_inicio() or 'break')
+    txt_contenido.bind('<Control-End>', lambda e: ir_final() or 'break')
+    txt_contenido.bind('<Button-1>', lambda e: txt_contenido.focus_set())
+    vista_win.protocol("WM_DELETE_WINDOW", cerrar_ventana)
+
+    # =============================================================================
+    # SECCIÓN: BOTONES
+    # =============================================================================
+
+    ttk.Radiobutton(controles_frame, text="Texto", value='texto', variable=modo_var,
+                    command=cambiar_modo).pack(side=tk.LEFT, padx=5)
+    ttk.Radiobutton(controles_frame, text="Hex", value='hex', variable=modo_var,
+                    command=cambiar_modo).pack(side=tk.LEFT, padx=5)
+
+    ttk.Button(controles_frame, text="⏮ Inicio", command=ir_inicio).pack(side=tk.LEFT, padx=5)
+    ttk.Button(controles_frame, text="⏭ Final", command=ir_final).pack(side=tk.LEFT, padx=5)
+
+    ttk.Label(controles_frame, text="Línea:").pack(side=tk.LEFT, padx=(10, 2))
+    entrada_linea = ttk.Entry(controles_frame, textvariable=linea_var, width=10)
+    entrada_linea.pack(side=tk.LEFT)
+    entrada_linea.bind('<Return>', lambda e: ir_a_linea())
+    ttk.Button(controles_frame, text="Ir", width=4, command=ir_a_linea).pack(side=tk.LEFT, padx=5)
+
+    ttk.Checkbutton(controles_frame, text="Seguir (tail -f)", variable=seguir_var,
+                    command=activar_seguir).pack(side=tk.LEFT, padx=10)
+
+    btn_retroceder = ttk.Button(controles_frame, text="⬅ Retroceder", command=cerrar_ventana)
+    btn_retroceder.pack(side=tk.RIGHT, padx=5)
+
+    # =============================================================================
+    # INICIALIZACIÓN
+    # =============================================================================
+
+    txt_contenido.focus_set()
+    seguir()
@@ -0,0 +1,170 @@
+import threading
+import time
+from collections import deque
+import psutil # pyright: ignore[reportMissingModuleSource]
+
+# =============================================================================
+# MUESTREO PERIÓDICO DE MEMORIA, DISCO Y PROCESOS
+# =============================================================================
+# Un hilo en segundo plano toma muestras periódicas y las guarda en buffers
+# circulares (deque con maxlen), de modo que el historial ocupa memoria
+# constante. Las claves que desaparecen de un lote (procesos que terminaron
+# o bajaron del umbral, discos desmontados) se descartan con su buffer.
+# Cada lote de muestras se entrega a los suscriptores (por ejemplo, el
+# motor de alertas) en el mismo hilo del muestreador, nunca en el de Tk.
+
+INTERVALO_SISTEMA = 1.0     # segundos entre muestras de memoria y disco
+INTERVALO_PROCESOS = 5.0    # segundos entre recorridos de procesos (más caros)
+CAPACIDAD_HISTORIAL = 300   # muestras guardadas por métrica
+
+
+class Muestreador:
+    """
+    Toma muestras periódicas del sistema en un hilo demonio.
+
+    Cada muestra es un lote (metrica, instante, valores) donde `valores` es un
+    diccionario clave -> valor:
+        - 'memoria': {'': porcentaje usado}
+        - 'disco':   {punto_montaje: porcentaje usado}
+        - 'rss':     {"pid nombre": bytes} solo para procesos cuyo RSS supera
+                     `umbral_rss`, para no pasar miles de valores irrelevantes
+    """
+
+    def __init__(self, intervalo=INTERVALO_SISTEMA, intervalo_procesos=INTERVALO_PROCESOS,
+                 capacidad=CAPACIDAD_HISTORIAL):
+        self.intervalo = intervalo
+        self.intervalo_procesos = intervalo_procesos
+        self.capacidad = capacidad
+        self.umbral_rss = None
+        self.historial = {}
+        # Claves presentes en el último lote de cada métrica
+        self._claves = {}
+        self._suscriptores = []
+        self._detener = threading.Event()
+        self._hilo = None
+        self._lock = threading.Lock()
+
+    def suscribir(self, callback):
+        """
+        Registra una función que recibirá cada lote de muestras.
+
+        Args:
+            callback (callable): Función (metrica, instante, valores)
+
+        Returns:
+            None
+        """
+        self._suscriptores.append(callback)
+
+    def iniciar(self):
+        """
+        Arranca el hilo de muestreo si no está ya en marcha.
+
+        Returns:
+            None
+        """
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._bucle, name="muestreador", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """
+        Detiene el hilo de muestreo.
+
+        Returns:
+            None
+        """
+        self._detener.set()
+
+    def ultimas(self, metrica, clave=''):
+        """
+        Devuelve una copia del buffer circular de una métrica.
+
+        Args:
+            metrica (str): Nombre de la métrica ('memoria', 'disco', 'rss')
+            clave (str): Clave dentro de la métrica
+
+        Returns:
+            list: Lista de tuplas (instante, valor), de la más antigua a la más reciente
+        """
+        with self._lock:
+            return list(self.historial.get((metrica, clave), ()))
+
+    def _registrar(self, metrica, instante, valores):
+        """
+        Guarda un lote en los buffers circulares y lo entrega a los suscriptores.
+
+        Cada lote trae todas las claves vigentes de la métrica, así que los
+        buffers de las claves que faltan se eliminan: con la rotación de
+        procesos, el historial de 'rss' crecería sin límite.
+        """
+        with self._lock:
+            for clave in self._claves.get(metrica, set()).difference(valores):
+                self.historial.pop((metrica, clave), None)
+            self._claves[metrica] = set(valores)
+            for clave, valor in valores.items():
+                buffer = self.historial.get((metrica, clave))
+                if buffer is None:
+                    buffer = self.historial[(metrica, clave)] = deque(maxlen=self.capacidad)
+                buffer.append((instante, valor))
+
+        for callback in self._suscriptores:
+            try:
+                callback(metrica, instante, valores)
+            except Exception as e:
+                print(f"Error en suscriptor del muestreador: {e}")
+
+    def _muestrear_sistema(self, instante):
+        self._registrar('memoria', instante, {'': psutil.virtual_memory().percent})
+
+        discos = {}
+        for particion in psutil.disk_partitions():
+            try:
+                discos[particion.mountpoint] = psutil.disk_usage(particion.mountpoint).percent
+            except Exception:
+                continue
+        self._registrar('disco', instante, discos)
+
+    def _muestrear_procesos(self, instante):
+        umbral = self.umbral_rss
+        if umbral is None:
+            return
+
+        excesos = {}
+        for proc in psutil.process_iter(['pid', 'name', 'memory_info']):
+            memoria = proc.info.get('memory_info')
+            if memoria is not None and memoria.rss > umbral:
+                excesos[f"{proc.info['pid']} {proc.info.get('name') or ''}"] = memoria.rss
+        self._registrar('rss', instante, excesos)
+
+    def _bucle(self):
+        proximo_procesos = 0.0
+        while not self._detener.is_set():
+            instante = time.monotonic()
+            try:
+                self._muestrear_sistema(instante)
+                if instante >= proximo_procesos:
+                    proximo_procesos = instante + self.intervalo_procesos
+                    self._muestrear_procesos(instante)
+            except Exception as e:
+                print(f"Error al muestrear el sistema: {e}")
+            self._detener.wait(self.intervalo)
+
+
+# Instancia compartida por toda la aplicación
+_muestreador = None
+
+
+def obtener_muestreador():
+    """
+    Devuelve el muestreador compartido de la aplicación, creándolo si hace falta.
+
+    Returns:
+        Muestreador: La instancia compartida
+    """
+    global _muestreador
+    if _muestreador is None:
+        _muestreador = Muestreador()
+    return _muestreador
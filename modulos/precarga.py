@@ -0,0 +1,232 @@
+import os
+import sys
+import threading
+import time
+from collections import deque
+from itertools import islice
+import psutil # pyright: ignore[reportMissingModuleSource]
+from .listado import crear_entrada, clave_orden, firma_directorio
+
+# =============================================================================
+# PRECARGA ESPECULATIVA DE LISTADOS DE SUBCARPETAS
+# =============================================================================
+# Al navegar, lo habitual es entrar en una de las carpetas que se están
+# viendo. Cuando termina de cargarse una carpeta, un hilo de baja prioridad
+# lee las primeras subcarpetas (y, antes que ninguna, la seleccionada) y
+# guarda sus listados en la caché de listados compartida: el siguiente doble
+# clic encuentra el listado con su firma vigente y lo muestra sin tocar el
+# disco.
+#
+# La precarga está acotada (pocas carpetas por tanda, ninguna enorme), se
+# cancela al navegar para no competir con la carga visible y no se hace en
+# sistemas de archivos remotos o FUSE, ni durante un rato en un dispositivo
+# donde una lectura completa resultó lenta.
+
+# Subcarpetas precargadas como mucho tras cargar una carpeta
+PRECARGA_MAX_DIRECTORIOS = 8
+
+# Las carpetas con más entradas no se precargan (se cargan por lotes al entrar)
+PRECARGA_MAX_ENTRADAS = 20000
+
+# Una lectura completa que tarde más que esto y más de PRECARGA_UMBRAL_ENTRADA
+# segundos por entrada desactiva la precarga en su dispositivo durante
+# PRECARGA_ESPERA_LENTO segundos (después se vuelve a probar)
+PRECARGA_UMBRAL_LENTO = 0.5
+PRECARGA_UMBRAL_ENTRADA = 0.001
+PRECARGA_ESPERA_LENTO = 60.0
+
+# Valor de nice del hilo de precarga (solo Linux: el nice es por hilo)
+PRECARGA_NICE = 19
+
+# Tipos de sistema de archivos en los que no se precarga
+TIPOS_REMOTOS = {
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'sshfs', '9p', 'afs', 'ncpfs',
+    'davfs', 'ceph', 'glusterfs', 'lustre', 'gpfs',
+}
+
+
+def es_montaje_lento(ruta, particiones=None):
+    """
+    Indica si una ruta está en un sistema de archivos remoto o FUSE.
+
+    Args:
+        ruta (str): Ruta a comprobar
+        particiones (list): Resultado de psutil.disk_partitions(all=True)
+                            (se consulta si no se pasa)
+
+    Returns:
+        bool: True si el punto de montaje que la contiene es remoto o FUSE
+    """
+    if particiones is None:
+        particiones = psutil.disk_partitions(all=True)
+    ruta = os.path.realpath(ruta)
+    mejor, tipo = '', ''
+    for particion in particiones:
+        punto = particion.mountpoint
+        dentro = ruta == punto or ruta.startswith(punto.rstrip(os.sep) + os.sep)
+        if dentro and len(punto) > len(mejor):
+            mejor, tipo = punto, particion.fstype.lower()
+    return tipo in TIPOS_REMOTOS or tipo.startswith('fuse')
+
+
+class PrecargadorListados:
+    """
+    Lee en segundo plano listados de subcarpetas y los guarda en la caché.
+
+    Hay un único hilo por precargador que atiende una cola corta: programar()
+    sustituye la tanda pendiente y, con `prioritario`, pone una carpeta
+    delante de las demás. Cancelar invalida también la lectura en curso.
+    """
+
+    def __init__(self, cache, max_directorios=PRECARGA_MAX_DIRECTORIOS, max_entradas=PRECARGA_MAX_ENTRADAS,
+                 umbral_lento=PRECARGA_UMBRAL_LENTO, umbral_entrada=PRECARGA_UMBRAL_ENTRADA,
+                 espera_lento=PRECARGA_ESPERA_LENTO):
+        self.cache = cache
+        self.max_directorios = max_directorios
+        self.max_entradas = max_entradas
+        self.umbral_lento = umbral_lento
+        self.umbral_entrada = umbral_entrada
+        self.espera_lento = espera_lento
+        self.precargados = 0
+        self._pendientes = deque()
+        self._generacion = 0
+        self._detenido = False
+        self._condicion = threading.Condition()
+        self._hilo = None
+        # Dispositivo (st_dev) -> True si es un montaje remoto o FUSE
+        self._dispositivos_lentos = {}
+        # Dispositivo (st_dev) -> instante (monotonic) hasta el que no se
+        # precarga en él porque una lectura resultó lenta
+        self._lentos_hasta = {}
+
+    def programar(self, directorio, nombres, prioritario=False):
+        """
+        Encola la precarga de subcarpetas de un directorio.
+
+        Args:
+            directorio (str): Carpeta que contiene las subcarpetas
+            nombres (iterable): Nombres de las subcarpetas, en orden de
+                                preferencia (solo se toman las primeras)
+            prioritario (bool): Si es True se añaden delante de la tanda
+                                pendiente en lugar de sustituirla
+
+        Returns:
+            None
+        """
+        rutas = [os.path.join(directorio, nombre) for nombre in islice(nombres, self.max_directorios)]
+        with self._condicion:
+            if self._detenido:
+                return
+            if prioritario:
+                for ruta in reversed(rutas):
+                    if ruta in self._pendientes:
+                        self._pendientes.remove(ruta)
+                    self._pendientes.appendleft(ruta)
+                while len(self._pendientes) > 2 * self.max_directorios:
+                    self._pendientes.pop()
+            else:
+                self._generacion += 1
+                self._pendientes.clear()
+                self._pendientes.extend(rutas)
+            self._condicion.notify()
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._trabajar, name="precarga-listados", daemon=True)
+            self._hilo.start()
+
+    def cancelar(self):
+        """
+        Descarta la tanda pendiente y abandona la lectura en curso.
+
+        Returns:
+            None
+        """
+        with self._condicion:
+            self._generacion += 1
+            self._pendientes.clear()
+
+    def detener(self):
+        """
+        Cancela todo y termina el hilo.
+
+        Returns:
+            None
+        """
+        with self._condicion:
+            self._detenido = True
+            self._generacion += 1
+            self._pendientes.clear()
+            self._condicion.notify()
+
+    def _trabajar(self):
+        try:
+            # En Linux cada hilo tiene su propio nice; en otros sistemas
+            # esto cambiaría el proceso entero o no existe
+            if sys.platform.startswith('linux'):
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), PRECARGA_NICE)
+        except (AttributeError, OSError):
+            pass
+
+        while True:
+            with self._condicion:
+                while not self._pendientes and not self._detenido:
+                    self._condicion.wait()
+                if self._detenido:
+                    return
+                ruta = self._pendientes.popleft()
+                generacion = self._generacion
+            self._precargar(ruta, generacion)
+
+    def _lento(self, dispositivo, ruta):
+        hasta = self._lentos_hasta.get(dispositivo)
+        if hasta is not None:
+            if time.monotonic() < hasta:
+                return True
+            del self._lentos_hasta[dispositivo]
+        lento = self._dispositivos_lentos.get(dispositivo)
+        if lento is None:
+            try:
+                lento = es_montaje_lento(ruta)
+            except OSError:
+                lento = True
+            self._dispositivos_lentos[dispositivo] = lento
+        return lento
+
+    def _precargar(self, ruta, generacion):
+        """
+        Lee un directorio y guarda su listado, salvo que ya esté en caché,
+        sea demasiado grande, esté en un montaje lento o se cancele.
+        """
+        try:
+            firma = firma_directorio(ruta)
+        except OSError:
+            return
+        if self._lento(firma[2], ruta):
+            return
+        listado = self.cache.obtener(ruta)
+        if listado is not None and listado.firma == firma:
+            return
+
+        inicio = time.monotonic()
+        entradas = []
+        try:
+            with os.scandir(ruta) as it:
+                for entry in it:
+                    if self._generacion != generacion or len(entradas) >= self.max_entradas:
+                        return
+                    entradas.append(crear_entrada(entry))
+        except OSError:
+            return
+
+        # Solo cuenta una lectura terminada: una cancelada o fallida no dice
+        # nada del dispositivo, y una carpeta grande tarda por tener muchas
+        # entradas, no por estar en un disco lento
+        duracion = time.monotonic() - inicio
+        if duracion > self.umbral_lento and duracion > self.umbral_entrada * max(1, len(entradas)):
+            self._lentos_hasta[firma[2]] = time.monotonic() + self.espera_lento
+
+        entradas.sort(key=clave_orden)
+        with self._condicion:
+            if self._generacion != generacion:
+                return
+        self.cache.guardar(ruta, firma, entradas)
+        self.precargados += 1
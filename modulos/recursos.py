@@ -0,0 +1,437 @@
+import heapq
+import itertools
+import os
+import signal
+import sys
+import threading
+import time
+import psutil # pyright: ignore[reportMissingModuleSource]
+from .listado import formatear_tamano
+
+try:
+    import resource
+except ImportError:
+    # Windows: no hay getrusage; solo se mide el tiempo real
+    resource = None
+
+# =============================================================================
+# CONSUMO DE RECURSOS DE LOS COMANDOS DE LA SHELL
+# =============================================================================
+# Cada ejecución lleva la cuenta de lo que ha consumido:
+#
+# - Los procesos hijos se recogen con os.wait4(), que devuelve el rusage de
+#   ese proceso concreto (y de los descendientes a los que esperó). A
+#   diferencia de restar dos getrusage(RUSAGE_CHILDREN), no mezcla el
+#   consumo de los trabajos en segundo plano que terminen a la vez.
+# - Las órdenes internas corren en un hilo de la aplicación: se mide la
+#   diferencia de getrusage(RUSAGE_THREAD) de ese hilo (solo en Linux).
+#
+# `time comando` escribe el informe al terminar, la ventana puede añadir
+# un pie con el resumen a cada comando y `times` lista los comandos más
+# lentos de la sesión.
+#
+# Además, los procesos que lanza la shell nacen con límites (setrlimit en
+# el hijo, antes del exec): segundos de CPU, espacio de direcciones,
+# descriptores abiertos y tamaño de los archivos que escriben, con
+# prioridad de CPU (nice) y de disco (ionice) bajas. La salida total de
+# cada comando también está acotada: al superarla se detiene. Así un
+# comando desbocado no se come la máquina que el monitor vigila. `ulimit`
+# consulta y cambia los límites de la sesión.
+
+# Comandos que guarda la tabla de los más lentos
+MAX_COMANDOS_LENTOS = 10
+
+# ru_maxrss está en KB en Linux y en bytes en macOS
+BYTES_MAXRSS = 1 if sys.platform == 'darwin' else 1024
+
+# Límites por defecto de cada comando (None: sin límite)
+LIMITE_CPU = 60                               # segundos de CPU
+LIMITE_MEMORIA = 2 * 1024 * 1024 * 1024       # espacio de direcciones, bytes
+LIMITE_ARCHIVOS = 256                         # descriptores abiertos
+LIMITE_TAMANO_ARCHIVO = 256 * 1024 * 1024     # por archivo escrito, bytes
+LIMITE_SALIDA = 64 * 1024 * 1024              # salida y errores, bytes
+
+# Cuánto se baja la prioridad de los procesos hijos
+INCREMENTO_NICE = 10
+
+# Segundos de CPU entre el aviso (SIGXCPU) y el SIGKILL del sistema
+MARGEN_CPU = 5
+
+
+def uso_hilo():
+    """
+    Recursos consumidos hasta ahora por el hilo actual.
+
+    Returns:
+        resource.struct_rusage: Uso del hilo, o None si el sistema no lo mide
+    """
+    if resource is None or not hasattr(resource, 'RUSAGE_THREAD'):
+        return None
+    return resource.getrusage(resource.RUSAGE_THREAD)
+
+
+def formatear_segundos(segundos):
+    """Segundos al estilo de `time` de bash: 0m1.234s."""
+    minutos, segundos = divmod(segundos, 60)
+    return f"{int(minutos)}m{segundos:.3f}s"
+
+
+class ConsumoRecursos:
+    """
+    Tiempo real, CPU de usuario y de sistema, memoria máxima y operaciones
+    de E/S de bloque de una ejecución. Seguro entre hilos.
+
+    `max_rss` es el del mayor proceso hijo (None si no hubo procesos, el
+    sistema no lo mide o no superó el de la propia aplicación); `medido`
+    indica si hay datos de CPU.
+    """
+
+    def __init__(self):
+        self.inicio = None
+        self.real = None
+        self.usuario = 0.0
+        self.sistema = 0.0
+        self.max_rss = None
+        self.lecturas = 0
+        self.escrituras = 0
+        self.procesos = 0
+        self.medido = False
+        self._lock = threading.Lock()
+
+    def iniciar(self):
+        """Empieza a contar el tiempo real."""
+        self.inicio = time.monotonic()
+
+    def terminar(self):
+        """Fija el tiempo real transcurrido."""
+        if self.inicio is not None:
+            self.real = time.monotonic() - self.inicio
+
+    def duracion(self):
+        """
+        Segundos transcurridos (hasta ahora o hasta que terminó).
+
+        Returns:
+            float: Tiempo real, o None si no ha empezado
+        """
+        if self.real is not None:
+            return self.real
+        return None if self.inicio is None else time.monotonic() - self.inicio
+
+    def sumar_proceso(self, uso):
+        """
+        Suma el rusage de un proceso hijo devuelto por os.wait4().
+
+        Args:
+            uso (resource.struct_rusage): Uso del proceso (None: se ignora)
+
+        Returns:
+            None
+        """
+        if uso is None:
+            return
+        # El pico de un hijo nunca baja del de la aplicación que lo lanzó (el
+        # exec parte de su memoria); por debajo de ese valor no es suyo
+        propio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        with self._lock:
+            self._sumar(uso.ru_utime, uso.ru_stime, uso.ru_inblock, uso.ru_oublock)
+            self.procesos += 1
+            if uso.ru_maxrss > propio:
+                self.max_rss = max(self.max_rss or 0, uso.ru_maxrss * BYTES_MAXRSS)
+
+    def sumar_hilo(self, antes):
+        """
+        Suma lo que ha consumido el hilo actual desde `antes`.
+
+        Args:
+            antes (resource.struct_rusage): Resultado de uso_hilo() al empezar
+
+        Returns:
+            None
+        """
+        ahora = uso_hilo()
+        if antes is None or ahora is None:
+            return
+        with self._lock:
+            self._sumar(ahora.ru_utime - antes.ru_utime, ahora.ru_stime - antes.ru_stime,
+                        ahora.ru_inblock - antes.ru_inblock, ahora.ru_oublock - antes.ru_oublock)
+
+    def _sumar(self, usuario, sistema, lecturas, escrituras):
+        self.usuario += usuario
+        self.sistema += sistema
+        self.lecturas += lecturas
+        self.escrituras += escrituras
+        self.medido = True
+
+    def informe(self):
+        """
+        Informe de `time comando`, una medida por línea.
+
+        Returns:
+            str: Texto del informe
+        """
+        lineas = [f"\nreal      {formatear_segundos(self.duracion() or 0.0)}\n"]
+        if self.medido:
+            lineas.append(f"usuario   {formatear_segundos(self.usuario)}\n")
+            lineas.append(f"sistema   {formatear_segundos(self.sistema)}\n")
+        if self.max_rss is not None:
+            lineas.append(f"mem. máx. {formatear_tamano(self.max_rss)}\n")
+        if self.medido:
+            lineas.append(f"E/S       {self.lecturas} lecturas, {self.escrituras} escrituras de bloque\n")
+        return ''.join(lineas)
+
+    def resumen(self):
+        """
+        Resumen de una línea para el pie de cada comando.
+
+        Returns:
+            str: Texto del resumen (sin salto de línea)
+        """
+        partes = [f"real {self.duracion() or 0.0:.3f} s"]
+        if self.medido:
+            partes.append(f"usuario {self.usuario:.3f} s")
+            partes.append(f"sistema {self.sistema:.3f} s")
+        if self.max_rss is not None:
+            partes.append(f"mem. máx. {formatear_tamano(self.max_rss)}")
+        if self.medido:
+            partes.append(f"E/S {self.lecturas}/{self.escrituras} bloques")
+        return ", ".join(partes)
+
+
+class RegistroTiempos:
+    """
+    Comandos terminados de una sesión: totales y los más lentos.
+
+    Solo se guardan los `maximo` de mayor tiempo real (un montículo de
+    mínimos), así que la memoria no crece con el número de comandos.
+    """
+
+    def __init__(self, maximo=MAX_COMANDOS_LENTOS):
+        self.maximo = maximo
+        self.comandos = 0
+        self.total_real = 0.0
+        self.total_cpu = 0.0
+        self._lentos = []
+        self._contador = itertools.count()
+        self._lock = threading.Lock()
+
+    def registrar(self, comando, consumo):
+        """
+        Anota un comando terminado.
+
+        Args:
+            comando (str): Línea del comando
+            consumo (ConsumoRecursos): Su consumo
+
+        Returns:
+            None
+        """
+        real = consumo.duracion() or 0.0
+        with self._lock:
+            self.comandos += 1
+            self.total_real += real
+            self.total_cpu += consumo.usuario + consumo.sistema
+            # El contador desempata sin comparar los consumos
+            elemento = (real, next(self._contador), comando, consumo)
+            if len(self._lentos) < self.maximo:
+                heapq.heappush(self._lentos, elemento)
+            else:
+                heapq.heappushpop(self._lentos, elemento)
+
+    def mas_lentos(self):
+        """
+        Returns:
+            list: Tuplas (comando, ConsumoRecursos), de más a menos lento
+        """
+        with self._lock:
+            return [(comando, consumo) for _, _, comando, consumo in sorted(self._lentos, reverse=True)]
+
+    def tabla(self):
+        """
+        Tabla de `times`: totales de la sesión y los comandos más lentos.
+
+        Returns:
+            list: Líneas de texto
+        """
+        lentos = self.mas_lentos()
+        lineas = [f"Comandos ejecutados: {self.comandos}  ·  tiempo real total: {self.total_real:.3f} s  ·  "
+                  f"CPU total: {self.total_cpu:.3f} s\n"]
+        if not lentos:
+            return lineas
+        lineas.append(f"\n{'real':>10} {'usuario':>9} {'sistema':>9} {'mem. máx.':>10}  comando\n")
+        for comando, consumo in lentos:
+            usuario = f"{consumo.usuario:.3f}" if consumo.medido else "-"
+            sistema = f"{consumo.sistema:.3f}" if consumo.medido else "-"
+            memoria = formatear_tamano(consumo.max_rss) or "-"
+            lineas.append(f"{consumo.duracion() or 0.0:>10.3f} {usuario:>9} {sistema:>9} {memoria:>10}  {comando}\n")
+        return lineas
+
+
+class LimitesRecursos:
+    """
+    Límites que se aplican a los comandos de una sesión.
+
+    Los atributos se pueden cambiar (`ulimit`); cada ejecución se lleva una
+    copia al prepararse, de modo que el cambio afecta a los comandos
+    siguientes y no a los que ya están en marcha. Los valores con los que se
+    crean son el máximo: como un límite duro, se pueden bajar pero no subir
+    por encima de ellos (maximo()).
+    """
+
+    # (atributo, opción de ulimit, descripción, unidad de ulimit en bytes)
+    CAMPOS = [
+        ('cpu', 't', "tiempo de CPU (segundos)", None),
+        ('memoria', 'v', "memoria virtual (KB)", 1024),
+        ('archivos', 'n', "archivos abiertos", None),
+        ('tamano_archivo', 'f', "tamaño de archivo (KB)", 1024),
+        ('salida', 'o', "salida del comando (KB)", 1024),
+    ]
+
+    def __init__(self, cpu=LIMITE_CPU, memoria=LIMITE_MEMORIA, archivos=LIMITE_ARCHIVOS,
+                 tamano_archivo=LIMITE_TAMANO_ARCHIVO, salida=LIMITE_SALIDA, nice=INCREMENTO_NICE):
+        self.cpu = cpu
+        self.memoria = memoria
+        self.archivos = archivos
+        self.tamano_archivo = tamano_archivo
+        self.salida = salida
+        self.nice = nice
+        self._maximos = {atributo: getattr(self, atributo) for atributo, _, _, _ in self.CAMPOS}
+
+    def copia(self):
+        """Devuelve una copia independiente de los límites."""
+        copia = LimitesRecursos(self.cpu, self.memoria, self.archivos, self.tamano_archivo, self.salida, self.nice)
+        copia._maximos = self._maximos
+        return copia
+
+    def maximo(self, atributo):
+        """
+        Valor más alto que admite un límite.
+
+        Args:
+            atributo (str): Atributo de CAMPOS ('cpu', 'memoria'...)
+
+        Returns:
+            int: Máximo en las unidades del atributo, o None si no hay
+        """
+        return self._maximos[atributo]
+
+    def describir(self):
+        """
+        Líneas de `ulimit -a`.
+
+        Returns:
+            list: Una línea por límite
+        """
+        lineas = []
+        for atributo, opcion, descripcion, unidad in self.CAMPOS:
+            valor = getattr(self, atributo)
+            texto = "ilimitado" if valor is None else str(valor // unidad if unidad else valor)
+            lineas.append(f"{descripcion:<28} (-{opcion}) {texto}\n")
+        return lineas
+
+    def funcion_hijo(self):
+        """
+        Prepara la función que Popen ejecuta en el hijo antes del exec
+        (preexec_fn).
+
+        Los valores se calculan aquí, en el proceso padre: en el hijo, recién
+        creado con fork en una aplicación con hilos, solo se hacen las
+        llamadas al sistema (setrlimit y nice), sin importar ni reservar
+        nada más.
+
+        Returns:
+            callable: Función para preexec_fn, o None si no hay nada que aplicar
+                      (o el sistema no admite límites)
+        """
+        if resource is None:
+            return None
+        cambios = []
+        for recurso, valor, margen in ((resource.RLIMIT_CPU, self.cpu, MARGEN_CPU),
+                                       (getattr(resource, 'RLIMIT_AS', None), self.memoria, 0),
+                                       (resource.RLIMIT_NOFILE, self.archivos, 0),
+                                       (resource.RLIMIT_FSIZE, self.tamano_archivo, 0)):
+            if recurso is None or valor is None:
+                continue
+            blando_actual, duro_actual = resource.getrlimit(recurso)
+            # No se puede subir el límite duro (ni el blando por encima de él)
+            duro = valor + margen if duro_actual == resource.RLIM_INFINITY else min(valor + margen, duro_actual)
+            blando = min(valor, duro)
+            if blando_actual != resource.RLIM_INFINITY and blando_actual <= blando:
+                continue
+            cambios.append((recurso, (blando, duro)))
+        nice = self.nice
+        if not cambios and not nice:
+            return None
+        setrlimit = resource.setrlimit
+
+        def aplicar():
+            for recurso, valores in cambios:
+                setrlimit(recurso, valores)
+            if nice:
+                os.nice(nice)
+
+        return aplicar
+
+    def bajar_prioridad_disco(self, pid):
+        """
+        Baja la prioridad de E/S de un proceso recién lanzado (ionice en
+        Linux; en Windows, su clase de prioridad, porque no hay nice).
+
+        Args:
+            pid (int): Proceso hijo
+
+        Returns:
+            None
+        """
+        if not self.nice:
+            return
+        try:
+            proceso = psutil.Process(pid)
+            if os.name == 'nt':
+                proceso.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+            elif hasattr(psutil, 'IOPRIO_CLASS_BE'):
+                # La prioridad más baja de la clase normal (la ociosa podría
+                # no avanzar nunca con el disco ocupado)
+                proceso.ionice(psutil.IOPRIO_CLASS_BE, 7)
+        except (psutil.Error, OSError):
+            # El proceso ya terminó o no se permite el cambio
+            pass
+
+    def mensaje_salida(self):
+        """Aviso de que un comando se detuvo por escribir más de `salida` bytes."""
+        return f"Límite de salida superado ({formatear_tamano(self.salida)}): el comando se ha detenido"
+
+    def motivo_fin(self, codigo, uso):
+        """
+        Explica si un proceso terminó por alcanzar un límite.
+
+        Args:
+            codigo (int): Código de salida (negativo: señal, como en Popen)
+            uso (resource.struct_rusage): Recursos del proceso (o None)
+
+        Returns:
+            str: Mensaje para mostrar, o None
+        """
+        if codigo is None or codigo >= 0:
+            return None
+        senal = -codigo
+        cpu_usada = uso.ru_utime + uso.ru_stime if uso is not None else 0.0
+        if senal == getattr(signal, 'SIGXCPU', None) or (
+                senal == getattr(signal, 'SIGKILL', None) and self.cpu is not None and cpu_usada >= self.cpu):
+            return f"Límite de tiempo de CPU superado ({self.cpu} s): el proceso recibió {nombre_senal(senal)}"
+        if senal == getattr(signal, 'SIGXFSZ', None):
+            return (f"Límite de tamaño de archivo superado ({formatear_tamano(self.tamano_archivo)}): "
+                    f"el proceso recibió SIGXFSZ")
+        if self.memoria is not None and senal in (getattr(signal, 'SIGSEGV', None), getattr(signal, 'SIGABRT', None),
+                                                  getattr(signal, 'SIGBUS', None), getattr(signal, 'SIGKILL', None)):
+            return (f"El proceso terminó por {nombre_senal(senal)}: puede haber superado el límite de "
+                    f"memoria ({formatear_tamano(self.memoria)})")
+        return None
+
+
+def nombre_senal(numero):
+    """Nombre de una señal (SIGXCPU...) o su número si no se conoce."""
+    try:
+        return signal.Signals(numero).name
+    except ValueError:
+        return f"señal {numero}"
@@ -0,0 +1,313 @@
+import tkinter as tk
+from tkinter import ttk, font as tkfont
+
+# =============================================================================
+# TABLA VIRTUALIZADA SOBRE UN CANVAS
+# =============================================================================
+# La tabla no crea un elemento de Tk por registro: guarda una referencia a la
+# lista de registros y mantiene solo un conjunto de textos para las filas que
+# caben en pantalla. Al desplazarse se reescriben esos mismos textos con los
+# registros visibles, así que el coste de dibujar y la memoria de Tk dependen
+# del alto de la ventana y no del número de registros.
+
+
+class TablaVirtual(ttk.Frame):
+    """
+    Tabla de solo lectura que dibuja únicamente las filas visibles.
+
+    Las columnas se describen con diccionarios:
+        {'titulo': str, 'ancho': int o None, 'ancla': 'w' o 'e',
+         'valor': callable(registro) -> str}
+    Una columna con 'ancho' None ocupa el espacio sobrante.
+    """
+
+    def __init__(self, padre, columnas, fuente=('Courier', 10), **kwargs):
+        super().__init__(padre, **kwargs)
+        self.columnas = columnas
+        self.registros = []
+        self.seleccionado = None
+        self.mensaje = None
+        self.primera = 0
+        self._al_activar = None
+        self._al_seleccionar = None
+
+        self.fuente = tkfont.Font(font=fuente)
+        self.alto_fila = self.fuente.metrics('linespace') + 4
+
+        # Encabezado con los títulos de las columnas
+        self.encabezado = tk.Canvas(self, height=self.alto_fila + 2, highlightthickness=0, bg='#dde3ea')
+        self.encabezado.pack(fill=tk.X, side=tk.TOP)
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._desplazar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.canvas = tk.Canvas(self, bg='white', highlightthickness=1, takefocus=1)
+        self.canvas.pack(expand=True, fill=tk.BOTH, side=tk.LEFT)
+
+        # Elementos reutilizados: una fila de textos por fila visible
+        self._seleccion_item = self.canvas.create_rectangle(0, 0, 0, 0, fill='#cce4f7', width=0, state='hidden')
+        self._filas = []
+        self._mensaje_item = self.canvas.create_text(8, 8, anchor='nw', font=self.fuente, fill='#555555')
+        self._posiciones = []
+
+        self.canvas.bind('<Configure>', lambda e: self._recalcular())
+        self.canvas.bind('<Button-1>', self._clic)
+        self.canvas.bind('<Double-1>', self._doble_clic)
+        self.canvas.bind('<MouseWheel>', self._rueda)
+        self.canvas.bind('<Button-4>', lambda e: self.desplazar_filas(-3))
+        self.canvas.bind('<Button-5>', lambda e: self.desplazar_filas(3))
+        for tecla, delta in (('<Up>', -1), ('<Down>', 1), ('<Prior>', None), ('<Next>', None)):
+            self.canvas.bind(tecla, lambda e, d=delta, k=tecla: self._tecla(d, k))
+        self.canvas.bind('<Home>', lambda e: self.seleccionar(0))
+        self.canvas.bind('<End>', lambda e: self.seleccionar(len(self.registros) - 1))
+        self.canvas.bind('<Return>', lambda e: self._activar())
+
+    # -------------------------------------------------------------------------
+    # API pública
+    # -------------------------------------------------------------------------
+
+    def establecer_registros(self, registros, conservar_posicion=False):
+        """
+        Asigna la lista de registros a mostrar (se guarda por referencia).
+
+        Args:
+            registros (list): Lista de registros; la tabla la lee, no la copia
+            conservar_posicion (bool): Si es True mantiene el desplazamiento
+                                       y la selección actuales
+
+        Returns:
+            None
+        """
+        self.registros = registros
+        if not conservar_posicion:
+            self.seleccionado = None
+            self.primera = 0
+        self.mensaje = None
+        self.actualizar()
+
+    def actualizar(self):
+        """
+        Vuelve a dibujar las filas visibles tras cambiar la lista de registros.
+
+        Returns:
+            None
+        """
+        maximo = max(0, len(self.registros) - self._filas_visibles() + 1)
+        self.primera = min(self.primera, maximo)
+        if self.seleccionado is not None and self.seleccionado >= len(self.registros):
+            self.seleccionado = None
+        self._dibujar()
+
+    def mostrar_mensaje(self, texto):
+        """
+        Vacía la tabla y muestra un mensaje (p. ej. carpeta vacía o error).
+
+        Args:
+            texto (str): Mensaje a mostrar
+
+        Returns:
+            None
+        """
+        self.registros = []
+        self.seleccionado = None
+        self.primera = 0
+        self.mensaje = texto
+        self._dibujar()
+
+    def seleccion(self):
+        """
+        Devuelve el índice del registro seleccionado.
+
+        Returns:
+            int: Índice en la lista de registros, o None si no hay selección
+        """
+        return self.seleccionado
+
+    def seleccionar(self, indice):
+        """
+        Selecciona un registro y desplaza la vista para que sea visible.
+
+        Args:
+            indice (int): Índice del registro
+
+        Returns:
+            None
+        """
+        if not self.registros:
+            return
+        self.seleccionado = max(0, min(indice, len(self.registros) - 1))
+        self.ver(self.seleccionado)
+        self._dibujar()
+        if self._al_seleccionar:
+            self._al_seleccionar(self.seleccionado)
+
+    def ver(self, indice):
+        """
+        Desplaza la vista lo mínimo necesario para mostrar un registro.
+
+        Args:
+            indice (int): Índice del registro
+
+        Returns:
+            None
+        """
+        visibles = max(1, self._filas_visibles() - 1)
+        if indice < self.primera:
+            self.primera = indice
+        elif indice >= self.primera + visibles:
+            self.primera = indice - visibles + 1
+        self._dibujar()
+
+    def desplazar_filas(self, filas):
+        """
+        Desplaza la vista un número de filas.
+
+        Args:
+            filas (int): Filas a desplazar (negativo hacia arriba)
+
+        Returns:
+            None
+        """
+        maximo = max(0, len(self.registros) - self._filas_visibles() + 1)
+        self.primera = max(0, min(self.primera + filas, maximo))
+        self._dibujar()
+
+    def al_activar(self, callback):
+        """
+        Registra la función llamada con el índice al hacer doble clic o Enter.
+
+        Args:
+            callback (callable): Función (indice)
+
+        Returns:
+            None
+        """
+        self._al_activar = callback
+
+    def al_seleccionar(self, callback):
+        """
+        Registra la función llamada con el índice al cambiar la selección.
+
+        Args:
+            callback (callable): Función (indice)
+
+        Returns:
+            None
+        """
+        self._al_seleccionar = callback
+
+    # -------------------------------------------------------------------------
+    # Dibujo
+    # -------------------------------------------------------------------------
+
+    def _filas_visibles(self):
+        return max(1, self.canvas.winfo_height() // self.alto_fila + 1)
+
+    def _recalcular(self):
+        """
+        Recalcula posiciones de columnas y el número de filas reutilizables.
+        """
+        ancho = max(self.canvas.winfo_width(), 100)
+        fijo = sum(c['ancho'] or 0 for c in self.columnas)
+        flexibles = sum(1 for c in self.columnas if not c['ancho']) or 1
+        sobrante = max(80, (ancho - fijo - 8) // flexibles)
+
+        self._posiciones = []
+        x = 6
+        for columna in self.columnas:
+            ancho_col = columna['ancho'] or sobrante
+            izquierda = columna.get('ancla', 'w') == 'w'
+            self._posiciones.append((x if izquierda else x + ancho_col - 6, 'w' if izquierda else 'e'))
+            x += ancho_col
+
+        self.encabezado.delete('all')
+        for columna, (x, ancla) in zip(self.columnas, self._posiciones):
+            self.encabezado.create_text(x, (self.alto_fila + 2) // 2, anchor=ancla, text=columna['titulo'],
+                                        font=('Arial', 9, 'bold'))
+
+        necesarias = self._filas_visibles()
+        while len(self._filas) < necesarias:
+            self._filas.append([self.canvas.create_text(0, 0, anchor='w', font=self.fuente)
+                                for _ in self.columnas])
+        while len(self._filas) > necesarias:
+            for item in self._filas.pop():
+                self.canvas.delete(item)
+
+        for fila, items in enumerate(self._filas):
+            y = fila * self.alto_fila + self.alto_fila // 2
+            for item, (x, ancla) in zip(items, self._posiciones):
+                self.canvas.coords(item, x, y)
+                self.canvas.itemconfigure(item, anchor=ancla)
+        self._dibujar()
+
+    def _dibujar(self):
+        total = len(self.registros)
+        registros = self.registros
+        for fila, items in enumerate(self._filas):
+            indice = self.primera + fila
+            if indice < total:
+                registro = registros[indice]
+                for item, columna in zip(items, self.columnas):
+                    self.canvas.itemconfigure(item, text=columna['valor'](registro))
+            else:
+                for item in items:
+                    self.canvas.itemconfigure(item, text='')
+
+        self.canvas.itemconfigure(self._mensaje_item, text=self.mensaje or '')
+
+        if self.seleccionado is not None and 0 <= self.seleccionado - self.primera < len(self._filas):
+            y = (self.seleccionado - self.primera) * self.alto_fila
+            self.canvas.coords(self._seleccion_item, 0, y, self.canvas.winfo_width(), y + self.alto_fila)
+            self.canvas.itemconfigure(self._seleccion_item, state='normal')
+        else:
+            self.canvas.itemconfigure(self._seleccion_item, state='hidden')
+
+        if total:
+            visibles = self._filas_visibles() - 1
+            self.scrollbar.set(self.primera / total, min(1.0, (self.primera + visibles) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    # -------------------------------------------------------------------------
+    # Eventos
+    # -------------------------------------------------------------------------
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        if accion == 'moveto':
+            self.primera = int(float(cantidad) * len(self.registros))
+            self.desplazar_filas(0)
+        elif accion == 'scroll':
+            pasos = int(cantidad)
+            if unidad == 'pages':
+                pasos *= max(1, self._filas_visibles() - 2)
+            self.desplazar_filas(pasos)
+
+    def _rueda(self, event):
+        self.desplazar_filas(-3 if event.delta > 0 else 3)
+
+    def _indice_en(self, y):
+        indice = self.primera + int(self.canvas.canvasy(y)) // self.alto_fila
+        return indice if indice < len(self.registros) else None
+
+    def _clic(self, event):
+        self.canvas.focus_set()
+        indice = self._indice_en(event.y)
+        if indice is not None:
+            self.seleccionar(indice)
+
+    def _doble_clic(self, event):
+        indice = self._indice_en(event.y)
+        if indice is not None:
+            self.seleccionado = indice
+            self._activar()
+
+    def _tecla(self, delta, tecla):
+        if delta is None:
+            pagina = max(1, self._filas_visibles() - 2)
+            delta = -pagina if tecla == '<Prior>' else pagina
+        actual = self.seleccionado if self.seleccionado is not None else self.primera - 1
+        self.seleccionar(actual + delta)
+
+    def _activar(self):
+        if self._al_activar and self.seleccionado is not None:
+            self._al_activar(self.seleccionado)
@@ -0,0 +1,297 @@
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# =============================================================================
+# CÁLCULO RECURSIVO Y PARALELO DEL TAMAÑO DE UN DIRECTORIO
+# =============================================================================
+# Varios hilos recorren el árbol con os.scandir (que libera el GIL durante las
+# llamadas al sistema) y un hilo coordinador suma los resultados a medida que
+# llegan, de modo que la interfaz puede mostrar totales parciales.
+#
+# Para cada directorio se guarda en caché lo que aporta por sí mismo (sus
+# archivos) junto con su firma (mtime, inodo, dispositivo). Si la firma no
+# cambió, en la siguiente pasada basta un stat para reutilizarlo sin leerlo.
+# Limitación conocida: modificar el contenido de un archivo no cambia el mtime
+# de su directorio, así que ese crecimiento no se ve hasta que cambie el
+# directorio (igual que otras herramientas con caché tipo ncdu).
+#
+# Los archivos con varios enlaces duros se guardan aparte como (dev, inodo,
+# tamaño) y el coordinador los cuenta una sola vez por cálculo.
+#
+# La caché es LRU y está acotada: al recorrer discos enteros no crece sin
+# límite, y los directorios expulsados simplemente se vuelven a leer.
+
+HILOS_POR_DEFECTO = 8
+
+# Directorios (y totales) que guarda como máximo la caché de tamaños
+MAX_DIRECTORIOS_CACHE = 100000
+
+# Aporte propio de un directorio (sin contar subdirectorios)
+InfoDirectorio = namedtuple('InfoDirectorio', 'firma propio enlaces subdirs')
+
+
+def tamano_en_disco(info):
+    """
+    Devuelve el espacio que ocupa un archivo en disco.
+
+    Args:
+        info (os.stat_result): Resultado de stat
+
+    Returns:
+        int: Bytes ocupados (bloques reales en POSIX, tamaño aparente en Windows)
+    """
+    bloques = getattr(info, 'st_blocks', None)
+    if bloques is None:
+        return info.st_size
+    return bloques * 512
+
+
+class CacheTamanos:
+    """
+    Caché LRU de aportes por directorio y de totales ya calculados, con
+    `max_directorios` elementos como máximo de cada tipo.
+    """
+
+    def __init__(self, max_directorios=MAX_DIRECTORIOS_CACHE):
+        self.max_directorios = max_directorios
+        self._directorios = OrderedDict()
+        self._totales = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _guardar_acotado(self, tabla, ruta, valor):
+        # Llamar con el lock tomado
+        tabla[ruta] = valor
+        tabla.move_to_end(ruta)
+        while len(tabla) > self.max_directorios:
+            tabla.popitem(last=False)
+
+    def obtener(self, ruta):
+        with self._lock:
+            info = self._directorios.get(ruta)
+            if info is not None:
+                self._directorios.move_to_end(ruta)
+            return info
+
+    def guardar(self, ruta, info):
+        with self._lock:
+            self._guardar_acotado(self._directorios, ruta, info)
+
+    def total(self, ruta):
+        """
+        Devuelve el último total completo calculado para un directorio.
+
+        Args:
+            ruta (str): Directorio
+
+        Returns:
+            int: Total en bytes, o None si nunca se calculó
+        """
+        with self._lock:
+            return self._totales.get(ruta)
+
+    def guardar_total(self, ruta, total):
+        with self._lock:
+            self._guardar_acotado(self._totales, ruta, total)
+
+
+class CalculadorTamano:
+    """
+    Calcula en segundo plano el tamaño de un árbol de directorios.
+
+    Atributos de progreso (leer con progreso() y detalle()):
+        total: bytes sumados hasta ahora
+        totales: bytes por subdirectorio, indexados por su ruta relativa a la
+                 raíz como tupla de nombres, hasta `profundidad` niveles
+        propios: bytes de los archivos de cada directorio (sin subcarpetas),
+                 con la misma clave, para los niveles por encima del último
+        directorios: directorios procesados
+        reutilizados: directorios tomados de la caché sin leerlos
+    No cruza a otros sistemas de archivos (como `du -x`).
+    """
+
+    def __init__(self, raiz, cache=None, hilos=HILOS_POR_DEFECTO, profundidad=1):
+        self.raiz = os.path.abspath(raiz)
+        self.cache = cache or obtener_cache_tamanos()
+        self.hilos = hilos
+        self.profundidad = profundidad
+        self.total = 0
+        self.totales = {}
+        self.propios = {}
+        self.directorios = 0
+        self.reutilizados = 0
+        self.errores = 0
+        self.terminado = threading.Event()
+        self._cancelado = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelado(self):
+        return self._cancelado.is_set()
+
+    def iniciar(self):
+        """
+        Arranca el cálculo en un hilo coordinador.
+
+        Returns:
+            CalculadorTamano: El propio calculador (para encadenar llamadas)
+        """
+        threading.Thread(target=self._coordinar, name="calculador-tamano", daemon=True).start()
+        return self
+
+    def cancelar(self):
+        """
+        Detiene el cálculo lo antes posible.
+
+        Returns:
+            None
+        """
+        self._cancelado.set()
+
+    def progreso(self):
+        """
+        Devuelve una copia coherente del progreso actual.
+
+        Returns:
+            tuple: (total, totales_hijos, directorios), donde totales_hijos
+                   va de nombre de subcarpeta directa a bytes
+        """
+        with self._lock:
+            hijos = {clave[0]: total for clave, total in self.totales.items() if len(clave) == 1}
+            return self.total, hijos, self.directorios
+
+    def detalle(self):
+        """
+        Devuelve una copia de los totales por nivel y de los aportes propios.
+
+        Returns:
+            tuple: (totales, propios) indexados por tupla de ruta relativa
+        """
+        with self._lock:
+            return dict(self.totales), dict(self.propios)
+
+    def _escanear(self, ruta, dev_raiz):
+        """
+        Obtiene el aporte propio de un directorio (de la caché si sigue válido).
+
+        Returns:
+            tuple: (ruta, InfoDirectorio o None si se omite o falla)
+        """
+        if self._cancelado.is_set():
+            return ruta, None
+        try:
+            st = os.stat(ruta, follow_symlinks=False)
+            if st.st_dev != dev_raiz:
+                return ruta, None
+            firma = (st.st_mtime_ns, st.st_ino, st.st_dev)
+
+            en_cache = self.cache.obtener(ruta)
+            if en_cache is not None and en_cache.firma == firma:
+                with self._lock:
+                    self.reutilizados += 1
+                return ruta, en_cache
+
+            # El propio directorio también ocupa bloques (como cuenta `du`)
+            propio = tamano_en_disco(st)
+            enlaces = []
+            subdirs = []
+            fallidas = 0
+            with os.scandir(ruta) as it:
+                for entry in it:
+                    # Una entrada que desaparece o no se puede consultar se
+                    # omite sin perder el resto del directorio
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                            continue
+                        info = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        fallidas += 1
+                        continue
+                    if info.st_nlink > 1:
+                        enlaces.append(((info.st_dev, info.st_ino), tamano_en_disco(info)))
+                    else:
+                        propio += tamano_en_disco(info)
+
+            info = InfoDirectorio(firma, propio, tuple(enlaces), tuple(subdirs))
+            if fallidas:
+                # Incompleto: no se guarda para que la próxima pasada lo relea
+                with self._lock:
+                    self.errores += fallidas
+            else:
+                self.cache.guardar(ruta, info)
+            return ruta, info
+        except OSError:
+            with self._lock:
+                self.errores += 1
+            return ruta, None
+
+    def _coordinar(self):
+        try:
+            dev_raiz = os.stat(self.raiz).st_dev
+        except OSError:
+            with self._lock:
+                self.errores += 1
+            self.terminado.set()
+            return
+
+        vistos = set()
+        with ThreadPoolExecutor(max_workers=self.hilos) as pool:
+            # futuro -> ruta relativa a la raíz (truncada a `profundidad` niveles)
+            pendientes = {pool.submit(self._escanear, self.raiz, dev_raiz): ()}
+            while pendientes and not self._cancelado.is_set():
+                hechos, _ = wait(pendientes, timeout=0.2, return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    relativa = pendientes.pop(futuro)
+                    ruta, info = futuro.result()
+                    if info is None:
+                        continue
+
+                    suma = info.propio
+                    for clave, tamano in info.enlaces:
+                        if clave not in vistos:
+                            vistos.add(clave)
+                            suma += tamano
+
+                    profundo = len(relativa) >= self.profundidad
+                    with self._lock:
+                        self.total += suma
+                        self.directorios += 1
+                        # Sumar al total de cada nivel seguido (O(profundidad))
+                        for nivel in range(1, len(relativa) + 1):
+                            self.totales[relativa[:nivel]] += suma
+                        if not profundo:
+                            self.propios[relativa] = suma
+                            for nombre in info.subdirs:
+                                self.totales.setdefault(relativa + (nombre,), 0)
+
+                    for nombre in info.subdirs:
+                        futuro_hijo = pool.submit(self._escanear, os.path.join(ruta, nombre), dev_raiz)
+                        pendientes[futuro_hijo] = relativa if profundo else relativa + (nombre,)
+
+            for futuro in pendientes:
+                futuro.cancel()
+
+        if not self._cancelado.is_set():
+            self.cache.guardar_total(self.raiz, self.total)
+            for relativa, total in self.totales.items():
+                self.cache.guardar_total(os.path.join(self.raiz, *relativa), total)
+        self.terminado.set()
+
+
+# Instancia compartida por todas las ventanas
+_cache_tamanos = None
+
+
+def obtener_cache_tamanos():
+    """
+    Devuelve la caché de tamaños compartida de la aplicación.
+
+    Returns:
+        CacheTamanos: La instancia compartida
+    """
+    global _cache_tamanos
+    if _cache_tamanos is None:
+        _cache_tamanos = CacheTamanos()
+    return _cache_tamanos
@@ -0,0 +1,247 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .ejecucion import ErrorComando, CODIGO_CANCELADO
+
+# =============================================================================
+# TRABAJOS EN SEGUNDO PLANO DE LA SHELL EDUCATIVA
+# =============================================================================
+# `comando &` no ocupa la línea de órdenes: la ejecución se entrega a un
+# grupo acotado de hilos (como mucho MAX_TRABAJOS_SIMULTANEOS a la vez; el
+# resto espera en cola) y su salida se guarda en el buffer propio de la
+# ejecución, acotado a BYTES_SALIDA_TRABAJO, hasta que alguien la recoja con
+# `fg`. Por muchos trabajos que se lancen, ni los hilos ni la memoria crecen
+# sin límite y la ventana solo lee el estado cada cierto tiempo.
+
+# Estados de un trabajo
+EN_COLA = "En cola"
+EJECUTANDO = "Ejecutando"
+TERMINADO = "Terminado"
+FALLIDO = "Error"
+CANCELADO = "Cancelado"
+
+# Trabajos que se ejecutan a la vez (los demás esperan su turno)
+MAX_TRABAJOS_SIMULTANEOS = 4
+
+# Trabajos sin terminar (en cola o en ejecución) que admite una sesión
+MAX_TRABAJOS_ACTIVOS = 32
+
+# Trabajos terminados que se conservan en la lista para `jobs` y `fg`
+MAX_TRABAJOS_TERMINADOS = 20
+
+# Salida que se guarda por trabajo (se conserva el final)
+BYTES_SALIDA_TRABAJO = 256 * 1024
+
+
+class TrabajoShell:
+    """
+    Un comando lanzado con `&`.
+
+    Atributos leídos por la interfaz:
+        numero, comando, estado, inicio, fin, ejecucion (con su buffer de
+        salida), en_primer_plano (lo está siguiendo `fg`)
+    """
+
+    def __init__(self, numero, comando, ejecucion):
+        self.numero = numero
+        self.comando = comando
+        self.ejecucion = ejecucion
+        self.ejecucion.salida.max_bytes = BYTES_SALIDA_TRABAJO
+        self.estado = EN_COLA
+        self.inicio = None
+        self.fin = None
+        self.en_primer_plano = False
+        self.notificado = False
+        self.terminado = threading.Event()
+        self._cancelado = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def codigo(self):
+        """Código de salida (None mientras no termine)."""
+        if self.ejecucion.codigo is not None:
+            return self.ejecucion.codigo
+        return CODIGO_CANCELADO if self.estado == CANCELADO else None
+
+    def duracion(self):
+        """
+        Segundos en ejecución (hasta ahora o hasta que terminó).
+
+        Returns:
+            float: Duración, o None si aún está en cola
+        """
+        if self.inicio is None:
+            return None
+        return (self.fin or time.monotonic()) - self.inicio
+
+    def cancelar(self):
+        """
+        Interrumpe el trabajo; si aún estaba en cola ya no llegará a ejecutarse.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._cancelado.set()
+            if self.estado == EN_COLA:
+                self.estado = CANCELADO
+                self.terminado.set()
+                return
+        self.ejecucion.cancelar()
+
+    def ejecutar(self):
+        """
+        Lanza la ejecución y espera a que termine (en un hilo del grupo).
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._cancelado.is_set():
+                return
+            self.estado = EJECUTANDO
+            self.inicio = time.monotonic()
+            self.ejecucion.iniciar()
+        try:
+            self.ejecucion.terminado.wait()
+        finally:
+            self.fin = time.monotonic()
+            if self.ejecucion.cancelado and not self.ejecucion.limites_superados:
+                self.estado = CANCELADO
+            elif self.ejecucion.error is not None or self.ejecucion.codigo != 0:
+                self.estado = FALLIDO
+            else:
+                self.estado = TERMINADO
+            self.terminado.set()
+
+    def texto_estado(self):
+        """
+        Estado para mostrar, con el código de salida si falló.
+
+        Returns:
+            str: Texto del estado
+        """
+        if self.estado == FALLIDO and self.ejecucion.error is None:
+            return f"{FALLIDO} ({self.codigo})"
+        return self.estado
+
+
+class GestorTrabajos:
+    """
+    Trabajos en segundo plano de una sesión, ejecutados por un grupo de hilos.
+
+    Los números de trabajo (%1, %2...) se reutilizan cuando no queda ningún
+    trabajo con un número mayor, como en bash.
+    """
+
+    def __init__(self, max_simultaneos=MAX_TRABAJOS_SIMULTANEOS, max_activos=MAX_TRABAJOS_ACTIVOS):
+        self.max_simultaneos = max_simultaneos
+        self.max_activos = max_activos
+        self.trabajos = []
+        self._ejecutor = None
+        self._lock = threading.Lock()
+
+    def agregar(self, comando, ejecucion):
+        """
+        Encola una ejecución (sin iniciar) como trabajo en segundo plano.
+
+        Args:
+            comando (str): Línea del comando (para mostrarla)
+            ejecucion (Ejecucion): Ejecución preparada por la sesión
+
+        Returns:
+            TrabajoShell: El trabajo creado
+
+        Raises:
+            ErrorComando: Si ya hay demasiados trabajos sin terminar
+        """
+        with self._lock:
+            activos = sum(1 for t in self.trabajos if not t.terminado.is_set())
+            if activos >= self.max_activos:
+                raise ErrorComando(f"Demasiados trabajos en segundo plano ({activos}); "
+                                   f"espera a que terminen o usa kill %n")
+            self._podar()
+            numero = max((t.numero for t in self.trabajos), default=0) + 1
+            trabajo = TrabajoShell(numero, comando, ejecucion)
+            self.trabajos.append(trabajo)
+            if self._ejecutor is None:
+                self._ejecutor = ThreadPoolExecutor(max_workers=self.max_simultaneos,
+                                                    thread_name_prefix="trabajo-shell")
+            self._ejecutor.submit(trabajo.ejecutar)
+        return trabajo
+
+    def obtener(self, referencia=None, orden='fg'):
+        """
+        Busca un trabajo por su referencia (%n o n); sin ella, el más reciente.
+
+        Args:
+            referencia (str): Referencia escrita por el usuario
+            orden (str): Orden que la usa (para los mensajes de error)
+
+        Returns:
+            TrabajoShell: El trabajo
+
+        Raises:
+            ErrorComando: Si la referencia no es válida o no existe el trabajo
+        """
+        trabajos = self.trabajos
+        if referencia is None:
+            if not trabajos:
+                raise ErrorComando(f"{orden}: no hay trabajos")
+            return trabajos[-1]
+        try:
+            numero = int(referencia[1:] if referencia.startswith('%') else referencia)
+        except ValueError:
+            raise ErrorComando(f"{orden}: {referencia}: referencia de trabajo no válida", 2)
+        for trabajo in trabajos:
+            if trabajo.numero == numero:
+                return trabajo
+        raise ErrorComando(f"{orden}: {referencia}: no existe ese trabajo")
+
+    def quitar(self, trabajo):
+        """
+        Quita de la lista un trabajo terminado (su salida ya se recogió).
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.trabajos = [t for t in self.trabajos if t is not trabajo]
+
+    def obtener_terminados(self):
+        """
+        Devuelve los trabajos terminados de los que aún no se ha avisado.
+
+        Los que se han seguido con `fg` no se avisan: su final ya se vio.
+
+        Returns:
+            list: Trabajos recién terminados, en orden de número
+        """
+        nuevos = []
+        for trabajo in self.trabajos:
+            if trabajo.terminado.is_set() and not trabajo.notificado:
+                trabajo.notificado = True
+                if not trabajo.en_primer_plano:
+                    nuevos.append(trabajo)
+        return nuevos
+
+    def cancelar_todos(self):
+        """
+        Interrumpe todos los trabajos y libera el grupo de hilos.
+
+        Returns:
+            None
+        """
+        for trabajo in self.trabajos:
+            trabajo.cancelar()
+        with self._lock:
+            if self._ejecutor is not None:
+                self._ejecutor.shutdown(wait=False, cancel_futures=True)
+                self._ejecutor = None
+
+    def _podar(self):
+        # Con el lock tomado: se olvidan los terminados más antiguos
+        terminados = [t for t in self.trabajos if t.terminado.is_set()]
+        sobran = set(map(id, terminados[:max(0, len(terminados) - MAX_TRABAJOS_TERMINADOS + 1)]))
+        if sobran:
+            self.trabajos = [t for t in self.trabajos if id(t) not in sobran]
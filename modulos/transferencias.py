@@ -0,0 +1,565 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import shutil
+import stat
+import sys
+import threading
+import time
+from collections import deque
+
+# =============================================================================
+# COPIA Y MOVIMIENTO DE ARCHIVOS EN SEGUNDO PLANO
+# =============================================================================
+# Cada copia o movimiento es un Trabajo que se ejecuta en su propio hilo,
+# lanzado por una cola que limita cuántos trabajos tocan a la vez un mismo
+# dispositivo (dos copias simultáneas sobre el mismo disco mecánico van más
+# lentas que una detrás de otra).
+#
+# El contenido se copia dentro del núcleo cuando es posible, sin pasar por
+# buffers de Python: os.copy_file_range (Linux 4.5+, que además puede usar
+# reflinks o copia del lado del servidor en NFS), luego os.sendfile y, si
+# ninguno está disponible, lecturas y escrituras por bloques de 1 MB.
+#
+# Nada del origen se toca hasta que el destino está completo: se copia a un
+# nombre temporal en la carpeta de destino, se renombra al nombre final y
+# solo entonces, si es un movimiento, se borra el origen. Dentro de un mismo
+# sistema de archivos mover es un simple rename.
+#
+# El nombre final se elige al arrancar el trabajo, no al encolarlo, y la cola
+# lo reserva hasta que termina: dos trabajos con el mismo nombre hacia la
+# misma carpeta acaban como "x" y "x (2)". El rename final nunca reemplaza
+# un archivo existente (renameat2 con RENAME_NOREPLACE, o link + unlink); si
+# el nombre aparece entretanto, se elige otro.
+
+# Estados de un trabajo
+PENDIENTE = "Pendiente"
+EN_CURSO = "En curso"
+COMPLETADO = "Completado"
+FALLIDO = "Error"
+CANCELADO = "Cancelado"
+
+COPIAR = "Copiar"
+MOVER = "Mover"
+
+# Bytes por llamada de copia en el núcleo y tamaño del buffer de respaldo
+BLOQUE_NUCLEO = 8 * 1024 * 1024
+BLOQUE_BUFFER = 1024 * 1024
+
+# Trabajos simultáneos por dispositivo
+MAX_POR_DISPOSITIVO = 1
+
+# Errores con los que se abandona un método de copia y se prueba el siguiente
+ERRORES_NO_SOPORTADO = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP,
+                        getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP), errno.EBADF, errno.EPERM}
+
+# renameat2(2): flags y directorio relativo de las rutas
+RENAME_NOREPLACE = 1
+AT_FDCWD = -100
+
+# Intentos de elegir otro nombre si el elegido aparece antes del rename final
+MAX_INTENTOS_NOMBRE = 100
+
+
+class TransferenciaCancelada(Exception):
+    """El usuario canceló el trabajo."""
+
+
+def nombre_disponible(carpeta, nombre, reservadas=()):
+    """
+    Devuelve un nombre que no exista en la carpeta ("x (2).txt", ...).
+
+    Args:
+        carpeta (str): Carpeta de destino
+        nombre (str): Nombre deseado
+        reservadas (set): Rutas ya elegidas por otros trabajos en curso
+
+    Returns:
+        str: `nombre` si está libre, o una variante numerada
+    """
+    def ocupada(candidato):
+        ruta = os.path.join(carpeta, candidato)
+        return ruta in reservadas or os.path.lexists(ruta)
+
+    if not ocupada(nombre):
+        return nombre
+    base, extension = os.path.splitext(nombre)
+    n = 2
+    while ocupada(f"{base} ({n}){extension}"):
+        n += 1
+    return f"{base} ({n}){extension}"
+
+
+_libc = None
+
+
+def _renameat2():
+    """Función renameat2 de la libc (Linux, glibc 2.28+), o None."""
+    global _libc
+    if not sys.platform.startswith('linux'):
+        return None
+    if _libc is None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            libc.renameat2.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+            _libc = libc
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc.renameat2 if _libc else None
+
+
+def renombrar_sin_reemplazar(origen, destino):
+    """
+    Renombra `origen` a `destino` sin reemplazar nunca un destino existente.
+
+    En Linux usa renameat2(RENAME_NOREPLACE); si el sistema de archivos no
+    lo admite, link + unlink para archivos y enlaces, y para carpetas se
+    crea `destino` vacío en exclusiva y se renombra encima (rename solo
+    reemplaza una carpeta vacía). En Windows rename ya no reemplaza.
+
+    Args:
+        origen (str): Ruta actual
+        destino (str): Ruta nueva (en el mismo sistema de archivos)
+
+    Returns:
+        None
+
+    Raises:
+        FileExistsError: Si `destino` ya existe
+        OSError: Si falla el renombrado
+    """
+    if os.name == 'nt':
+        os.rename(origen, destino)
+        return
+    renameat2 = _renameat2()
+    if renameat2 is not None:
+        if renameat2(AT_FDCWD, os.fsencode(origen), AT_FDCWD, os.fsencode(destino), RENAME_NOREPLACE) == 0:
+            return
+        codigo = ctypes.get_errno()
+        if codigo not in ERRORES_NO_SOPORTADO:
+            raise OSError(codigo, os.strerror(codigo), destino)
+    if not stat.S_ISDIR(os.lstat(origen).st_mode):
+        os.link(origen, destino, follow_symlinks=False)
+        os.unlink(origen)
+        return
+    os.mkdir(destino, 0o700)
+    try:
+        os.rename(origen, destino)
+    except OSError:
+        os.rmdir(destino)
+        raise
+
+
+def copiar_contenido(fd_origen, fd_destino, avanzar, cancelado):
+    """
+    Copia el contenido de un descriptor a otro, en el núcleo si se puede.
+
+    Args:
+        fd_origen (int): Descriptor de lectura (posicionado al inicio)
+        fd_destino (int): Descriptor de escritura (vacío)
+        avanzar (callable): Se llama con los bytes copiados en cada paso
+        cancelado (threading.Event): Se comprueba entre bloques
+
+    Returns:
+        str: Método usado ('copy_file_range', 'sendfile' o 'buffer')
+
+    Raises:
+        TransferenciaCancelada: Si se cancela a mitad
+        OSError: Si falla la lectura o la escritura
+    """
+    copiados = 0
+
+    def comprobar():
+        if cancelado.is_set():
+            raise TransferenciaCancelada()
+
+    # 1. copy_file_range: de archivo a archivo sin salir del núcleo
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while True:
+                comprobar()
+                n = os.copy_file_range(fd_origen, fd_destino, BLOQUE_NUCLEO)
+                if n == 0:
+                    return 'copy_file_range'
+                copiados += n
+                avanzar(n)
+        except OSError as e:
+            # Solo se cambia de método si aún no se había copiado nada
+            if copiados or e.errno not in ERRORES_NO_SOPORTADO:
+                raise
+
+    # 2. sendfile: en Linux admite archivos regulares como destino
+    if hasattr(os, 'sendfile'):
+        try:
+            while True:
+                comprobar()
+                n = os.sendfile(fd_destino, fd_origen, copiados, BLOQUE_NUCLEO)
+                if n == 0:
+                    return 'sendfile'
+                copiados += n
+                avanzar(n)
+        except OSError as e:
+            if copiados or e.errno not in ERRORES_NO_SOPORTADO:
+                raise
+
+    # 3. Respaldo portátil: lecturas y escrituras en bloques grandes
+    while True:
+        comprobar()
+        datos = os.read(fd_origen, BLOQUE_BUFFER)
+        if not datos:
+            return 'buffer'
+        vista = memoryview(datos)
+        escritos = 0
+        while escritos < len(datos):
+            escritos += os.write(fd_destino, vista[escritos:])
+        avanzar(len(datos))
+
+
+def medir_arbol(ruta):
+    """
+    Cuenta los bytes y archivos de un archivo o carpeta (sin seguir enlaces).
+
+    Returns:
+        tuple: (bytes, archivos)
+    """
+    info = os.lstat(ruta)
+    if not stat.S_ISDIR(info.st_mode):
+        return (info.st_size if stat.S_ISREG(info.st_mode) else 0), 1
+    total = archivos = 0
+    pendientes = [ruta]
+    while pendientes:
+        with os.scandir(pendientes.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    pendientes.append(entry.path)
+                    continue
+                archivos += 1
+                if entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+    return total, archivos
+
+
+def dispositivo(ruta):
+    """
+    Devuelve el dispositivo de una ruta (o del primer ancestro existente).
+
+    Returns:
+        int: st_dev
+    """
+    while True:
+        try:
+            return os.stat(ruta).st_dev
+        except OSError:
+            padre = os.path.dirname(ruta)
+            if padre == ruta:
+                raise
+            ruta = padre
+
+
+def _primer_nombre_libre(trabajo):
+    trabajo.destino = os.path.join(trabajo.carpeta_destino, nombre_disponible(trabajo.carpeta_destino, trabajo.nombre))
+
+
+class Trabajo:
+    """
+    Una copia o movimiento de un archivo o carpeta hacia otra carpeta.
+
+    Atributos leídos por la interfaz:
+        estado, bytes_totales, bytes_copiados, archivos_copiados, error,
+        destino (ruta final), metodo (forma de copia usada)
+    """
+
+    def __init__(self, tipo, origen, carpeta_destino):
+        self.tipo = tipo
+        self.origen = os.path.abspath(origen)
+        self.carpeta_destino = os.path.abspath(carpeta_destino)
+        self.nombre = os.path.basename(self.origen.rstrip(os.sep))
+        self.destino = None
+        self.estado = PENDIENTE
+        self.error = None
+        self.metodo = None
+        self.bytes_totales = 0
+        self.bytes_copiados = 0
+        self.archivos_copiados = 0
+        self.inicio = None
+        self.fin = None
+        self.dispositivos = set()
+        self.lanzado = False
+        self._cancelado = threading.Event()
+        # Muestras (instante, bytes) de los últimos segundos para la velocidad
+        self._muestras = deque(maxlen=20)
+
+    def cancelar(self):
+        """
+        Pide cancelar el trabajo (el destino parcial se elimina).
+
+        Returns:
+            None
+        """
+        self._cancelado.set()
+        if self.estado == PENDIENTE:
+            self.estado = CANCELADO
+
+    @property
+    def terminado(self):
+        return self.estado in (COMPLETADO, FALLIDO, CANCELADO)
+
+    def velocidad(self):
+        """
+        Velocidad reciente en bytes por segundo.
+
+        Returns:
+            float: Bytes/s en la ventana de muestras (o media si terminó)
+        """
+        if self.inicio is None:
+            return 0.0
+        if self.terminado:
+            duracion = (self.fin or time.monotonic()) - self.inicio
+            return self.bytes_copiados / duracion if duracion > 0 else 0.0
+        ahora = time.monotonic()
+        if self._muestras:
+            instante, copiados = self._muestras[0]
+        else:
+            instante, copiados = self.inicio, 0
+        duracion = ahora - instante
+        return (self.bytes_copiados - copiados) / duracion if duracion > 0 else 0.0
+
+    def eta(self):
+        """
+        Segundos estimados hasta terminar.
+
+        Returns:
+            float: Segundos restantes, o None si no se puede estimar
+        """
+        velocidad = self.velocidad()
+        if self.estado != EN_CURSO or velocidad <= 0:
+            return None
+        return max(0.0, (self.bytes_totales - self.bytes_copiados) / velocidad)
+
+    def _avanzar(self, n):
+        self.bytes_copiados += n
+        ahora = time.monotonic()
+        if not self._muestras or ahora - self._muestras[-1][0] >= 0.25:
+            self._muestras.append((ahora, self.bytes_copiados))
+
+    def preparar(self):
+        """
+        Comprueba el origen y el destino y calcula los dispositivos implicados.
+
+        El nombre final no se elige aquí sino al arrancar (ver ejecutar()).
+
+        Returns:
+            None
+
+        Raises:
+            OSError: Si el origen no existe o el destino no es válido
+        """
+        if not os.path.isdir(self.carpeta_destino):
+            raise NotADirectoryError(errno.ENOTDIR, "La carpeta de destino no existe", self.carpeta_destino)
+        if self.carpeta_destino == self.origen or self.carpeta_destino.startswith(self.origen + os.sep):
+            raise OSError(errno.EINVAL, "No se puede copiar una carpeta dentro de sí misma", self.origen)
+        if self.tipo == MOVER and os.path.dirname(self.origen) == self.carpeta_destino:
+            raise OSError(errno.EEXIST, "El origen ya está en esa carpeta", self.origen)
+        self.dispositivos = {os.lstat(self.origen).st_dev, dispositivo(self.carpeta_destino)}
+
+    # -------------------------------------------------------------------------
+    # Ejecución (en el hilo del trabajo)
+    # -------------------------------------------------------------------------
+
+    def ejecutar(self, reservar=None):
+        """
+        Realiza la copia o el movimiento y actualiza el estado.
+
+        Args:
+            reservar (callable): Elige y reserva `self.destino` (lo pasa la
+                cola); por defecto el primer nombre libre de la carpeta
+
+        Returns:
+            None
+        """
+        reservar = reservar or _primer_nombre_libre
+        self.estado = EN_CURSO
+        self.inicio = time.monotonic()
+        temporal = None
+        try:
+            self.bytes_totales, _ = medir_arbol(self.origen)
+            reservar(self)
+            movido = False
+            if self.tipo == MOVER and len(self.dispositivos) == 1:
+                # Mismo sistema de archivos: renombrar es atómico y no copia datos
+                try:
+                    self._renombrar_final(self.origen, reservar)
+                    movido = True
+                except OSError as e:
+                    # Montajes enlazados (mismo st_dev, distinto montaje): se copia
+                    if e.errno != errno.EXDEV:
+                        raise
+            if movido:
+                self.bytes_copiados = self.bytes_totales
+                self.metodo = 'rename'
+            else:
+                temporal = os.path.join(self.carpeta_destino, f".{self.nombre}.parcial-{os.getpid()}-{id(self)}")
+                self._copiar(self.origen, temporal)
+                # El destino aparece de golpe con su nombre final
+                self._renombrar_final(temporal, reservar)
+                temporal = None
+                if self.tipo == MOVER:
+                    self._borrar(self.origen)
+            self.estado = COMPLETADO
+        except TransferenciaCancelada:
+            self.estado = CANCELADO
+        except OSError as e:
+            self.error = e
+            self.estado = FALLIDO
+        finally:
+            if temporal is not None:
+                self._borrar(temporal, ignorar_errores=True)
+            self.fin = time.monotonic()
+
+    def _renombrar_final(self, ruta, reservar):
+        # Si otro proceso crea el nombre elegido, se reserva el siguiente libre
+        for _ in range(MAX_INTENTOS_NOMBRE):
+            try:
+                renombrar_sin_reemplazar(ruta, self.destino)
+                return
+            except FileExistsError:
+                reservar(self)
+        raise FileExistsError(errno.EEXIST, "No se encontró un nombre libre en el destino", self.destino)
+
+    def _copiar(self, origen, destino):
+        info = os.lstat(origen)
+        if stat.S_ISLNK(info.st_mode):
+            os.symlink(os.readlink(origen), destino)
+        elif stat.S_ISDIR(info.st_mode):
+            os.mkdir(destino)
+            with os.scandir(origen) as it:
+                for entry in it:
+                    self._copiar(entry.path, os.path.join(destino, entry.name))
+            shutil.copystat(origen, destino, follow_symlinks=False)
+        elif stat.S_ISREG(info.st_mode):
+            self._copiar_archivo(origen, destino, info)
+        # Dispositivos, FIFOs y sockets no se copian
+        self.archivos_copiados += 1
+
+    def _copiar_archivo(self, origen, destino, info):
+        fd_origen = os.open(origen, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            fd_destino = os.open(destino, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0),
+                                 stat.S_IMODE(info.st_mode) | stat.S_IWUSR)
+            try:
+                metodo = copiar_contenido(fd_origen, fd_destino, self._avanzar, self._cancelado)
+                if self.metodo is None or metodo != 'buffer':
+                    self.metodo = metodo
+            finally:
+                os.close(fd_destino)
+        finally:
+            os.close(fd_origen)
+        shutil.copystat(origen, destino, follow_symlinks=False)
+
+    def _borrar(self, ruta, ignorar_errores=False):
+        try:
+            if os.path.isdir(ruta) and not os.path.islink(ruta):
+                shutil.rmtree(ruta, ignore_errors=ignorar_errores)
+            else:
+                os.remove(ruta)
+        except OSError:
+            if not ignorar_errores:
+                raise
+
+
+class ColaTransferencias:
+    """
+    Cola de trabajos que limita la concurrencia por dispositivo.
+
+    Un trabajo arranca cuando todos sus dispositivos (origen y destino)
+    tienen menos de `max_por_dispositivo` trabajos en curso; mientras, espera
+    en orden de llegada sin bloquear a los de otros dispositivos.
+    """
+
+    def __init__(self, max_por_dispositivo=MAX_POR_DISPOSITIVO):
+        self.max_por_dispositivo = max_por_dispositivo
+        self.trabajos = []
+        self._activos = {}
+        # Destinos elegidos por trabajos en curso que quizá aún no existen
+        self._reservados = set()
+        self._lock = threading.Lock()
+
+    def agregar(self, tipo, origen, carpeta_destino):
+        """
+        Añade un trabajo y lo arranca si su dispositivo está libre.
+
+        Args:
+            tipo (str): COPIAR o MOVER
+            origen (str): Archivo o carpeta a copiar/mover
+            carpeta_destino (str): Carpeta donde dejarlo
+
+        Returns:
+            Trabajo: El trabajo creado
+
+        Raises:
+            OSError: Si el origen o el destino no son válidos
+        """
+        trabajo = Trabajo(tipo, origen, carpeta_destino)
+        trabajo.preparar()
+        with self._lock:
+            self.trabajos.append(trabajo)
+        self._lanzar_pendientes()
+        return trabajo
+
+    def limpiar_terminados(self):
+        """
+        Quita de la lista los trabajos terminados.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.trabajos = [t for t in self.trabajos if not t.terminado]
+
+    def _lanzar_pendientes(self):
+        with self._lock:
+            for trabajo in self.trabajos:
+                if trabajo.estado != PENDIENTE or trabajo.lanzado:
+                    continue
+                if all(self._activos.get(d, 0) < self.max_por_dispositivo for d in trabajo.dispositivos):
+                    for d in trabajo.dispositivos:
+                        self._activos[d] = self._activos.get(d, 0) + 1
+                    trabajo.lanzado = True
+                    threading.Thread(target=self._ejecutar, args=(trabajo,),
+                                     name="transferencia", daemon=True).start()
+
+    def _reservar_destino(self, trabajo):
+        with self._lock:
+            self._reservados.discard(trabajo.destino)
+            nombre = nombre_disponible(trabajo.carpeta_destino, trabajo.nombre, self._reservados)
+            trabajo.destino = os.path.join(trabajo.carpeta_destino, nombre)
+            self._reservados.add(trabajo.destino)
+
+    def _ejecutar(self, trabajo):
+        try:
+            if not trabajo._cancelado.is_set():
+                trabajo.ejecutar(self._reservar_destino)
+        finally:
+            with self._lock:
+                self._reservados.discard(trabajo.destino)
+                for d in trabajo.dispositivos:
+                    self._activos[d] -= 1
+            self._lanzar_pendientes()
+
+
+# Instancia compartida por todas las ventanas
+_cola_transferencias = None
+
+
+def obtener_cola_transferencias():
+    """
+    Devuelve la cola de transferencias compartida de la aplicación.
+
+    Returns:
+        ColaTransferencias: La instancia compartida
+    """
+    global _cola_transferencias
+    if _cola_transferencias is None:
+        _cola_transferencias = ColaTransferencias()
+    return _cola_transferencias
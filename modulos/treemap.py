@@ -0,0 +1,191 @@
+from collections import deque, namedtuple
+
+# =============================================================================
+# DISPOSICIÓN DE UN MAPA DE ÁRBOL (TREEMAP) CUADRICULADO
+# =============================================================================
+# Algoritmo "squarified" de Bruls, Huizing y van Wijk: los valores, ordenados
+# de mayor a menor, se colocan en filas a lo largo del lado corto del
+# rectángulo libre; un valor se añade a la fila actual mientras no empeore la
+# peor relación de aspecto de la fila. El resultado son rectángulos casi
+# cuadrados, fáciles de comparar y de señalar con el ratón.
+#
+# La disposición solo trabaja con números: recibe los totales por ruta
+# relativa de CalculadorTamano.detalle() y devuelve rectángulos; dibujarlos
+# es cosa de la ventana (modulos/mod_treemap.py).
+
+# Nombre del nodo que agrupa los archivos sueltos de una carpeta. Ninguna
+# carpeta real puede llamarse así (un nombre de archivo nunca está vacío).
+ARCHIVOS = ''
+
+# Rectángulo ya colocado: clave es la ruta relativa como tupla de nombres
+Nodo = namedtuple('Nodo', 'clave nivel x y ancho alto tamano')
+
+
+def _peor_aspecto(suma, minimo, maximo, lado):
+    """
+    Peor relación de aspecto de una fila de áreas colocada sobre `lado`.
+    """
+    lado2 = lado * lado
+    suma2 = suma * suma
+    return max(lado2 * maximo / suma2, suma2 / (lado2 * minimo))
+
+
+def distribuir_rectangulos(valores, x, y, ancho, alto):
+    """
+    Reparte un rectángulo en trozos proporcionales a los valores.
+
+    Args:
+        valores (list): Valores positivos ordenados de mayor a menor
+        x, y (float): Esquina superior izquierda
+        ancho, alto (float): Tamaño del rectángulo a repartir
+
+    Returns:
+        list: Tuplas (x, y, ancho, alto) en el mismo orden que `valores`
+    """
+    total = sum(valores)
+    if total <= 0 or ancho <= 0 or alto <= 0:
+        return [(x, y, 0, 0) for _ in valores]
+
+    escala = ancho * alto / total
+    areas = [v * escala for v in valores]
+    rectangulos = []
+    inicio = 0
+    n = len(areas)
+
+    while inicio < n:
+        lado = min(ancho, alto)
+        suma = minimo = maximo = areas[inicio]
+        peor = _peor_aspecto(suma, minimo, maximo, lado)
+        fin = inicio + 1
+        # Ampliar la fila mientras la peor relación de aspecto no empeore
+        while fin < n:
+            area = areas[fin]
+            candidato = _peor_aspecto(suma + area, min(minimo, area), max(maximo, area), lado)
+            if candidato > peor:
+                break
+            suma += area
+            minimo = min(minimo, area)
+            maximo = max(maximo, area)
+            peor = candidato
+            fin += 1
+
+        if ancho >= alto:
+            # Columna pegada al lado izquierdo
+            grosor = suma / alto
+            posicion = y
+            for area in areas[inicio:fin]:
+                largo = area / grosor
+                rectangulos.append((x, posicion, grosor, largo))
+                posicion += largo
+            x += grosor
+            ancho -= grosor
+        else:
+            # Fila pegada al lado superior
+            grosor = suma / ancho
+            posicion = x
+            for area in areas[inicio:fin]:
+                largo = area / grosor
+                rectangulos.append((posicion, y, largo, grosor))
+                posicion += largo
+            y += grosor
+            alto -= grosor
+        inicio = fin
+
+    return rectangulos
+
+
+def indexar_hijos(totales):
+    """
+    Agrupa las claves de los totales por su carpeta padre.
+
+    Args:
+        totales (dict): Ruta relativa (tupla) -> bytes
+
+    Returns:
+        dict: Ruta relativa del padre -> lista de claves hijas
+    """
+    hijos = {}
+    for clave in totales:
+        hijos.setdefault(clave[:-1], []).append(clave)
+    return hijos
+
+
+def calcular_disposicion(totales, propios, raiz, x, y, ancho, alto,
+                         margen=2, cabecera=14, lado_minimo=6, max_nodos=4000):
+    """
+    Coloca recursivamente las carpetas de un árbol de tamaños.
+
+    Cada carpeta reserva una franja superior de `cabecera` píxeles para su
+    nombre y reparte el resto entre sus subcarpetas y sus archivos sueltos.
+    Solo se baja de nivel mientras los rectángulos sean legibles, así que con
+    totales parciales se ven primero los niveles altos y el detalle aparece a
+    medida que llegan más datos.
+
+    Args:
+        totales (dict): Ruta relativa (tupla) -> bytes, de CalculadorTamano
+        propios (dict): Ruta relativa -> bytes de archivos sueltos
+        raiz (tuple): Ruta relativa de la carpeta a mostrar (() para la raíz)
+        x, y, ancho, alto (float): Área disponible
+        margen (int): Separación entre una carpeta y su contenido
+        cabecera (int): Alto de la franja del nombre
+        lado_minimo (int): Lado mínimo para dibujar un rectángulo
+        max_nodos (int): Límite de rectángulos devueltos
+
+    Returns:
+        list: Nodos colocados, cada carpeta antes que su contenido
+    """
+    hijos = indexar_hijos(totales)
+    nodos = []
+    # Cola de (clave, nivel, x, y, ancho, alto) pendientes de subdividir: en
+    # anchura, para que el límite de nodos recorte los niveles más profundos
+    pendientes = deque([(raiz, 0, x, y, ancho, alto)])
+
+    while pendientes and len(nodos) < max_nodos:
+        clave, nivel, cx, cy, cancho, calto = pendientes.popleft()
+        if nivel > 0:
+            # El interior se reserva para el contenido de la carpeta
+            cx += margen
+            cy += cabecera
+            cancho -= 2 * margen
+            calto -= cabecera + margen
+        if cancho < lado_minimo or calto < lado_minimo:
+            continue
+
+        contenido = [(totales[h], h) for h in hijos.get(clave, ()) if totales[h] > 0]
+        propio = propios.get(clave, 0)
+        if propio > 0 and contenido:
+            contenido.append((propio, clave + (ARCHIVOS,)))
+        if not contenido:
+            continue
+        contenido.sort(key=lambda par: par[0], reverse=True)
+
+        rectangulos = distribuir_rectangulos([t for t, _ in contenido], cx, cy, cancho, calto)
+        for (tamano, hijo), (hx, hy, hancho, halto) in zip(contenido, rectangulos):
+            if hancho < lado_minimo or halto < lado_minimo:
+                continue
+            nodos.append(Nodo(hijo, nivel + 1, hx, hy, hancho, halto, tamano))
+            if hijo[-1] != ARCHIVOS:
+                pendientes.append((hijo, nivel + 1, hx, hy, hancho, halto))
+
+    return nodos
+
+
+def extraer_subarbol(totales, propios, prefijo):
+    """
+    Toma de unos totales la parte que cuelga de una subcarpeta.
+
+    Permite abrir una subcarpeta en el mapa con lo ya calculado mientras se
+    recalcula con más profundidad.
+
+    Args:
+        totales (dict): Ruta relativa (tupla) -> bytes
+        propios (dict): Ruta relativa -> bytes de archivos sueltos
+        prefijo (tuple): Ruta relativa de la subcarpeta
+
+    Returns:
+        tuple: (totales, propios) relativos a la subcarpeta
+    """
+    n = len(prefijo)
+    sub_totales = {c[n:]: t for c, t in totales.items() if len(c) > n and c[:n] == prefijo}
+    sub_propios = {c[n:]: t for c, t in propios.items() if c[:n] == prefijo}
+    return sub_totales, sub_propios
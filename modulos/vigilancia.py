@@ -0,0 +1,313 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from collections import OrderedDict
+from .listado import (
+    firma_directorio,
+    clave_orden,
+    buscar_posicion,
+    crear_entrada_desde_ruta,
+)
+
+# =============================================================================
+# VIGILANCIA DE CAMBIOS EN UN DIRECTORIO
+# =============================================================================
+# En Linux se usa inotify (vía ctypes, sin dependencias externas); en el resto
+# de sistemas, o si inotify no está disponible, se compara periódicamente la
+# firma del directorio y, si cambió, el conjunto de nombres.
+#
+# Los eventos se acumulan en un diccionario ordenado nombre -> operación, de
+# modo que una ráfaga (p. ej. descomprimir 50.000 archivos) se fusiona: cada
+# nombre aparece una sola vez con su último estado. La interfaz recoge los
+# cambios a su ritmo y en bloques acotados con obtener_cambios().
+
+# Operaciones resultantes tras fusionar eventos
+ELIMINADO = 'eliminado'
+ACTUALIZAR = 'actualizar'   # creado, renombrado hacia aquí o modificado
+
+# Constantes de <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o00004000
+IN_CLOEXEC = 0o02000000
+
+MASCARA_EVENTOS = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                   IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+CABECERA_EVENTO = struct.Struct('iIII')
+
+INTERVALO_SONDEO = 2.0   # segundos entre comprobaciones del modo de sondeo
+
+
+class VigilanteBase:
+    """
+    Parte común: cola de cambios fusionados y control del hilo.
+
+    Atributos:
+        desbordado (bool): True si se perdieron eventos y hay que releer todo
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.desbordado = False
+        self._pendientes = OrderedDict()
+        self._lock = threading.Lock()
+        self._detener = threading.Event()
+
+    def iniciar(self):
+        """
+        Arranca el hilo de vigilancia.
+
+        Returns:
+            VigilanteBase: El propio vigilante (para encadenar llamadas)
+        """
+        threading.Thread(target=self._vigilar, name="vigilante-directorio", daemon=True).start()
+        return self
+
+    def detener(self):
+        """
+        Detiene la vigilancia y libera los recursos.
+
+        Returns:
+            None
+        """
+        self._detener.set()
+
+    def hay_cambios(self):
+        """
+        Indica si hay cambios pendientes de recoger.
+
+        Returns:
+            bool: True si hay cambios o se perdieron eventos
+        """
+        return self.desbordado or bool(self._pendientes)
+
+    def obtener_cambios(self, maximo):
+        """
+        Extrae como mucho `maximo` cambios fusionados, del más antiguo al más nuevo.
+
+        Args:
+            maximo (int): Número máximo de cambios a devolver
+
+        Returns:
+            list: Lista de tuplas (nombre, operación)
+        """
+        cambios = []
+        with self._lock:
+            while self._pendientes and len(cambios) < maximo:
+                cambios.append(self._pendientes.popitem(last=False))
+        return cambios
+
+    def _anotar(self, nombre, operacion):
+        with self._lock:
+            # Mover al final: el último evento de cada nombre es el que cuenta
+            self._pendientes.pop(nombre, None)
+            self._pendientes[nombre] = operacion
+
+    def _marcar_desbordado(self):
+        with self._lock:
+            self._pendientes.clear()
+            self.desbordado = True
+
+    def _vigilar(self):
+        raise NotImplementedError
+
+
+class VigilanteInotify(VigilanteBase):
+    """
+    Vigilante basado en inotify (solo Linux).
+    """
+
+    _libc = None
+
+    @classmethod
+    def disponible(cls):
+        """
+        Comprueba si inotify se puede usar en este sistema.
+
+        Returns:
+            bool: True en Linux con una libc que exporte inotify_init1
+        """
+        if not sys.platform.startswith('linux'):
+            return False
+        if cls._libc is None:
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                cls._libc = libc
+            except (OSError, AttributeError):
+                return False
+        return True
+
+    def iniciar(self):
+        if not self.disponible():
+            raise OSError("inotify no está disponible en este sistema")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falló")
+        if self._libc.inotify_add_watch(self._fd, os.fsencode(self.ruta), MASCARA_EVENTOS) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"No se pudo vigilar {self.ruta}")
+        return super().iniciar()
+
+    def _vigilar(self):
+        try:
+            while not self._detener.is_set():
+                # select con timeout para poder atender detener()
+                listos, _, _ = select.select([self._fd], [], [], 0.5)
+                if not listos:
+                    continue
+                try:
+                    datos = os.read(self._fd, 256 * 1024)
+                except BlockingIOError:
+                    continue
+                self._procesar(datos)
+        except OSError:
+            self._marcar_desbordado()
+        finally:
+            os.close(self._fd)
+
+    def _procesar(self, datos):
+        desplazamiento = 0
+        while desplazamiento + CABECERA_EVENTO.size <= len(datos):
+            _, mascara, _, longitud = CABECERA_EVENTO.unpack_from(datos, desplazamiento)
+            inicio = desplazamiento + CABECERA_EVENTO.size
+            nombre = os.fsdecode(datos[inicio:inicio + longitud].rstrip(b'\0'))
+            desplazamiento = inicio + longitud
+
+            if mascara & (IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF):
+                self._marcar_desbordado()
+            elif not nombre:
+                continue
+            elif mascara & (IN_DELETE | IN_MOVED_FROM):
+                self._anotar(nombre, ELIMINADO)
+            else:
+                self._anotar(nombre, ACTUALIZAR)
+
+
+class VigilanteSondeo(VigilanteBase):
+    """
+    Vigilante portátil: compara la firma del directorio periódicamente.
+
+    Solo si la firma cambia se vuelve a leer el conjunto de nombres, así que
+    en reposo el coste es un stat cada INTERVALO_SONDEO segundos. No detecta
+    cambios de contenido de archivos que no alteren el directorio.
+    """
+
+    def __init__(self, ruta, intervalo=INTERVALO_SONDEO):
+        super().__init__(ruta)
+        self.intervalo = intervalo
+
+    def _leer_nombres(self):
+        with os.scandir(self.ruta) as it:
+            return {entry.name for entry in it}
+
+    def _vigilar(self):
+        try:
+            firma = firma_directorio(self.ruta)
+            nombres = self._leer_nombres()
+        except OSError:
+            self._marcar_desbordado()
+            return
+
+        while not self._detener.wait(self.intervalo):
+            try:
+                nueva_firma = firma_directorio(self.ruta)
+                if nueva_firma == firma:
+                    continue
+                firma = nueva_firma
+                nuevos_nombres = self._leer_nombres()
+            except OSError:
+                self._marcar_desbordado()
+                return
+            for nombre in nombres - nuevos_nombres:
+                self._anotar(nombre, ELIMINADO)
+            for nombre in nuevos_nombres - nombres:
+                self._anotar(nombre, ACTUALIZAR)
+            nombres = nuevos_nombres
+
+
+def crear_vigilante(ruta):
+    """
+    Crea y arranca el mejor vigilante disponible para un directorio.
+
+    Args:
+        ruta (str): Directorio a vigilar
+
+    Returns:
+        VigilanteBase: Vigilante inotify en Linux o de sondeo en otro caso
+    """
+    if VigilanteInotify.disponible():
+        try:
+            return VigilanteInotify(ruta).iniciar()
+        except OSError:
+            # Límite de vigilancias alcanzado u otro fallo: usar sondeo
+            pass
+    return VigilanteSondeo(ruta).iniciar()
+
+
+# =============================================================================
+# APLICACIÓN INCREMENTAL DE CAMBIOS A UN LISTADO ORDENADO
+# =============================================================================
+
+# A partir de este número de cambios en un bloque sale más a cuenta filtrar y
+# reordenar la lista entera (Timsort es casi lineal con datos casi ordenados)
+LIMITE_INCREMENTAL = 2000
+
+
+def aplicar_cambios(entradas, directorio, cambios):
+    """
+    Aplica un bloque de cambios fusionados a una lista ordenada, en el sitio.
+
+    Con pocos cambios cada fila se localiza por búsqueda binaria y se inserta
+    o elimina individualmente; con muchos, se reconstruye la lista de una vez.
+
+    Args:
+        entradas (list): Entradas ordenadas con clave_orden (se modifica)
+        directorio (str): Directorio al que pertenecen las entradas
+        cambios (list): Tuplas (nombre, operación) de obtener_cambios()
+
+    Returns:
+        None
+    """
+    afectados = set()
+    nuevas = []
+    for nombre, operacion in cambios:
+        afectados.add(nombre)
+        if operacion == ACTUALIZAR:
+            try:
+                nuevas.append(crear_entrada_desde_ruta(directorio, nombre))
+            except OSError:
+                # Creado y borrado antes de poder leerlo
+                pass
+
+    if len(cambios) > LIMITE_INCREMENTAL:
+        entradas[:] = [e for e in entradas if e.nombre not in afectados]
+        entradas.extend(nuevas)
+        entradas.sort(key=clave_orden)
+        return
+
+    for nombre in afectados:
+        clave = nombre.lower()
+        posicion = buscar_posicion(entradas, clave)
+        while posicion < len(entradas) and entradas[posicion].nombre.lower() == clave:
+            if entradas[posicion].nombre == nombre:
+                del entradas[posicion]
+                break
+            posicion += 1
+
+    for entrada in nuevas:
+        entradas.insert(buscar_posicion(entradas, clave_orden(entrada)), entrada)
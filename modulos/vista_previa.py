@@ -0,0 +1,344 @@
+import mmap
+import os
+import threading
+from array import array
+
+# =============================================================================
+# LECTURA PEREZOSA DE ARCHIVOS GRANDES CON MMAP
+# =============================================================================
+# La vista previa no carga el archivo: lo proyecta en memoria con mmap y solo
+# copia los bytes de las líneas que se están mostrando, así que abrir un log
+# de 20 GB, saltar al final o desplazarse cuesta lo mismo que con uno de
+# 20 KB. El sistema operativo trae las páginas bajo demanda y puede
+# descartarlas cuando quiera.
+#
+# La posición en la vista es un desplazamiento en bytes (no un número de
+# línea), de modo que desplazarse solo necesita buscar el '\n' anterior o
+# siguiente. Los números de línea salen de un índice disperso que se
+# construye en segundo plano: un punto de control (desplazamiento, línea)
+# cada PASO_INDICE bytes, contando saltos de línea con bytes.count().
+#
+# Si el archivo se trunca mientras está proyectado, tocar las páginas que
+# quedan más allá del nuevo final provoca SIGBUS y mata la aplicación. Por
+# eso cada acceso comprueba antes el tamaño real con fstat: si ha
+# encogido, las lecturas pasan a os.pread y las búsquedas se recortan al
+# nuevo final hasta que remapear() vuelva a proyectar el archivo.
+
+# Bytes entre puntos de control del índice de líneas
+PASO_INDICE = 64 * 1024
+
+# Longitud máxima de una línea mostrada; las más largas se parten
+LIMITE_LINEA = 4096
+
+
+class ArchivoMapeado:
+    """
+    Archivo de solo lectura proyectado en memoria, que puede crecer.
+
+    Los accesos se serializan con un candado porque remapear() sustituye
+    la proyección mientras el hilo del índice puede estar leyendo.
+    `tamano` es el de la proyección; si el archivo se truncó después, los
+    accesos se limitan a lo que sigue existiendo.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.tamano = 0
+        self._archivo = open(ruta, 'rb')
+        self._mapa = None
+        self._lock = threading.Lock()
+        self.remapear()
+
+    def remapear(self):
+        """
+        Vuelve a proyectar el archivo si cambió de tamaño.
+
+        Returns:
+            int: Diferencia de tamaño (positiva si creció, negativa si se
+                 truncó, 0 si no cambió)
+        """
+        tamano = os.fstat(self._archivo.fileno()).st_size
+        with self._lock:
+            diferencia = tamano - self.tamano
+            if diferencia == 0 and (self._mapa is not None or tamano == 0):
+                return 0
+            if self._mapa is not None:
+                self._mapa.close()
+                self._mapa = None
+            # mmap no admite archivos vacíos
+            if tamano > 0:
+                self._mapa = mmap.mmap(self._archivo.fileno(), tamano, access=mmap.ACCESS_READ)
+            self.tamano = tamano
+            return diferencia
+
+    def _truncado(self):
+        """Tamaño real si el archivo encogió tras proyectarlo (con el candado tomado), o None."""
+        tamano = os.fstat(self._archivo.fileno()).st_size
+        return tamano if tamano < self.tamano else None
+
+    def leer(self, inicio, cantidad):
+        """
+        Copia un fragmento del archivo.
+
+        Args:
+            inicio (int): Desplazamiento en bytes
+            cantidad (int): Bytes a leer (se recorta al final del archivo)
+
+        Returns:
+            bytes: Datos leídos
+        """
+        inicio, fin = max(0, inicio), max(0, inicio + cantidad)
+        with self._lock:
+            if self._mapa is None:
+                return b''
+            if self._truncado() is not None:
+                # Las páginas tras el nuevo final ya no se pueden tocar
+                return os.pread(self._archivo.fileno(), max(0, fin - inicio), inicio)
+            return self._mapa[inicio:fin]
+
+    def buscar(self, subcadena, inicio, fin):
+        """
+        Busca hacia delante entre inicio y fin (como bytes.find).
+
+        Returns:
+            int: Posición encontrada o -1
+        """
+        with self._lock:
+            if self._mapa is None:
+                return -1
+            real = self._truncado()
+            return self._mapa.find(subcadena, inicio, fin if real is None else min(fin, real))
+
+    def buscar_atras(self, subcadena, inicio, fin):
+        """
+        Busca hacia atrás entre inicio y fin (como bytes.rfind).
+
+        Returns:
+            int: Posición encontrada o -1
+        """
+        with self._lock:
+            if self._mapa is None:
+                return -1
+            real = self._truncado()
+            return self._mapa.rfind(subcadena, max(0, inicio), fin if real is None else min(fin, real))
+
+    def cerrar(self):
+        with self._lock:
+            if self._mapa is not None:
+                self._mapa.close()
+                self._mapa = None
+            self._archivo.close()
+
+
+def inicio_linea_siguiente(archivo, posicion):
+    """
+    Devuelve dónde empieza la línea que sigue a la que empieza en `posicion`.
+
+    Las líneas de más de LIMITE_LINEA bytes se parten en trozos.
+
+    Returns:
+        int: Desplazamiento de la línea siguiente (o el tamaño si no hay)
+    """
+    fin = min(archivo.tamano, posicion + LIMITE_LINEA)
+    salto = archivo.buscar(b'\n', posicion, fin)
+    return salto + 1 if salto >= 0 else fin
+
+
+def inicio_linea_anterior(archivo, posicion):
+    """
+    Devuelve dónde empieza la línea anterior a la que empieza en `posicion`.
+
+    Returns:
+        int: Desplazamiento de la línea anterior (0 si no hay)
+    """
+    if posicion <= 0:
+        return 0
+    # El byte en posicion - 1 es el '\n' que cierra la línea anterior
+    salto = archivo.buscar_atras(b'\n', posicion - 1 - LIMITE_LINEA, posicion - 1)
+    if salto >= 0:
+        return salto + 1
+    return max(0, posicion - LIMITE_LINEA)
+
+
+def leer_lineas(archivo, posicion, cantidad):
+    """
+    Lee como mucho `cantidad` líneas a partir de `posicion`.
+
+    Returns:
+        tuple: (lista de líneas como texto, desplazamiento tras la última)
+    """
+    lineas = []
+    while len(lineas) < cantidad and posicion < archivo.tamano:
+        siguiente = inicio_linea_siguiente(archivo, posicion)
+        datos = archivo.leer(posicion, siguiente - posicion)
+        lineas.append(datos.rstrip(b'\r\n').decode('utf-8', errors='replace'))
+        posicion = siguiente
+    return lineas, posicion
+
+
+def formatear_hex(datos, desplazamiento, ancho=16):
+    """
+    Formatea bytes como volcado hexadecimal.
+
+    Args:
+        datos (bytes): Bytes a mostrar
+        desplazamiento (int): Posición del primer byte en el archivo
+        ancho (int): Bytes por fila
+
+    Returns:
+        list: Filas de texto "desplazamiento  hex  |ascii|"
+    """
+    filas = []
+    for i in range(0, len(datos), ancho):
+        trozo = datos[i:i + ancho]
+        hexa = ' '.join(f"{b:02x}" for b in trozo)
+        texto = ''.join(chr(b) if 32 <= b < 127 else '.' for b in trozo)
+        filas.append(f"{desplazamiento + i:012x}  {hexa:<{ancho * 3 - 1}}  |{texto}|")
+    return filas
+
+
+class IndiceLineas:
+    """
+    Índice disperso de números de línea, construido en segundo plano.
+
+    Guarda un punto de control (desplazamiento de un inicio de línea,
+    número de esa línea) por cada PASO_INDICE bytes leídos, en arrays de
+    enteros de 64 bits: unos 5 MB para un archivo de 20 GB. Con él, pasar
+    de un número de línea a un desplazamiento (o al revés) solo requiere
+    recorrer como mucho un bloque.
+    """
+
+    def __init__(self, archivo, paso=PASO_INDICE):
+        self.archivo = archivo
+        self.paso = paso
+        self.desplazamientos = array('Q', [0])
+        self.lineas = array('Q', [0])
+        self.procesado = 0
+        self.saltos = 0
+        self._lock = threading.Lock()
+        self._hilo = None
+        self._detener = threading.Event()
+
+    @property
+    def completo(self):
+        return self.procesado >= self.archivo.tamano
+
+    def total_lineas(self):
+        """
+        Número de líneas del archivo (solo fiable si el índice está completo).
+
+        Returns:
+            int: Líneas contadas hasta ahora
+        """
+        with self._lock:
+            saltos, procesado = self.saltos, self.procesado
+        if procesado == 0:
+            return 0
+        # Una última línea sin '\n' final también cuenta
+        ultimo = self.archivo.leer(procesado - 1, 1)
+        return saltos + (0 if ultimo == b'\n' else 1)
+
+    def extender(self):
+        """
+        Indexa en segundo plano los bytes aún no procesados (p. ej. los
+        añadidos a un log). No hace nada si ya hay un hilo trabajando.
+
+        Returns:
+            None
+        """
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._hilo = threading.Thread(target=self._indexar, name="indice-lineas", daemon=True)
+        self._hilo.start()
+
+    def reiniciar(self):
+        """
+        Descarta el índice (p. ej. porque el archivo se truncó) y lo rehace.
+
+        Returns:
+            None
+        """
+        self.detener()
+        if self._hilo is not None:
+            self._hilo.join()
+        with self._lock:
+            self.desplazamientos = array('Q', [0])
+            self.lineas = array('Q', [0])
+            self.procesado = 0
+            self.saltos = 0
+        self._detener.clear()
+        self.extender()
+
+    def detener(self):
+        self._detener.set()
+
+    def _indexar(self):
+        while not self._detener.is_set():
+            inicio = self.procesado
+            bloque = self.archivo.leer(inicio, self.paso)
+            if not bloque:
+                return
+            saltos = bloque.count(b'\n')
+            ultimo = bloque.rfind(b'\n')
+            with self._lock:
+                self.saltos += saltos
+                if ultimo >= 0:
+                    # Punto de control: la línea que empieza tras el último '\n'
+                    self.desplazamientos.append(inicio + ultimo + 1)
+                    self.lineas.append(self.saltos)
+                self.procesado = inicio + len(bloque)
+
+    def _punto_control(self, valores, objetivo):
+        """Índice del último punto de control con valor <= objetivo."""
+        inicio, fin = 0, len(valores)
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            if valores[medio] <= objetivo:
+                inicio = medio + 1
+            else:
+                fin = medio
+        return max(0, inicio - 1)
+
+    def linea_de(self, posicion):
+        """
+        Número de línea (desde 0) de un desplazamiento ya indexado.
+
+        Args:
+            posicion (int): Desplazamiento en bytes
+
+        Returns:
+            int: Número de línea, o None si esa zona aún no está indexada
+                 (o si está muy lejos de cualquier salto de línea)
+        """
+        with self._lock:
+            if posicion > self.procesado:
+                return None
+            i = self._punto_control(self.desplazamientos, posicion)
+            desde, linea = self.desplazamientos[i], self.lineas[i]
+        if posicion - desde > 4 * self.paso:
+            # Zona sin saltos de línea (p. ej. un binario): no se cuenta
+            return None
+        return linea + self.archivo.leer(desde, posicion - desde).count(b'\n')
+
+    def desplazamiento_de(self, linea):
+        """
+        Desplazamiento en bytes donde empieza una línea ya indexada.
+
+        Args:
+            linea (int): Número de línea (desde 0)
+
+        Returns:
+            int: Desplazamiento, o None si esa línea aún no está indexada
+        """
+        with self._lock:
+            if linea > self.saltos:
+                return None
+            i = self._punto_control(self.lineas, linea)
+            posicion, actual = self.desplazamientos[i], self.lineas[i]
+        while actual < linea:
+            salto = self.archivo.buscar(b'\n', posicion, self.archivo.tamano)
+            if salto < 0:
+                break
+            posicion = salto + 1
+            actual += 1
+        return posicion